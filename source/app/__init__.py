@@ -35,6 +35,7 @@ from werkzeug.middleware.proxy_fix import ProxyFix
 from app.flask_dropzone import Dropzone
 from app.iris_engine.tasker.celery import make_celery
 from app.iris_engine.access_control.oidc_handler import get_oidc_client
+from app.iris_engine.utils.uploads import StreamedUploadRequest
 
 
 class ReverseProxied(object):
@@ -63,6 +64,7 @@ LOG_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
 logger.basicConfig(level=logger.INFO, format=LOG_FORMAT, datefmt=LOG_TIME_FORMAT)
 
 app = Flask(__name__)
+app.request_class = StreamedUploadRequest
 
 
 def ac_current_user_has_permission(*permissions):
@@ -0,0 +1,66 @@
+"""Add similarity postings keys
+
+Revision ID: 0b1a4ba10163
+Revises: fdcc7e638874
+Create Date: 2026-10-18 10:02:17.518443
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table, _table_has_column, index_exists
+
+# revision identifiers, used by Alembic.
+revision = '0b1a4ba10163'
+down_revision = 'fdcc7e638874'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not _has_table('similar_alerts_cache'):
+        return
+
+    if not _table_has_column('similar_alerts_cache', 'posting_key'):
+        op.add_column('similar_alerts_cache', sa.Column('posting_key', sa.Text(), nullable=True))
+
+        # Keys must match build_similarity_posting_key: whitespaces collapsed, lower case, md5 hex digest
+        op.execute(text("""
+            UPDATE similar_alerts_cache
+            SET posting_key = 'asset:' || md5(lower(regexp_replace(
+                regexp_replace(asset_name, '^\\s+|\\s+$', '', 'g'), '\\s+', ' ', 'g')))
+            WHERE asset_name IS NOT NULL
+        """))
+        op.execute(text("""
+            UPDATE similar_alerts_cache
+            SET posting_key = 'ioc:' || md5(lower(regexp_replace(
+                regexp_replace(ioc_value, '^\\s+|\\s+$', '', 'g'), '\\s+', ' ', 'g')))
+            WHERE ioc_value IS NOT NULL AND asset_name IS NULL
+        """))
+
+        # Title fingerprints additionally mask numbers
+        op.execute(text("""
+            INSERT INTO similar_alerts_cache (customer_id, alert_id, created_at, posting_key)
+            SELECT alert_customer_id, alert_id, alert_source_event_time,
+                   'title:' || md5(regexp_replace(lower(regexp_replace(
+                       regexp_replace(alert_title, '^\\s+|\\s+$', '', 'g'), '\\s+', ' ', 'g')), '[0-9]+', '#', 'g'))
+            FROM alerts
+        """))
+
+    if not index_exists('similar_alerts_cache', 'idx_similar_alerts_cache_posting'):
+        op.create_index('idx_similar_alerts_cache_posting', 'similar_alerts_cache',
+                        ['customer_id', 'posting_key', 'created_at'])
+
+    if not index_exists('similar_alerts_cache', 'idx_similar_alerts_cache_alert_id'):
+        op.create_index('idx_similar_alerts_cache_alert_id', 'similar_alerts_cache', ['alert_id'])
+
+    if not index_exists('similar_alerts_cache', 'idx_similar_alerts_cache_created_at'):
+        op.create_index('idx_similar_alerts_cache_created_at', 'similar_alerts_cache', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('idx_similar_alerts_cache_created_at', table_name='similar_alerts_cache')
+    op.drop_index('idx_similar_alerts_cache_alert_id', table_name='similar_alerts_cache')
+    op.drop_index('idx_similar_alerts_cache_posting', table_name='similar_alerts_cache')
+    op.drop_column('similar_alerts_cache', 'posting_key')
@@ -0,0 +1,77 @@
+"""Add datastore blobs
+
+Revision ID: 3f6c1e8a9b20
+Revises: 7e2a9c4b1d58
+Create Date: 2026-10-18 20:42:17.093581
+
+"""
+import shutil
+from alembic import op
+import sqlalchemy as sa
+from pathlib import Path
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+from app.alembic.alembic_utils import _table_has_column
+from app.alembic.alembic_utils import index_exists
+
+# revision identifiers, used by Alembic.
+revision = '3f6c1e8a9b20'
+down_revision = '7e2a9c4b1d58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing files keep their own copy until the datastore deduplication task moves them to blobs
+    if not _has_table('data_store_blob'):
+        op.create_table('data_store_blob',
+                        sa.Column('blob_id', sa.BigInteger, primary_key=True),
+                        sa.Column('blob_key', sa.Text, nullable=False, unique=True),
+                        sa.Column('blob_sha256', sa.Text, nullable=False),
+                        sa.Column('blob_local_name', sa.Text, nullable=False),
+                        sa.Column('blob_size', sa.BigInteger, nullable=False, server_default='0'),
+                        sa.Column('blob_refcount', sa.BigInteger, nullable=False, server_default='0'),
+                        sa.Column('blob_date_added', sa.DateTime)
+                        )
+
+    if not _table_has_column('data_store_file', 'file_blob_id'):
+        op.add_column('data_store_file',
+                      sa.Column('file_blob_id', sa.BigInteger, sa.ForeignKey('data_store_blob.blob_id'),
+                                nullable=True)
+                      )
+
+    if not index_exists('data_store_file', 'ix_data_store_file_file_blob_id'):
+        op.create_index('ix_data_store_file_file_blob_id', 'data_store_file', ['file_blob_id'])
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    # Each file gets its own copy again, the first file of a blob keeps the blob itself
+    if _table_has_column('data_store_file', 'file_blob_id'):
+        files = conn.execute(text("SELECT file_id, file_uuid, file_blob_id, file_local_name FROM data_store_file "
+                                  "WHERE file_blob_id IS NOT NULL ORDER BY file_blob_id, file_id")).all()
+        previous_blob_id = None
+        for file_id, file_uuid, blob_id, local_name in files:
+            if blob_id != previous_blob_id:
+                previous_blob_id = blob_id
+                continue
+
+            blob_path = Path(local_name)
+            if not blob_path.is_file():
+                continue
+
+            file_path = blob_path.parent / f"dsf-{file_uuid}{''.join(blob_path.suffixes)}"
+            shutil.copyfile(blob_path, file_path)
+            conn.execute(text("UPDATE data_store_file SET file_local_name = :local_name WHERE file_id = :file_id"),
+                         {'local_name': file_path.as_posix(), 'file_id': file_id})
+
+    if index_exists('data_store_file', 'ix_data_store_file_file_blob_id'):
+        op.drop_index('ix_data_store_file_file_blob_id', 'data_store_file')
+
+    if _table_has_column('data_store_file', 'file_blob_id'):
+        op.drop_column('data_store_file', 'file_blob_id')
+
+    if _has_table('data_store_blob'):
+        op.drop_table('data_store_blob')
@@ -0,0 +1,38 @@
+"""Add user API key digest
+
+Revision ID: 4f0d6e1c8a27
+Revises: 0b1a4ba10163
+Create Date: 2026-10-18 11:21:05.614202
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _table_has_column, index_exists
+
+# revision identifiers, used by Alembic.
+revision = '4f0d6e1c8a27'
+down_revision = '0b1a4ba10163'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not _table_has_column('user', 'api_key_digest'):
+        op.add_column('user', sa.Column('api_key_digest', sa.String(64), nullable=True))
+
+        # Must match get_api_key_digest: hexadecimal SHA-256 of the UTF-8 key
+        op.execute(text("""
+            UPDATE "user"
+            SET api_key_digest = encode(sha256(convert_to(api_key, 'UTF8')), 'hex')
+            WHERE api_key IS NOT NULL
+        """))
+
+    if not index_exists('user', 'ix_user_api_key_digest'):
+        op.create_index('ix_user_api_key_digest', 'user', ['api_key_digest'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_user_api_key_digest', table_name='user')
+    op.drop_column('user', 'api_key_digest')
@@ -0,0 +1,69 @@
+"""Add full-text and trigram search indexes
+
+Revision ID: 5b9d27e3f1a4
+Revises: c81f5a3e2d67
+Create Date: 2026-10-18 17:02:44.318920
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table, index_exists
+
+# revision identifiers, used by Alembic.
+revision = '5b9d27e3f1a4'
+down_revision = 'c81f5a3e2d67'
+branch_labels = None
+depends_on = None
+
+# The expressions must stay identical to the ones used by app.datamgmt.search.search_db, otherwise the
+# full-text searches do not use the indexes
+_fulltext_indexes = [
+    ('notes', 'ix_notes_fulltext',
+     "to_tsvector('simple'::regconfig, left(coalesce(note_title, '') || ' ' || coalesce(note_content, ''), 100000))"),
+    ('comments', 'ix_comments_fulltext',
+     "to_tsvector('simple'::regconfig, left(coalesce(comment_text, ''), 100000))")
+]
+
+_trigram_indexes = [
+    ('notes', 'ix_notes_content_trgm', 'note_content'),
+    ('comments', 'ix_comments_text_trgm', 'comment_text'),
+    ('ioc', 'ix_ioc_value_trgm', 'ioc_value')
+]
+
+
+def _create_trigram_extension(conn):
+    # The extension requires privileges the database user may not have. Pattern searches then keep
+    # scanning the tables, so the upgrade goes on without it
+    savepoint = conn.begin_nested()
+    try:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        savepoint.commit()
+        return True
+
+    except Exception as e:
+        savepoint.rollback()
+        print(f'Unable to create the pg_trgm extension, trigram indexes are not created: {e}')
+        return False
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    for table_name, index_name, expression in _fulltext_indexes:
+        if _has_table(table_name) and not index_exists(table_name, index_name):
+            conn.execute(text(f"CREATE INDEX {index_name} ON {table_name} USING gin (({expression}))"))
+
+    if not _create_trigram_extension(conn):
+        return
+
+    for table_name, index_name, column in _trigram_indexes:
+        if _has_table(table_name) and not index_exists(table_name, index_name):
+            conn.execute(text(f"CREATE INDEX {index_name} ON {table_name} USING gin ({column} gin_trgm_ops)"))
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    for table_name, index_name, _ in _fulltext_indexes + _trigram_indexes:
+        conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
@@ -0,0 +1,55 @@
+"""Add note revisions delta
+
+Revision ID: 7e2a9c4b1d58
+Revises: 5b9d27e3f1a4
+Create Date: 2026-10-18 18:11:52.604117
+
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _table_has_column
+from app.iris_engine.utils.text_delta import apply_delta
+
+# revision identifiers, used by Alembic.
+revision = '7e2a9c4b1d58'
+down_revision = '5b9d27e3f1a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing revisions are full snapshots; the compaction job converts them to deltas
+    if not _table_has_column('note_revisions', 'note_content_delta'):
+        op.add_column('note_revisions', sa.Column('note_content_delta', sa.JSON, nullable=True))
+
+
+def downgrade():
+    if not _table_has_column('note_revisions', 'note_content_delta'):
+        return
+
+    conn = op.get_bind()
+
+    # Rebuild the content of the delta revisions before dropping them
+    notes_ids = conn.execute(text("SELECT DISTINCT note_id FROM note_revisions "
+                                  "WHERE note_content_delta IS NOT NULL")).scalars().all()
+    for note_id in notes_ids:
+        revisions = conn.execute(text("SELECT revision_id, note_content, note_content_delta FROM note_revisions "
+                                      "WHERE note_id = :note_id ORDER BY revision_number"),
+                                 {'note_id': note_id}).all()
+        content = None
+        for revision_id, note_content, note_content_delta in revisions:
+            if note_content_delta is None:
+                content = note_content
+                continue
+
+            if isinstance(note_content_delta, str):
+                note_content_delta = json.loads(note_content_delta)
+
+            content = apply_delta(content, note_content_delta)
+            conn.execute(text("UPDATE note_revisions SET note_content = :content WHERE revision_id = :revision_id"),
+                         {'content': content, 'revision_id': revision_id})
+
+    op.drop_column('note_revisions', 'note_content_delta')
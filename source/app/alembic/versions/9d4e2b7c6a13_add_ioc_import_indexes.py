@@ -0,0 +1,44 @@
+"""Add IOC import indexes
+
+Revision ID: 9d4e2b7c6a13
+Revises: 3f6c1e8a9b20
+Create Date: 2026-10-18 22:11:36.204571
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table, index_exists
+
+# revision identifiers, used by Alembic.
+revision = '9d4e2b7c6a13'
+down_revision = '3f6c1e8a9b20'
+branch_labels = None
+depends_on = None
+
+_link_index_name = 'ix_ioc_link_ioc_id_case_id'
+
+# IOC values are not bounded, so they are indexed through their digest. The expression must stay identical to the
+# one used by app.datamgmt.case.case_iocs_db.get_iocs_ids_by_values_types, otherwise the lookups do not use the index
+_value_index_name = 'ix_ioc_type_id_value_md5'
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    if _has_table('ioc_link') and not index_exists('ioc_link', _link_index_name):
+        # Keep a single link per IOC and case before enforcing it
+        conn.execute(text("DELETE FROM ioc_link a USING ioc_link b "
+                          "WHERE a.ioc_id = b.ioc_id AND a.case_id = b.case_id AND a.ioc_link_id > b.ioc_link_id"))
+
+        op.create_index(_link_index_name, 'ioc_link', ['ioc_id', 'case_id'], unique=True)
+
+    if _has_table('ioc') and not index_exists('ioc', _value_index_name):
+        conn.execute(text(f"CREATE INDEX {_value_index_name} ON ioc (ioc_type_id, md5(ioc_value))"))
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text(f"DROP INDEX IF EXISTS {_value_index_name}"))
+    conn.execute(text(f"DROP INDEX IF EXISTS {_link_index_name}"))
@@ -0,0 +1,34 @@
+"""Add timeline filter indexes
+
+Revision ID: a3c51e7d9b40
+Revises: 4f0d6e1c8a27
+Create Date: 2026-10-18 12:04:51.220917
+
+"""
+from alembic import op
+
+from app.alembic.alembic_utils import _has_table, index_exists
+
+# revision identifiers, used by Alembic.
+revision = 'a3c51e7d9b40'
+down_revision = '4f0d6e1c8a27'
+branch_labels = None
+depends_on = None
+
+_indexes = [
+    ('cases_events', 'idx_cases_events_case_date', ['case_id', 'event_date']),
+    ('case_events_assets', 'idx_case_events_assets_case_event', ['case_id', 'event_id']),
+    ('case_events_ioc', 'idx_case_events_ioc_case_event', ['case_id', 'event_id'])
+]
+
+
+def upgrade():
+    for table_name, index_name, columns in _indexes:
+        if _has_table(table_name) and not index_exists(table_name, index_name):
+            op.create_index(index_name, table_name, columns)
+
+
+def downgrade():
+    for table_name, index_name, _ in _indexes:
+        if index_exists(table_name, index_name):
+            op.drop_index(index_name, table_name=table_name)
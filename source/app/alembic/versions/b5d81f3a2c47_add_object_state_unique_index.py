@@ -0,0 +1,40 @@
+"""Add object state unique index
+
+Revision ID: b5d81f3a2c47
+Revises: 9d4e2b7c6a13
+Create Date: 2026-10-19 09:42:17.518304
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table, index_exists
+
+# revision identifiers, used by Alembic.
+revision = 'b5d81f3a2c47'
+down_revision = '9d4e2b7c6a13'
+branch_labels = None
+depends_on = None
+
+_index_name = 'ix_object_state_object_case_id_object_name'
+
+
+def upgrade():
+    if not _has_table('object_state') or index_exists('object_state', _index_name):
+        return
+
+    conn = op.get_bind()
+
+    # Keep the most recent state of each object before enforcing a single one
+    conn.execute(text("DELETE FROM object_state a USING object_state b "
+                      "WHERE a.object_case_id = b.object_case_id AND a.object_name = b.object_name "
+                      "AND (a.object_state < b.object_state "
+                      "OR (a.object_state = b.object_state AND a.object_id < b.object_id))"))
+
+    op.create_index(_index_name, 'object_state', ['object_case_id', 'object_name'], unique=True)
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text(f"DROP INDEX IF EXISTS {_index_name}"))
@@ -0,0 +1,57 @@
+"""Sparse user case effective access
+
+Revision ID: c81f5a3e2d67
+Revises: a3c51e7d9b40
+Create Date: 2026-10-18 15:21:07.481263
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table, index_exists
+
+# revision identifiers, used by Alembic.
+revision = 'c81f5a3e2d67'
+down_revision = 'a3c51e7d9b40'
+branch_labels = None
+depends_on = None
+
+_table_name = 'user_case_effective_access'
+_unique_index_name = 'ix_user_case_effective_access_user_case'
+_case_index_name = 'ix_user_case_effective_access_case_id'
+
+
+def upgrade():
+    if not _has_table(_table_name):
+        return
+
+    conn = op.get_bind()
+
+    # Denied accesses are now implicit
+    conn.execute(text(f"DELETE FROM {_table_name} WHERE access_level IS NULL OR access_level & 1 = 1"))
+
+    # Keep a single access per user and case before enforcing it
+    conn.execute(text(f"DELETE FROM {_table_name} a USING {_table_name} b "
+                      f"WHERE a.user_id = b.user_id AND a.case_id = b.case_id AND a.id < b.id"))
+
+    if not index_exists(_table_name, _unique_index_name):
+        op.create_index(_unique_index_name, _table_name, ['user_id', 'case_id'], unique=True)
+
+    if not index_exists(_table_name, _case_index_name):
+        op.create_index(_case_index_name, _table_name, ['case_id'])
+
+
+def downgrade():
+    if not _has_table(_table_name):
+        return
+
+    for index_name in [_case_index_name, _unique_index_name]:
+        if index_exists(_table_name, index_name):
+            op.drop_index(index_name, table_name=_table_name)
+
+    # Restore the explicit denied accesses
+    conn = op.get_bind()
+    conn.execute(text(f"INSERT INTO {_table_name} (user_id, case_id, access_level) "
+                      f"SELECT u.id, c.case_id, 1 FROM \"user\" u CROSS JOIN cases c "
+                      f"WHERE NOT EXISTS (SELECT 1 FROM {_table_name} e "
+                      f"WHERE e.user_id = u.id AND e.case_id = c.case_id)"))
@@ -0,0 +1,67 @@
+"""Add note revisions unique number
+
+Revision ID: d3a8f6c2e915
+Revises: b5d81f3a2c47
+Create Date: 2026-10-19 14:06:31.207845
+
+"""
+import json
+from alembic import op
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table, index_exists
+from app.iris_engine.utils.text_delta import apply_delta
+
+# revision identifiers, used by Alembic.
+revision = 'd3a8f6c2e915'
+down_revision = 'b5d81f3a2c47'
+branch_labels = None
+depends_on = None
+
+_constraint_name = 'uq_note_revisions_note_id_revision_number'
+
+
+def upgrade():
+    if not _has_table('note_revisions') or index_exists('note_revisions', _constraint_name):
+        return
+
+    conn = op.get_bind()
+
+    # Concurrent updates could save several revisions of a note with the same number, each a delta from the revision
+    # preceding that number. The revisions of these notes are renumbered in their order of creation and stored as
+    # snapshots, so the deltas don't apply to the wrong revisions. The compaction job turns them back into deltas.
+    notes_ids = conn.execute(text("SELECT DISTINCT note_id FROM note_revisions "
+                                  "GROUP BY note_id, revision_number HAVING COUNT(*) > 1")).scalars().all()
+    for note_id in notes_ids:
+        revisions = conn.execute(text("SELECT revision_id, revision_number, note_content, note_content_delta "
+                                      "FROM note_revisions WHERE note_id = :note_id "
+                                      "ORDER BY revision_number, revision_id"),
+                                 {'note_id': note_id}).all()
+
+        previous_number = None
+        base_content = None
+        content = None
+        for new_number, (revision_id, revision_number, note_content, note_content_delta) in enumerate(revisions, 1):
+            if revision_number != previous_number:
+                base_content = content
+                previous_number = revision_number
+
+            if note_content_delta is None:
+                content = note_content
+            else:
+                if isinstance(note_content_delta, str):
+                    note_content_delta = json.loads(note_content_delta)
+                content = apply_delta(base_content, note_content_delta)
+
+            conn.execute(text("UPDATE note_revisions SET revision_number = :revision_number, "
+                              "note_content = :content, note_content_delta = NULL "
+                              "WHERE revision_id = :revision_id"),
+                         {'revision_number': new_number, 'content': content, 'revision_id': revision_id})
+
+    op.create_unique_constraint(_constraint_name, 'note_revisions', ['note_id', 'revision_number'])
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text(f"ALTER TABLE note_revisions DROP CONSTRAINT IF EXISTS {_constraint_name}"))
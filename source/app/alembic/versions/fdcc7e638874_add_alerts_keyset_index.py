@@ -0,0 +1,29 @@
+"""Add alerts keyset pagination index
+
+Revision ID: fdcc7e638874
+Revises: d5a720d1b99b
+Create Date: 2026-10-18 09:12:41.302117
+
+"""
+from alembic import op
+
+from app.alembic.alembic_utils import _has_table, index_exists
+
+# revision identifiers, used by Alembic.
+revision = 'fdcc7e638874'
+down_revision = 'd5a720d1b99b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Composite index backing the cursor pagination of /alerts/filter
+    if _has_table('alerts'):
+        if not index_exists('alerts', 'idx_alerts_source_event_time_id'):
+            op.create_index('idx_alerts_source_event_time_id', 'alerts',
+                            ['alert_source_event_time', 'alert_id'])
+
+
+def downgrade():
+    if index_exists('alerts', 'idx_alerts_source_event_time_id'):
+        op.drop_index('idx_alerts_source_event_time_id', table_name='alerts')
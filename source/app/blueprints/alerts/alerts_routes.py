@@ -32,10 +32,15 @@ from app.datamgmt.alerts.alerts_db import get_filtered_alerts, get_alert_by_id,
 from app.datamgmt.alerts.alerts_db import merge_alert_in_case, unmerge_alert_from_case, cache_similar_alert
 from app.datamgmt.alerts.alerts_db import get_related_alerts, get_related_alerts_details
 from app.datamgmt.alerts.alerts_db import get_alert_comments, delete_alert_comment, get_alert_comment
-from app.datamgmt.alerts.alerts_db import delete_similar_alert_cache, delete_alerts
+from app.datamgmt.alerts.alerts_db import delete_similar_alert_cache, delete_alerts, update_similar_alert_title
 from app.datamgmt.alerts.alerts_db import create_case_from_alerts
+from app.datamgmt.alerts.alerts_db import decode_alert_cursor, create_alerts_batch
+from app.datamgmt.alerts.alerts_db import get_alerts_by_ids, update_alerts_batch, add_alerts_history_entry
+from app.datamgmt.alerts.alerts_db import get_alert_status_by_name, update_similar_alerts_titles
+from app.datamgmt.alerts.alerts_db import get_alerts_aggregations, ALERTS_AGGREGATION_TIME_BUCKETS
 from app.datamgmt.case.case_db import get_case
 from app.datamgmt.manage.manage_access_control_db import check_ua_case_client, user_has_client_access
+from app.datamgmt.manage.manage_common import get_bulk_schema_context
 from app.iris_engine.access_control.utils import ac_set_new_case_access
 from app.iris_engine.module_handler.module_handler import call_modules_hook
 from app.iris_engine.utils.tracker import track_activity
@@ -52,6 +57,52 @@ alerts_blueprint = Blueprint(
     template_folder='templates'
 )
 
+ALERTS_BATCH_MAX_SIZE = 10000
+
+
+def _get_list_arg(name: str, item_type, error: str) -> Union[List, None]:
+    value = request.args.get(name)
+    if not value:
+        return None
+
+    try:
+        return [item_type(item) for item in value.split(',')]
+
+    except ValueError:
+        raise ValueError(error)
+
+
+def _get_alerts_filters_args() -> dict:
+    """
+    Read the alerts filters from the query arguments, shared by the alerts list and aggregations
+
+    returns:
+        dict: The filter arguments of get_filtered_alerts
+    """
+    return {
+        'start_date': request.args.get('creation_start_date'),
+        'end_date': request.args.get('creation_end_date'),
+        'source_start_date': request.args.get('source_start_date'),
+        'source_end_date': request.args.get('source_end_date'),
+        'source_reference': request.args.get('source_reference'),
+        'title': request.args.get('alert_title'),
+        'description': request.args.get('alert_description'),
+        'status': request.args.get('alert_status_id', type=int),
+        'severity': request.args.get('alert_severity_id', type=int),
+        'owner': request.args.get('alert_owner_id', type=int),
+        'source': request.args.get('alert_source'),
+        'tags': request.args.get('alert_tags'),
+        'classification': request.args.get('alert_classification_id', type=int),
+        'client': request.args.get('alert_customer_id'),
+        'case_id': request.args.get('case_id', type=int),
+        'alert_ids': _get_list_arg('alert_ids', int, 'Invalid alert id'),
+        'custom_conditions': request.args.get('custom_conditions'),
+        'assets': _get_list_arg('alert_assets', str, 'Invalid alert asset'),
+        'iocs': _get_list_arg('alert_iocs', str, 'Invalid alert ioc'),
+        'resolution_status': request.args.get('alert_resolution_id', type=int),
+        'current_user_id': current_user.id
+    }
+
 
 @alerts_blueprint.route('/alerts/filter', methods=['GET'])
 @ac_api_requires(Permissions.alerts_read)
@@ -68,47 +119,11 @@ def alerts_list_route() -> Response:
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
 
-    alert_ids_str = request.args.get('alert_ids')
-    alert_ids = None
-    if alert_ids_str:
-        try:
-
-            if ',' in alert_ids_str:
-                alert_ids = [int(alert_id) for alert_id in alert_ids_str.split(',')]
-
-            else:
-                alert_ids = [int(alert_ids_str)]
-
-        except ValueError:
-            return response_error('Invalid alert id')
-
-    alert_assets_str = request.args.get('alert_assets')
-    alert_assets = None
-    if alert_assets_str:
-        try:
-
-            if ',' in alert_assets_str:
-                alert_assets = [str(alert_asset) for alert_asset in alert_assets_str.split(',')]
-
-            else:
-                alert_assets = [str(alert_assets_str)]
-
-        except ValueError:
-            return response_error('Invalid alert asset')
-
-    alert_iocs_str = request.args.get('alert_iocs')
-    alert_iocs = None
-    if alert_iocs_str:
-        try:
-
-            if ',' in alert_iocs_str:
-                alert_iocs = [str(alert_ioc) for alert_ioc in alert_iocs_str.split(',')]
-
-            else:
-                alert_iocs = [str(alert_iocs_str)]
+    try:
+        filters = _get_alerts_filters_args()
 
-        except ValueError:
-            return response_error('Invalid alert ioc')
+    except ValueError as e:
+        return response_error(str(e))
 
     fields_str = request.args.get('fields')
     if fields_str:
@@ -117,33 +132,29 @@ def alerts_list_route() -> Response:
     else:
         fields = None
 
+    cursor = request.args.get('cursor')
+    use_cursor = request.args.get('pagination', 'page', type=str) == 'cursor' or cursor is not None
+    if cursor:
+        try:
+            decode_alert_cursor(cursor)
+
+        except ValueError:
+            return response_error('Invalid cursor')
+
+    count_mode = request.args.get('count', 'cached' if use_cursor else 'exact', type=str)
+    if count_mode not in ['exact', 'cached', 'none']:
+        return response_error('Invalid count mode')
+
     try:
         filtered_data = get_filtered_alerts(
-            start_date=request.args.get('creation_start_date'),
-            end_date=request.args.get('creation_end_date'),
-            source_start_date=request.args.get('source_start_date'),
-            source_end_date=request.args.get('source_end_date'),
-            source_reference=request.args.get('source_reference'),
-            title=request.args.get('alert_title'),
-            description=request.args.get('alert_description'),
-            status=request.args.get('alert_status_id', type=int),
-            severity=request.args.get('alert_severity_id', type=int),
-            owner=request.args.get('alert_owner_id', type=int),
-            source=request.args.get('alert_source'),
-            tags=request.args.get('alert_tags'),
-            classification=request.args.get('alert_classification_id', type=int),
-            client=request.args.get('alert_customer_id'),
-            case_id=request.args.get('case_id', type=int),
-            alert_ids=alert_ids,
+            **filters,
             page=page,
             per_page=per_page,
             sort=request.args.get('sort', 'desc', type=str),
-            custom_conditions=request.args.get('custom_conditions'),
-            assets=alert_assets,
-            iocs=alert_iocs,
-            resolution_status=request.args.get('alert_resolution_id', type=int),
-            current_user_id=current_user.id,
-            fields=fields
+            fields=fields,
+            use_cursor=use_cursor,
+            cursor=cursor,
+            count_mode=count_mode
         )
 
     except Exception as e:
@@ -156,6 +167,39 @@ def alerts_list_route() -> Response:
     return response_success(data=filtered_data)
 
 
+@alerts_blueprint.route('/alerts/aggregations', methods=['GET'])
+@ac_api_requires(Permissions.alerts_read)
+def alerts_aggregations_route() -> Response:
+    """
+    Get the counts of the filtered alerts by status, severity, customer, source, owner and time bucket.
+    Takes the same filters as /alerts/filter.
+
+    returns:
+        Response: The response
+    """
+    time_bucket = request.args.get('time_bucket', 'day', type=str)
+    if time_bucket not in ALERTS_AGGREGATION_TIME_BUCKETS:
+        return response_error('Invalid time bucket')
+
+    try:
+        filters = _get_alerts_filters_args()
+
+    except ValueError as e:
+        return response_error(str(e))
+
+    try:
+        aggregations = get_alerts_aggregations(filters, time_bucket=time_bucket)
+
+    except Exception as e:
+        app.app.logger.exception(e)
+        return response_error(str(e))
+
+    if aggregations is None:
+        return response_error('Filtering error')
+
+    return response_success(data=aggregations)
+
+
 @alerts_blueprint.route('/alerts/add', methods=['POST'])
 @ac_api_requires(Permissions.alerts_write)
 def alerts_add_route() -> Response:
@@ -208,7 +252,8 @@ def alerts_add_route() -> Response:
         # Cache the alert for similarities check
         cache_similar_alert(new_alert.alert_customer_id, assets=assets_list,
                             iocs=iocs_list, alert_id=new_alert.alert_id,
-                            creation_date=new_alert.alert_source_event_time)
+                            creation_date=new_alert.alert_source_event_time,
+                            title=new_alert.alert_title)
 
         #register_related_alerts(new_alert, assets_list=assets, iocs_list=iocs)
         
@@ -230,6 +275,118 @@ def alerts_add_route() -> Response:
         return response_error(str(e))
 
 
+def _load_alerts_batch(alerts_data: List[dict]):
+    """
+    Deserialize a batch of alerts in a single pass. Referential data and tags are loaded once for the whole batch.
+
+    args:
+        alerts_data (list): The alerts as received
+
+    returns:
+        tuple: The loaded alerts, their raw observables and the validation errors per index
+    """
+    tag_titles = set()
+    for alert_data in alerts_data:
+        if not isinstance(alert_data, dict):
+            continue
+        tag_titles.update((alert_data.get('alert_tags') or '').split(','))
+        for ioc_data in alert_data.get('alert_iocs') or []:
+            tag_titles.update((ioc_data.get('ioc_tags') or '').split(','))
+        for asset_data in alert_data.get('alert_assets') or []:
+            tag_titles.update((asset_data.get('asset_tags') or '').split(','))
+
+    context = get_bulk_schema_context(tag_titles)
+    alert_schema = AlertSchema(context=context)
+    ioc_schema = IocSchema(context=context, many=True)
+    asset_schema = CaseAssetsSchema(context=context, many=True)
+
+    new_alerts = []
+    alerts_observables = []
+    errors = []
+
+    for index, alert_data in enumerate(alerts_data):
+        if not isinstance(alert_data, dict):
+            errors.append({'index': index, 'errors': 'An alert object is expected'})
+            continue
+
+        alert_data = dict(alert_data)
+        iocs_list = alert_data.pop('alert_iocs', []) or []
+        assets_list = alert_data.pop('alert_assets', []) or []
+
+        try:
+            iocs = ioc_schema.load(iocs_list)
+            assets = asset_schema.load(assets_list)
+            new_alert = alert_schema.load(alert_data)
+
+        except marshmallow.exceptions.ValidationError as e:
+            errors.append({'index': index, 'errors': e.normalized_messages()})
+            continue
+
+        new_alert.iocs = iocs
+        new_alert.assets = assets
+
+        new_alerts.append(new_alert)
+        alerts_observables.append((iocs_list, assets_list))
+
+    return new_alerts, alerts_observables, errors
+
+
+@alerts_blueprint.route('/alerts/batch/add', methods=['POST'])
+@ac_api_requires(Permissions.alerts_write)
+def alerts_batch_add_route() -> Response:
+    """
+    Add a batch of alerts to the database. The alerts are validated together and inserted in a single
+    transaction, then the history, activity, hooks and notifications are issued once for the whole batch.
+
+    returns:
+        Response: The response
+    """
+    if not request.json:
+        return response_error('No JSON data provided')
+
+    data = request.get_json()
+    alerts_data = data.get('alerts') if isinstance(data, dict) else data
+
+    if not isinstance(alerts_data, list) or not alerts_data:
+        return response_error('A list of alerts is expected')
+
+    if len(alerts_data) > ALERTS_BATCH_MAX_SIZE:
+        return response_error(f'Too many alerts in the batch, the maximum is {ALERTS_BATCH_MAX_SIZE}')
+
+    try:
+        new_alerts, alerts_observables, errors = _load_alerts_batch(alerts_data)
+        if errors:
+            db.session.rollback()
+            return response_error('Invalid alerts in the batch, none were added', data=errors)
+
+        # Verify the user is entitled to create alerts for each client of the batch
+        for customer_id in {alert.alert_customer_id for alert in new_alerts}:
+            if not user_has_client_access(current_user.id, customer_id):
+                db.session.rollback()
+                return response_error(f'User not entitled to create alerts for the client {customer_id}', status=403)
+
+        new_alerts = create_alerts_batch(new_alerts, alerts_observables)
+
+        new_alerts = call_modules_hook('on_postload_alert_create', data=new_alerts)
+
+        alert_ids = [alert.alert_id for alert in new_alerts]
+        track_activity(f"created {len(alert_ids)} alerts in batch (#{min(alert_ids)} to #{max(alert_ids)})",
+                       ctx_less=True)
+
+        app.socket_io.emit('new_alerts', json.dumps({
+            'alert_ids': alert_ids
+        }), namespace='/alerts')
+
+        return response_success(msg=f'{len(alert_ids)} alerts created', data={
+            'count': len(alert_ids),
+            'alerts': [{'alert_id': alert.alert_id, 'alert_uuid': str(alert.alert_uuid)} for alert in new_alerts]
+        })
+
+    except Exception as e:
+        app.app.logger.exception(e)
+        return response_error(str(e))
+
+
 @alerts_blueprint.route('/alerts/<int:alert_id>', methods=['GET'])
 @ac_api_requires(Permissions.alerts_read)
 def alerts_get_route(alert_id) -> Response:
@@ -259,7 +416,7 @@ def alerts_get_route(alert_id) -> Response:
     alert_dump = alert_schema.dump(alert)
 
     # Get similar alerts
-    similar_alerts = get_related_alerts(alert.alert_customer_id, alert.assets, alert.iocs)
+    similar_alerts = get_related_alerts(alert.alert_customer_id, alert.assets, alert.iocs, title=alert.alert_title)
     alert_dump['related_alerts'] = similar_alerts
 
     return response_success(data=alert_dump)
@@ -374,6 +531,9 @@ def alerts_update_route(alert_id) -> Response:
         # Save the changes
         db.session.commit()
 
+        if 'alert_title' in data:
+            update_similar_alert_title(updated_alert)
+
         updated_alert = call_modules_hook('on_postload_alert_update', data=updated_alert)
 
         if do_resolution_hook:
@@ -399,17 +559,92 @@ def alerts_update_route(alert_id) -> Response:
         return response_error(str(e))
 
 
+def _parse_alert_ids(alert_ids) -> List[int]:
+    """
+    Parse the alert IDs of a batch, given as a list or as a comma separated string. Duplicates are removed.
+
+    args:
+        alert_ids (list|str): The alert IDs
+
+    returns:
+        list: The alert IDs, in the order they were given
+
+    raises:
+        ValueError: If the alert IDs are invalid
+    """
+    if isinstance(alert_ids, str):
+        alert_ids = alert_ids.split(',')
+
+    if not isinstance(alert_ids, list) or len(alert_ids) > ALERTS_BATCH_MAX_SIZE:
+        raise ValueError('Invalid alert IDs')
+
+    return list(dict.fromkeys(int(alert_id) for alert_id in alert_ids))
+
+
+def _get_batch_alerts(alert_ids: List[int], action: str, with_observables: bool = False):
+    """
+    Load the alerts of a batch in a single query, and check the access of the user once per customer
+
+    args:
+        alert_ids (list): The alert IDs
+        action (str): The action performed, for the outcome messages
+        with_observables (bool): Whether to load the IOCs and assets of the alerts as well
+
+    returns:
+        tuple: The alerts the user can act on, and the outcomes of the other alerts by alert ID
+    """
+    alerts = get_alerts_by_ids(alert_ids, with_observables=with_observables)
+
+    allowed_customers = {customer_id for customer_id in {alert.alert_customer_id for alert in alerts}
+                         if user_has_client_access(current_user.id, customer_id)}
+
+    outcomes = {alert_id: {'alert_id': alert_id, 'outcome': 'not_found', 'message': 'Alert not found'}
+                for alert_id in alert_ids}
+    allowed_alerts = []
+    for alert in alerts:
+        if alert.alert_customer_id in allowed_customers:
+            del outcomes[alert.alert_id]
+            allowed_alerts.append(alert)
+
+        else:
+            outcomes[alert.alert_id] = {'alert_id': alert.alert_id, 'outcome': 'forbidden',
+                                        'message': f'User not entitled to {action} alerts for the client'}
+
+    return allowed_alerts, outcomes
+
+
+def _get_batch_results(alert_ids: List[int], outcomes: dict, outcome: str) -> List[dict]:
+    """
+    Return the outcome of each alert of a batch, the alerts without a failed outcome getting the given one
+    """
+    return [outcomes.get(alert_id, {'alert_id': alert_id, 'outcome': outcome}) for alert_id in alert_ids]
+
+
+def _load_alerts_batch_updates(updates: dict) -> dict:
+    """
+    Validate the updates of a batch once, and return the new values of the alerts columns
+    """
+    updated_alert = AlertSchema().load(updates, partial=True)
+    if updated_alert in db.session:
+        db.session.expunge(updated_alert)
+
+    columns = set(Alert.__table__.columns.keys()) - {'alert_id', 'alert_uuid'}
+
+    return {key: getattr(updated_alert, key) for key in updates if key in columns}
+
+
 @alerts_blueprint.route('/alerts/batch/update', methods=['POST'])
 @ac_api_requires(Permissions.alerts_write)
 def alerts_batch_update_route() -> Response:
     """
-    Update multiple alerts in the database
+    Update multiple alerts in the database. The updates are validated once and applied with a single statement,
+    then the history, activity and hooks are issued once for the whole batch.
 
     args:
         caseid (int): The case id
 
     returns:
-        Response: The response
+        Response: The response, with the outcome of each alert
     """
     if not request.json:
         return response_error('No JSON data provided')
@@ -418,8 +653,14 @@ def alerts_batch_update_route() -> Response:
     data = request.get_json()
 
     # Get the list of alert IDs and updates from the request data
-    alert_ids: List[int] = data.get('alert_ids', [])
-    updates = data.get('updates', {})
+    try:
+        alert_ids = _parse_alert_ids(data.get('alert_ids') or [])
+    except (TypeError, ValueError):
+        return response_error('Invalid alert IDs')
+
+    updates = data.get('updates') or {}
+    if not isinstance(updates, dict):
+        return response_error('Invalid updates')
 
     if not updates.get('alert_tags'):
         updates.pop('alert_tags', None)
@@ -427,52 +668,63 @@ def alerts_batch_update_route() -> Response:
     if not alert_ids:
         return response_error('No alert IDs provided')
 
-    alert_schema = AlertSchema()
-
-    # Process each alert ID
-    for alert_id in alert_ids:
-        alert = get_alert_by_id(alert_id)
-        if not alert:
-            return response_error(f'Alert with ID {alert_id} not found')
+    try:
+        values = _load_alerts_batch_updates(updates)
 
-        try:
+    except marshmallow.exceptions.ValidationError as e:
+        db.session.rollback()
+        return response_error('Invalid updates', data=e.normalized_messages())
 
-            activity_data = []
-            for key, value in updates.items():
-                old_value = getattr(alert, key, None)
+    if updates.get('alert_owner_id') in ["-1", -1] or data.get('alert_owner_id') in ["-1", -1]:
+        values['alert_owner_id'] = None
 
-                if old_value != value:
-                    activity_data.append(f"\"{key}\"")
+    alerts, outcomes = _get_batch_alerts(alert_ids, 'update')
+    if not alerts:
+        return response_error('No alert updated', data=_get_batch_results(alert_ids, outcomes, 'updated'))
 
-            # Check if the user has access to the client
-            if not user_has_client_access(current_user.id, alert.alert_customer_id):
-                return response_error('User not entitled to update alerts for the client', status=403)
+    try:
+        # Alerts are grouped by changed fields, to record the same history entry for each group
+        changed_alerts = {}
+        for alert in alerts:
+            changed_keys = tuple(key for key, value in values.items() if getattr(alert, key, None) != value)
+            changed_alerts.setdefault(changed_keys, []).append(alert.alert_id)
 
-            if getattr(alert, 'alert_owner_id') is None:
-                updates['alert_owner_id'] = current_user.id
+        updated_ids = [alert.alert_id for alert in alerts]
+        update_alerts_batch(updated_ids, values, default_owner_id=current_user.id)
 
-            if data.get('alert_owner_id') == "-1" or data.get('alert_owner_id') == -1:
-                updates['alert_owner_id'] = None
+        for changed_keys, changed_ids in changed_alerts.items():
+            if changed_keys:
+                activity = ','.join(f'"{key}"' for key in changed_keys)
+                add_alerts_history_entry(changed_ids, f"updated alert: {activity}")
 
-            # Deserialize the JSON data into an Alert object
-            alert_schema.load(updates, instance=alert, partial=True)
+        db.session.commit()
 
-            db.session.commit()
+        alerts = get_alerts_by_ids(updated_ids)
+        if 'alert_title' in values:
+            update_similar_alerts_titles(alerts)
 
-            alert = call_modules_hook('on_postload_alert_update', data=alert)
+        alerts = call_modules_hook('on_postload_alert_update', data=alerts)
 
-            if activity_data:
-                track_activity(f"updated alert #{alert_id}: {','.join(activity_data)}", ctx_less=True)
-                add_obj_history_entry(alert, f"updated alert: {','.join(activity_data)}")
+        for key, hook_name in [('alert_resolution_status_id', 'on_postload_alert_resolution_update'),
+                               ('alert_status_id', 'on_postload_alert_status_update')]:
+            hook_ids = {alert_id for changed_keys, changed_ids in changed_alerts.items() if key in changed_keys
+                        for alert_id in changed_ids}
+            if hook_ids:
+                call_modules_hook(hook_name, data=[alert for alert in alerts if alert.alert_id in hook_ids])
 
-            db.session.commit()
+        activity = ','.join(f'"{key}"' for key in values)
+        track_activity(f"updated {len(updated_ids)} alerts in batch (#{min(updated_ids)} to #{max(updated_ids)}): "
+                       f"{activity}", ctx_less=True)
 
-        except Exception as e:
-            # Handle any errors during deserialization or DB operations
-            return response_error(str(e))
+    except Exception as e:
+        app.app.logger.exception(e)
+        db.session.rollback()
+        return response_error(str(e))
 
-    # Return a success response
-    return response_success(msg='Batch update successful')
+    return response_success(msg=f'{len(updated_ids)} alerts updated', data={
+        'count': len(updated_ids),
+        'results': _get_batch_results(alert_ids, outcomes, 'updated')
+    })
 
 
 @alerts_blueprint.route('/alerts/batch/delete', methods=['POST'])
@@ -765,13 +1017,14 @@ def alerts_unmerge_route(alert_id) -> Response:
 @ac_api_requires(Permissions.alerts_write)
 def alerts_batch_merge_route() -> Response:
     """
-    Merge multiple alerts into a case
+    Merge multiple alerts into a case. The alerts are loaded in a single query and their status and history are
+    updated with a statement each, then the activity and hooks are issued once for the whole batch.
 
     args:
         caseid (str): The case id
 
     returns:
-        Response: The response
+        Response: The response, with the updated case and the outcome of each alert
     """
     if request.json is None:
         return response_error('No JSON data provided')
@@ -782,7 +1035,11 @@ def alerts_batch_merge_route() -> Response:
     if target_case_id is None:
         return response_error('No target case id provided')
 
-    alert_ids = data.get('alert_ids')
+    try:
+        alert_ids = _parse_alert_ids(data.get('alert_ids') or [])
+    except (TypeError, ValueError):
+        return response_error('Invalid alert ids')
+
     if not alert_ids:
         return response_error('No alert ids provided')
 
@@ -800,42 +1057,39 @@ def alerts_batch_merge_route() -> Response:
     if not check_ua_case_client(current_user.id, target_case_id):
         return response_error('User not entitled to merge alerts for the case', status=403)
 
-    try:
-        # Merge the alerts into a case
-        for alert_id in alert_ids.split(','):
-            alert_id = int(alert_id)
-
-            alert = get_alert_by_id(alert_id)
-            if not alert:
-                continue
-
-            # Check if the user has access to the client
-            if not user_has_client_access(current_user.id, alert.alert_customer_id):
-                return response_error('User not entitled to merge alerts for the client', status=403)
+    alerts, outcomes = _get_batch_alerts(alert_ids, 'merge', with_observables=True)
+    if not alerts:
+        return response_error('No alert merged', data=_get_batch_results(alert_ids, outcomes, 'merged'))
 
-            alert.alert_status_id = AlertStatus.query.filter_by(status_name='Merged').first().status_id
-            db.session.commit()
+    try:
+        merged_ids = [alert.alert_id for alert in alerts]
 
-            # Merge alert in the case
+        # Merge the alerts into the case
+        for alert in alerts:
             merge_alert_in_case(alert, case, iocs_list=iocs_import_list, assets_list=assets_import_list, note=None,
                                 import_as_event=import_as_event, case_tags=case_tags)
 
-            add_obj_history_entry(alert, f"Alert merged into existing case #{target_case_id}")
-
-            alert = call_modules_hook('on_postload_alert_merge', data=alert)
+        update_alerts_batch(merged_ids, {'alert_status_id': get_alert_status_by_name('Merged').status_id})
+        add_alerts_history_entry(merged_ids, f"Alert merged into existing case #{target_case_id}")
 
         if note:
             case.description += f"\n\n### Escalation note\n\n{note}\n\n" if case.description else f"\n\n{note}\n\n"
-            db.session.commit()
 
-        track_activity(f"batched merge alerts {alert_ids} into existing case #{target_case_id}",
+        db.session.commit()
+
+        call_modules_hook('on_postload_alert_merge', data=get_alerts_by_ids(merged_ids), caseid=target_case_id)
+
+        track_activity(f"batched merge {len(merged_ids)} alerts {merged_ids} into existing case #{target_case_id}",
                        caseid=target_case_id)
 
         # Return the updated case as JSON
-        return response_success(data=CaseSchema().dump(case))
+        case_data = CaseSchema().dump(case)
+        case_data['results'] = _get_batch_results(alert_ids, outcomes, 'merged')
+        return response_success(data=case_data)
 
     except Exception as e:
         app.app.logger.exception(e)
+        db.session.rollback()
         # Handle any errors during deserialization or DB operations
         return response_error(str(e))
 
@@ -844,20 +1098,25 @@ def alerts_batch_merge_route() -> Response:
 @ac_api_requires(Permissions.alerts_write)
 def alerts_batch_escalate_route() -> Response:
     """
-    Escalate multiple alerts into a case
+    Escalate multiple alerts into a case. The alerts are loaded in a single query and their status and history are
+    updated with a statement each, then the activity and hooks are issued once for the whole batch.
 
     args:
         caseid (str): The case id
 
     returns:
-        Response: The response
+        Response: The response, with the new case and the outcome of each alert
     """
     if request.json is None:
         return response_error('No JSON data provided')
 
     data = request.get_json()
 
-    alert_ids = data.get('alert_ids')
+    try:
+        alert_ids = _parse_alert_ids(data.get('alert_ids') or [])
+    except (TypeError, ValueError):
+        return response_error('Invalid alert ids')
+
     if not alert_ids:
         return response_error('No alert ids provided')
 
@@ -867,27 +1126,20 @@ def alerts_batch_escalate_route() -> Response:
     import_as_event: bool = data.get('import_as_event')
     case_tags = data.get('case_tags')
     case_title = data.get('case_title')
-    alerts_list = []
     case_template_id: int = data.get('case_template_id', None)
 
-    try:
-        # Merge the alerts into a case
-        for alert_id in alert_ids.split(','):
-            alert_id = int(alert_id)
-
-            alert = get_alert_by_id(alert_id)
-            if not alert:
-                continue
+    alerts_list, outcomes = _get_batch_alerts(alert_ids, 'escalate', with_observables=True)
+    if not alerts_list:
+        return response_error('No alert escalated', data=_get_batch_results(alert_ids, outcomes, 'escalated'))
 
-            # Check if the user has access to the client
-            if not user_has_client_access(current_user.id, alert.alert_customer_id):
-                return response_error('User not entitled to escalate alerts for the client', status=403)
+    try:
+        escalated_ids = [alert.alert_id for alert in alerts_list]
 
-            alert.alert_status_id = AlertStatus.query.filter_by(status_name='Merged').first().status_id
-            db.session.commit()
-            alert = call_modules_hook('on_postload_alert_escalate', data=alert)
+        update_alerts_batch(escalated_ids, {'alert_status_id': get_alert_status_by_name('Merged').status_id})
+        db.session.commit()
 
-            alerts_list.append(alert)
+        alerts_list = call_modules_hook('on_postload_alert_escalate',
+                                        data=get_alerts_by_ids(escalated_ids, with_observables=True))
 
         # Merge alerts in the case
         case = create_case_from_alerts(alerts_list, iocs_list=iocs_import_list, assets_list=assets_import_list,
@@ -905,14 +1157,17 @@ def alerts_batch_escalate_route() -> Response:
         track_activity("new case {case_name} created from alerts".format(case_name=case.name),
                        caseid=case.case_id)
 
-        for alert in alerts_list:
-            add_obj_history_entry(alert, f"Alert escalated into new case #{case.case_id}")
+        add_alerts_history_entry(escalated_ids, f"Alert escalated into new case #{case.case_id}")
+        db.session.commit()
 
         # Return the updated case as JSON
-        return response_success(data=CaseSchema().dump(case))
+        case_data = CaseSchema().dump(case)
+        case_data['results'] = _get_batch_results(alert_ids, outcomes, 'escalated')
+        return response_success(data=case_data)
 
     except Exception as e:
         app.app.logger.exception(e)
+        db.session.rollback()
         # Handle any errors during deserialization or DB operations
         return response_error(str(e))
 
@@ -16,7 +16,6 @@
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
-import csv
 # IMPORTS ------------------------------------------------
 from datetime import datetime
 
@@ -28,16 +27,20 @@ from flask import request
 from flask import url_for
 from flask_login import current_user
 
-import app
+from app import app
 from app import db
 from app.blueprints.case.case_comments import case_comment_update
+from app.blueprints.case.case_csv_imports import case_csv_import_errors
+from app.blueprints.case.case_csv_imports import case_csv_import_queue
+from app.blueprints.case.case_csv_imports import case_csv_import_status
+from app.business.assets import import_csv_assets
+from app.business.csv_imports import ASSETS_CSV_IMPORT
 from app.datamgmt.case.case_assets_db import add_comment_to_asset, get_raw_assets
 from app.datamgmt.case.case_assets_db import create_asset
 from app.datamgmt.case.case_assets_db import delete_asset
 from app.datamgmt.case.case_assets_db import delete_asset_comment
 from app.datamgmt.case.case_assets_db import get_analysis_status_list
 from app.datamgmt.case.case_assets_db import get_asset
-from app.datamgmt.case.case_assets_db import get_asset_type_id
 from app.datamgmt.case.case_assets_db import get_assets
 from app.datamgmt.case.case_assets_db import get_assets_ioc_links
 from app.datamgmt.case.case_assets_db import get_assets_types
@@ -60,7 +63,6 @@ from app.forms import AssetBasicForm
 from app.forms import ModalAddCaseAssetForm
 from app.iris_engine.module_handler.module_handler import call_modules_hook
 from app.iris_engine.utils.tracker import track_activity
-from app.models import AnalysisStatus
 from app.models.authorization import CaseAccessLevel
 from app.schema.marshables import CaseAssetsSchema
 from app.schema.marshables import CommentSchema
@@ -244,100 +246,39 @@ def add_asset(caseid):
 @case_assets_blueprint.route('/case/assets/upload', methods=['POST'])
 @ac_api_case_requires(CaseAccessLevel.full_access)
 def case_upload_ioc(caseid):
+    jsdata = request.get_json()
+    if not jsdata or not isinstance(jsdata.get('CSVData'), str):
+        return response_error('No CSV data provided')
 
-    try:
-        # validate before saving
-        add_asset_schema = CaseAssetsSchema()
-        jsdata = request.get_json()
-
-        # get IOC list from request
-        csv_lines = jsdata["CSVData"].splitlines() # unavoidable since the file is passed as a string
-
-        headers = "asset_name,asset_type_name,asset_description,asset_ip,asset_domain,asset_tags"
-
-        if csv_lines[0].lower() != headers:
-            csv_lines.insert(0, headers)
-
-        # convert list of strings into CSV
-        csv_data = csv.DictReader(csv_lines, delimiter=',')
-
-        ret = []
-        errors = []
-
-        analysis_status = AnalysisStatus.query.filter(AnalysisStatus.name == 'Unspecified').first()
-        analysis_status_id = analysis_status.id
-
-        index = 0
-        for row in csv_data:
-            missing_field = False
-            for e in headers.split(','):
-                if row.get(e) is None:
-                    errors.append(f"{e} is missing for row {index}")
-                    missing_field = True
-                    continue
-
-            if missing_field:
-                continue
-
-            # Asset name must not be empty
-            if not row.get("asset_name"):
-                errors.append(f"Empty asset name for row {index}")
-                track_activity(f"Attempted to upload an empty asset name")
-                index += 1
-                continue
+    # unavoidable since the file is passed as a string
+    csv_data = jsdata['CSVData']
+    lines_count = csv_data.count('\n') + 1
 
-            if row.get("asset_tags"):
-                row["asset_tags"] = row.get("asset_tags").replace("|", ",")  # Reformat Tags
+    if lines_count >= app.config.get('ASSET_CSV_IMPORT_ASYNC_LINES'):
+        return case_csv_import_queue(ASSETS_CSV_IMPORT, ASSETS_CSV_IMPORT.save_file(csv_data), lines_count, caseid)
 
-            if not row.get('asset_type_name'):
-                errors.append(f"Empty asset type for row {index}")
-                track_activity(f"Attempted to upload an empty asset type")
-                index += 1
-                continue
+    imported, errors = import_csv_assets(csv_data.splitlines(), caseid)
 
-            type_id = get_asset_type_id(row['asset_type_name'].lower())
-            if not type_id:
-                errors.append(f"{row.get('asset_name')} (invalid asset type: {row.get('asset_type_name')}) for row {index}")
-                track_activity(f"Attempted to upload unrecognized asset type \"{row.get('asset_type_name')}\"")
-                index += 1
-                continue
-
-            row['asset_type_id'] = type_id.asset_id
-            row.pop('asset_type_name', None)
-
-            row['analysis_status_id'] = analysis_status_id
-
-            request_data = call_modules_hook('on_preload_asset_create', data=row, caseid=caseid)
-
-            add_asset_schema.is_unique_for_cid(caseid, request_data)
-            asset_sc = add_asset_schema.load(request_data)
-            asset_sc.custom_attributes = get_default_custom_attributes('asset')
-            asset = create_asset(asset=asset_sc,
-                                 caseid=caseid,
-                                 user_id=current_user.id
-                                 )
-
-            asset = call_modules_hook('on_postload_asset_create', data=asset, caseid=caseid)
-
-            if not asset:
-                errors.append(f"Unable to add asset for internal reason")
-                index += 1
-                continue
+    if len(errors) == 0:
+        msg = "Successfully imported data."
+    else:
+        msg = "Data is imported but we got errors with the following rows:\n- " + "\n- ".join(
+            f"{error['asset_name']} ({error['error']}) for row {error['row']}" for error in errors
+        )
 
-            ret.append(request_data)
-            track_activity(f"added asset {asset.asset_name}", caseid=caseid)
+    return response_success(msg=msg, data=imported)
 
-            index += 1
 
-        if len(errors) == 0:
-            msg = "Successfully imported data."
-        else:
-            msg = "Data is imported but we got errors with the following rows:\n- " + "\n- ".join(errors)
+@case_assets_blueprint.route('/case/assets/upload/status/<task_id>', methods=['GET'])
+@ac_api_case_requires(CaseAccessLevel.full_access)
+def case_upload_assets_status(task_id, caseid):
+    return case_csv_import_status(ASSETS_CSV_IMPORT, task_id, caseid)
 
-        return response_success(msg=msg, data=ret)
 
-    except marshmallow.exceptions.ValidationError as e:
-        return response_error(msg="Data error", data=e.messages)
+@case_assets_blueprint.route('/case/assets/upload/errors/<task_id>', methods=['GET'])
+@ac_api_case_requires(CaseAccessLevel.full_access)
+def case_upload_assets_errors(task_id, caseid):
+    return case_csv_import_errors(ASSETS_CSV_IMPORT, task_id, caseid)
 
 
 @case_assets_blueprint.route('/case/assets/<int:cur_id>', methods=['GET'])
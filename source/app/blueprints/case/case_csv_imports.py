@@ -0,0 +1,81 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import os
+from flask import send_file
+from flask_login import current_user
+from iris_interface.IrisInterfaceStatus import IIStatus
+
+from app import celery
+from app.iris_engine.tasker.tasks import task_import_csv
+from app.util import response_error
+from app.util import response_success
+
+
+def _is_case_csv_import(values, csv_import, caseid):
+    return values.get('import_name') == csv_import.name and values.get('caseid') == caseid
+
+
+def case_csv_import_queue(csv_import, csv_path, lines_count, caseid, csv_options=None):
+    task = task_import_csv.delay(import_name=csv_import.name, csv_path=csv_path, caseid=caseid,
+                                 user_id=current_user.id, lines_count=lines_count, csv_options=csv_options)
+
+    return response_success('CSV import queued', data={'task_id': task.id})
+
+
+def case_csv_import_status(csv_import, task_id, caseid):
+    task = celery.AsyncResult(task_id)
+
+    if task.state == 'PENDING':
+        # Unknown tasks are pending as well, so nothing is disclosed
+        return response_success('Import pending', data={'state': 'pending'})
+
+    if task.state == 'PROGRESS':
+        info = task.info or {}
+        if not _is_case_csv_import(info, csv_import, caseid):
+            return response_error('Invalid task ID for this case')
+
+        return response_success('Import in progress', data={'state': 'progress',
+                                                             'processed': info.get('processed'),
+                                                             'total': info.get('total')})
+
+    if not _is_case_csv_import(task.kwargs or {}, csv_import, caseid):
+        return response_error('Invalid task ID for this case')
+
+    if isinstance(task.info, IIStatus) and task.info.is_success():
+        return response_success(task.info.get_message(), data={'state': 'success', **(task.info.get_data() or {})})
+
+    message = task.info.get_message() if isinstance(task.info, IIStatus) else 'CSV import failed'
+    return response_error(message, data={'state': 'failure'})
+
+
+def case_csv_import_errors(csv_import, task_id, caseid):
+    task = celery.AsyncResult(task_id)
+
+    if task.state != 'SUCCESS' or not _is_case_csv_import(task.kwargs or {}, csv_import, caseid):
+        return response_error('Invalid task ID for this case')
+
+    if not isinstance(task.info, IIStatus) or not (task.info.get_data() or {}).get('errors_count'):
+        return response_error('No rejected rows for this import')
+
+    errors_path = csv_import.get_errors_path(task_id)
+    if not os.path.isfile(errors_path):
+        return response_error('Errors report not available', status=404)
+
+    return send_file(errors_path, as_attachment=True, download_name=f'{csv_import.name}_import_errors_{task_id}.csv',
+                     mimetype='text/csv')
@@ -19,8 +19,6 @@
 # IMPORTS ------------------------------------------------
 from datetime import datetime
 
-import csv
-import logging as log
 import marshmallow
 from flask import Blueprint
 from flask import redirect
@@ -29,13 +27,16 @@ from flask import request
 from flask import url_for
 from flask_login import current_user
 
+from app import app
 from app import db
 from app.blueprints.case.case_comments import case_comment_update
+from app.blueprints.case.case_csv_imports import case_csv_import_errors
+from app.blueprints.case.case_csv_imports import case_csv_import_queue
+from app.blueprints.case.case_csv_imports import case_csv_import_status
+from app.business.csv_imports import IOCS_CSV_IMPORT
 from app.datamgmt.case.case_assets_db import get_assets_types
 from app.datamgmt.case.case_db import get_case
 from app.datamgmt.case.case_iocs_db import add_comment_to_ioc
-from app.datamgmt.case.case_iocs_db import add_ioc
-from app.datamgmt.case.case_iocs_db import add_ioc_link
 from app.datamgmt.case.case_iocs_db import delete_ioc_comment
 from app.datamgmt.case.case_iocs_db import get_case_ioc_comment
 from app.datamgmt.case.case_iocs_db import get_case_ioc_comments
@@ -43,10 +44,8 @@ from app.datamgmt.case.case_iocs_db import get_case_iocs_comments_count
 from app.datamgmt.case.case_iocs_db import get_detailed_iocs
 from app.datamgmt.case.case_iocs_db import get_ioc
 from app.datamgmt.case.case_iocs_db import get_ioc_links
-from app.datamgmt.case.case_iocs_db import get_ioc_type_id
 from app.datamgmt.case.case_iocs_db import get_ioc_types_list
 from app.datamgmt.case.case_iocs_db import get_tlps
-from app.datamgmt.case.case_iocs_db import get_tlps_dict
 from app.datamgmt.manage.manage_attribute_db import get_default_custom_attributes
 from app.datamgmt.states import get_ioc_state
 from app.forms import ModalAddCaseAssetForm
@@ -64,6 +63,7 @@ from app.util import response_success
 from app.business.iocs import create
 from app.business.iocs import update
 from app.business.iocs import delete
+from app.business.iocs import import_csv_iocs
 from app.business.errors import BusinessProcessingError
 
 case_ioc_blueprint = Blueprint(
@@ -139,96 +139,39 @@ def case_add_ioc(caseid):
 @case_ioc_blueprint.route('/case/ioc/upload', methods=['POST'])
 @ac_api_case_requires(CaseAccessLevel.full_access)
 def case_upload_ioc(caseid):
-    try:
-        # validate before saving
-        add_ioc_schema = IocSchema()
-        jsdata = request.get_json()
-
-        # get IOC list from request
-        headers = "ioc_value,ioc_type,ioc_description,ioc_tags,ioc_tlp"
-        csv_lines = jsdata["CSVData"].splitlines()  # unavoidable since the file is passed as a string
-        if csv_lines[0].lower() != headers:
-            csv_lines.insert(0, headers)
-
-        # convert list of strings into CSV
-        csv_data = csv.DictReader(csv_lines, quotechar='"', delimiter=',')
-
-        # build a Dict of possible TLP
-        tlp_dict = get_tlps_dict()
-        ret = []
-        errors = []
-
-        index = 0
-        for row in csv_data:
-
-            for e in headers.split(','):
-                if row.get(e) is None:
-                    errors.append(f"{e} is missing for row {index}")
-                    index += 1
-                    continue
-
-            # IOC value must not be empty
-            if not row.get("ioc_value"):
-                errors.append(f"Empty IOC value for row {index}")
-                track_activity(f"Attempted to upload an empty IOC value")
-                index += 1
-                continue
-
-            row["ioc_tags"] = row["ioc_tags"].replace("|", ",")  # Reformat Tags
-
-            # Convert TLP into TLP id
-            if row["ioc_tlp"] in tlp_dict:
-                row["ioc_tlp_id"] = tlp_dict[row["ioc_tlp"]]
-            else:
-                row["ioc_tlp_id"] = ""
-            row.pop("ioc_tlp", None)
-
-            type_id = get_ioc_type_id(row['ioc_type'].lower())
-            if not type_id:
-                errors.append(f"{row['ioc_value']} (invalid ioc type: {row['ioc_type']}) for row {index}")
-                log.error(f'Unrecognised IOC type {row["ioc_type"]}')
-                index += 1
-                continue
-
-            row['ioc_type_id'] = type_id.type_id
-            row.pop('ioc_type', None)
-
-            request_data = call_modules_hook('on_preload_ioc_create', data=row, caseid=caseid)
-
-            ioc = add_ioc_schema.load(request_data)
-            ioc.custom_attributes = get_default_custom_attributes('ioc')
-            ioc, existed = add_ioc(ioc=ioc,
-                                   user_id=current_user.id,
-                                   caseid=caseid
-                                   )
-            link_existed = add_ioc_link(ioc.ioc_id, caseid)
-
-            if link_existed:
-                errors.append(f"{ioc.ioc_value} (already exists and linked to this case)")
-                log.error(f"IOC {ioc.ioc_value} already exists and linked to this case")
-                index += 1
-                continue
-
-            if ioc:
-                ioc = call_modules_hook('on_postload_ioc_create', data=ioc, caseid=caseid)
-                ret.append(request_data)
-                track_activity(f"added ioc \"{ioc.ioc_value}\"", caseid=caseid)
-
-            else:
-                errors.append(f"{ioc.ioc_value} (internal reasons)")
-                log.error(f"Unable to create IOC {ioc.ioc_value} for internal reasons")
-
-            index += 1
-
-        if len(errors) == 0:
-            msg = "Successfully imported data."
-        else:
-            msg = "Data is imported but we got errors with the following rows:\n- " + "\n- ".join(errors)
-
-        return response_success(msg=msg, data=ret)
+    jsdata = request.get_json()
+    if not jsdata or not isinstance(jsdata.get('CSVData'), str):
+        return response_error('No CSV data provided')
 
-    except marshmallow.exceptions.ValidationError as e:
-        return response_error(msg="Data error", data=e.messages)
+    # unavoidable since the file is passed as a string
+    csv_data = jsdata['CSVData']
+    lines_count = csv_data.count('\n') + 1
+
+    if lines_count >= app.config.get('IOC_CSV_IMPORT_ASYNC_LINES'):
+        return case_csv_import_queue(IOCS_CSV_IMPORT, IOCS_CSV_IMPORT.save_file(csv_data), lines_count, caseid)
+
+    imported, errors = import_csv_iocs(csv_data.splitlines(), caseid)
+
+    if len(errors) == 0:
+        msg = "Successfully imported data."
+    else:
+        msg = "Data is imported but we got errors with the following rows:\n- " + "\n- ".join(
+            f"{error['ioc_value']} ({error['error']}) for row {error['row']}" for error in errors
+        )
+
+    return response_success(msg=msg, data=imported)
+
+
+@case_ioc_blueprint.route('/case/ioc/upload/status/<task_id>', methods=['GET'])
+@ac_api_case_requires(CaseAccessLevel.full_access)
+def case_upload_ioc_status(task_id, caseid):
+    return case_csv_import_status(IOCS_CSV_IMPORT, task_id, caseid)
+
+
+@case_ioc_blueprint.route('/case/ioc/upload/errors/<task_id>', methods=['GET'])
+@ac_api_case_requires(CaseAccessLevel.full_access)
+def case_upload_ioc_errors(task_id, caseid):
+    return case_csv_import_errors(IOCS_CSV_IMPORT, task_id, caseid)
 
 
 @case_ioc_blueprint.route('/case/ioc/add/modal', methods=['GET'])
@@ -54,7 +54,9 @@ from app.datamgmt.manage.manage_groups_db import get_groups_list
 from app.datamgmt.manage.manage_users_db import get_user
 from app.datamgmt.manage.manage_users_db import get_users_list_restricted_from_case
 from app.datamgmt.manage.manage_users_db import set_user_case_access
-from app.datamgmt.reporter.report_db import export_case_json
+from app.datamgmt.reporter.report_db import export_caseinfo_json
+from app.datamgmt.reporter.report_db import iter_case_json_sections
+from app.datamgmt.reporter.report_db import process_md_images_links_for_report
 from app.forms import PipelinesCaseForm
 from app.iris_engine.access_control.utils import ac_get_all_access_level, ac_fast_check_current_user_has_case_access, \
     ac_fast_check_user_has_case_access
@@ -71,6 +73,7 @@ from app.util import ac_case_requires
 from app.util import ac_socket_requires
 from app.util import response_error
 from app.util import response_success
+from app.util import response_success_stream
 
 app.register_blueprint(case_timeline_blueprint)
 app.register_blueprint(case_notes_blueprint)
@@ -240,7 +243,13 @@ def activity_fetch(caseid):
 @case_blueprint.route("/case/export", methods=['GET'])
 @ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
 def export_case(caseid):
-    return response_success('', data=export_case_json(caseid))
+    case = export_caseinfo_json(caseid)
+    if not case:
+        return response_success('', data={'errors': ["Invalid case number"]})
+
+    case['description'] = process_md_images_links_for_report(case['description'])
+
+    return response_success_stream('', data_sections=iter_case_json_sections(caseid, case=case))
 
 
 @case_blueprint.route("/case/meta", methods=['GET'])
@@ -19,6 +19,7 @@
 # IMPORTS ------------------------------------------------
 import csv
 import json
+import os
 import urllib.parse
 from datetime import datetime
 
@@ -35,6 +36,11 @@ from sqlalchemy import and_
 from app import db
 from app import app
 from app.blueprints.case.case_comments import case_comment_update
+from app.blueprints.case.case_csv_imports import case_csv_import_queue
+from app.blueprints.case.case_csv_imports import case_csv_import_status
+from app.business.csv_imports import TIMELINE_CSV_IMPORT
+from app.business.errors import BusinessProcessingError
+from app.business.events import import_csv_events
 from app.datamgmt.case.case_assets_db import get_asset_by_name
 from app.datamgmt.case.case_events_db import add_comment_to_event, get_category_by_name, get_default_category
 from app.datamgmt.case.case_events_db import delete_event
@@ -50,6 +56,7 @@ from app.datamgmt.case.case_events_db import get_event_assets_ids
 from app.datamgmt.case.case_events_db import get_event_category
 from app.datamgmt.case.case_events_db import get_event_iocs_ids
 from app.datamgmt.case.case_events_db import get_events_categories
+from app.datamgmt.case.case_events_db import get_filtered_case_events
 from app.datamgmt.case.case_events_db import save_event_category
 from app.datamgmt.case.case_events_db import update_event_assets
 from app.datamgmt.case.case_events_db import update_event_iocs
@@ -62,12 +69,10 @@ from app.iris_engine.module_handler.module_handler import call_modules_hook
 from app.iris_engine.utils.collab import collab_notify
 from app.iris_engine.utils.common import parse_bf_date_format
 from app.iris_engine.utils.tracker import track_activity
-from app.models import CompromiseStatus
 from app.models.authorization import CaseAccessLevel
 from app.models.authorization import User
 from app.models.cases import Cases
 from app.models.cases import CasesEvent
-from app.models.models import AssetsType
 from app.models.models import CaseAssets
 from app.models.models import CaseEventsAssets
 from app.models.models import CaseEventsIoc
@@ -399,18 +404,10 @@ def case_filter_timeline(caseid):
     event_ids = filter_d.get('event_id')
     iocs = filter_d.get('ioc')
     iocs_id = filter_d.get('ioc_id')
-    tags = filter_d.get('tag')
-    descriptions = filter_d.get('description')
-    categories = filter_d.get('category')
-    raws = filter_d.get('raw')
     start_date = filter_d.get('startDate')
     end_date = filter_d.get('endDate')
-    titles = filter_d.get('title')
-    sources = filter_d.get('source')
     flag = filter_d.get('flag')
 
-    condition = (CasesEvent.case_id == caseid)
-
     if assets:
         assets = [asset.lower() for asset in assets]
 
@@ -418,8 +415,9 @@ def case_filter_timeline(caseid):
         assets_id = [int(asset) for asset in assets_id]
 
     if flag:
-        flags = (flag[0].lower() == 'true')
-        condition = and_(condition, CasesEvent.event_is_flagged == flags)
+        flag = (flag[0].lower() == 'true')
+    else:
+        flag = None
 
     if iocs:
         iocs = [ioc.lower() for ioc in iocs]
@@ -427,214 +425,56 @@ def case_filter_timeline(caseid):
     if iocs_id:
         iocs_id = [int(ioc) for ioc in iocs_id]
 
-    if tags:
-        for tag in tags:
-            condition = and_(condition,
-                             CasesEvent.event_tags.ilike(f'%{tag}%'))
-
-    if titles:
-        for title in titles:
-            condition = and_(condition,
-                             CasesEvent.event_title.ilike(f'%{title}%'))
-
-    if sources:
-        for source in sources:
-            condition = and_(condition,
-                             CasesEvent.event_source.ilike(f'%{source}%'))
-
-    if descriptions:
-        for description in descriptions:
-            condition = and_(condition,
-                             CasesEvent.event_content.ilike(f'%{description}%'))
-
-    if raws:
-        for raw in raws:
-            condition = and_(condition,
-                             CasesEvent.event_raw.ilike(f'%{raw}%'))
-
+    parsed_start_date = None
     if start_date:
         try:
             parsed_start_date = parse_bf_date_format(start_date[0])
-            condition = and_(condition,
-                             CasesEvent.event_date >= parsed_start_date)
 
         except Exception as e:
             print(e)
             pass
 
+    parsed_end_date = None
     if end_date:
         try:
             parsed_end_date = parse_bf_date_format(end_date[0])
-            condition = and_(condition,
-                             CasesEvent.event_date <= parsed_end_date)
         except Exception as e:
             pass
 
-    if categories:
-        for category in categories:
-            condition = and_(condition,
-                             EventCategory.name == category)
-
     if event_ids:
         try:
             event_ids = [int(event_id) for event_id in event_ids]
         except Exception as e:
             return response_error('Invalid event id')
 
-        condition = and_(condition,
-                         CasesEvent.event_id.in_(event_ids))
-
-    timeline = CasesEvent.query.with_entities(
-        CasesEvent.event_id,
-        CasesEvent.event_uuid,
-        CasesEvent.event_date,
-        CasesEvent.event_date_wtz,
-        CasesEvent.event_tz,
-        CasesEvent.event_title,
-        CasesEvent.event_color,
-        CasesEvent.event_tags,
-        CasesEvent.event_content,
-        CasesEvent.event_in_summary,
-        CasesEvent.event_in_graph,
-        CasesEvent.event_is_flagged,
-        CasesEvent.parent_event_id,
-        User.user,
-        CasesEvent.event_added,
-        EventCategory.name.label("category_name")
-    ).filter(condition).order_by(
-        CasesEvent.event_date
-    ).outerjoin(
-        CasesEvent.category
-    ).join(
-        CasesEvent.user
-    ).all()
-
-    assets_cache_condition = and_(
-        CaseEventsAssets.case_id == caseid
+    page = request.args.get('page', None, type=int)
+    per_page = request.args.get('per_page', None, type=int)
+    if page is not None and (page < 1 or not per_page or per_page < 1):
+        return response_error('Invalid pagination parameters')
+
+    filtered_events = get_filtered_case_events(
+        caseid,
+        assets=assets,
+        assets_id=assets_id,
+        iocs=iocs,
+        iocs_id=iocs_id,
+        tags=filter_d.get('tag'),
+        titles=filter_d.get('title'),
+        sources=filter_d.get('source'),
+        descriptions=filter_d.get('description'),
+        raws=filter_d.get('raw'),
+        categories=filter_d.get('category'),
+        start_date=parsed_start_date,
+        end_date=parsed_end_date,
+        flag=flag,
+        event_ids=event_ids,
+        page=page,
+        per_page=per_page
     )
 
-    if assets_id:
-        assets_cache_condition = and_(
-            assets_cache_condition,
-            CaseEventsAssets.asset_id.in_(assets_id)
-        )
-
-    assets_cache = (CaseAssets.query.with_entities(
-        CaseEventsAssets.event_id,
-        CaseAssets.asset_id,
-        CaseAssets.asset_name,
-        AssetsType.asset_name.label('type'),
-        CaseAssets.asset_ip,
-        CaseAssets.asset_description,
-        CaseAssets.asset_compromise_status_id
-    ).filter(
-        assets_cache_condition
-    ).join(CaseEventsAssets.asset)
-     .join(CaseAssets.asset_type).all())
-
-    iocs_cache_condition = and_(
-        CaseEventsIoc.case_id == caseid
-    )
-
-    if iocs_id:
-        iocs_cache_condition = and_(
-            iocs_cache_condition,
-            CaseEventsIoc.ioc_id.in_(iocs_id)
-        )
-
-    iocs_cache = CaseEventsIoc.query.with_entities(
-        CaseEventsIoc.event_id,
-        CaseEventsIoc.ioc_id,
-        Ioc.ioc_value,
-        Ioc.ioc_description
-    ).filter(
-        iocs_cache_condition
-    ).join(
-        CaseEventsIoc.ioc
-    ).all()
-
-    assets_map = {}
-    cache = {}
-    for asset in assets_cache:
-        if asset.asset_id not in cache:
-            cache[asset.asset_id] = [asset.asset_name, asset.type]
-
-        if (assets and asset.asset_name.lower() in assets) \
-                or (assets_id and asset.asset_id in assets_id):
-            if asset.event_id in assets_map:
-                assets_map[asset.event_id] += 1
-            else:
-                assets_map[asset.event_id] = 1
-
-    assets_filter = []
-    len_assets = 0
-    if assets:
-        len_assets += len(assets)
-    if assets_id:
-        len_assets += len(assets_id)
-
-    for event_id in assets_map:
-        if assets_map[event_id] == len_assets:
-            assets_filter.append(event_id)
-
-    iocs_filter = []
-    if iocs:
-        for ioc in iocs_cache:
-            if ioc.event_id not in iocs_filter and ioc.ioc_value.lower() in iocs:
-                iocs_filter.append(ioc.event_id)
-
-    tim = []
-    events_list = []
-    for row in timeline:
-        if assets is not None or assets_id is not None:
-            if row.event_id not in assets_filter:
-                continue
-
-        if iocs is not None:
-            if row.event_id not in iocs_filter:
-                continue
-
-        ras = row._asdict()
-
-        ras['event_date'] = ras['event_date'].strftime('%Y-%m-%dT%H:%M:%S.%f')
-        ras['event_date_wtz'] = ras['event_date_wtz'].strftime('%Y-%m-%dT%H:%M:%S.%f') if ras[
-            'event_date_wtz'] else None
-        ras['event_added'] = ras['event_added'].strftime('%Y-%m-%dT%H:%M:%S')
-
-        if row.event_id not in events_list:
-            events_list.append(row.event_id)
-
-        alki = []
-        for asset in assets_cache:
-
-            if asset.event_id == ras['event_id']:
-                alki.append(
-                    {
-                        "name": "{} ({})".format(asset.asset_name, asset.type),
-                        "ip": asset.asset_ip,
-                        "description": asset.asset_description,
-                        "compromised": asset.asset_compromise_status_id == CompromiseStatus.compromised.value
-                    }
-                )
-
-        ras['assets'] = alki
-
-        alki = []
-        for ioc in iocs_cache:
-            if ioc.event_id == ras['event_id']:
-                if ioc.ioc_id not in cache:
-                    cache[ioc.ioc_id] = [ioc.ioc_value]
-
-                alki.append(
-                    {
-                        "name": "{}".format(ioc.ioc_value),
-                        "description": ioc.ioc_description
-                    }
-                )
-
-        ras['iocs'] = alki
-
-        tim.append(ras)
+    tim = filtered_events.get('events')
+    cache = filtered_events.get('objects_map')
+    events_list = [event.get('event_id') for event in tim]
 
     if request.cookies.get('session'):
 
@@ -667,6 +507,13 @@ def case_filter_timeline(caseid):
             "state": get_timeline_state(caseid=caseid)
         }
 
+    if page is not None:
+        resp.update({
+            "total": filtered_events.get('total'),
+            "page": page,
+            "per_page": per_page
+        })
+
     return response_success("ok", data=resp)
 
 
@@ -1164,4 +1011,54 @@ def case_events_upload_csv(caseid):
 
     return response_success(msg="Events added (CSV File)")
 
+
+def _save_timeline_csv(csv_file):
+    """
+    Streams an uploaded CSV file to the uploads directory, shared with the workers, counting its lines on the way
+    """
+    csv_path = TIMELINE_CSV_IMPORT.create_file_path()
+
+    lines_count = 0
+    with open(csv_path, 'wb') as fout:
+        for chunk in iter(lambda: csv_file.stream.read(1024 * 1024), b''):
+            lines_count += chunk.count(b'\n')
+            fout.write(chunk)
+
+    return csv_path, lines_count
+
+
+@case_timeline_blueprint.route('/case/timeline/events/csv_upload/file', methods=['POST'])
+@ac_api_case_requires(CaseAccessLevel.full_access)
+def case_events_upload_csv_file(caseid):
+    csv_file = request.files.get('file')
+    if not csv_file:
+        return response_error('No CSV file provided')
+
+    try:
+        csv_options = json.loads(request.form.get('CSVOptions') or '{}')
+    except ValueError:
+        return response_error('Invalid CSV options')
+
+    csv_path, lines_count = _save_timeline_csv(csv_file)
+
+    if lines_count >= app.config.get('TIMELINE_CSV_IMPORT_ASYNC_LINES'):
+        return case_csv_import_queue(TIMELINE_CSV_IMPORT, csv_path, lines_count, caseid, csv_options=csv_options)
+
+    try:
+        events_count = import_csv_events(csv_path, caseid, csv_options)
+
+    except BusinessProcessingError as e:
+        return response_error(e.get_message(), data=e.get_data())
+
+    finally:
+        os.remove(csv_path)
+
+    return response_success('Events added (CSV File)', data={'events_count': events_count})
+
+
+@case_timeline_blueprint.route('/case/timeline/events/csv_upload/status/<task_id>', methods=['GET'])
+@ac_api_case_requires(CaseAccessLevel.full_access)
+def case_events_upload_csv_status(task_id, caseid):
+    return case_csv_import_status(TIMELINE_CSV_IMPORT, task_id, caseid)
+
 # END_RS_CODE
@@ -19,8 +19,10 @@ import base64
 import datetime
 import json
 import marshmallow.exceptions
+import mimetypes
 import urllib.parse
 from flask import Blueprint
+from flask import Response
 from flask import render_template
 from flask import request
 from flask import send_file
@@ -41,11 +43,17 @@ from app.datamgmt.datastore.datastore_db import datastore_get_file
 from app.datamgmt.datastore.datastore_db import datastore_get_interactive_path_node
 from app.datamgmt.datastore.datastore_db import datastore_get_local_file_path
 from app.datamgmt.datastore.datastore_db import datastore_get_path_node
-from app.datamgmt.datastore.datastore_db import datastore_get_standard_path
 from app.datamgmt.datastore.datastore_db import datastore_rename_node
+from app.datamgmt.datastore.datastore_db import ds_list_node_files
 from app.datamgmt.datastore.datastore_db import ds_list_tree
+from app.datamgmt.states import update_datastore_state
 from app.forms import ModalDSFileForm
 from app.iris_engine.utils.tracker import track_activity
+from app.iris_engine.utils.uploads import discard_chunked_upload
+from app.iris_engine.utils.uploads import get_chunked_upload_chunks
+from app.iris_engine.utils.uploads import get_upload_chunk
+from app.iris_engine.utils.uploads import save_upload_chunk
+from app.iris_engine.utils.uploads import streamed_upload
 from app.models.authorization import CaseAccessLevel
 from app.schema.marshables import DSFileSchema, DSPathSchema
 from app.util import ac_api_case_requires
@@ -72,6 +80,17 @@ def datastore_list_tree(caseid):
     return response_success("", data=data)
 
 
+@datastore_blueprint.route('/datastore/list/tree/<int:cur_id>', methods=['GET'])
+@ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
+def datastore_list_tree_node_files(cur_id: int, caseid: int):
+
+    data = ds_list_node_files(cur_id, caseid)
+    if data is None:
+        return response_error('Invalid node ID for this case')
+
+    return response_success("", data=data)
+
+
 @datastore_blueprint.route('/datastore/list/filter', methods=['GET'])
 @ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
 def datastore_list_filter(caseid):
@@ -193,6 +212,7 @@ def datastore_info_file(cur_id: int, caseid: int):
 
 
 @datastore_blueprint.route('/datastore/file/update/<int:cur_id>', methods=['POST'])
+@streamed_upload
 @ac_api_case_requires(CaseAccessLevel.full_access)
 def datastore_update_file(cur_id: int, caseid: int):
 
@@ -209,19 +229,11 @@ def datastore_update_file(cur_id: int, caseid: int):
         dsf.file_is_ioc = request.form.get('file_is_ioc') is not None or request.form.get('file_is_ioc') is True
         dsf.file_is_evidence = request.form.get('file_is_evidence') is not None or request.form.get('file_is_evidence') is True
 
+        update_datastore_state(caseid=caseid)
         db.session.commit()
 
         if request.files.get('file_content'):
-            ds_location = datastore_get_standard_path(dsf_sc, caseid)
-            dsf_sc.file_local_name, dsf_sc.file_size, dsf_sc.file_sha256 = dsf_schema.ds_store_file(
-                request.files.get('file_content'),
-                ds_location,
-                dsf_sc.file_is_ioc,
-                dsf_sc.file_password)
-
-            if dsf_sc.file_is_ioc and not dsf_sc.file_password:
-                dsf_sc.file_password = 'infected'
-
+            dsf_schema.ds_store_file(request.files.get('file_content'), dsf_sc)
             db.session.commit()
 
         msg_added_as = ''
@@ -256,6 +268,7 @@ def datastore_move_file(cur_id: int, caseid: int):
         return response_error('Invalid destination node ID for this case')
 
     dsf.file_parent_id = dsp.path_id
+    update_datastore_state(caseid=caseid)
     db.session.commit()
 
     track_activity(f'File \"{dsf.file_original_name}\" moved to \"{dsp.path_name}\" in DS', caseid=caseid)
@@ -281,6 +294,7 @@ def datastore_move_folder(cur_id: int, caseid: int):
         return response_error("If that's true, then I've made a mistake, and you should kill me now.")
 
     dsp.path_parent_id = dsp_dst.path_id
+    update_datastore_state(caseid=caseid)
     db.session.commit()
 
     dsf_folder_schema = DSPathSchema()
@@ -290,6 +304,39 @@ def datastore_move_folder(cur_id: int, caseid: int):
     return response_success(msg, data=dsf_folder_schema.dump(dsp))
 
 
+def _get_file_etag(dsf):
+    # Encrypted archives of the same content differ, they are identified by the name of their blob
+    if dsf.file_is_ioc or dsf.file_password:
+        return Path(dsf.file_local_name).stem
+
+    return dsf.file_sha256
+
+
+def _get_offloaded_file_response(dsf, destination_name, etag):
+    # The proxy serves the file from an internal location mapped to the datastore, including range requests
+    prefix = app.app.config.get('DATASTORE_X_ACCEL_REDIRECT_PREFIX')
+    if not prefix:
+        return None
+
+    datastore_path = Path(app.app.config['DATASTORE_PATH']).resolve()
+    local_path = Path(dsf.file_local_name).resolve()
+    if datastore_path not in local_path.parents:
+        return None
+
+    if etag and request.if_none_match.contains(etag):
+        resp = Response(status=304)
+        resp.set_etag(etag)
+        return resp
+
+    resp = Response(mimetype=mimetypes.guess_type(destination_name)[0] or 'application/octet-stream')
+    resp.headers['Content-Disposition'] = f"inline; filename*=UTF-8''{urllib.parse.quote(destination_name, safe='')}"
+    resp.headers['X-Accel-Redirect'] = f"{prefix.rstrip('/')}/{local_path.relative_to(datastore_path).as_posix()}"
+    if etag:
+        resp.set_etag(etag)
+
+    return resp
+
+
 @datastore_blueprint.route('/datastore/file/view/<int:cur_id>', methods=['GET'])
 @ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
 def datastore_view_file(cur_id: int, caseid: int):
@@ -306,14 +353,42 @@ def datastore_view_file(cur_id: int, caseid: int):
         return response_error(f'File {dsf.file_local_name} does not exists on the server. '
                               f'Update or delete virtual entry')
 
-    resp = send_file(dsf.file_local_name, as_attachment=False,
-                     download_name=destination_name)
+    etag = _get_file_etag(dsf)
+    resp = _get_offloaded_file_response(dsf, destination_name, etag)
+    if resp is None:
+        # Conditional responses include the If-None-Match and Range requests
+        resp = send_file(dsf.file_local_name, as_attachment=False, download_name=destination_name,
+                         conditional=True, etag=etag or True)
 
     track_activity(f"File \"{destination_name}\" downloaded", caseid=caseid, display_in_ui=False)
     return resp
 
 
+@datastore_blueprint.route('/datastore/file/add/chunks/<string:upload_id>', methods=['GET'])
+@ac_api_case_requires(CaseAccessLevel.full_access)
+def datastore_add_file_chunks(upload_id: str, caseid: int):
+
+    try:
+        chunks = get_chunked_upload_chunks(current_user.id, upload_id)
+    except ValueError as e:
+        return response_error(str(e))
+
+    return response_success('', data={'upload_id': upload_id, 'received_chunks': chunks})
+
+
+def _save_upload_chunk(chunk):
+    file_storage = request.files.get('file_content')
+    if file_storage is None:
+        raise ValueError('No file provided')
+
+    try:
+        return save_upload_chunk(file_storage, current_user.id, chunk)
+    finally:
+        file_storage.close()
+
+
 @datastore_blueprint.route('/datastore/file/add/<int:cur_id>', methods=['POST'])
+@streamed_upload
 @ac_api_case_requires(CaseAccessLevel.full_access)
 def datastore_add_file(cur_id: int, caseid: int):
 
@@ -321,6 +396,20 @@ def datastore_add_file(cur_id: int, caseid: int):
     if not dsp:
         return response_error('Invalid path node for this case')
 
+    # Chunks follow the parameters of Dropzone chunked uploads, preferably in the query string so that they are
+    # written at their offset while received
+    try:
+        chunk = get_upload_chunk(request.values, app.app.config.get('DROPZONE_MAX_FILE_SIZE'))
+        upload_path = _save_upload_chunk(chunk) if chunk is not None else None
+    except ValueError as e:
+        return response_error(str(e))
+
+    if chunk is not None and upload_path is None:
+        return response_success('Chunk received', data={
+            'upload_id': chunk.upload_id,
+            'received_chunks': get_chunked_upload_chunks(current_user.id, chunk.upload_id)
+        })
+
     dsf_schema = DSFileSchema()
     try:
 
@@ -339,13 +428,13 @@ def datastore_add_file(cur_id: int, caseid: int):
         db.session.add(dsf_sc)
         db.session.commit()
 
-        ds_location = datastore_get_standard_path(dsf_sc, caseid)
-        dsf_sc.file_local_name, dsf_sc.file_size, dsf_sc.file_sha256 = dsf_schema.ds_store_file(
-            request.files.get('file_content'),
-            ds_location,
-            dsf_sc.file_is_ioc,
-            dsf_sc.file_password)
+        if upload_path is not None:
+            dsf_schema.ds_store_uploaded_file(upload_path, dsf_sc)
 
+        else:
+            dsf_schema.ds_store_file(request.files.get('file_content'), dsf_sc)
+
+        update_datastore_state(caseid=caseid)
         db.session.commit()
 
         msg_added_as = ''
@@ -363,6 +452,10 @@ def datastore_add_file(cur_id: int, caseid: int):
     except marshmallow.exceptions.ValidationError as e:
         return response_error(msg="Data error", data=e.messages)
 
+    finally:
+        if upload_path is not None:
+            discard_chunked_upload(current_user.id, chunk.upload_id)
+
 
 @datastore_blueprint.route('/datastore/file/add-interactive', methods=['POST'])
 @ac_api_case_requires(CaseAccessLevel.full_access)
@@ -385,6 +478,8 @@ def datastore_add_interactive_file(caseid: int):
         dsf_sc, existed = dsf_schema.ds_store_file_b64(filename, file_content, dsp, caseid)
 
         if not existed:
+            update_datastore_state(caseid=caseid)
+            db.session.commit()
             msg = "File saved in datastore"
 
         else:
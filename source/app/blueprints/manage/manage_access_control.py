@@ -20,6 +20,7 @@ from flask import url_for
 from flask_wtf import FlaskForm
 from werkzeug.utils import redirect
 
+from app import celery
 from app.business.users import _reset_user_mfa
 from app.iris_engine.access_control.utils import ac_recompute_all_users_effective_ac
 from app.iris_engine.access_control.utils import ac_recompute_effective_ac
@@ -28,6 +29,7 @@ from app.iris_engine.access_control.utils import ac_trace_user_effective_cases_a
 from app.models.authorization import Permissions
 from app.util import ac_api_requires
 from app.util import ac_requires
+from app.util import response_error
 from app.util import response_success
 
 manage_ac_blueprint = Blueprint(
@@ -52,11 +54,33 @@ def manage_ac_index(caseid, url_redir):
 @ac_api_requires(Permissions.server_administrator)
 def manage_ac_compute_effective_all_ac():
 
-    ac_recompute_all_users_effective_ac()
+    task_id = ac_recompute_all_users_effective_ac()
+    if task_id:
+        return response_success('Update started', data={'task_id': task_id})
 
     return response_success('Updated')
 
 
+@manage_ac_blueprint.route('/manage/access-control/recompute-effective-users-ac/status/<task_id>', methods=['GET'])
+@ac_api_requires(Permissions.server_administrator)
+def manage_ac_compute_effective_all_ac_status(task_id):
+    task = celery.AsyncResult(task_id)
+
+    if task.state == 'PENDING':
+        return response_success('Update pending', data={'state': 'pending'})
+
+    if task.state == 'PROGRESS':
+        info = task.info or {}
+        return response_success('Update in progress', data={'state': 'progress',
+                                                             'processed': info.get('processed'),
+                                                             'total': info.get('total')})
+
+    if task.state == 'SUCCESS':
+        return response_success('Updated', data={'state': 'success', 'processed': task.info})
+
+    return response_error('Update failed', data={'state': 'failure'})
+
+
 @manage_ac_blueprint.route('/manage/access-control/recompute-effective-user-ac/<int:cur_id>', methods=['GET'])
 @ac_api_requires(Permissions.server_administrator)
 def manage_ac_compute_effective_ac(cur_id):
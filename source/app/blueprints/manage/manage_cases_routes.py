@@ -29,7 +29,9 @@ from flask_login import current_user
 from flask_wtf import FlaskForm
 from werkzeug import Response
 from werkzeug.utils import secure_filename
+from iris_interface.IrisInterfaceStatus import IIStatus
 
+from app import celery
 from app import db
 from app.datamgmt.alerts.alerts_db import get_alert_status_by_name
 from app.datamgmt.case.case_db import get_case
@@ -54,6 +56,7 @@ from app.iris_engine.module_handler.module_handler import call_modules_hook
 from app.iris_engine.module_handler.module_handler import configure_module_on_init
 from app.iris_engine.module_handler.module_handler import instantiate_module_from_name
 from app.iris_engine.tasker.tasks import task_case_update
+from app.iris_engine.tasker.tasks import task_delete_case
 from app.iris_engine.utils.common import build_upload_path
 from app.iris_engine.utils.tracker import track_activity
 from app.models.authorization import CaseAccessLevel
@@ -67,7 +70,7 @@ from app.util import ac_api_return_access_denied
 from app.util import ac_requires
 from app.util import response_error
 from app.util import response_success
-from app.business.cases import delete
+from app.business.cases import check_case_deletion
 from app.business.cases import update
 from app.business.cases import create
 from app.business.errors import BusinessProcessingError
@@ -233,13 +236,37 @@ def manage_case_filter() -> Response:
 @ac_api_requires(Permissions.standard_user)
 def api_delete_case(cur_id):
     try:
-        delete(cur_id)
-        return response_success('Case successfully deleted')
+        check_case_deletion(cur_id)
     except BusinessProcessingError as e:
         return response_error(e.get_message())
     except PermissionDeniedError:
         return ac_api_return_access_denied(caseid=cur_id)
 
+    task = task_delete_case.delay(caseid=cur_id, user_id=current_user.id)
+    track_activity(f'started the deletion of case {cur_id}', ctx_less=True)
+
+    return response_success('Case deletion started', data={'task_id': task.id})
+
+
+@manage_cases_blueprint.route('/manage/cases/delete/status/<task_id>', methods=['GET'])
+@ac_api_requires(Permissions.standard_user)
+def api_delete_case_status(task_id):
+    task = celery.AsyncResult(task_id)
+
+    if task.state == 'PENDING':
+        # Unknown tasks are pending as well, so nothing is disclosed
+        return response_success('Case deletion pending', data={'state': 'pending'})
+
+    # The case is gone once deleted, so the deletion is only disclosed to the user who requested it
+    if (task.kwargs or {}).get('user_id') != current_user.id:
+        return response_error('Invalid task ID')
+
+    if isinstance(task.info, IIStatus) and task.info.is_success():
+        return response_success(task.info.get_message(), data={'state': 'success', **(task.info.get_data() or {})})
+
+    message = task.info.get_message() if isinstance(task.info, IIStatus) else 'Case deletion failed'
+    return response_error(message, data={'state': 'failure'})
+
 
 @manage_cases_blueprint.route('/manage/cases/reopen/<int:cur_id>', methods=['POST'])
 @ac_api_requires(Permissions.standard_user)
@@ -27,9 +27,13 @@ from werkzeug.utils import redirect
 from app import app
 from app import celery
 from app import db
+from app.datamgmt.datastore.datastore_db import datastore_get_blobs_stats
 from app.datamgmt.manage.manage_srv_settings_db import get_alembic_revision
 from app.datamgmt.manage.manage_srv_settings_db import get_srv_settings
 from app.iris_engine.backup.backup import backup_iris_db
+from app.iris_engine.module_handler.module_registry import invalidate_modules_registry
+from app.iris_engine.tasker.tasks import task_compact_note_revisions
+from app.iris_engine.tasker.tasks import task_deduplicate_datastore
 from app.iris_engine.updater.updater import is_updates_available
 from app.iris_engine.updater.updater import remove_periodic_update_checks
 from app.iris_engine.updater.updater import setup_periodic_update_checks
@@ -41,6 +45,7 @@ from app.util import ac_requires
 from app.util import response_error
 from app.util import response_success
 from dictdiffer import diff
+from iris_interface.IrisInterfaceStatus import IIStatus
 
 
 manage_srv_settings_blueprint = Blueprint(
@@ -74,6 +79,75 @@ def manage_make_db_backup():
     return rep
 
 
+@manage_srv_settings_blueprint.route('/manage/server/maintenance/compact-note-revisions', methods=['POST'])
+@ac_api_requires(Permissions.server_administrator)
+def manage_compact_note_revisions():
+
+    task = task_compact_note_revisions.delay()
+    track_activity("started the compaction of the note revisions", ctx_less=True)
+
+    return response_success('Compaction started', data={'task_id': task.id})
+
+
+@manage_srv_settings_blueprint.route('/manage/server/maintenance/compact-note-revisions/status/<task_id>',
+                                     methods=['GET'])
+@ac_api_requires(Permissions.server_administrator)
+def manage_compact_note_revisions_status(task_id):
+    task = celery.AsyncResult(task_id)
+
+    if task.state == 'PENDING':
+        return response_success('Compaction pending', data={'state': 'pending'})
+
+    if task.state == 'PROGRESS':
+        info = task.info or {}
+        return response_success('Compaction in progress', data={'state': 'progress',
+                                                                 'processed': info.get('processed'),
+                                                                 'total': info.get('total')})
+
+    if isinstance(task.info, IIStatus) and task.info.is_success():
+        return response_success(task.info.get_message(), data={'state': 'success', **(task.info.get_data() or {})})
+
+    return response_error('Compaction failed', data={'state': 'failure'})
+
+
+@manage_srv_settings_blueprint.route('/manage/server/datastore/stats', methods=['GET'])
+@ac_api_requires(Permissions.server_administrator)
+def manage_datastore_stats():
+
+    return response_success('', data=datastore_get_blobs_stats())
+
+
+@manage_srv_settings_blueprint.route('/manage/server/maintenance/deduplicate-datastore', methods=['POST'])
+@ac_api_requires(Permissions.server_administrator)
+def manage_deduplicate_datastore():
+
+    task = task_deduplicate_datastore.delay()
+    track_activity("started the deduplication of the datastore", ctx_less=True)
+
+    return response_success('Deduplication started', data={'task_id': task.id})
+
+
+@manage_srv_settings_blueprint.route('/manage/server/maintenance/deduplicate-datastore/status/<task_id>',
+                                     methods=['GET'])
+@ac_api_requires(Permissions.server_administrator)
+def manage_deduplicate_datastore_status(task_id):
+    task = celery.AsyncResult(task_id)
+
+    if task.state == 'PENDING':
+        return response_success('Deduplication pending', data={'state': 'pending'})
+
+    if task.state == 'PROGRESS':
+        info = task.info or {}
+        return response_success('Deduplication in progress', data={'state': 'progress',
+                                                                    'processed': info.get('processed'),
+                                                                    'total': info.get('total')})
+
+    if isinstance(task.info, IIStatus) and task.info.is_success():
+        return response_success(task.info.get_message(), data={'state': 'success', **(task.info.get_data() or {})})
+
+    return response_error('Deduplication failed', data={'state': 'failure'})
+
+
 @manage_srv_settings_blueprint.route('/manage/server/check-updates/modal', methods=['GET'])
 @ac_requires(Permissions.server_administrator, no_cid_required=True)
 def manage_check_updates_modal(caseid, url_redir):
@@ -130,6 +204,9 @@ def manage_update_settings():
         srv_settings_sc = srv_settings_schema.load(request.get_json(), instance=server_settings)
         db.session.commit()
 
+        # Module instances hold the server settings
+        invalidate_modules_registry()
+
         if original_update_check != srv_settings_sc.enable_updates_check:
             if srv_settings_sc.enable_updates_check:
                 setup_periodic_update_checks(celery)
@@ -47,6 +47,7 @@ from app.datamgmt.manage.manage_users_db import remove_cases_access_from_user
 from app.datamgmt.manage.manage_users_db import update_user
 from app.datamgmt.manage.manage_users_db import update_user_groups
 from app.forms import AddUserForm
+from app.iris_engine.access_control.api_key_handler import invalidate_api_key_cache
 from app.iris_engine.access_control.utils import ac_get_all_access_level
 from app.iris_engine.access_control.utils import ac_current_user_has_permission
 from app.iris_engine.utils.tracker import track_activity
@@ -476,6 +477,7 @@ def deactivate_user_api(cur_id):
 
     user.active = False
     db.session.commit()
+    invalidate_api_key_cache(user.id)
     user_schema = UserSchema()
 
     track_activity(f"user {user.user} deactivated", ctx_less=True)
@@ -514,6 +516,7 @@ def renew_user_api_key(cur_id):
 
     user.api_key = secrets.token_urlsafe(nbytes=64)
     db.session.commit()
+    invalidate_api_key_cache(user.id)
 
     user_schema = UserFullSchema()
 
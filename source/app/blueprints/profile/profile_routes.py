@@ -32,6 +32,7 @@ from app.datamgmt.manage.manage_srv_settings_db import get_srv_settings, get_ser
 from app.datamgmt.manage.manage_users_db import get_user
 from app.datamgmt.manage.manage_users_db import get_user_primary_org
 from app.datamgmt.manage.manage_users_db import update_user
+from app.iris_engine.access_control.api_key_handler import invalidate_api_key_cache
 from app.iris_engine.access_control.utils import ac_current_user_has_permission
 from app.iris_engine.access_control.utils import ac_get_effective_permissions_of_user
 from app.iris_engine.access_control.utils import ac_recompute_effective_ac
@@ -71,6 +72,7 @@ def user_renew_api():
     user.api_key = secrets.token_urlsafe(nbytes=64)
 
     db.session.commit()
+    invalidate_api_key_cache(user.id)
 
     return response_success("Token renewed")
 
@@ -16,129 +16,133 @@
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
-import os
-import tempfile
-import base64
-
 from flask import Blueprint
 from flask import request
 from flask import send_file
-
-from app.iris_engine.module_handler.module_handler import call_modules_hook
-from app.iris_engine.reporter.reporter import IrisMakeDocReport
-from app.iris_engine.reporter.reporter import IrisMakeMdReport
-from app.iris_engine.utils.tracker import track_activity
-from app.models import CaseTemplateReport
-from app.util import FileRemover
+from flask_login import current_user
+
+from app import celery
+from app.business.errors import BusinessProcessingError
+from app.business.reports import REPORT_TYPES
+from app.business.reports import generate_report
+from app.iris_engine.reporter.report_cache import get_stored_report_path
+from app.iris_engine.tasker.tasks import task_generate_report
+from app.models.authorization import CaseAccessLevel
+from app.util import ac_api_case_requires
 from app.util import ac_api_requires
 from app.util import ac_requires_case_identifier
 from app.util import response_error
-from app.datamgmt.case.case_db import get_case
+from app.util import response_success
+from iris_interface.IrisInterfaceStatus import IIStatus
 
 reports_blueprint = Blueprint('reports', __name__, template_folder='templates')
 
-file_remover = FileRemover()
+
+def _send_report(report_id, caseid, doc_type):
+    safe_mode = request.args.get('safe-mode') == 'true'
+
+    try:
+        fpath, _ = generate_report(caseid, report_id, doc_type, safe_mode)
+
+    except BusinessProcessingError as e:
+        if e.get_message() == 'Unknown report':
+            return response_error(e.get_message(), status=404)
+
+        return response_error(e.get_message(), data=e.get_data())
+
+    return send_file(fpath, as_attachment=True)
 
 
 @reports_blueprint.route('/case/report/generate-activities/<int:report_id>', methods=['GET'])
 @ac_api_requires()
 @ac_requires_case_identifier()
 def download_case_activity(report_id, caseid):
+    return _send_report(report_id, caseid, 'Activities')
 
-    call_modules_hook('on_preload_activities_report_create', data=report_id, caseid=caseid)
-    if report_id:
-        report = CaseTemplateReport.query.filter(CaseTemplateReport.id == report_id).first()
-        if report:
-            tmp_dir = tempfile.mkdtemp()
-
-            safe_mode = False
-
-            if request.args.get('safe-mode') == 'true':
-                safe_mode = True
 
-            # Get file extension
-            _, report_format = os.path.splitext(report.internal_reference)
-            
-            # Depending on the template format, the generation process is different
-            if report_format == ".docx":
-                mreport = IrisMakeDocReport(tmp_dir, report_id, caseid, safe_mode)
-                fpath, logs = mreport.generate_doc_report(doc_type="Activities")
+@reports_blueprint.route("/case/report/generate-investigation/<int:report_id>", methods=['GET'])
+@ac_api_requires()
+@ac_requires_case_identifier()
+def _gen_report(report_id, caseid):
+    return _send_report(report_id, caseid, 'Investigation')
 
-            elif report_format == ".md" or report_format == ".html" :
-                mreport = IrisMakeMdReport(tmp_dir, report_id, caseid, safe_mode)
-                fpath, logs = mreport.generate_md_report(doc_type="Activities")
 
-            else:
-                return response_error("Report error", "Unknown report format.")
+@reports_blueprint.route('/case/report/jobs/add', methods=['POST'])
+@ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
+def case_report_job_add(caseid):
+    """
+    Starts the generation of a report in the background.
+    Expects a JSON body with report_id, report_type (Investigation or Activities) and optionally safe_mode.
+    """
+    request_data = request.get_json(silent=True) or {}
 
-            if fpath is None:
-                track_activity("failed to generate a report")
-                return response_error(msg="Failed to generate the report", data=logs)
+    report_id = request_data.get('report_id')
+    report_type = request_data.get('report_type')
+    if not isinstance(report_id, int) or report_type not in REPORT_TYPES:
+        return response_error('Invalid data', data=f'Expected report_id and report_type in {REPORT_TYPES}')
 
-            call_modules_hook('on_postload_activities_report_create', data=report_id, caseid=caseid)
-            resp = send_file(fpath, as_attachment=True)
-            file_remover.cleanup_once_done(resp, tmp_dir)
+    task = task_generate_report.apply_async(kwargs={'caseid': caseid,
+                                                    'report_id': report_id,
+                                                    'doc_type': report_type,
+                                                    'safe_mode': request_data.get('safe_mode') is True,
+                                                    'user_id': current_user.id})
 
-            track_activity("generated a report")
+    return response_success('Report generation started', data={'job_id': task.id})
 
-            return resp
 
-    return response_error("Unknown report", status=404)
+def _get_report_job(job_id, caseid):
+    task = celery.AsyncResult(job_id)
 
+    if task.state in ['PENDING', 'PROGRESS']:
+        return task, None
 
-@reports_blueprint.route("/case/report/generate-investigation/<int:report_id>", methods=['GET'])
-@ac_api_requires()
-@ac_requires_case_identifier()
-def _gen_report(report_id, caseid):
+    if (task.kwargs or {}).get('caseid') != caseid:
+        return None, response_error('Invalid job ID for this case')
 
-    safe_mode = False
+    return task, None
 
-    call_modules_hook('on_preload_report_create', data=report_id, caseid=caseid)
-    if report_id:
-        report = CaseTemplateReport.query.filter(CaseTemplateReport.id == report_id).first()
-        if report:
-            tmp_dir = tempfile.mkdtemp()
 
-            if request.args.get('safe-mode') == 'true':
-                safe_mode = True
+@reports_blueprint.route('/case/report/jobs/<job_id>', methods=['GET'])
+@ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
+def case_report_job_status(job_id, caseid):
+    task, error = _get_report_job(job_id, caseid)
+    if error:
+        return error
 
-            _, report_format = os.path.splitext(report.internal_reference)
-            
-            if report_format == ".md" or report_format == ".html":
-                mreport = IrisMakeMdReport(tmp_dir, report_id, caseid, safe_mode)
-                fpath, logs = mreport.generate_md_report(doc_type="Investigation")
+    if task.state == 'PENDING':
+        # Unknown jobs are pending as well, so nothing is disclosed
+        return response_success('Report generation pending', data={'state': 'pending'})
 
-            elif report_format == ".docx":
-                mreport = IrisMakeDocReport(tmp_dir, report_id, caseid, safe_mode)
-                fpath, logs = mreport.generate_doc_report(doc_type="Investigation")
+    if task.state == 'PROGRESS':
+        info = task.info or {}
+        if info.get('caseid') != caseid:
+            return response_error('Invalid job ID for this case')
 
-            else:
-                return response_error("Report error", "Unknown report format.")
+        return response_success('Report generation in progress', data={'state': 'progress',
+                                                                        'step': info.get('step')})
 
-            if fpath is None:
-                track_activity("failed to generate the report")
-                return response_error(msg="Failed to generate the report", data=logs)
-            
-            with open(fpath,'rb') as rfile:
-                encoded_file = base64.b64encode(rfile.read()).decode('utf-8')
+    if isinstance(task.info, IIStatus) and task.info.is_success():
+        data = task.info.get_data() or {}
+        return response_success(task.info.get_message(), data={'state': 'success',
+                                                               'file_name': data.get('file_name'),
+                                                               'cached': data.get('cached')})
 
-            res = get_case(caseid)
-            
-            _data = {
-                'report_id':report_id,
-                'file_path':fpath,
-                'case_id':res.case_id,
-                'user_name':res.user.name,
-                'file':encoded_file
-            }
+    message = task.info.get_message() if isinstance(task.info, IIStatus) else 'Report generation failed'
+    return response_error(message, data={'state': 'failure'})
 
-            call_modules_hook('on_postload_report_create', data=_data, caseid=caseid)
 
-            resp = send_file(fpath, as_attachment=True)
-            file_remover.cleanup_once_done(resp, tmp_dir)
+@reports_blueprint.route('/case/report/jobs/<job_id>/download', methods=['GET'])
+@ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
+def case_report_job_download(job_id, caseid):
+    task, error = _get_report_job(job_id, caseid)
+    if error:
+        return error
 
-            track_activity("generated a report")
+    if task.state != 'SUCCESS' or not isinstance(task.info, IIStatus) or not task.info.is_success():
+        return response_error('Report not available')
 
-            return resp
+    fpath = get_stored_report_path(caseid, (task.info.get_data() or {}).get('report_path', ''))
+    if fpath is None:
+        return response_error('Report expired, the case was updated since its generation', status=404)
 
-    return response_error("Unknown report", status=404)
+    return send_file(fpath, as_attachment=True)
@@ -22,24 +22,28 @@ from flask import redirect
 from flask import render_template
 from flask import request
 from flask import url_for
-from sqlalchemy import and_
+from flask_login import current_user
 
+from app import app
+from app.datamgmt.search.search_db import search_comments
+from app.datamgmt.search.search_db import search_iocs
+from app.datamgmt.search.search_db import search_notes
 from app.forms import SearchForm
-from app.iris_engine.access_control.utils import ac_flag_match_mask
 from app.iris_engine.utils.tracker import track_activity
-from app.models import Comments
 from app.models.authorization import Permissions
-from app.models.cases import Cases
-from app.models.models import Client
-from app.models.models import Ioc
-from app.models.models import IocLink
-from app.models.models import IocType
-from app.models.models import Notes
-from app.models.models import Tlp
 from app.util import ac_api_requires
 from app.util import ac_requires
+from app.util import response_error
 from app.util import response_success
 
+_DEFAULT_RESULTS_PER_PAGE = 50
+_MAX_RESULTS_PER_PAGE = 500
+
+
+def _has_results(results):
+    return bool(results['total'] if isinstance(results, dict) else results)
+
+
 search_blueprint = Blueprint('search',
                              __name__,
                              template_folder='templates')
@@ -53,80 +57,32 @@ def search_file_post():
     search_value = jsdata.get('search_value')
     search_type = jsdata.get('search_type')
     files = []
-    search_condition = and_()
+
+    # Pattern searches are the former LIKE searches, kept as a fallback of the full-text ones and used for wildcards
+    fulltext = (jsdata.get('search_mode', 'fulltext') != 'pattern' and app.config.get('SEARCH_FULLTEXT_ENABLED')
+                and '%' not in (search_value or ''))
+
+    page = jsdata.get('page')
+    per_page = _DEFAULT_RESULTS_PER_PAGE
+    if page is not None:
+        try:
+            page = max(1, int(page))
+            per_page = min(max(1, int(jsdata.get('per_page', _DEFAULT_RESULTS_PER_PAGE))), _MAX_RESULTS_PER_PAGE)
+        except (TypeError, ValueError):
+            return response_error('Invalid pagination parameters')
 
     track_activity("started a global search for {} on {}".format(search_value, search_type))
 
-    if search_type == "ioc":
-        res = Ioc.query.with_entities(
-                            Ioc.ioc_value.label('ioc_name'),
-                            Ioc.ioc_description.label('ioc_description'),
-                            Ioc.ioc_misp,
-                            IocType.type_name,
-                            Tlp.tlp_name,
-                            Tlp.tlp_bscolor,
-                            Cases.name.label('case_name'),
-                            Cases.case_id,
-                            Client.name.label('customer_name')
-                    ).filter(
-                        and_(
-                            Ioc.ioc_value.like(search_value),
-                            IocLink.ioc_id == Ioc.ioc_id,
-                            IocLink.case_id == Cases.case_id,
-                            Client.client_id == Cases.client_id,
-                            Ioc.ioc_tlp_id == Tlp.tlp_id,
-                            search_condition
-                        )
-                    ).join(Ioc.ioc_type).all()
-
-        files = [row._asdict() for row in res]
-
-    if search_type == "notes":
-
-        ns = []
-        if search_value:
-            search_value = "%{}%".format(search_value)
-            ns = Notes.query.filter(
-                Notes.note_content.like(search_value),
-                Cases.client_id == Client.client_id,
-                search_condition
-            ).with_entities(
-                Notes.note_id,
-                Notes.note_title,
-                Cases.name.label('case_name'),
-                Client.name.label('client_name'),
-                Cases.case_id
-            ).join(
-                Notes.case
-            ).order_by(
-                Client.name
-            ).all()
-
-            ns = [row._asdict() for row in ns]
-
-        files = ns
-
-    if search_type == "comments":
-        search_value = "%{}%".format(search_value)
-        comments = Comments.query.filter(
-            Comments.comment_text.like(search_value),
-            Cases.client_id == Client.client_id,
-            search_condition
-        ).with_entities(
-            Comments.comment_id,
-            Comments.comment_text,
-            Cases.name.label('case_name'),
-            Client.name.label('customer_name'),
-            Cases.case_id
-        ).join(
-            Comments.case
-        ).join(
-            Cases.client
-        ).order_by(
-            Client.name
-        ).all()
-
-        files = [row._asdict() for row in comments]
+    if search_value and search_type == "ioc":
+        files = search_iocs(search_value, current_user.id, fulltext=fulltext, page=page, per_page=per_page)
+
+    if search_value and search_type in ["notes", "comments"]:
+        search_function = search_notes if search_type == "notes" else search_comments
+        files = search_function(search_value, current_user.id, fulltext=fulltext, page=page, per_page=per_page)
+
+        # Full-text searches match whole words only, a part of a word is searched as a pattern
+        if fulltext and not _has_results(files):
+            files = search_function(search_value, current_user.id, fulltext=False, page=page, per_page=per_page)
 
     return response_success("Results fetched", files)
 
@@ -0,0 +1,287 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import csv
+import itertools
+from datetime import datetime
+from flask_login import current_user
+from marshmallow import ValidationError
+
+from app import db
+from app.datamgmt.case.case_assets_db import add_assets_batch
+from app.datamgmt.case.case_assets_db import get_analysis_status_list
+from app.datamgmt.case.case_assets_db import get_assets_types_ids_by_names
+from app.datamgmt.case.case_assets_db import get_case_assets_names_types
+from app.datamgmt.case.case_assets_db import get_unspecified_analysis_status_id
+from app.datamgmt.case.case_events_db import get_case_iocs_ids_by_values
+from app.datamgmt.manage.manage_attribute_db import get_default_custom_attributes
+from app.datamgmt.manage.manage_common import get_bulk_schema_context
+from app.datamgmt.manage.manage_tags_db import add_db_tags
+from app.datamgmt.states import update_assets_state
+from app.iris_engine.module_handler.module_handler import call_modules_hook
+from app.iris_engine.utils.tracker import track_activity
+from app.models import CaseAssets
+from app.schema.marshables import CaseAssetsSchema
+
+ASSET_CSV_FIELDS = [
+    "asset_name",
+    "asset_type_name",
+    "asset_description",
+    "asset_ip",
+    "asset_domain",
+    "asset_tags"
+]
+
+# Only read when the file has a header line
+ASSET_CSV_OPTIONAL_FIELDS = [
+    "analysis_status",
+    "asset_iocs"
+]
+
+ASSET_CSV_ERRORS_FIELDS = [
+    "row",
+    "asset_name",
+    "asset_type_name",
+    "error"
+]
+
+_CSV_IMPORT_CHUNK_SIZE = 5000
+
+_ASSET_COLUMNS = ['asset_name', 'asset_description', 'asset_domain', 'asset_ip', 'asset_info', 'asset_type_id',
+                  'asset_tags', 'asset_compromise_status_id', 'analysis_status_id']
+
+
+def _import_error(line, row, error):
+    return {'row': line, 'asset_name': row.get('asset_name'), 'asset_type_name': row.get('asset_type_name'),
+            'error': error}
+
+
+def _split_names(value, separator):
+    return [name for name in (value or '').split(separator) if name != '']
+
+
+def _get_csv_reader(csv_lines):
+    """
+    Returns a reader of the rows of an asset CSV content and the line number of its first row. The header line is
+    optional, the optional fields are only read when it is present.
+    """
+    csv_lines = iter(csv_lines)
+    first_line = next(csv_lines, '')
+    fields = [field.strip().lower() for field in next(csv.reader([first_line]), [])]
+
+    if fields[:len(ASSET_CSV_FIELDS)] == ASSET_CSV_FIELDS:
+        fieldnames = ASSET_CSV_FIELDS + [field for field in fields if field in ASSET_CSV_OPTIONAL_FIELDS]
+        return csv.DictReader(csv_lines, fieldnames=fields, delimiter=','), fieldnames, 2
+
+    return csv.DictReader(itertools.chain([first_line], csv_lines), fieldnames=ASSET_CSV_FIELDS,
+                          delimiter=','), ASSET_CSV_FIELDS, 1
+
+
+def _read_csv_assets(csv_lines, assets_types, analysis_statuses, default_analysis_status_id, errors):
+    """
+    Reads the rows of an asset CSV content and resolves their type and analysis status.
+    Yields the line number, the row read and the row ready to be loaded, the invalid rows being added to the errors.
+    """
+    reader, fieldnames, first_line = _get_csv_reader(csv_lines)
+
+    for line, row in enumerate(reader, start=first_line):
+        missing_fields = [field for field in fieldnames if row.get(field) is None]
+        if missing_fields:
+            errors.append(_import_error(line, row, f"{','.join(missing_fields)} missing"))
+            continue
+
+        if not row.get('asset_name'):
+            errors.append(_import_error(line, row, 'empty asset name'))
+            continue
+
+        if not row.get('asset_type_name'):
+            errors.append(_import_error(line, row, 'empty asset type'))
+            continue
+
+        type_id = assets_types.get(row.get('asset_type_name').lower())
+        if not type_id:
+            errors.append(_import_error(line, row, f"invalid asset type: {row.get('asset_type_name')}"))
+            continue
+
+        analysis_status_id = default_analysis_status_id
+        if row.get('analysis_status'):
+            analysis_status_id = analysis_statuses.get(row.get('analysis_status').lower())
+            if not analysis_status_id:
+                errors.append(_import_error(line, row, f"invalid analysis status: {row.get('analysis_status')}"))
+                continue
+
+        yield line, row, {
+            'asset_name': row.get('asset_name'),
+            'asset_type_id': type_id,
+            'asset_description': row.get('asset_description'),
+            'asset_ip': row.get('asset_ip'),
+            'asset_domain': row.get('asset_domain'),
+            'asset_tags': row.get('asset_tags').replace('|', ','),
+            'analysis_status_id': analysis_status_id
+        }
+
+
+def _import_assets_chunk(chunk, case_identifier, asset_schema, custom_attributes, file_assets, errors):
+    """
+    Loads a chunk of rows, checks they are unique in the file and in the case with a single query, then inserts the
+    assets and their IOCs links with one statement each. The IOCs to link are resolved with a single query.
+    The assets of the file are tracked across chunks in file_assets, mapped to the line of their first row.
+
+    returns:
+        list of the rows imported, and the IDs of their assets
+    """
+    rows = call_modules_hook('on_preload_asset_create', data=[row for _, _, row in chunk], caseid=case_identifier)
+
+    tag_titles = set()
+    iocs_values = set()
+    for _, csv_row, row in chunk:
+        iocs_values.update(_split_names(csv_row.get('asset_iocs'), '|'))
+    for row in rows:
+        tag_titles.update((row.get('asset_tags') or '').split(','))
+
+    add_db_tags(tag_titles)
+    iocs_ids = get_case_iocs_ids_by_values(iocs_values, case_identifier)
+
+    loaded = []
+    for (line, csv_row, _), row in zip(chunk, rows):
+        try:
+            asset = asset_schema.load(row)
+        except ValidationError as e:
+            errors.append(_import_error(line, csv_row, str(e.messages)))
+            continue
+
+        if asset in db.session:
+            db.session.expunge(asset)
+
+        unknown_iocs = [value for value in _split_names(csv_row.get('asset_iocs'), '|') if value not in iocs_ids]
+        if unknown_iocs:
+            errors.append(_import_error(line, csv_row, f"IOCs not found in this case: {','.join(unknown_iocs)}"))
+            continue
+
+        loaded.append((line, csv_row, row, asset))
+
+    case_assets = get_case_assets_names_types({(asset.asset_name.lower(), asset.asset_type_id)
+                                               for _, _, _, asset in loaded}, case_identifier)
+
+    now = datetime.utcnow()
+    imported = []
+    assets = []
+    iocs_assets = []
+    for line, csv_row, row, asset in loaded:
+        key = (asset.asset_name.lower(), asset.asset_type_id)
+        if key in file_assets:
+            errors.append(_import_error(line, csv_row, f'duplicate of row {file_assets[key]} in the file'))
+            continue
+
+        if key in case_assets:
+            errors.append(_import_error(line, csv_row, 'asset name already exists in this case'))
+            continue
+
+        file_assets[key] = line
+        imported.append(row)
+
+        values = {column: getattr(asset, column) for column in _ASSET_COLUMNS}
+        values.update({
+            'case_id': case_identifier,
+            'user_id': current_user.id,
+            'date_added': now,
+            'date_update': now,
+            'custom_attributes': custom_attributes
+        })
+        assets.append(values)
+        iocs_assets.append([iocs_ids[value] for value in _split_names(csv_row.get('asset_iocs'), '|')])
+
+    return imported, add_assets_batch(assets, iocs_assets)
+
+
+def import_csv_assets(csv_lines, case_identifier, progress_callback=None):
+    """
+    Imports the assets of a CSV content in a case.
+
+    The types, analysis statuses and default custom attributes are resolved once, and the types and statuses are
+    validated against these in-memory lookups. The rows are then processed by chunks: the uniqueness of the assets
+    of a chunk is checked with a single query, the IOCs they reference are resolved with another one, then the
+    assets and their IOCs links are inserted at once. Each chunk is committed on its own along with the assets
+    state, so an interrupted import keeps the chunks already processed. The activity is tracked once at the end.
+
+    The header line is optional. When present, it may add an analysis_status column and an asset_iocs column
+    listing the values of case IOCs to link, separated with "|". Invalid rows do not stop the import, they are
+    reported in the errors.
+
+    args:
+        csv_lines: iterable of the lines of the CSV content, such as an opened file
+        case_identifier: ID of the case
+        progress_callback: called with the number of rows processed after each chunk
+
+    returns:
+        tuple of the list of the rows imported, and the list of the errors as dict of ASSET_CSV_ERRORS_FIELDS
+    """
+    context = get_bulk_schema_context()
+    # Tags are registered by chunks before the rows are loaded
+    context['tags_registered'] = True
+    asset_schema = CaseAssetsSchema(context=context)
+
+    assets_types = get_assets_types_ids_by_names()
+    analysis_statuses = {name.lower(): status_id for status_id, name in get_analysis_status_list()}
+    custom_attributes = get_default_custom_attributes('asset')
+
+    imported = []
+    errors = []
+    file_assets = {}
+    processed = 0
+
+    def import_chunk(chunk):
+        chunk_imported, assets_ids = _import_assets_chunk(chunk, case_identifier, asset_schema, custom_attributes,
+                                                          file_assets, errors)
+        update_assets_state(caseid=case_identifier, userid=current_user.id)
+        db.session.commit()
+
+        if assets_ids:
+            assets = CaseAssets.query.filter(CaseAssets.asset_id.in_(assets_ids)).all()
+            call_modules_hook('on_postload_asset_create', data=assets, caseid=case_identifier)
+
+        imported.extend(chunk_imported)
+
+    try:
+        chunk = []
+        for line, csv_row, row in _read_csv_assets(csv_lines, assets_types, analysis_statuses,
+                                                   get_unspecified_analysis_status_id(), errors):
+            chunk.append((line, csv_row, row))
+            processed = line
+
+            if len(chunk) >= _CSV_IMPORT_CHUNK_SIZE:
+                import_chunk(chunk)
+                chunk = []
+                if progress_callback:
+                    progress_callback(processed)
+
+        if chunk:
+            import_chunk(chunk)
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if progress_callback:
+        progress_callback(processed)
+
+    track_activity(f"added {len(imported)} assets from CSV file", caseid=case_identifier)
+    errors.sort(key=lambda error: error['row'])
+
+    return imported, errors
+
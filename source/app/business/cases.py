@@ -36,6 +36,8 @@ from app.models import ReviewStatusList
 
 from app.iris_engine.module_handler.module_handler import call_modules_hook
 from app.iris_engine.utils.tracker import track_activity
+from app.iris_engine.access_control.utils import ac_bump_access_version
+from app.iris_engine.access_control.utils import ac_recompute_case_customers_effective_ac
 from app.iris_engine.access_control.utils import ac_set_new_case_access
 
 from app.datamgmt.case.case_db import save_case_tags
@@ -120,7 +122,7 @@ def create(request_json):
         raise BusinessProcessingError('Error creating case - check server logs')
 
 
-def delete(case_identifier):
+def check_case_deletion(case_identifier):
     check_current_user_has_some_permission([Permissions.standard_user])
     check_current_user_has_some_case_access(case_identifier, [CaseAccessLevel.full_access])
 
@@ -130,6 +132,15 @@ def delete(case_identifier):
 
         raise BusinessProcessingError('Cannot delete a primary case to keep consistency')
 
+    if not get_case(case_identifier):
+        track_activity(f'tried to delete case {case_identifier}, but it doesn\'t exist',
+                       caseid=case_identifier, ctx_less=True)
+        raise BusinessProcessingError('Tried to delete a non-existing case')
+
+
+def delete(case_identifier):
+    check_case_deletion(case_identifier)
+
     try:
         call_modules_hook('on_preload_case_delete', data=case_identifier, caseid=case_identifier)
         if not delete_case(case_identifier):
@@ -138,6 +149,8 @@ def delete(case_identifier):
             raise BusinessProcessingError('Tried to delete a non-existing case')
         call_modules_hook('on_postload_case_delete', data=case_identifier, caseid=case_identifier)
         track_activity(f'case {case_identifier} deleted successfully', ctx_less=True)
+    except BusinessProcessingError:
+        raise
     except Exception as e:
         app.logger.exception(e)
         raise BusinessProcessingError('Cannot delete the case. Please check server logs for additional informations')
@@ -154,6 +167,7 @@ def update(case_identifier, request_data):
     try:
 
         previous_case_state = case_i.state_id
+        previous_client_id = case_i.client_id
         case_previous_reviewer_id = case_i.reviewer_id
         closed_state_id = get_case_state_by_name('Closed').state_id
 
@@ -171,8 +185,16 @@ def update(case_identifier, request_data):
 
         case = _load(request_data, instance=case_i, partial=True)
 
+        # Access granted through the customer of the case changes with it
+        client_changed = previous_client_id != case.client_id
+        if client_changed:
+            ac_recompute_case_customers_effective_ac(case.case_id, [previous_client_id, case.client_id])
+
         db.session.commit()
 
+        if client_changed:
+            ac_bump_access_version()
+
         if previous_case_state != case.state_id:
             if case.state_id == closed_state_id:
                 track_activity('case closed', caseid=case_identifier)
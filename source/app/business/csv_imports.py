@@ -0,0 +1,142 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import csv
+import os
+import time
+import uuid
+
+from app import app
+from app.business.assets import ASSET_CSV_ERRORS_FIELDS
+from app.business.assets import import_csv_assets
+from app.business.events import import_csv_events
+from app.business.iocs import IOC_CSV_ERRORS_FIELDS
+from app.business.iocs import import_csv_iocs
+
+_ERRORS_SUFFIX = '-errors.csv'
+
+
+class CsvImport:
+    """
+    Kind of CSV file imported in a case, by the request or by task_import_csv for the large files.
+
+    The files of the imports are kept in a directory of the uploads folder shared with the workers: the uploaded
+    files, removed once imported, and the reports of the rows rejected by the background imports, removed once
+    expired. The import function is called with the path of the file, the case ID, the import options and a progress
+    callback. It returns the number of objects imported and the list of the errors as dict of errors_fields.
+    """
+    def __init__(self, name, directory, import_function, objects_name, errors_fields=None):
+        self.name = name
+        self.directory = directory
+        self.import_function = import_function
+        self.objects_name = objects_name
+        self.errors_fields = errors_fields or []
+
+    def get_directory_path(self):
+        import_dir = os.path.join(app.config['UPLOADED_PATH'], self.directory)
+        os.makedirs(import_dir, exist_ok=True)
+
+        return import_dir
+
+    def create_file_path(self):
+        """
+        Returns the path of a new CSV file to import
+        """
+        return os.path.join(self.get_directory_path(), f'{uuid.uuid4()}.csv')
+
+    def save_file(self, csv_data):
+        """
+        Writes a CSV content to a new file to import, and returns its path
+        """
+        csv_path = self.create_file_path()
+        with open(csv_path, 'w', newline='', encoding='utf-8') as fout:
+            fout.write(csv_data)
+
+        return csv_path
+
+    def import_file(self, csv_path, case_identifier, csv_options=None, progress_callback=None):
+        return self.import_function(csv_path, case_identifier, csv_options, progress_callback)
+
+    def get_errors_path(self, task_id):
+        """
+        Returns the path of the errors report of a background import
+        """
+        return os.path.join(self.get_directory_path(), f'{uuid.UUID(task_id)}{_ERRORS_SUFFIX}')
+
+    def write_errors(self, errors, file_path):
+        """
+        Writes the errors of an import as a CSV file, one rejected row per line
+        """
+        with open(file_path, 'w', newline='', encoding='utf-8') as fout:
+            writer = csv.DictWriter(fout, fieldnames=self.errors_fields)
+            writer.writeheader()
+            writer.writerows(errors)
+
+
+def _import_iocs_file(csv_path, case_identifier, csv_options, progress_callback):
+    with open(csv_path, newline='', encoding='utf-8') as csv_file:
+        imported, errors = import_csv_iocs(csv_file, case_identifier, progress_callback=progress_callback)
+
+    return len(imported), errors
+
+
+def _import_assets_file(csv_path, case_identifier, csv_options, progress_callback):
+    with open(csv_path, newline='', encoding='utf-8') as csv_file:
+        imported, errors = import_csv_assets(csv_file, case_identifier, progress_callback=progress_callback)
+
+    return len(imported), errors
+
+
+def _import_events_file(csv_path, case_identifier, csv_options, progress_callback):
+    # The events are imported at once, an invalid row stops the import
+    return import_csv_events(csv_path, case_identifier, csv_options, progress_callback=progress_callback), []
+
+
+IOCS_CSV_IMPORT = CsvImport('iocs', 'ioc_imports', _import_iocs_file, 'IOCs', IOC_CSV_ERRORS_FIELDS)
+ASSETS_CSV_IMPORT = CsvImport('assets', 'asset_imports', _import_assets_file, 'assets', ASSET_CSV_ERRORS_FIELDS)
+TIMELINE_CSV_IMPORT = CsvImport('timeline', 'timeline_imports', _import_events_file, 'events')
+
+_CSV_IMPORTS = {csv_import.name: csv_import for csv_import in [IOCS_CSV_IMPORT, ASSETS_CSV_IMPORT,
+                                                                TIMELINE_CSV_IMPORT]}
+
+
+def get_csv_import(name):
+    """
+    Returns the CsvImport of a name, or None if unknown
+    """
+    return _CSV_IMPORTS.get(name)
+
+
+def delete_expired_csv_imports_errors():
+    """
+    Deletes the errors reports of the background CSV imports older than CSV_IMPORT_ERRORS_EXPIRATION hours
+
+    returns:
+        number of reports deleted
+    """
+    expiration = time.time() - app.config.get('CSV_IMPORT_ERRORS_EXPIRATION') * 3600
+    deleted = 0
+
+    for csv_import in _CSV_IMPORTS.values():
+        with os.scandir(csv_import.get_directory_path()) as entries:
+            for entry in entries:
+                if entry.name.endswith(_ERRORS_SUFFIX) and entry.is_file() and entry.stat().st_mtime < expiration:
+                    os.remove(entry.path)
+                    deleted += 1
+
+    return deleted
@@ -0,0 +1,229 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import csv
+from datetime import datetime
+from flask_login import current_user
+from marshmallow import ValidationError
+
+from app import app
+from app import db
+from app.business.errors import BusinessProcessingError
+from app.datamgmt.case.case_events_db import add_events_batch
+from app.datamgmt.case.case_events_db import get_case_assets_ids_by_names
+from app.datamgmt.case.case_events_db import get_case_iocs_ids_by_values
+from app.datamgmt.case.case_events_db import get_default_category
+from app.datamgmt.case.case_events_db import get_events_categories_ids_by_names
+from app.datamgmt.states import update_timeline_state
+from app.iris_engine.module_handler.module_handler import call_modules_hook
+from app.iris_engine.utils.tracker import track_activity
+from app.models.cases import CasesEvent
+from app.schema.marshables import EventSchema
+
+TIMELINE_CSV_FIELDS = [
+    "event_date",
+    "event_tz",
+    "event_title",
+    "event_category",
+    "event_content",
+    "event_raw",
+    "event_source",
+    "event_assets",
+    "event_iocs",
+    "event_tags"
+]
+
+_CSV_IMPORT_CHUNK_SIZE = 5000
+
+
+def _data_error(message, line):
+    return BusinessProcessingError('Data error', data={"Error": f"{message}.\nrow number: {line}"})
+
+
+def _split_names(value, separator):
+    return [name for name in (value or '').split(separator) if name != '']
+
+
+def _open_csv(csv_path):
+    return open(csv_path, newline='', encoding='utf-8')
+
+
+def _check_csv_events(csv_path):
+    """
+    First pass over the file: checks the fields mapping and the rows, and collects the referenced names with
+    the first line referencing them.
+    """
+    assets_names = {}
+    iocs_values = {}
+    categories_names = {}
+
+    with _open_csv(csv_path) as csv_file:
+        reader = csv.DictReader(csv_file, delimiter=',')
+        csv_fields = reader.fieldnames or []
+
+        missing_fields = [field for field in TIMELINE_CSV_FIELDS if field not in csv_fields]
+        if missing_fields:
+            msg = f"Bad SCV Fields Mapping. Fields missing: [{','.join(missing_fields)}]"
+            data = {"error_code": "BAD_FIELDS_MAPPING", "expected": ','.join(TIMELINE_CSV_FIELDS),
+                    "found": ','.join(csv_fields), "missing": ','.join(missing_fields)}
+            app.logger.warning(data)
+            raise BusinessProcessingError(msg, data=data)
+
+        line = 0
+        for line, row in enumerate(reader, start=1):
+            if not row.get('event_title'):
+                raise _data_error('Event Title can not be empty', line)
+
+            for asset_name in _split_names(row.get('event_assets'), ';'):
+                assets_names.setdefault(asset_name, line)
+
+            for ioc_value in _split_names(row.get('event_iocs'), '|'):
+                iocs_values.setdefault(ioc_value, line)
+
+            if row.get('event_category'):
+                categories_names.setdefault(row.get('event_category'), line)
+
+    return line, assets_names, iocs_values, categories_names
+
+
+def _resolve_names(names, resolver, error_label):
+    resolved = resolver(names.keys())
+
+    unknown_names = [(line, name) for name, line in names.items() if name not in resolved]
+    if unknown_names:
+        line, name = min(unknown_names)
+        raise _data_error(f"{error_label} not recognized : {name}", line)
+
+    return resolved
+
+
+def _insert_events_chunk(events, caseid, sync_iocs_assets):
+    if not events:
+        return []
+
+    events = call_modules_hook('on_preload_event_create', data=events, caseid=caseid)
+
+    return add_events_batch(events, caseid, sync_iocs_assets=sync_iocs_assets)
+
+
+def import_csv_events(csv_path, case_identifier, csv_options, progress_callback=None):
+    """
+    Imports the events of a timeline CSV file in a case.
+
+    The file is read twice without being loaded in memory: a first pass checks the rows and collects the assets,
+    IOCs and categories names, which are then resolved with a single query each. The second pass inserts the events
+    and their links by chunks. The whole import is committed at once, then followed by a single timeline state
+    update and activity.
+
+    args:
+        csv_path: path of the CSV file
+        case_identifier: ID of the case
+        csv_options: dict of the import options (event_sync_iocs_assets, event_in_summary, event_in_graph,
+                     event_source)
+        progress_callback: called with the number of events processed after each chunk
+
+    returns:
+        number of events imported
+    """
+    csv_options = csv_options or {}
+    sync_iocs_assets = bool(csv_options.get('event_sync_iocs_assets'))
+    event_in_summary = csv_options.get('event_in_summary') if csv_options.get('event_in_summary') else False
+    event_in_graph = csv_options.get('event_in_graph') if csv_options.get('event_in_graph') else True
+    event_source = csv_options.get('event_source') if csv_options.get('event_source') else ''
+
+    _, assets_names, iocs_values, categories_names = _check_csv_events(csv_path)
+
+    assets_map = _resolve_names(assets_names, lambda names: get_case_assets_ids_by_names(names, case_identifier),
+                                'Asset')
+    iocs_map = _resolve_names(iocs_values, lambda values: get_case_iocs_ids_by_values(values, case_identifier),
+                              'IoC')
+    categories_map = _resolve_names(categories_names, get_events_categories_ids_by_names, 'event_category')
+    default_category_id = get_default_category().id
+
+    event_schema = EventSchema()
+    history_entry = {
+        datetime.now().timestamp(): {
+            'user': current_user.user,
+            'user_id': current_user.id,
+            'action': 'created'
+        }
+    }
+
+    events_ids = []
+    try:
+        with _open_csv(csv_path) as csv_file:
+            chunk = []
+            for line, row in enumerate(csv.DictReader(csv_file, delimiter=','), start=1):
+                if len(row.get('event_title')) < 2:
+                    raise _data_error('Event Title must be at least 2 characters long', line)
+
+                try:
+                    event_date, event_date_wtz = event_schema.validate_date(row.get('event_date'),
+                                                                            row.get('event_tz'))
+                except ValidationError:
+                    raise _data_error('Invalid date time', line)
+
+                event_tags = row.get('event_tags')
+                chunk.append({
+                    'case_id': case_identifier,
+                    'user_id': current_user.id,
+                    'event_added': datetime.utcnow(),
+                    'event_title': row.get('event_title'),
+                    'event_content': row.get('event_content'),
+                    'event_raw': row.get('event_raw'),
+                    'event_source': event_source,
+                    'event_tags': ','.join(event_tags.split('|')) if event_tags else event_tags,
+                    'event_tz': row.get('event_tz'),
+                    'event_date': event_date,
+                    'event_date_wtz': event_date_wtz,
+                    'event_in_summary': event_in_summary,
+                    'event_in_graph': event_in_graph,
+                    'event_is_flagged': False,
+                    'modification_history': history_entry,
+                    'event_category_id': categories_map.get(row.get('event_category'), default_category_id),
+                    'event_assets': [assets_map[name] for name in _split_names(row.get('event_assets'), ';')],
+                    'event_iocs': [iocs_map[value] for value in _split_names(row.get('event_iocs'), '|')]
+                })
+
+                if len(chunk) >= _CSV_IMPORT_CHUNK_SIZE:
+                    events_ids.extend(_insert_events_chunk(chunk, case_identifier, sync_iocs_assets))
+                    chunk = []
+                    if progress_callback:
+                        progress_callback(len(events_ids))
+
+            events_ids.extend(_insert_events_chunk(chunk, case_identifier, sync_iocs_assets))
+
+        update_timeline_state(caseid=case_identifier)
+        db.session.commit()
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if progress_callback:
+        progress_callback(len(events_ids))
+
+    for i in range(0, len(events_ids), _CSV_IMPORT_CHUNK_SIZE):
+        events = CasesEvent.query.filter(
+            CasesEvent.event_id.in_(events_ids[i:i + _CSV_IMPORT_CHUNK_SIZE])
+        ).all()
+        call_modules_hook('on_postload_event_create', data=events, caseid=case_identifier)
+
+    track_activity(f"added {len(events_ids)} events from CSV file", caseid=case_identifier)
+
+    return len(events_ids)
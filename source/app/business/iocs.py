@@ -16,6 +16,7 @@
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
+import csv
 from flask_login import current_user
 from marshmallow.exceptions import ValidationError
 
@@ -24,9 +25,16 @@ from app.models import Ioc, IocLink
 from app.models.authorization import CaseAccessLevel
 from app.datamgmt.case.case_iocs_db import add_ioc
 from app.datamgmt.case.case_iocs_db import add_ioc_link
+from app.datamgmt.case.case_iocs_db import add_ioc_links_batch
+from app.datamgmt.case.case_iocs_db import add_iocs_batch
 from app.datamgmt.case.case_iocs_db import check_ioc_type_id
 from app.datamgmt.case.case_iocs_db import get_iocs_by_case
+from app.datamgmt.case.case_iocs_db import get_iocs_ids_by_values_types
+from app.datamgmt.case.case_iocs_db import get_tlps_dict
 from app.datamgmt.case.case_iocs_db import delete_ioc
+from app.datamgmt.manage.manage_attribute_db import get_default_custom_attributes
+from app.datamgmt.manage.manage_common import get_bulk_schema_context
+from app.datamgmt.manage.manage_tags_db import add_db_tags
 from app.datamgmt.states import update_ioc_state
 from app.schema.marshables import IocSchema
 from app.iris_engine.module_handler.module_handler import call_modules_hook
@@ -35,6 +43,23 @@ from app.business.errors import BusinessProcessingError
 from app.business.permissions import check_current_user_has_some_case_access_stricter
 from app.datamgmt.case.case_iocs_db import get_ioc
 
+IOC_CSV_FIELDS = [
+    "ioc_value",
+    "ioc_type",
+    "ioc_description",
+    "ioc_tags",
+    "ioc_tlp"
+]
+
+IOC_CSV_ERRORS_FIELDS = [
+    "row",
+    "ioc_value",
+    "ioc_type",
+    "error"
+]
+
+_CSV_IMPORT_CHUNK_SIZE = 5000
+
 
 def get_ioc_by_identifier(ioc_identifier):
 
@@ -184,3 +209,180 @@ def build_filter_case_ioc_query(ioc_id: int = None,
         return query.join(IocLink, Ioc.ioc_id == IocLink.ioc_id).filter(IocLink.case_id == linked_cases)
 
     return query
+
+
+def _import_error(line, row, error):
+    return {'row': line, 'ioc_value': row.get('ioc_value'), 'ioc_type': row.get('ioc_type'), 'error': error}
+
+
+def _read_csv_iocs(csv_lines, ioc_types, tlps, errors):
+    """
+    Reads the rows of an IOC CSV content, whose header line is optional, and resolves their type and TLP.
+    Yields the line number, the row read and the row ready to be loaded, the invalid rows being added to the errors.
+    """
+    reader = csv.DictReader(csv_lines, fieldnames=IOC_CSV_FIELDS, quotechar='"', delimiter=',')
+
+    for line, row in enumerate(reader, start=1):
+        if line == 1 and [(row.get(field) or '').lower() for field in IOC_CSV_FIELDS] == IOC_CSV_FIELDS:
+            continue
+
+        missing_fields = [field for field in IOC_CSV_FIELDS if row.get(field) is None]
+        if missing_fields:
+            errors.append(_import_error(line, row, f"{','.join(missing_fields)} missing"))
+            continue
+
+        if not row.get('ioc_value'):
+            errors.append(_import_error(line, row, 'empty IOC value'))
+            continue
+
+        type_id = ioc_types.get(row.get('ioc_type').lower())
+        if not type_id:
+            errors.append(_import_error(line, row, f"invalid ioc type: {row.get('ioc_type')}"))
+            continue
+
+        tlp_id = None
+        if row.get('ioc_tlp'):
+            tlp_id = tlps.get(row.get('ioc_tlp'))
+            if not tlp_id:
+                errors.append(_import_error(line, row, f"invalid TLP: {row.get('ioc_tlp')}"))
+                continue
+
+        yield line, row, {
+            'ioc_value': row.get('ioc_value'),
+            'ioc_type_id': type_id,
+            'ioc_description': row.get('ioc_description'),
+            'ioc_tags': row.get('ioc_tags').replace('|', ','),
+            'ioc_tlp_id': tlp_id
+        }
+
+
+def _import_iocs_chunk(chunk, case_identifier, ioc_schema, custom_attributes, file_iocs, errors):
+    """
+    Loads a chunk of rows, then creates the missing IOCs and links them to the case with one statement each.
+    Rows whose IOC is already linked to the case, or repeats an IOC of the file, are added to the errors. The IOCs
+    of the file are tracked across chunks in file_iocs, mapped to the line of their first row.
+
+    returns:
+        list of the rows imported, and the IDs of their IOCs
+    """
+    rows = call_modules_hook('on_preload_ioc_create', data=[row for _, _, row in chunk], caseid=case_identifier)
+
+    tag_titles = set()
+    for row in rows:
+        tag_titles.update((row.get('ioc_tags') or '').split(','))
+    add_db_tags(tag_titles)
+
+    iocs = {}
+    for (line, csv_row, _), row in zip(chunk, rows):
+        try:
+            ioc = ioc_schema.load(row)
+        except ValidationError as e:
+            errors.append(_import_error(line, csv_row, str(e.messages)))
+            continue
+
+        if ioc in db.session:
+            db.session.expunge(ioc)
+
+        key = (ioc.ioc_value, ioc.ioc_type_id)
+        if key in file_iocs:
+            errors.append(_import_error(line, csv_row, f'duplicate of row {file_iocs[key]} in the file'))
+            continue
+
+        file_iocs[key] = line
+        iocs[key] = (line, csv_row, row, {
+            'ioc_value': ioc.ioc_value,
+            'ioc_type_id': ioc.ioc_type_id,
+            'ioc_description': ioc.ioc_description,
+            'ioc_tags': ioc.ioc_tags,
+            'ioc_tlp_id': ioc.ioc_tlp_id,
+            'user_id': current_user.id,
+            'custom_attributes': custom_attributes
+        })
+
+    iocs_ids = get_iocs_ids_by_values_types(iocs.keys())
+    new_keys = [key for key in iocs if key not in iocs_ids]
+    iocs_ids.update(zip(new_keys, add_iocs_batch([iocs[key][3] for key in new_keys])))
+
+    linked_iocs_ids = add_ioc_links_batch(iocs_ids.values(), case_identifier)
+
+    imported = []
+    for key, (line, csv_row, row, _) in iocs.items():
+        if iocs_ids[key] in linked_iocs_ids:
+            imported.append(row)
+        else:
+            errors.append(_import_error(line, csv_row, 'already exists and linked to this case'))
+
+    return imported, linked_iocs_ids
+
+
+def import_csv_iocs(csv_lines, case_identifier, progress_callback=None):
+    """
+    Imports the IOCs of a CSV content in a case.
+
+    The types, TLPs and default custom attributes are resolved once. The rows are then processed by chunks: the
+    existing IOCs of a chunk are found with a single query, the new ones are inserted at once and the links to the
+    case are inserted ignoring the ones which already exist. Each chunk is committed on its own along with the IOC
+    state, so an interrupted import keeps the chunks already processed. The activity is tracked once at the end.
+
+    Invalid rows do not stop the import, they are reported in the errors.
+
+    args:
+        csv_lines: iterable of the lines of the CSV content, such as an opened file
+        case_identifier: ID of the case
+        progress_callback: called with the number of rows processed after each chunk
+
+    returns:
+        tuple of the list of the rows imported, and the list of the errors as dict of IOC_CSV_ERRORS_FIELDS
+    """
+    context = get_bulk_schema_context()
+    # Tags are registered by chunks before the rows are loaded
+    context['tags_registered'] = True
+    ioc_schema = IocSchema(context=context)
+
+    ioc_types = {ioc_type.type_name: type_id for type_id, ioc_type in context['ioc_types'].items()}
+    custom_attributes = get_default_custom_attributes('ioc')
+
+    imported = []
+    errors = []
+    file_iocs = {}
+    processed = 0
+
+    def import_chunk(chunk):
+        chunk_imported, iocs_ids = _import_iocs_chunk(chunk, case_identifier, ioc_schema, custom_attributes,
+                                                      file_iocs, errors)
+        update_ioc_state(caseid=case_identifier)
+        db.session.commit()
+
+        if iocs_ids:
+            iocs = Ioc.query.filter(Ioc.ioc_id.in_(iocs_ids)).all()
+            call_modules_hook('on_postload_ioc_create', data=iocs, caseid=case_identifier)
+
+        imported.extend(chunk_imported)
+
+    try:
+        chunk = []
+        for line, csv_row, row in _read_csv_iocs(csv_lines, ioc_types, get_tlps_dict(), errors):
+            chunk.append((line, csv_row, row))
+            processed = line
+
+            if len(chunk) >= _CSV_IMPORT_CHUNK_SIZE:
+                import_chunk(chunk)
+                chunk = []
+                if progress_callback:
+                    progress_callback(processed)
+
+        if chunk:
+            import_chunk(chunk)
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if progress_callback:
+        progress_callback(processed)
+
+    track_activity(f"added {len(imported)} IOCs from CSV file", caseid=case_identifier)
+    errors.sort(key=lambda error: error['row'])
+
+    return imported, errors
+
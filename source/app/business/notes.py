@@ -22,7 +22,12 @@ from marshmallow import ValidationError
 from app import db, app
 from app.business.errors import BusinessProcessingError, UnhandledBusinessError
 from app.business.permissions import check_current_user_has_some_case_access_stricter
+from app.datamgmt.case.case_note_revisions_db import add_note_revision
+from app.datamgmt.case.case_note_revisions_db import delete_note_revision as delete_note_revision_db
+from app.datamgmt.case.case_note_revisions_db import get_latest_note_revision
+from app.datamgmt.case.case_note_revisions_db import get_note_revision_content
 from app.datamgmt.case.case_notes_db import get_note
+from app.datamgmt.states import update_notes_state
 from app.iris_engine.module_handler.module_handler import call_modules_hook
 from app.iris_engine.utils.tracker import track_activity
 from app.models import NoteRevisions
@@ -63,15 +68,8 @@ def create(request_json, case_identifier):
         db.session.add(note)
         db.session.flush()
 
-        note_revision = NoteRevisions(
-            note_id=note.note_id,
-            revision_number=1,
-            note_title=note.note_title,
-            note_content=note.note_content,
-            note_user=note.note_user,
-            revision_timestamp=datetime.utcnow()
-        )
-        db.session.add(note_revision)
+        add_note_revision(note.note_id, 1, note.note_title, note.note_content, note.note_user)
+        update_notes_state(caseid=case_identifier)
 
         add_obj_history_entry(note, 'created note', commit=True)
         note = call_modules_hook('on_postload_note_create', data=note, caseid=case_identifier)
@@ -100,43 +98,32 @@ def update(identifier: int = None, request_json: dict = None, case_identifier: i
     try:
         addnote_schema = CaseNoteSchema()
 
-        note = get_note(identifier, caseid=case_identifier)
+        # The note stays locked until its revision and its new content are committed, so concurrent updates get
+        # distinct revision numbers
+        note = get_note(identifier, caseid=case_identifier, for_update=True)
         if not note:
             raise BusinessProcessingError("Invalid note ID for this case")
 
         request_data = call_modules_hook('on_preload_note_update', data=request_json, caseid=case_identifier)
 
-        latest_version = db.session.query(
-            NoteRevisions
-        ).filter_by(
-            note_id=identifier
-        ).order_by(
-            NoteRevisions.revision_number.desc()
-        ).first()
-        revision_number = 1 if latest_version is None else latest_version.revision_number + 1
+        latest_version = get_latest_note_revision(identifier)
+        revision_number = 1 if latest_version is None else latest_version['revision_number'] + 1
         no_changes = False
 
         if revision_number > 1:
-            if latest_version.note_title == request_data.get('note_title') and latest_version.note_content == request_data.get('note_content'):
+            if latest_version['note_title'] == request_data.get('note_title') and latest_version['note_content'] == request_data.get('note_content'):
                 no_changes = True
                 app.logger.debug(f"Note {identifier} has not changed, skipping versioning")
 
         if not no_changes:
-            note_version = NoteRevisions(
-                note_id=note.note_id,
-                revision_number=revision_number,
-                note_title=note.note_title,
-                note_content=note.note_content,
-                note_user=current_user.id,
-                revision_timestamp=datetime.utcnow()
-            )
-            db.session.add(note_version)
-            db.session.commit()
+            add_note_revision(note.note_id, revision_number, note.note_title, note.note_content, current_user.id,
+                              previous_revision=latest_version)
 
         request_data['note_id'] = identifier
         addnote_schema.load(request_data, partial=True, instance=note)
         note.update_date = datetime.utcnow()
         note.user_id = current_user.id
+        update_notes_state(caseid=case_identifier)
 
         add_obj_history_entry(note, 'updated note', commit=True)
         note = call_modules_hook('on_postload_note_update', data=note, caseid=case_identifier)
@@ -202,10 +189,7 @@ def get_note_revision(identifier: int = None, revision_number: int = None, case_
         if not note:
             raise BusinessProcessingError("Invalid note ID for this case")
 
-        note_revision = NoteRevisions.query.filter(
-            NoteRevisions.note_id == identifier,
-            NoteRevisions.revision_number == revision_number
-        ).first()
+        note_revision = get_note_revision_content(identifier, revision_number)
 
         return note_revision
 
@@ -231,17 +215,9 @@ def delete_note_revision(identifier: int = None, revision_number: int = None, ca
         if not note:
             raise BusinessProcessingError("Invalid note ID for this case")
 
-        note_revision = NoteRevisions.query.filter(
-            NoteRevisions.note_id == identifier,
-            NoteRevisions.revision_number == revision_number
-        ).first()
-
-        if not note_revision:
+        if not delete_note_revision_db(identifier, revision_number):
             raise BusinessProcessingError("Invalid note revision number")
 
-        db.session.delete(note_revision)
-        db.session.commit()
-
         track_activity(f"deleted note revision {revision_number} of note \"{note.note_title}\"", caseid=case_identifier)
 
     except ValidationError as e:
@@ -0,0 +1,131 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import base64
+import os
+import shutil
+import tempfile
+from flask_login import current_user
+
+from app.business.errors import BusinessProcessingError
+from app.datamgmt.case.case_db import get_case
+from app.iris_engine.module_handler.module_handler import call_modules_hook
+from app.iris_engine.reporter.report_cache import get_cached_report
+from app.iris_engine.reporter.report_cache import get_report_slot
+from app.iris_engine.reporter.report_cache import get_report_version
+from app.iris_engine.reporter.report_cache import store_report
+from app.iris_engine.reporter.reporter import IrisMakeDocReport
+from app.iris_engine.reporter.reporter import IrisMakeMdReport
+from app.iris_engine.utils.tracker import track_activity
+from app.models import CaseTemplateReport
+
+REPORT_TYPES = ['Investigation', 'Activities']
+
+
+def _render_report(report, report_format, case_identifier, doc_type, safe_mode, tmp_dir):
+    if report_format == ".docx":
+        mreport = IrisMakeDocReport(tmp_dir, report.id, case_identifier, safe_mode)
+        return mreport.generate_doc_report(doc_type=doc_type)
+
+    mreport = IrisMakeMdReport(tmp_dir, report.id, case_identifier, safe_mode)
+    return mreport.generate_md_report(doc_type=doc_type)
+
+
+def _call_postload_hook(report_id, fpath, case_identifier, doc_type):
+    if doc_type == 'Activities':
+        call_modules_hook('on_postload_activities_report_create', data=report_id, caseid=case_identifier)
+        return
+
+    with open(fpath, 'rb') as rfile:
+        encoded_file = base64.b64encode(rfile.read()).decode('utf-8')
+
+    case = get_case(case_identifier)
+    call_modules_hook('on_postload_report_create', data={
+        'report_id': report_id,
+        'file_path': fpath,
+        'case_id': case.case_id,
+        'user_name': case.user.name,
+        'file': encoded_file
+    }, caseid=case_identifier)
+
+
+def generate_report(case_identifier, report_id, doc_type, safe_mode=False, progress_callback=None):
+    """
+    Generates a report of a case from a template.
+
+    Renderings are cached by case, template, options, user and version of the case content, so that generating the
+    report of an unchanged case again on the same day returns the previous rendering.
+
+    args:
+        case_identifier: ID of the case
+        report_id: ID of the report template
+        doc_type: Investigation or Activities
+        safe_mode: True to generate the report without the images
+        progress_callback: called with the name of each generation step
+
+    returns:
+        tuple (path of the rendered report, True if it was found in the cache)
+    """
+    if doc_type not in REPORT_TYPES:
+        raise BusinessProcessingError('Unknown report type')
+
+    preload_hook = 'on_preload_report_create' if doc_type == 'Investigation' else 'on_preload_activities_report_create'
+    call_modules_hook(preload_hook, data=report_id, caseid=case_identifier)
+
+    report = CaseTemplateReport.query.filter(CaseTemplateReport.id == report_id).first()
+    if not report:
+        raise BusinessProcessingError('Unknown report')
+
+    _, report_format = os.path.splitext(report.internal_reference)
+    if report_format not in ['.docx', '.md', '.html']:
+        raise BusinessProcessingError('Report error', data='Unknown report format.')
+
+    if progress_callback:
+        progress_callback('checking_cache')
+
+    slot = get_report_slot(report_id, doc_type, safe_mode, current_user.id)
+    version = get_report_version(case_identifier, report, doc_type)
+    if version is None:
+        raise BusinessProcessingError('Invalid case number')
+
+    fpath = get_cached_report(case_identifier, slot, version)
+    cached = fpath is not None
+
+    if not cached:
+        if progress_callback:
+            progress_callback('rendering')
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            fpath, logs = _render_report(report, report_format, case_identifier, doc_type, safe_mode, tmp_dir)
+            if fpath is None:
+                track_activity("failed to generate the report")
+                raise BusinessProcessingError('Failed to generate the report', data=logs)
+
+            fpath = store_report(case_identifier, slot, version, fpath)
+            if fpath is None:
+                # A newer version of the case was stored meanwhile
+                raise BusinessProcessingError('The case was updated during the generation, please try again')
+
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    _call_postload_hook(report_id, fpath, case_identifier, doc_type)
+    track_activity("generated a report")
+
+    return fpath, cached
@@ -351,6 +351,27 @@ class Config:
 
     UPDATE_DIR_NAME = '_updates_'
 
+    ALERTS_SIMILARITY_RETENTION_DAYS = int(config.load('IRIS', 'ALERTS_SIMILARITY_RETENTION_DAYS', fallback=365))
+
+    ACCESS_CONTROL_CACHE_TIMEOUT = int(config.load('IRIS', 'ACCESS_CONTROL_CACHE_TIMEOUT', fallback=0))
+
+    API_KEY_CACHE_TIMEOUT = int(config.load('IRIS', 'API_KEY_CACHE_TIMEOUT', fallback=60))
+    API_KEY_CACHE_SIZE = int(config.load('IRIS', 'API_KEY_CACHE_SIZE', fallback=1024))
+
+    TIMELINE_CSV_IMPORT_ASYNC_LINES = int(config.load('IRIS', 'TIMELINE_CSV_IMPORT_ASYNC_LINES', fallback=100000))
+    MODULES_HOOKS_CACHE_TIMEOUT = int(config.load('IRIS', 'MODULES_HOOKS_CACHE_TIMEOUT', fallback=10))
+    AC_RECOMPUTE_BATCH_SIZE = int(config.load('IRIS', 'AC_RECOMPUTE_BATCH_SIZE', fallback=200))
+    AC_RECOMPUTE_ASYNC_USERS = int(config.load('IRIS', 'AC_RECOMPUTE_ASYNC_USERS', fallback=200))
+    SEARCH_FULLTEXT_ENABLED = config.load('IRIS', 'SEARCH_FULLTEXT_ENABLED', fallback='True') == 'True'
+    NOTE_REVISIONS_SNAPSHOT_INTERVAL = int(config.load('IRIS', 'NOTE_REVISIONS_SNAPSHOT_INTERVAL', fallback=20))
+    DATASTORE_TREE_LAZY_FILES = int(config.load('IRIS', 'DATASTORE_TREE_LAZY_FILES', fallback=1000))
+    DATASTORE_CHUNKED_UPLOADS_EXPIRATION = int(config.load('IRIS', 'DATASTORE_CHUNKED_UPLOADS_EXPIRATION',
+                                                           fallback=24))
+    DATASTORE_X_ACCEL_REDIRECT_PREFIX = config.load('IRIS', 'DATASTORE_X_ACCEL_REDIRECT_PREFIX', fallback='')
+    IOC_CSV_IMPORT_ASYNC_LINES = int(config.load('IRIS', 'IOC_CSV_IMPORT_ASYNC_LINES', fallback=10000))
+    ASSET_CSV_IMPORT_ASYNC_LINES = int(config.load('IRIS', 'ASSET_CSV_IMPORT_ASYNC_LINES', fallback=10000))
+    CSV_IMPORT_ERRORS_EXPIRATION = int(config.load('IRIS', 'CSV_IMPORT_ERRORS_EXPIRATION', fallback=24))
+
     DROPZONE_MAX_FILE_SIZE = 1024 * 1024 * 1024 * 10  # 10 GB
 
     DROPZONE_TIMEOUT = 15 * 60 * 10000  # 15 Minutes of uploads per file
@@ -17,24 +17,33 @@
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 from copy import deepcopy
 
+import base64
+import binascii
+import hashlib
 import json
+import re
 from datetime import datetime, timedelta
 from flask_login import current_user
 from functools import reduce
-from sqlalchemy import desc, asc, func, tuple_, or_, not_, and_
-from sqlalchemy.orm import aliased, make_transient, selectinload
+from sqlalchemy import desc, asc, func, tuple_, or_, not_, and_, insert
+from sqlalchemy import JSON, cast, literal, literal_column, update, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import aliased, make_transient, selectinload, lazyload
 from typing import List, Tuple, Dict
 
 import app
+from app import cache
 from app import db
 from app.datamgmt.case.case_assets_db import create_asset, set_ioc_links, get_unspecified_analysis_status_id
-from app.datamgmt.case.case_events_db import update_event_assets, update_event_iocs
+from app.datamgmt.case.case_assets_db import add_assets_batch, add_ioc_asset_links_batch, move_assets_to_case
+from app.datamgmt.case.case_events_db import update_event_assets, update_event_iocs, add_events_batch
 from app.datamgmt.case.case_iocs_db import add_ioc, add_ioc_link
+from app.datamgmt.case.case_iocs_db import add_ioc_links_batch, get_iocs_ids_by_values_types
 from app.datamgmt.manage.manage_access_control_db import get_user_clients_id
 from app.datamgmt.manage.manage_case_state_db import get_case_state_by_name
 from app.datamgmt.manage.manage_case_templates_db import get_case_template_by_id, \
     case_template_post_modifier
-from app.datamgmt.states import update_timeline_state
+from app.datamgmt.states import update_assets_state, update_ioc_state, update_timeline_state
 from app.iris_engine.access_control.utils import ac_current_user_has_permission
 from app.iris_engine.utils.common import parse_bf_date_format
 from app.models import Cases, EventCategory, Tags, AssetsType, Comments, CaseAssets, alert_assets_association, \
@@ -69,6 +78,12 @@ RESTRICTED_USER_FIELDS = {
     'is_service_account'
 }
 
+ALERTS_COUNT_CACHE_TIMEOUT = 60
+
+ALERTS_AGGREGATIONS_CACHE_TIMEOUT = 30
+
+ALERTS_AGGREGATION_TIME_BUCKETS = ['hour', 'day', 'week', 'month']
+
 
 def db_list_all_alerts():
     """
@@ -125,7 +140,138 @@ def combine_conditions(conditions, logical_operator):
         return None
 
 
-def get_filtered_alerts(
+def encode_alert_cursor(event_time: datetime, alert_id: int, direction: str = 'next') -> str:
+    """
+    Build an opaque pagination cursor pointing to an alert
+
+    args:
+        event_time (datetime): The source event time of the alert
+        alert_id (int): The ID of the alert
+        direction (str): The direction to browse from the alert, 'next' or 'prev'
+
+    returns:
+        str: The url-safe cursor
+    """
+    payload = json.dumps({
+        't': event_time.isoformat() if event_time else None,
+        'i': alert_id,
+        'd': direction
+    }, separators=(',', ':'))
+
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_alert_cursor(cursor: str) -> Tuple[datetime, int, str]:
+    """
+    Decode a cursor built by encode_alert_cursor
+
+    args:
+        cursor (str): The opaque cursor
+
+    returns:
+        tuple: The source event time, the alert ID and the direction
+
+    raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        event_time = datetime.fromisoformat(payload['t'])
+        alert_id = int(payload['i'])
+        direction = payload.get('d', 'next')
+
+    except (binascii.Error, UnicodeError, TypeError, KeyError, ValueError):
+        raise ValueError('Invalid cursor')
+
+    if direction not in ['next', 'prev']:
+        raise ValueError('Invalid cursor')
+
+    return event_time, alert_id, direction
+
+
+def get_alerts_filter_hash(filters: dict) -> str:
+    """
+    Compute a stable hash of a set of alert filters, used as a cache key
+
+    args:
+        filters (dict): The filter arguments
+
+    returns:
+        str: The hex digest of the filters
+    """
+    serialized = json.dumps(filters, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+def _count_filtered_alerts(query, filters_hash: str, use_cache: bool) -> int:
+    """
+    Count the alerts matched by a query. When use_cache is set, the total is kept
+    for ALERTS_COUNT_CACHE_TIMEOUT seconds so that browsing pages does not recount.
+    """
+    cache_key = f'alerts_count_{filters_hash}'
+    if use_cache:
+        total = cache.get(cache_key)
+        if total is not None:
+            return total
+
+    sub_query = query.options(lazyload('*')).order_by(None).subquery()
+    total = db.session.query(func.count()).select_from(sub_query).scalar()
+
+    if use_cache:
+        cache.set(cache_key, total, timeout=ALERTS_COUNT_CACHE_TIMEOUT)
+
+    return total
+
+
+def _get_alerts_keyset_page(query, per_page: int, sort: str, cursor: str = None) -> dict:
+    """
+    Fetch a page of alerts after or before a cursor, ordered on (alert_source_event_time, alert_id).
+    Each page costs an index range scan regardless of its depth.
+    """
+    sort_key = tuple_(Alert.alert_source_event_time, Alert.alert_id)
+    direction = 'next'
+
+    if cursor:
+        event_time, alert_id, direction = decode_alert_cursor(cursor)
+        cursor_key = tuple_(event_time, alert_id)
+
+        # Browsing backwards on a descending sort means fetching greater keys, and the other way around
+        if (sort == 'desc') == (direction == 'next'):
+            query = query.filter(sort_key < cursor_key)
+        else:
+            query = query.filter(sort_key > cursor_key)
+
+    order_func = desc if (sort == 'desc') == (direction == 'next') else asc
+    alerts = query.order_by(
+        order_func(Alert.alert_source_event_time),
+        order_func(Alert.alert_id)
+    ).limit(per_page + 1).all()
+
+    has_more = len(alerts) > per_page
+    alerts = alerts[:per_page]
+
+    if direction == 'prev':
+        alerts.reverse()
+
+    next_cursor = None
+    prev_cursor = None
+    if alerts:
+        first, last = alerts[0], alerts[-1]
+        if has_more or direction == 'prev':
+            next_cursor = encode_alert_cursor(last.alert_source_event_time, last.alert_id, 'next')
+        if cursor and (has_more or direction == 'next'):
+            prev_cursor = encode_alert_cursor(first.alert_source_event_time, first.alert_id, 'prev')
+
+    return {
+        'alerts': alerts,
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor
+    }
+
+
+def _filter_alerts_query(
+        query,
         start_date: str = None,
         end_date: str = None,
         source_start_date: str = None,
@@ -144,25 +290,16 @@ def get_filtered_alerts(
         assets: List[str] = None,
         iocs: List[str] = None,
         resolution_status: List[int] = None,
-        logical_operator: str = 'and',  # Logical operator: 'and', 'or', 'not'
-        page: int = 1,
-        per_page: int = 10,
-        sort: str = 'desc',
+        logical_operator: str = 'and',
         current_user_id: int = None,
         source_reference=None,
-        custom_conditions: List[dict] = None,
-        fields: List[str] = None):
+        custom_conditions: List[dict] = None):
     """
-    Get a list of alerts that match the given filter conditions
-
-    args:
-        start_date (datetime): The start date of the alert creation time
-        end_date (datetime): The end date of the alert creation time
-        ...
-        fields (List[str]): The list of fields to include in the output
+    Apply the filter conditions of get_filtered_alerts to a query on alerts. The custom conditions on related
+    fields join their relationships, so the query may return an alert several times.
 
     returns:
-        dict: Dictionary with pagination info and list of serialized alerts
+        The filtered query, or None if the custom conditions cannot be parsed
     """
     conditions = []
 
@@ -237,17 +374,6 @@ def get_filtered_alerts(
         if clients_filters is not None:
             conditions.append(Alert.alert_customer_id.in_(clients_filters))
 
-    query = db.session.query(
-        Alert
-    ).options(
-        selectinload(Alert.severity),
-        selectinload(Alert.status),
-        selectinload(Alert.customer),
-        selectinload(Alert.cases),
-        selectinload(Alert.iocs),
-        selectinload(Alert.assets)
-    )
-
     # Apply custom conditions if provided
     if custom_conditions:
         if isinstance(custom_conditions, str):
@@ -305,6 +431,84 @@ def get_filtered_alerts(
         # Combine conditions
     combined_conditions = combine_conditions(conditions, logical_operator)
 
+    if combined_conditions is not None:
+        query = query.filter(combined_conditions)
+
+    return query
+
+
+def get_filtered_alerts(
+        start_date: str = None,
+        end_date: str = None,
+        source_start_date: str = None,
+        source_end_date: str = None,
+        title: str = None,
+        description: str = None,
+        status: int = None,
+        severity: int = None,
+        owner: int = None,
+        source: str = None,
+        tags: str = None,
+        case_id: int = None,
+        client: int = None,
+        classification: int = None,
+        alert_ids: List[int] = None,
+        assets: List[str] = None,
+        iocs: List[str] = None,
+        resolution_status: List[int] = None,
+        logical_operator: str = 'and',  # Logical operator: 'and', 'or', 'not'
+        page: int = 1,
+        per_page: int = 10,
+        sort: str = 'desc',
+        current_user_id: int = None,
+        source_reference=None,
+        custom_conditions: List[dict] = None,
+        fields: List[str] = None,
+        use_cursor: bool = False,
+        cursor: str = None,
+        count_mode: str = 'exact'):
+    """
+    Get a list of alerts that match the given filter conditions
+
+    args:
+        start_date (datetime): The start date of the alert creation time
+        end_date (datetime): The end date of the alert creation time
+        ...
+        fields (List[str]): The list of fields to include in the output
+        use_cursor (bool): Use keyset pagination on (alert_source_event_time, alert_id) instead of page numbers
+        cursor (str): The opaque cursor returned by a previous call, implies use_cursor
+        count_mode (str): How to compute the total, 'exact', 'cached' (cached per filter) or 'none'
+
+    returns:
+        dict: Dictionary with pagination info and list of serialized alerts
+    """
+    filters = {
+        'start_date': start_date, 'end_date': end_date,
+        'source_start_date': source_start_date, 'source_end_date': source_end_date,
+        'title': title, 'description': description, 'status': status, 'severity': severity,
+        'owner': owner, 'source': source, 'tags': tags, 'case_id': case_id, 'client': client,
+        'classification': classification, 'alert_ids': alert_ids, 'assets': assets, 'iocs': iocs,
+        'resolution_status': resolution_status, 'logical_operator': logical_operator,
+        'current_user_id': current_user_id, 'source_reference': source_reference,
+        'custom_conditions': custom_conditions
+    }
+    filters_hash = get_alerts_filter_hash(filters)
+
+    query = db.session.query(
+        Alert
+    ).options(
+        selectinload(Alert.severity),
+        selectinload(Alert.status),
+        selectinload(Alert.customer),
+        selectinload(Alert.cases),
+        selectinload(Alert.iocs),
+        selectinload(Alert.assets)
+    )
+
+    query = _filter_alerts_query(query, **filters)
+    if query is None:
+        return
+
     order_func = desc if sort == "desc" else asc
 
     # If fields are provided, use them in the schema
@@ -318,21 +522,50 @@ def get_filtered_alerts(
         alert_schema = AlertSchema()
 
     try:
-        # Query the alerts using the filter conditions
+        if use_cursor or cursor:
+            alerts_page = _get_alerts_keyset_page(query, per_page=per_page, sort=sort, cursor=cursor)
+
+            total = None
+            if count_mode != 'none':
+                total = _count_filtered_alerts(query, filters_hash, use_cache=count_mode == 'cached')
 
-        if combined_conditions is not None:
-            query = query.filter(combined_conditions)
+            return {
+                'total': total,
+                'alerts': alert_schema.dump(alerts_page['alerts'], many=True),
+                'per_page': per_page,
+                'next_cursor': alerts_page['next_cursor'],
+                'prev_cursor': alerts_page['prev_cursor']
+            }
 
         filtered_alerts = query.order_by(
-            order_func(Alert.alert_source_event_time)
-        ).paginate(page=page, per_page=per_page, error_out=False)
+            order_func(Alert.alert_source_event_time),
+            order_func(Alert.alert_id)
+        ).paginate(page=page, per_page=per_page, error_out=False,
+                   count=count_mode == 'exact')
+
+        if count_mode == 'exact':
+            return {
+                'total': filtered_alerts.total,
+                'alerts': alert_schema.dump(filtered_alerts, many=True),
+                'last_page': filtered_alerts.pages,
+                'current_page': filtered_alerts.page,
+                'next_page': filtered_alerts.next_num if filtered_alerts.has_next else None,
+            }
+
+        total = None
+        last_page = None
+        has_next = len(filtered_alerts.items) == filtered_alerts.per_page
+        if count_mode == 'cached':
+            total = _count_filtered_alerts(query, filters_hash, use_cache=True)
+            last_page = max(1, -(-total // filtered_alerts.per_page))
+            has_next = filtered_alerts.page < last_page
 
         return {
-            'total': filtered_alerts.total,
+            'total': total,
             'alerts': alert_schema.dump(filtered_alerts, many=True),
-            'last_page': filtered_alerts.pages,
+            'last_page': last_page,
             'current_page': filtered_alerts.page,
-            'next_page': filtered_alerts.next_num if filtered_alerts.has_next else None,
+            'next_page': filtered_alerts.page + 1 if has_next else None,
         }
 
     except Exception as e:
@@ -340,6 +573,97 @@ def get_filtered_alerts(
         return None
 
 
+def _get_names_by_ids(id_column, name_column, ids) -> dict:
+    ids = [identifier for identifier in ids if identifier is not None]
+    if not ids:
+        return {}
+
+    return dict(db.session.query(id_column, name_column).filter(id_column.in_(ids)).all())
+
+
+def get_alerts_aggregations(filters: dict, time_bucket: str = 'day', use_cache: bool = True) -> dict:
+    """
+    Count the alerts matching a set of filters, grouped by status, severity, customer, source, owner and
+    creation time bucket.
+
+    The counts are computed with a single GROUP BY GROUPING SETS statement over the filtered alerts, so that no
+    alert is loaded nor serialized. The alerts are selected by ID, so the joins of the custom conditions do not
+    count an alert twice. The result is cached for ALERTS_AGGREGATIONS_CACHE_TIMEOUT seconds per filters.
+
+    args:
+        filters (dict): The filter arguments of get_filtered_alerts, including current_user_id
+        time_bucket (str): The truncation of the creation time, one of ALERTS_AGGREGATION_TIME_BUCKETS
+        use_cache (bool): Whether to return the cached result of the same filters
+
+    returns:
+        dict: The total and the list of counts of each grouping, or None if the filters cannot be parsed
+    """
+    if time_bucket not in ALERTS_AGGREGATION_TIME_BUCKETS:
+        raise ValueError(f"Invalid time bucket: {time_bucket}")
+
+    cache_key = f'alerts_aggregations_{get_alerts_filter_hash(dict(filters, time_bucket=time_bucket))}'
+    if use_cache:
+        aggregations = cache.get(cache_key)
+        if aggregations is not None:
+            return aggregations
+
+    alerts_query = _filter_alerts_query(db.session.query(Alert.alert_id), **filters)
+    if alerts_query is None:
+        return None
+
+    alerts_ids = alerts_query.order_by(None).subquery()
+
+    # The bucket is rendered inline so that the selected and grouped expressions are identical
+    bucket = func.date_trunc(literal_column(f"'{time_bucket}'"), Alert.alert_creation_time)
+    groupings = {
+        'status': Alert.alert_status_id,
+        'severity': Alert.alert_severity_id,
+        'customer': Alert.alert_customer_id,
+        'source': Alert.alert_source,
+        'owner': Alert.alert_owner_id,
+        'time': bucket
+    }
+
+    rows = db.session.execute(
+        select(*groupings.values(), *[func.grouping(column) for column in groupings.values()], func.count())
+        .where(Alert.alert_id.in_(select(alerts_ids.c.alert_id)))
+        .group_by(func.grouping_sets(*groupings.values()))
+    ).all()
+
+    counts = {name: {} for name in groupings}
+    for row in rows:
+        values, grouped, count = row[:len(groupings)], row[len(groupings):-1], row[-1]
+        for name, value, is_grouped in zip(groupings, values, grouped):
+            if is_grouped == 0:
+                counts[name][value] = count
+
+    statuses = _get_names_by_ids(AlertStatus.status_id, AlertStatus.status_name, counts['status'])
+    severities = _get_names_by_ids(Severity.severity_id, Severity.severity_name, counts['severity'])
+    customers = _get_names_by_ids(Client.client_id, Client.name, counts['customer'])
+    owners = _get_names_by_ids(User.id, User.name, counts['owner'])
+
+    def by_id(name, names):
+        return sorted([{'id': identifier, 'name': names.get(identifier), 'count': count}
+                       for identifier, count in counts[name].items()], key=lambda entry: -entry['count'])
+
+    aggregations = {
+        'total': sum(counts['status'].values()),
+        'time_bucket': time_bucket,
+        'status': by_id('status', statuses),
+        'severity': by_id('severity', severities),
+        'customer': by_id('customer', customers),
+        'owner': by_id('owner', owners),
+        'source': sorted([{'name': source, 'count': count} for source, count in counts['source'].items()],
+                         key=lambda entry: -entry['count']),
+        'time': [{'bucket': time.isoformat() if time else None, 'count': count}
+                 for time, count in sorted(counts['time'].items(), key=lambda item: (item[0] is None, item[0]))]
+    }
+
+    cache.set(cache_key, aggregations, timeout=ALERTS_AGGREGATIONS_CACHE_TIMEOUT)
+
+    return aggregations
+
+
 def add_alert(
         title,
         description,
@@ -378,6 +702,45 @@ def add_alert(
     return alert
 
 
+def create_alerts_batch(new_alerts: List[Alert], alerts_observables: List[Tuple[list, list]]) -> List[Alert]:
+    """
+    Add a batch of alerts, with their IOCs and assets, in a single transaction. Rows of each table
+    are grouped by the session into multi-rows INSERT statements when it is flushed.
+
+    args:
+        new_alerts (list): The alerts to add, with their IOCs and assets already attached
+        alerts_observables (list): For each alert, the raw IOCs and assets lists used to fill the similarity index
+
+    returns:
+        list: The alerts added to the database
+    """
+    creation_time = datetime.utcnow()
+    for alert in new_alerts:
+        alert.alert_creation_time = creation_time
+        add_obj_history_entry(alert, 'Alert created')
+
+    try:
+        db.session.add_all(new_alerts)
+        db.session.flush()
+
+        cache_similar_alerts([{
+            'customer_id': alert.alert_customer_id,
+            'alert_id': alert.alert_id,
+            'creation_date': alert.alert_source_event_time,
+            'title': alert.alert_title,
+            'iocs': iocs_list,
+            'assets': assets_list
+        } for alert, (iocs_list, assets_list) in zip(new_alerts, alerts_observables)], commit=False)
+
+        db.session.commit()
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return new_alerts
+
+
 def get_alert_by_id(alert_id: int) -> Alert:
     """
     Get an alert from the database
@@ -396,6 +759,87 @@ def get_alert_by_id(alert_id: int) -> Alert:
     )
 
 
+def get_alerts_by_ids(alert_ids: List[int], with_observables: bool = False) -> List[Alert]:
+    """
+    Get alerts from the database in a single query
+
+    args:
+        alert_ids (list): The IDs of the alerts
+        with_observables (bool): Whether to load the IOCs and assets of the alerts as well
+
+    returns:
+        list: The alerts found, ordered by ID
+    """
+    query = db.session.query(Alert).filter(Alert.alert_id.in_(alert_ids))
+    if with_observables:
+        query = query.options(selectinload(Alert.iocs), selectinload(Alert.assets))
+
+    return query.order_by(Alert.alert_id).all()
+
+
+def update_alerts_batch(alert_ids: List[int], values: dict, default_owner_id: int = None) -> None:
+    """
+    Update alerts with a single UPDATE statement. Expects a db commit soon after.
+
+    args:
+        alert_ids (list): The IDs of the alerts
+        values (dict): The new values of the columns
+        default_owner_id (int): The owner given to the alerts without one, unless the values set the owner
+
+    returns:
+        None
+    """
+    values = dict(values)
+    if default_owner_id is not None and 'alert_owner_id' not in values:
+        values['alert_owner_id'] = func.coalesce(Alert.alert_owner_id, default_owner_id)
+
+    if not values:
+        return
+
+    db.session.execute(
+        update(Alert).where(
+            Alert.alert_id.in_(alert_ids)
+        ).values(
+            **values
+        ).execution_options(synchronize_session=False)
+    )
+
+
+def add_alerts_history_entry(alert_ids: List[int], action: str) -> None:
+    """
+    Append the same entry to the modification history of alerts with a single UPDATE statement, as
+    add_obj_history_entry does for one object. Expects a db commit soon after.
+
+    args:
+        alert_ids (list): The IDs of the alerts
+        action (str): The action to record
+
+    returns:
+        None
+    """
+    entry = {
+        str(datetime.now().timestamp()): {
+            'user': current_user.user,
+            'user_id': current_user.id,
+            'action': action
+        }
+    }
+
+    # Histories are objects, or JSON null when they were never set
+    history = func.coalesce(
+        func.nullif(cast(Alert.modification_history, JSONB), literal_column("'null'::jsonb")),
+        literal_column("'{}'::jsonb")
+    )
+
+    db.session.execute(
+        update(Alert).where(
+            Alert.alert_id.in_(alert_ids)
+        ).values(
+            modification_history=cast(history.op('||')(literal(entry, JSONB)), JSON)
+        ).execution_options(synchronize_session=False)
+    )
+
+
 def get_unspecified_event_category():
     """
     Get the id of the 'Unspecified' event category
@@ -407,13 +851,115 @@ def get_unspecified_event_category():
     return event_cat
 
 
+def _get_escalated_observables(alerts: List[Alert], iocs_list: List[str], assets_list: List[str]):
+    """
+    Select the observables of the alerts to import in a case, deduplicated across the alerts: the IOCs by value and
+    type, the assets by name and type. The values are read at once, as the commits of the case creation expire the
+    loaded observables.
+
+    args:
+        alerts (list): The alerts, with their observables loaded
+        iocs_list (list): The UUIDs of the IOCs to import
+        assets_list (list): The UUIDs of the assets to import
+
+    returns:
+        tuple: The IDs of the IOCs and the columns of the assets kept, indexed by their key, and the keys of the
+        observables of each alert
+    """
+    iocs_uuids = set(iocs_list or [])
+    assets_uuids = set(assets_list or [])
+
+    iocs = {}
+    assets = {}
+    alerts_observables = []
+    for alert in alerts:
+        alert_iocs = {}
+        for alert_ioc in alert.iocs:
+            if str(alert_ioc.ioc_uuid) in iocs_uuids:
+                key = (alert_ioc.ioc_value, alert_ioc.ioc_type_id)
+                iocs.setdefault(key, alert_ioc.ioc_id)
+                alert_iocs[key] = None
+
+        alert_assets = {}
+        for alert_asset in alert.assets:
+            if str(alert_asset.asset_uuid) in assets_uuids:
+                key = ((alert_asset.asset_name or '').lower(), alert_asset.asset_type_id)
+                if key not in assets:
+                    assets[key] = {column.key: getattr(alert_asset, column.key)
+                                   for column in CaseAssets.__table__.columns}
+                alert_assets[key] = None
+
+        alerts_observables.append((list(alert_iocs), list(alert_assets)))
+
+    return iocs, assets, alerts_observables
+
+
+def _import_escalated_assets(assets: Dict[tuple, dict], case_id: int) -> Dict[tuple, int]:
+    """
+    Add the assets of alerts to a case. The assets which do not belong to a case yet are moved with a single
+    statement, the others are copied with a single insert so that their case keeps them.
+
+    returns:
+        dict: The IDs of the assets in the case, indexed by their key
+    """
+    analysis_status_id = get_unspecified_analysis_status_id()
+    assets_ids = {key: asset['asset_id'] for key, asset in assets.items() if asset['case_id'] is None}
+    move_assets_to_case(assets_ids.values(), case_id, current_user.id, analysis_status_id)
+
+    copied_keys = [key for key, asset in assets.items() if asset['case_id'] is not None]
+    now = datetime.utcnow()
+    copies = []
+    for key in copied_keys:
+        values = {column: value for column, value in assets[key].items() if column not in ['asset_id', 'asset_uuid']}
+        values.update({'case_id': case_id, 'user_id': current_user.id, 'analysis_status_id': analysis_status_id,
+                       'date_added': now, 'date_update': now})
+        copies.append(values)
+
+    assets_ids.update(zip(copied_keys, add_assets_batch(copies)))
+
+    return assets_ids
+
+
+def _get_escalated_event(alert: Alert) -> dict:
+    """
+    Build the timeline event of an escalated alert, in the format expected by add_events_batch, but for its case,
+    category and observables
+    """
+    event_date = alert.alert_source_event_time or datetime.now()
+
+    return {
+        'user_id': current_user.id,
+        'event_added': datetime.utcnow(),
+        'event_title': f"[ALERT] {alert.alert_title}",
+        'event_content': alert.alert_description,
+        'event_source': alert.alert_source,
+        'event_raw': json.dumps(alert.alert_source_content, indent=4),
+        'event_date': event_date,
+        'event_date_wtz': event_date,
+        'event_tags': alert.alert_tags,
+        'event_tz': '+00:00',
+        'modification_history': {
+            datetime.now().timestamp(): {
+                'user': current_user.user,
+                'user_id': current_user.id,
+                'action': 'created'
+            }
+        }
+    }
+
+
 def create_case_from_alerts(alerts: List[Alert], iocs_list: List[str], assets_list: List[str], case_title: str,
                             note: str, import_as_event: bool, case_tags: str, template_id: int) -> Cases:
     """
-    Create a case from multiple alerts
+    Create a case from multiple alerts.
+
+    The observables are deduplicated across the alerts, then imported with a statement per table: the IOCs are
+    linked to the case, the assets are moved or copied to it, and the IOCs of each alert are linked to its assets.
+    The events of the alerts are inserted at once, and the states of the case are updated once. The values of the
+    alerts are read before the case is created, as its commits expire them.
 
     args:
-        alerts (Alert): The Alerts
+        alerts (Alert): The Alerts, with their observables loaded
         iocs_list (list): The list of IOCs
         assets_list (list): The list of assets
         note (str): The note to add to the case
@@ -430,18 +976,24 @@ def create_case_from_alerts(alerts: List[Alert], iocs_list: List[str], assets_li
     if note:
         escalation_note = f"\n\n### Escalation note\n\n{note}\n\n"
 
+    case_template_title_prefix = ""
+
     if template_id is not None and template_id != 0 and template_id != '':
         case_template = get_case_template_by_id(template_id)
         if case_template:
             case_template_title_prefix = case_template.title_prefix
 
+    alerts_ids = [alert.alert_id for alert in alerts]
+    iocs, assets, alerts_observables = _get_escalated_observables(alerts, iocs_list, assets_list)
+    events = [_get_escalated_event(alert) for alert in alerts] if import_as_event else []
+
     # Create the case
     case = Cases(
         name=f"[ALERT]{case_template_title_prefix} "
-             f"Merge of alerts {', '.join([str(alert.alert_id) for alert in alerts])}" if not case_title else
+             f"Merge of alerts {', '.join([str(alert_id) for alert_id in alerts_ids])}" if not case_title else
              f"{case_template_title_prefix} {case_title}",
         description=f"*Alerts escalated by {current_user.name}*\n\n{escalation_note}"
-                    f"[Alerts link](/alerts?alert_ids={','.join([str(alert.alert_id) for alert in alerts])})",
+                    f"[Alerts link](/alerts?alert_ids={','.join([str(alert_id) for alert_id in alerts_ids])})",
         soc_id='',
         client_id=alerts[0].alert_customer_id,
         user=current_user,
@@ -458,76 +1010,37 @@ def create_case_from_alerts(alerts: List[Alert], iocs_list: List[str], assets_li
 
     db.session.commit()
 
-    # Link the alert to the case
-    for alert in alerts:
-        alert.cases.append(case)
-
-        ioc_links = []
-        asset_links = []
-
-        # Add the IOCs to the case
-        for ioc_uuid in iocs_list:
-            for alert_ioc in alert.iocs:
-                if str(alert_ioc.ioc_uuid) == ioc_uuid:
+    # Link the alerts to the case
+    db.session.execute(insert(AlertCaseAssociation), [{'alert_id': alert_id, 'case_id': case.case_id}
+                                                      for alert_id in alerts_ids])
 
-                    ioc, existed = add_ioc(alert_ioc, current_user.id, case.case_id)
-                    add_ioc_link(ioc.ioc_id, case.case_id)
-                    ioc_links.append(ioc.ioc_id)
+    # Add the IOCs to the case, an existing IOC with the same value and type being reused
+    iocs_ids = get_iocs_ids_by_values_types(iocs.keys())
+    for key, ioc_id in iocs.items():
+        iocs_ids.setdefault(key, ioc_id)
+    add_ioc_links_batch(iocs_ids.values(), case.case_id)
 
-        # Add the assets to the case
-        for asset_uuid in assets_list:
-            for alert_asset in alert.assets:
-                if str(alert_asset.asset_uuid) == asset_uuid:
-                    alert_asset.analysis_status_id = get_unspecified_analysis_status_id()
+    # Add the assets to the case, linked to the IOCs of their alerts
+    assets_ids = _import_escalated_assets(assets, case.case_id)
+    add_ioc_asset_links_batch((assets_ids[asset_key], iocs_ids[ioc_key])
+                              for alert_iocs, alert_assets in alerts_observables
+                              for asset_key in alert_assets for ioc_key in alert_iocs)
 
-                    asset = create_asset(asset=alert_asset,
-                                         caseid=case.case_id,
-                                         user_id=current_user.id
-                                         )
-                    asset.asset_uuid = alert_asset.asset_uuid
+    # Add the events to the timeline
+    if import_as_event:
+        category_id = get_unspecified_event_category().id
+        for event, (alert_iocs, alert_assets) in zip(events, alerts_observables):
+            event.update({
+                'case_id': case.case_id,
+                'event_category_id': category_id,
+                'event_iocs': [iocs_ids[key] for key in alert_iocs],
+                'event_assets': [assets_ids[key] for key in alert_assets]
+            })
+        add_events_batch(events, case.case_id)
+        update_timeline_state(caseid=case.case_id)
 
-                    set_ioc_links(ioc_links, asset.asset_id)
-                    asset_links.append(asset.asset_id)
-
-        # Add event to timeline
-        if import_as_event:
-            unspecified_cat = get_unspecified_event_category()
-
-            event_schema = EventSchema()
-            event = event_schema.load({
-                'event_title': f"[ALERT] {alert.alert_title}",
-                'event_content': alert.alert_description,
-                'event_source': alert.alert_source,
-                'event_raw': json.dumps(alert.alert_source_content, indent=4),
-                'event_date': alert.alert_source_event_time.strftime("%Y-%m-%dT%H:%M:%S.%f"),
-                'event_date_wtz': alert.alert_source_event_time.strftime("%Y-%m-%dT%H:%M:%S.%f"),
-                'event_iocs': ioc_links,
-                'event_assets': asset_links,
-                'event_tags': alert.alert_tags,
-                'event_tz': '+00:00',
-                'event_category_id': unspecified_cat.id,
-            }, session=db.session)
-
-            event.case_id = case.case_id
-            event.user_id = current_user.id
-            event.event_added = datetime.utcnow()
-
-            add_obj_history_entry(event, 'created')
-
-            db.session.add(event)
-            update_timeline_state(caseid=case.case_id)
-
-            event.category = [unspecified_cat]
-
-            update_event_assets(event_id=event.event_id,
-                                caseid=case.case_id,
-                                assets_list=asset_links,
-                                iocs_list=ioc_links,
-                                sync_iocs_assets=False)
-
-            update_event_iocs(event_id=event.event_id,
-                              caseid=case.case_id,
-                              iocs_list=ioc_links)
+    update_ioc_state(caseid=case.case_id)
+    update_assets_state(caseid=case.case_id, userid=current_user.id)
 
     if template_id is not None and template_id != 0 and template_id != '':
         case, logs = case_template_post_modifier(case, template_id)
@@ -897,7 +1410,113 @@ def search_alert_resolution_by_name(resolution_status_name: str, exact_match: Fa
         AlertResolutionStatus.resolution_status_name.ilike(f"%{resolution_status_name}%")).all()
 
 
-def cache_similar_alert(customer_id, assets, iocs, alert_id, creation_date):
+def _normalize_similarity_value(value) -> str:
+    """
+    Normalize a value before it enters the similarity index: whitespaces are collapsed and case is ignored
+    """
+    return ' '.join(str(value).split()).lower()
+
+
+def get_alert_title_fingerprint(title: str) -> str:
+    """
+    Get the fingerprint of an alert title. Numbers are masked so that titles only differing by
+    counters, ports or addresses share the same fingerprint.
+
+    args:
+        title (str): The title of the alert
+
+    returns:
+        str: The fingerprint of the title
+    """
+    return re.sub(r'[0-9]+', '#', _normalize_similarity_value(title))
+
+
+def build_similarity_posting_key(kind: str, value) -> str:
+    """
+    Build the key of a posting in the similarity index. The value is normalized and hashed,
+    so keys have a fixed length whatever the size of the IOC or asset.
+
+    args:
+        kind (str): The kind of posting, 'asset', 'ioc' or 'title'
+        value (str): The value to index
+
+    returns:
+        str: The posting key
+    """
+    if kind == 'title':
+        normalized = get_alert_title_fingerprint(value)
+    else:
+        normalized = _normalize_similarity_value(value)
+
+    return f"{kind}:{hashlib.md5(normalized.encode('utf-8')).hexdigest()}"
+
+
+def _build_similarity_postings(customer_id, alert_id, creation_date, assets, iocs, title=None) -> List[dict]:
+    """
+    Build the postings rows of an alert, deduplicated on their key
+    """
+    postings = {}
+    created_at = creation_date if creation_date else datetime.utcnow()
+
+    for asset in assets:
+        if not asset.get('asset_name'):
+            continue
+
+        posting_key = build_similarity_posting_key('asset', asset['asset_name'])
+        postings.setdefault(posting_key, {
+            'customer_id': customer_id, 'alert_id': alert_id, 'created_at': created_at,
+            'posting_key': posting_key, 'asset_name': asset['asset_name'],
+            'asset_type_id': asset.get('asset_type_id'), 'ioc_value': None, 'ioc_type_id': None
+        })
+
+    for ioc in iocs:
+        if not ioc.get('ioc_value'):
+            continue
+
+        posting_key = build_similarity_posting_key('ioc', ioc['ioc_value'])
+        postings.setdefault(posting_key, {
+            'customer_id': customer_id, 'alert_id': alert_id, 'created_at': created_at,
+            'posting_key': posting_key, 'asset_name': None, 'asset_type_id': None,
+            'ioc_value': ioc['ioc_value'], 'ioc_type_id': ioc.get('ioc_type_id')
+        })
+
+    if title:
+        posting_key = build_similarity_posting_key('title', title)
+        postings.setdefault(posting_key, {
+            'customer_id': customer_id, 'alert_id': alert_id, 'created_at': created_at,
+            'posting_key': posting_key, 'asset_name': None, 'asset_type_id': None,
+            'ioc_value': None, 'ioc_type_id': None
+        })
+
+    return list(postings.values())
+
+
+def cache_similar_alerts(alerts_entries: List[dict], commit: bool = True):
+    """
+    Add the postings of several alerts to the similarity index with a single multi-rows insert
+
+    args:
+        alerts_entries (list): The alerts to index. Each entry is a dict with the keys customer_id, alert_id,
+                               creation_date, assets, iocs and optionally title
+        commit (bool): Whether to commit the session
+
+    returns:
+        None
+    """
+    postings = []
+    for entry in alerts_entries:
+        postings.extend(_build_similarity_postings(entry['customer_id'], entry['alert_id'],
+                                                   entry.get('creation_date'), entry.get('assets', []),
+                                                   entry.get('iocs', []), title=entry.get('title')))
+
+    if postings:
+        db.session.execute(insert(SimilarAlertsCache), postings)
+
+    if commit:
+        db.session.commit()
+
+
+def cache_similar_alert(customer_id, assets, iocs, alert_id, creation_date, title=None):
     """
     Cache similar alerts
 
@@ -907,25 +1526,75 @@ def cache_similar_alert(customer_id, assets, iocs, alert_id, creation_date):
         iocs (list): The list of IOCs
         alert_id (int): The ID of the alert
         creation_date (datetime): The creation date of the alert
+        title (str): The title of the alert
 
     returns:
         None
 
     """
-    for asset in assets:
-        cache_entry = SimilarAlertsCache(customer_id=customer_id, asset_name=asset['asset_name'],
-                                         asset_type_id=asset["asset_type_id"], alert_id=alert_id,
-                                         created_at=creation_date)
-        db.session.add(cache_entry)
+    cache_similar_alerts([{
+        'customer_id': customer_id,
+        'alert_id': alert_id,
+        'creation_date': creation_date,
+        'assets': assets,
+        'iocs': iocs,
+        'title': title
+    }])
 
-    for ioc in iocs:
-        cache_entry = SimilarAlertsCache(customer_id=customer_id, ioc_value=ioc['ioc_value'],
-                                         ioc_type_id=ioc['ioc_type_id'], alert_id=alert_id,
-                                         created_at=creation_date)
-        db.session.add(cache_entry)
 
+def update_similar_alert_title(alert: Alert):
+    """
+    Replace the title posting of an alert after its title changed
+
+    args:
+        alert (Alert): The alert
+
+    returns:
+        None
+    """
+    update_similar_alerts_titles([alert])
+
+
+def update_similar_alerts_titles(alerts: List[Alert]):
+    """
+    Replace the title postings of alerts after their titles changed, with a statement per table
+
+    args:
+        alerts (list): The alerts
+
+    returns:
+        None
+    """
+    SimilarAlertsCache.query.filter(
+        SimilarAlertsCache.alert_id.in_([alert.alert_id for alert in alerts]),
+        SimilarAlertsCache.posting_key.like('title:%')
+    ).delete(synchronize_session=False)
+
+    cache_similar_alerts([{
+        'customer_id': alert.alert_customer_id,
+        'alert_id': alert.alert_id,
+        'creation_date': alert.alert_source_event_time,
+        'title': alert.alert_title
+    } for alert in alerts])
+
+
+def prune_similar_alerts_cache(retention_days: int) -> int:
+    """
+    Remove the postings older than the retention period from the similarity index
+
+    args:
+        retention_days (int): The number of days to keep
+
+    returns:
+        int: The number of postings removed
+    """
+    removed = SimilarAlertsCache.query.filter(
+        SimilarAlertsCache.created_at < datetime.utcnow() - timedelta(days=retention_days)
+    ).delete(synchronize_session=False)
     db.session.commit()
 
+    return removed
+
 
 def register_related_alerts(new_alert=None, assets_list=None, iocs_list=None):
     """
@@ -1043,7 +1712,8 @@ def delete_related_alerts_cache(alert_ids: List[int]):
     db.session.commit()
 
 
-def get_related_alerts(customer_id, assets, iocs, details=False):
+def get_related_alerts(customer_id, assets, iocs, details=False, title=None, days_back=None,
+                       number_of_results=1000):
     """
     Check if an alert is related to another alert
 
@@ -1052,28 +1722,49 @@ def get_related_alerts(customer_id, assets, iocs, details=False):
         assets (list): The list of assets
         iocs (list): The list of IOCs
         details (bool): Whether to return the details of the related alerts
+        title (str): The title of the alert, to match alerts with the same title fingerprint
+        days_back (int): The number of days to look back. Defaults to the similarity retention period
+        number_of_results (int): The maximum number of postings to consider for each kind of match
 
     returns:
-        bool: True if the alert is related to another alert, False otherwise
+        dict: The IDs of the related alerts, grouped by kind of match
     """
-    asset_names = [asset.asset_name for asset in assets]
-    ioc_values = [ioc.ioc_value for ioc in iocs]
-
-    similar_assets = SimilarAlertsCache.query.filter(
-        SimilarAlertsCache.customer_id == customer_id,
-        SimilarAlertsCache.asset_name.in_(asset_names)
-    ).all()
-
-    similar_iocs = SimilarAlertsCache.query.filter(
-        SimilarAlertsCache.customer_id == customer_id,
-        SimilarAlertsCache.ioc_value.in_(ioc_values)
-    ).all()
+    kinds_keys = {
+        'assets': {build_similarity_posting_key('asset', asset.asset_name) for asset in assets},
+        'iocs': {build_similarity_posting_key('ioc', ioc.ioc_value) for ioc in iocs},
+        'titles': {build_similarity_posting_key('title', title)} if title else set()
+    }
 
     similarities = {
-        'assets': [asset.alert_id for asset in similar_assets],
-        'iocs': [ioc.alert_id for ioc in similar_iocs]
+        'assets': [],
+        'iocs': [],
+        'titles': []
     }
 
+    if days_back is None:
+        days_back = app.app.config.get('ALERTS_SIMILARITY_RETENTION_DAYS')
+
+    since = datetime.utcnow() - timedelta(days=days_back)
+
+    # Each kind of match is capped on its own, so frequent assets don't hide the IOCs or titles matches.
+    # Postings are dated with their alert creation time, the most recent alerts are kept.
+    for kind, posting_keys in kinds_keys.items():
+        if not posting_keys:
+            continue
+
+        postings = SimilarAlertsCache.query.with_entities(
+            SimilarAlertsCache.alert_id
+        ).filter(
+            SimilarAlertsCache.customer_id == customer_id,
+            SimilarAlertsCache.posting_key.in_(list(posting_keys)),
+            SimilarAlertsCache.created_at >= since
+        ).order_by(
+            SimilarAlertsCache.created_at.desc(),
+            SimilarAlertsCache.alert_id.desc()
+        ).limit(number_of_results).all()
+
+        similarities[kind] = [alert_id for alert_id, in postings]
+
     return similarities
 
 
@@ -1102,8 +1793,8 @@ def get_related_alerts_details(customer_id, assets, iocs, open_alerts, closed_al
             'edges': []
         }
 
-    asset_names = [(asset.asset_name, asset.asset_type_id) for asset in assets]
-    ioc_values = [(ioc.ioc_value, ioc.ioc_type_id) for ioc in iocs]
+    asset_keys = {build_similarity_posting_key('asset', asset.asset_name) for asset in assets}
+    ioc_keys = {build_similarity_posting_key('ioc', ioc.ioc_value) for ioc in iocs}
 
     asset_type_alias = aliased(AssetsType)
     alert_status_filter = []
@@ -1122,39 +1813,36 @@ def get_related_alerts_details(customer_id, assets, iocs, open_alerts, closed_al
 
     conditions = and_(
         SimilarAlertsCache.customer_id == customer_id,
-        and_(or_(
-            tuple_(SimilarAlertsCache.asset_name, SimilarAlertsCache.asset_type_id).in_(asset_names),
-            tuple_(SimilarAlertsCache.ioc_value, SimilarAlertsCache.ioc_type_id).in_(ioc_values)
-        ),
+        SimilarAlertsCache.posting_key.in_(list(asset_keys | ioc_keys)),
         SimilarAlertsCache.created_at >= (func.now() - timedelta(days=days_back))
-        )
     )
 
     if alert_status_filter:
         conditions = and_(conditions, Alert.alert_status_id.in_(alert_status_filter))
 
     related_alerts = (
-        db.session.query(Alert, SimilarAlertsCache.asset_name, SimilarAlertsCache.ioc_value,
-                         asset_type_alias.asset_icon_not_compromised)
+        db.session.query(Alert, SimilarAlertsCache.posting_key, SimilarAlertsCache.asset_name,
+                         SimilarAlertsCache.ioc_value, asset_type_alias.asset_icon_not_compromised)
         .join(SimilarAlertsCache, Alert.alert_id == SimilarAlertsCache.alert_id)
         .outerjoin(Alert.resolution_status)
         .outerjoin(asset_type_alias, SimilarAlertsCache.asset_type_id == asset_type_alias.asset_id)
         .filter(conditions)
+        .order_by(Alert.alert_creation_time.desc(), Alert.alert_id.desc())
         .limit(number_of_results)
         .all()
     )
 
     alerts_dict = {}
 
-    for alert, asset_name, ioc_value, asset_icon_not_compromised in related_alerts:
+    for alert, posting_key, asset_name, ioc_value, asset_icon_not_compromised in related_alerts:
         if alert.alert_id not in alerts_dict:
             alerts_dict[alert.alert_id] = {'alert': alert, 'assets': [], 'iocs': []}
 
-        if any(name == asset_name for name, _ in asset_names):
+        if posting_key in asset_keys:
             asset_info = {'asset_name': asset_name, 'icon': asset_icon_not_compromised}
             alerts_dict[alert.alert_id]['assets'].append(asset_info)
 
-        if any(value == ioc_value for value, _ in ioc_values):
+        if posting_key in ioc_keys:
             alerts_dict[alert.alert_id]['iocs'].append(ioc_value)
 
     nodes = []
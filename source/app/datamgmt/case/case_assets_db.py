@@ -21,6 +21,9 @@ import datetime
 from flask_login import current_user
 from sqlalchemy import and_
 from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import tuple_
+from sqlalchemy import update
 
 from app import db, app
 from app.datamgmt.states import update_assets_state
@@ -226,6 +229,120 @@ def get_asset_type_id(asset_type_name):
     return assets_type_id
 
 
+def get_assets_types_ids_by_names():
+    """
+    Returns the IDs of all the asset types, indexed by their lower case name
+    """
+    return {asset_name.lower(): asset_id for asset_id, asset_name in get_assets_types()}
+
+
+def get_case_assets_names_types(names_types, caseid):
+    """
+    Returns the assets of a case matching pairs of name and type with a single query, names being case insensitive
+
+    args:
+        names_types: iterable of (lower case asset_name, asset_type_id) tuples
+        caseid: ID of the case
+
+    returns:
+        set of the (lower case asset_name, asset_type_id) tuples found
+    """
+    names_types = set(names_types)
+    if not names_types:
+        return set()
+
+    assets = CaseAssets.query.with_entities(
+        func.lower(CaseAssets.asset_name).label('asset_name'),
+        CaseAssets.asset_type_id
+    ).filter(
+        CaseAssets.case_id == caseid,
+        tuple_(func.lower(CaseAssets.asset_name), CaseAssets.asset_type_id).in_(list(names_types))
+    ).all()
+
+    return {(asset.asset_name, asset.asset_type_id) for asset in assets}
+
+
+def add_assets_batch(assets, iocs_assets=None):
+    """
+    Inserts a batch of assets of a case with their IOCs links. Each table receives a single multi-rows insert.
+    The caller is responsible for committing.
+
+    args:
+        assets: list of dict of CaseAssets columns, already validated
+        iocs_assets: list of the IOC IDs to link to each asset, in the order of the assets
+
+    returns:
+        list of the IDs of the assets created, in the order of the input
+    """
+    if not assets:
+        return []
+
+    assets_ids = db.session.scalars(
+        insert(CaseAssets).returning(CaseAssets.asset_id, sort_by_parameter_order=True),
+        assets
+    ).all()
+
+    links = [{'asset_id': asset_id, 'ioc_id': ioc_id}
+             for asset_id, iocs_ids in zip(assets_ids, iocs_assets or []) for ioc_id in set(iocs_ids)]
+    if links:
+        db.session.execute(insert(IocAssetLink), links)
+
+    return assets_ids
+
+
+def move_assets_to_case(assets_ids, caseid, user_id, analysis_status_id):
+    """
+    Moves assets which do not belong to a case yet, such as the assets of alerts, to a case with a single statement.
+    The caller is responsible for committing.
+
+    args:
+        assets_ids: IDs of the assets
+        caseid: ID of the case
+        user_id: ID of the user adding the assets
+        analysis_status_id: analysis status of the assets in the case
+    """
+    if not assets_ids:
+        return
+
+    now = datetime.datetime.utcnow()
+    db.session.execute(
+        update(CaseAssets).where(
+            CaseAssets.asset_id.in_(list(assets_ids))
+        ).values(
+            case_id=caseid,
+            user_id=user_id,
+            analysis_status_id=analysis_status_id,
+            date_added=now,
+            date_update=now
+        ).execution_options(synchronize_session=False)
+    )
+
+
+def add_ioc_asset_links_batch(assets_iocs):
+    """
+    Links IOCs to assets with a single insert, skipping the links which already exist.
+    The caller is responsible for committing.
+
+    args:
+        assets_iocs: iterable of (asset_id, ioc_id) tuples
+    """
+    assets_iocs = set(assets_iocs)
+    if not assets_iocs:
+        return
+
+    existing_links = IocAssetLink.query.with_entities(
+        IocAssetLink.asset_id,
+        IocAssetLink.ioc_id
+    ).filter(
+        tuple_(IocAssetLink.asset_id, IocAssetLink.ioc_id).in_(list(assets_iocs))
+    ).all()
+
+    missing_links = assets_iocs - {(link.asset_id, link.ioc_id) for link in existing_links}
+    if missing_links:
+        db.session.execute(insert(IocAssetLink), [{'asset_id': asset_id, 'ioc_id': ioc_id}
+                                                  for asset_id, ioc_id in missing_links])
+
+
 def get_assets_ioc_links(caseid):
 
     ioc_links_req = IocAssetLink.query.with_entities(
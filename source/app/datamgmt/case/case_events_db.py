@@ -17,10 +17,17 @@
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 from flask_login import current_user
 from sqlalchemy import and_
+from sqlalchemy import false
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy import tuple_
 
 from app import db
 from app.datamgmt.states import update_timeline_state
 from app.models import AssetsType
+from app.models import CompromiseStatus
 from app.models import CaseAssets
 from app.models import CaseEventCategory
 from app.models import CaseEventsAssets
@@ -403,3 +410,356 @@ def get_default_category():
         EventCategory.name == "Unspecified"
     ).first()
 
+
+def _build_timeline_events_conditions(caseid, assets=None, assets_id=None, iocs=None, iocs_id=None, tags=None,
+                                      titles=None, sources=None, descriptions=None, raws=None, categories=None,
+                                      start_date=None, end_date=None, flag=None, event_ids=None):
+    conditions = [CasesEvent.case_id == caseid]
+
+    if flag is not None:
+        conditions.append(CasesEvent.event_is_flagged == flag)
+
+    for column, values in ((CasesEvent.event_tags, tags), (CasesEvent.event_title, titles),
+                           (CasesEvent.event_source, sources), (CasesEvent.event_content, descriptions),
+                           (CasesEvent.event_raw, raws)):
+        for value in values or []:
+            conditions.append(column.ilike(f'%{value}%'))
+
+    if start_date:
+        conditions.append(CasesEvent.event_date >= start_date)
+
+    if end_date:
+        conditions.append(CasesEvent.event_date <= end_date)
+
+    for category in categories or []:
+        conditions.append(EventCategory.name == category)
+
+    if event_ids:
+        conditions.append(CasesEvent.event_id.in_(event_ids))
+
+    if assets is not None or assets_id is not None:
+        # Events must be linked to every requested asset
+        asset_matches = []
+        if assets:
+            asset_matches.append(func.lower(CaseAssets.asset_name).in_(assets))
+        if assets_id:
+            asset_matches.append(CaseEventsAssets.asset_id.in_(assets_id))
+
+        links_conditions = [CaseEventsAssets.case_id == caseid, or_(*asset_matches) if asset_matches else false()]
+        if assets_id:
+            links_conditions.append(CaseEventsAssets.asset_id.in_(assets_id))
+
+        conditions.append(CasesEvent.event_id.in_(
+            select(CaseEventsAssets.event_id).join(
+                CaseAssets, CaseEventsAssets.asset_id == CaseAssets.asset_id
+            ).where(
+                *links_conditions
+            ).group_by(
+                CaseEventsAssets.event_id
+            ).having(
+                func.count() == len(assets or []) + len(assets_id or [])
+            )
+        ))
+
+    if iocs is not None:
+        # Events must be linked to at least one of the requested IOCs
+        links_conditions = [CaseEventsIoc.case_id == caseid, func.lower(Ioc.ioc_value).in_(iocs)]
+        if iocs_id:
+            links_conditions.append(CaseEventsIoc.ioc_id.in_(iocs_id))
+
+        conditions.append(CasesEvent.event_id.in_(
+            select(CaseEventsIoc.event_id).join(
+                Ioc, CaseEventsIoc.ioc_id == Ioc.ioc_id
+            ).where(*links_conditions)
+        ))
+
+    return conditions
+
+
+def get_filtered_case_events(caseid, assets=None, assets_id=None, iocs=None, iocs_id=None, tags=None,
+                             titles=None, sources=None, descriptions=None, raws=None, categories=None,
+                             start_date=None, end_date=None, flag=None, event_ids=None,
+                             page=None, per_page=None):
+    """
+    Returns the events of a case matching the timeline filters, with their linked assets and IOCs.
+
+    All predicates are evaluated by the database. Links are only fetched for the returned events and grouped
+    per event in a single pass.
+
+    args:
+        caseid: ID of the case
+        assets: lower-cased names of assets the events must all be linked to
+        assets_id: IDs of assets the events must all be linked to. Also restricts the assets returned
+        iocs: lower-cased values of IOCs, one of which the events must be linked to
+        iocs_id: IDs restricting the IOCs matched and returned
+        tags, titles, sources, descriptions, raws: substrings the events must all contain
+        categories: category names of the events
+        start_date, end_date: bounds of the events date
+        flag: flag status of the events
+        event_ids: IDs of the events
+        page: page to return, starting at 1. All events are returned if no page is provided
+        per_page: number of events per page
+
+    returns:
+        dict with the events, the total number of matching events and a map of the assets and IOCs returned
+    """
+    conditions = _build_timeline_events_conditions(caseid, assets=assets, assets_id=assets_id, iocs=iocs,
+                                                   iocs_id=iocs_id, tags=tags, titles=titles, sources=sources,
+                                                   descriptions=descriptions, raws=raws, categories=categories,
+                                                   start_date=start_date, end_date=end_date, flag=flag,
+                                                   event_ids=event_ids)
+
+    query = CasesEvent.query.with_entities(
+        CasesEvent.event_id,
+        CasesEvent.event_uuid,
+        CasesEvent.event_date,
+        CasesEvent.event_date_wtz,
+        CasesEvent.event_tz,
+        CasesEvent.event_title,
+        CasesEvent.event_color,
+        CasesEvent.event_tags,
+        CasesEvent.event_content,
+        CasesEvent.event_in_summary,
+        CasesEvent.event_in_graph,
+        CasesEvent.event_is_flagged,
+        CasesEvent.parent_event_id,
+        User.user,
+        CasesEvent.event_added,
+        EventCategory.name.label("category_name")
+    ).filter(
+        *conditions
+    ).outerjoin(
+        CasesEvent.category
+    ).join(
+        CasesEvent.user
+    )
+
+    if page is not None and per_page:
+        total = query.order_by(None).count()
+        query = query.order_by(
+            CasesEvent.event_date, CasesEvent.event_id
+        ).limit(per_page).offset((page - 1) * per_page)
+        events = query.all()
+        events_ids = [event.event_id for event in events]
+        assets_links_conditions = [CaseEventsAssets.event_id.in_(events_ids)]
+        iocs_links_conditions = [CaseEventsIoc.event_id.in_(events_ids)]
+
+    else:
+        events = query.order_by(CasesEvent.event_date, CasesEvent.event_id).all()
+        total = len(events)
+        assets_links_conditions = [CaseEventsAssets.case_id == caseid]
+        iocs_links_conditions = [CaseEventsIoc.case_id == caseid]
+
+    if assets_id:
+        assets_links_conditions.append(CaseEventsAssets.asset_id.in_(assets_id))
+
+    if iocs_id:
+        iocs_links_conditions.append(CaseEventsIoc.ioc_id.in_(iocs_id))
+
+    objects_map = {}
+    events_assets = {}
+    assets_links = CaseEventsAssets.query.with_entities(
+        CaseEventsAssets.event_id,
+        CaseAssets.asset_id,
+        CaseAssets.asset_name,
+        AssetsType.asset_name.label('type'),
+        CaseAssets.asset_ip,
+        CaseAssets.asset_description,
+        CaseAssets.asset_compromise_status_id
+    ).filter(
+        *assets_links_conditions
+    ).join(
+        CaseEventsAssets.asset
+    ).join(
+        CaseAssets.asset_type
+    ).all()
+
+    for asset in assets_links:
+        objects_map.setdefault(asset.asset_id, [asset.asset_name, asset.type])
+        events_assets.setdefault(asset.event_id, []).append({
+            "name": "{} ({})".format(asset.asset_name, asset.type),
+            "ip": asset.asset_ip,
+            "description": asset.asset_description,
+            "compromised": asset.asset_compromise_status_id == CompromiseStatus.compromised.value
+        })
+
+    events_iocs = {}
+    iocs_links = CaseEventsIoc.query.with_entities(
+        CaseEventsIoc.event_id,
+        CaseEventsIoc.ioc_id,
+        Ioc.ioc_value,
+        Ioc.ioc_description
+    ).filter(
+        *iocs_links_conditions
+    ).join(
+        CaseEventsIoc.ioc
+    ).all()
+
+    for ioc in iocs_links:
+        events_iocs.setdefault(ioc.event_id, []).append(ioc)
+
+    timeline = []
+    for row in events:
+        event = row._asdict()
+
+        event['event_date'] = event['event_date'].strftime('%Y-%m-%dT%H:%M:%S.%f')
+        event['event_date_wtz'] = event['event_date_wtz'].strftime('%Y-%m-%dT%H:%M:%S.%f') if event[
+            'event_date_wtz'] else None
+        event['event_added'] = event['event_added'].strftime('%Y-%m-%dT%H:%M:%S')
+
+        event['assets'] = events_assets.get(row.event_id, [])
+
+        event['iocs'] = []
+        for ioc in events_iocs.get(row.event_id, []):
+            objects_map.setdefault(ioc.ioc_id, [ioc.ioc_value])
+            event['iocs'].append({
+                "name": "{}".format(ioc.ioc_value),
+                "description": ioc.ioc_description
+            })
+
+        timeline.append(event)
+
+    return {
+        'events': timeline,
+        'total': total,
+        'objects_map': objects_map
+    }
+
+
+def get_case_assets_ids_by_names(assets_names, caseid):
+    """
+    Resolves asset names of a case in a single query
+
+    args:
+        assets_names: names of the assets
+        caseid: ID of the case
+
+    returns:
+        dict mapping the names found to their asset ID
+    """
+    if not assets_names:
+        return {}
+
+    assets = CaseAssets.query.with_entities(
+        CaseAssets.asset_name,
+        CaseAssets.asset_id
+    ).filter(
+        CaseAssets.asset_name.in_(list(assets_names)),
+        CaseAssets.case_id == caseid
+    ).all()
+
+    return {asset.asset_name: asset.asset_id for asset in assets}
+
+
+def get_case_iocs_ids_by_values(iocs_values, caseid):
+    """
+    Resolves IOC values of a case in a single query
+
+    args:
+        iocs_values: values of the IOCs
+        caseid: ID of the case
+
+    returns:
+        dict mapping the values found to their IOC ID
+    """
+    if not iocs_values:
+        return {}
+
+    iocs = IocLink.query.with_entities(
+        Ioc.ioc_value,
+        Ioc.ioc_id
+    ).filter(
+        Ioc.ioc_value.in_(list(iocs_values)),
+        IocLink.case_id == caseid
+    ).join(
+        IocLink.ioc
+    ).all()
+
+    return {ioc.ioc_value: ioc.ioc_id for ioc in iocs}
+
+
+def get_events_categories_ids_by_names(categories_names):
+    """
+    Resolves events categories names in a single query
+
+    args:
+        categories_names: names of the categories
+
+    returns:
+        dict mapping the names found to their category ID
+    """
+    if not categories_names:
+        return {}
+
+    categories = EventCategory.query.with_entities(
+        EventCategory.name,
+        EventCategory.id
+    ).filter(
+        EventCategory.name.in_(list(categories_names))
+    ).all()
+
+    return {category.name: category.id for category in categories}
+
+
+def add_events_batch(events, caseid, sync_iocs_assets=False):
+    """
+    Inserts a batch of events of a case with their category, assets and IOCs links.
+    Each table receives a single multi-rows insert. The caller is responsible for committing.
+
+    args:
+        events: list of dict of CasesEvent columns, plus event_category_id and the event_assets and
+                event_iocs lists of IDs, already validated
+        caseid: ID of the case
+        sync_iocs_assets: link the IOCs of each event to its assets
+
+    returns:
+        list of the IDs of the events created, in the order of the input
+    """
+    if not events:
+        return []
+
+    links_fields = ['event_category_id', 'event_assets', 'event_iocs']
+    events_ids = db.session.scalars(
+        insert(CasesEvent).returning(CasesEvent.event_id, sort_by_parameter_order=True),
+        [{k: v for k, v in event.items() if k not in links_fields} for event in events]
+    ).all()
+
+    categories = []
+    events_assets = []
+    events_iocs = []
+    iocs_assets = set()
+    for event_id, event in zip(events_ids, events):
+        categories.append({'event_id': event_id, 'category_id': event.get('event_category_id')})
+
+        for asset_id in event.get('event_assets'):
+            events_assets.append({'event_id': event_id, 'asset_id': asset_id, 'case_id': caseid})
+
+            if sync_iocs_assets:
+                iocs_assets.update((asset_id, ioc_id) for ioc_id in event.get('event_iocs'))
+
+        for ioc_id in event.get('event_iocs'):
+            events_iocs.append({'event_id': event_id, 'ioc_id': ioc_id, 'case_id': caseid})
+
+    db.session.execute(insert(CaseEventCategory), categories)
+
+    if events_assets:
+        db.session.execute(insert(CaseEventsAssets), events_assets)
+
+    if events_iocs:
+        db.session.execute(insert(CaseEventsIoc), events_iocs)
+
+    if iocs_assets:
+        existing_links = IocAssetLink.query.with_entities(
+            IocAssetLink.asset_id,
+            IocAssetLink.ioc_id
+        ).filter(
+            tuple_(IocAssetLink.asset_id, IocAssetLink.ioc_id).in_(list(iocs_assets))
+        ).all()
+
+        missing_links = iocs_assets - {(link.asset_id, link.ioc_id) for link in existing_links}
+        if missing_links:
+            db.session.execute(insert(IocAssetLink), [{'asset_id': asset_id, 'ioc_id': ioc_id}
+                                                      for asset_id, ioc_id in missing_links])
+
+    return events_ids
+
@@ -15,8 +15,13 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import hashlib
 from flask_login import current_user
 from sqlalchemy import and_
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app import db
 from app.datamgmt.states import update_ioc_state
@@ -227,6 +232,85 @@ def add_ioc_link(ioc_id, caseid):
         return False
 
 
+def get_iocs_ids_by_values_types(values_types):
+    """
+    Returns the IDs of the existing IOCs matching pairs of value and type, with a single query.
+    The values are looked up through their digest, which is indexed.
+
+    args:
+        values_types: iterable of (ioc_value, ioc_type_id) tuples
+
+    returns:
+        dict of the IOC IDs indexed by (ioc_value, ioc_type_id), the oldest IOC being kept for duplicates
+    """
+    values_types = set(values_types)
+    if not values_types:
+        return {}
+
+    digests = {(ioc_type_id, hashlib.md5(ioc_value.encode('utf-8')).hexdigest())
+               for ioc_value, ioc_type_id in values_types if ioc_value is not None}
+    if not digests:
+        return {}
+
+    iocs = db.session.query(
+        Ioc.ioc_value,
+        Ioc.ioc_type_id,
+        func.min(Ioc.ioc_id).label('ioc_id')
+    ).filter(
+        tuple_(Ioc.ioc_type_id, func.md5(Ioc.ioc_value)).in_(list(digests))
+    ).group_by(
+        Ioc.ioc_value,
+        Ioc.ioc_type_id
+    ).all()
+
+    return {(ioc.ioc_value, ioc.ioc_type_id): ioc.ioc_id for ioc in iocs
+            if (ioc.ioc_value, ioc.ioc_type_id) in values_types}
+
+
+def add_iocs_batch(iocs):
+    """
+    Inserts a batch of IOCs with a single multi-rows insert. The caller is responsible for committing.
+
+    args:
+        iocs: list of dict of Ioc columns, already validated
+
+    returns:
+        list of the IDs of the IOCs created, in the order of the input
+    """
+    if not iocs:
+        return []
+
+    return db.session.scalars(
+        insert(Ioc).returning(Ioc.ioc_id, sort_by_parameter_order=True),
+        iocs
+    ).all()
+
+
+def add_ioc_links_batch(iocs_ids, caseid):
+    """
+    Links a batch of IOCs to a case with a single insert, skipping the IOCs already linked.
+    The caller is responsible for committing.
+
+    args:
+        iocs_ids: iterable of IOC IDs
+        caseid: ID of the case
+
+    returns:
+        set of the IDs of the IOCs newly linked
+    """
+    iocs_ids = set(iocs_ids)
+    if not iocs_ids:
+        return set()
+
+    return set(db.session.scalars(
+        pg_insert(IocLink).values(
+            [{'ioc_id': ioc_id, 'case_id': caseid} for ioc_id in iocs_ids]
+        ).on_conflict_do_nothing(
+            index_elements=['ioc_id', 'case_id']
+        ).returning(IocLink.ioc_id)
+    ).all())
+
+
 def get_ioc_types_list():
     ioc_types = IocType.query.with_entities(
         IocType.type_id,
@@ -0,0 +1,299 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy import update
+
+from app import app
+from app import db
+from app.iris_engine.utils.text_delta import apply_delta
+from app.iris_engine.utils.text_delta import get_delta_size
+from app.iris_engine.utils.text_delta import get_text_size
+from app.iris_engine.utils.text_delta import make_delta
+from app.models import NoteRevisions
+
+# The first revision of a note is a full snapshot. The following ones store the line delta from the previous
+# revision, up to a new snapshot every NOTE_REVISIONS_SNAPSHOT_INTERVAL revisions or whenever the delta would not be
+# smaller than the content. Rebuilding a revision thus reads at most NOTE_REVISIONS_SNAPSHOT_INTERVAL rows.
+
+_COMPACTION_WINDOW_SIZE = 50
+
+
+def _get_revision_delta(previous_content, deltas_count, content):
+    """
+    Returns the delta to store for a revision, or None if the revision must be a snapshot
+    """
+    if content is None or deltas_count + 1 >= app.config.get('NOTE_REVISIONS_SNAPSHOT_INTERVAL'):
+        return None
+
+    delta = make_delta(previous_content, content)
+    if get_delta_size(delta) >= get_text_size(content):
+        return None
+
+    return delta
+
+
+def _get_revisions_chain(note_id, revision_number=None):
+    """
+    Returns the revisions needed to rebuild a revision, from the latest snapshot preceding it
+    """
+    query = NoteRevisions.query.filter(NoteRevisions.note_id == note_id)
+    if revision_number is not None:
+        query = query.filter(NoteRevisions.revision_number <= revision_number)
+
+    snapshot_number = query.with_entities(
+        func.max(NoteRevisions.revision_number)
+    ).filter(
+        NoteRevisions.note_content_delta.is_(None)
+    ).scalar_subquery()
+
+    return query.filter(
+        NoteRevisions.revision_number >= snapshot_number
+    ).order_by(
+        NoteRevisions.revision_number
+    ).all()
+
+
+def _rebuild_content(chain):
+    content = None
+    for revision in chain:
+        if revision.note_content_delta is None:
+            content = revision.note_content
+        else:
+            content = apply_delta(content, revision.note_content_delta)
+
+    return content
+
+
+def _revision_to_dict(revision, content):
+    return {
+        'revision_id': revision.revision_id,
+        'note_id': revision.note_id,
+        'revision_number': revision.revision_number,
+        'note_title': revision.note_title,
+        'note_content': content,
+        'note_user': revision.note_user,
+        'revision_timestamp': revision.revision_timestamp
+    }
+
+
+def get_note_revision_content(note_id, revision_number):
+    """
+    Returns a revision of a note with its content rebuilt
+
+    args:
+        note_id: ID of the note
+        revision_number: number of the revision
+
+    returns:
+        dict of the revision, or None if it does not exist
+    """
+    chain = _get_revisions_chain(note_id, revision_number)
+    if not chain or chain[-1].revision_number != revision_number:
+        return None
+
+    return _revision_to_dict(chain[-1], _rebuild_content(chain))
+
+
+def get_latest_note_revision(note_id):
+    """
+    Returns the latest revision of a note with its content rebuilt
+
+    args:
+        note_id: ID of the note
+
+    returns:
+        dict of the revision, with the number of deltas stored since the last snapshot as deltas_count,
+        or None if the note has no revision
+    """
+    chain = _get_revisions_chain(note_id)
+    if not chain:
+        return None
+
+    revision = _revision_to_dict(chain[-1], _rebuild_content(chain))
+    revision['deltas_count'] = len(chain) - 1
+
+    return revision
+
+
+def add_note_revision(note_id, revision_number, note_title, note_content, user_id, previous_revision=None):
+    """
+    Adds a revision to a note, stored as a delta from the previous revision when possible.
+    Expects a db commit soon after.
+
+    args:
+        note_id: ID of the note
+        revision_number: number of the new revision
+        note_title: title of the note
+        note_content: content of the note
+        user_id: ID of the user saving the revision
+        previous_revision: latest revision of the note, as returned by get_latest_note_revision
+
+    returns:
+        NoteRevisions
+    """
+    delta = None
+    if previous_revision is not None:
+        delta = _get_revision_delta(previous_revision['note_content'], previous_revision['deltas_count'],
+                                    note_content)
+
+    note_revision = NoteRevisions(
+        note_id=note_id,
+        revision_number=revision_number,
+        note_title=note_title,
+        note_content=note_content if delta is None else None,
+        note_content_delta=delta,
+        note_user=user_id,
+        revision_timestamp=datetime.utcnow()
+    )
+    db.session.add(note_revision)
+
+    return note_revision
+
+
+def delete_note_revision(note_id, revision_number):
+    """
+    Deletes a revision of a note. The following revision is turned into a snapshot if it was a delta from it.
+
+    args:
+        note_id: ID of the note
+        revision_number: number of the revision
+
+    returns:
+        True if the revision was deleted, False if it does not exist
+    """
+    note_revision = NoteRevisions.query.filter(
+        NoteRevisions.note_id == note_id,
+        NoteRevisions.revision_number == revision_number
+    ).first()
+    if not note_revision:
+        return False
+
+    next_revision = NoteRevisions.query.filter(
+        NoteRevisions.note_id == note_id,
+        NoteRevisions.revision_number > revision_number
+    ).order_by(
+        NoteRevisions.revision_number
+    ).first()
+
+    if next_revision is not None and next_revision.note_content_delta is not None:
+        next_revision.note_content = _rebuild_content(_get_revisions_chain(note_id, next_revision.revision_number))
+        next_revision.note_content_delta = None
+
+    db.session.delete(note_revision)
+    db.session.commit()
+
+    return True
+
+
+def _compact_note(note_id, stats):
+    revisions = db.session.query(
+        NoteRevisions.revision_id,
+        NoteRevisions.note_content,
+        NoteRevisions.note_content_delta
+    ).filter(
+        NoteRevisions.note_id == note_id
+    ).order_by(
+        NoteRevisions.revision_number
+    ).yield_per(_COMPACTION_WINDOW_SIZE)
+
+    updates = []
+    previous_content = None
+    deltas_count = None
+
+    for revision in revisions:
+        is_delta = revision.note_content_delta is not None
+        if is_delta:
+            content = apply_delta(previous_content, revision.note_content_delta)
+            size_before = get_delta_size(revision.note_content_delta)
+        else:
+            content = revision.note_content
+            size_before = get_text_size(content)
+
+        delta = None
+        if deltas_count is not None:
+            delta = _get_revision_delta(previous_content, deltas_count, content)
+
+        if delta is None:
+            deltas_count = 0
+            stats['bytes_after'] += get_text_size(content)
+            if is_delta:
+                updates.append({'revision_id': revision.revision_id, 'note_content': content,
+                                'note_content_delta': None})
+
+        else:
+            deltas_count += 1
+            if is_delta:
+                # Already a delta from the same content, kept as is
+                stats['bytes_after'] += size_before
+            else:
+                stats['bytes_after'] += get_delta_size(delta)
+                stats['converted'] += 1
+                updates.append({'revision_id': revision.revision_id, 'note_content': None,
+                                'note_content_delta': delta})
+
+        stats['bytes_before'] += size_before
+        stats['revisions'] += 1
+        previous_content = content
+
+        if len(updates) >= _COMPACTION_WINDOW_SIZE:
+            db.session.execute(update(NoteRevisions), updates)
+            updates = []
+
+    if updates:
+        db.session.execute(update(NoteRevisions), updates)
+
+
+def compact_note_revisions(progress_callback=None):
+    """
+    Converts the stored revisions of all the notes to the snapshots and deltas layout, one transaction per note.
+    Revisions stored before deltas were introduced are full snapshots, as well as the ones saved with a different
+    snapshot interval.
+
+    The reclaimed space is the difference of the stored content sizes. Postgres reuses it once the table is vacuumed.
+
+    args:
+        progress_callback: called with the number of notes processed and the total number of notes after each note
+
+    returns:
+        dict of statistics: notes, revisions, converted, bytes_before, bytes_after, bytes_reclaimed
+    """
+    notes_ids = [row.note_id for row in db.session.query(
+        NoteRevisions.note_id
+    ).distinct().order_by(
+        NoteRevisions.note_id
+    ).all()]
+
+    stats = {
+        'notes': len(notes_ids),
+        'revisions': 0,
+        'converted': 0,
+        'bytes_before': 0,
+        'bytes_after': 0
+    }
+
+    for index, note_id in enumerate(notes_ids, start=1):
+        _compact_note(note_id, stats)
+        db.session.commit()
+
+        if progress_callback:
+            progress_callback(index, len(notes_ids))
+
+    stats['bytes_reclaimed'] = stats['bytes_before'] - stats['bytes_after']
+
+    return stats
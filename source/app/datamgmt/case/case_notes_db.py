@@ -18,8 +18,11 @@
 from flask_login import current_user
 from sqlalchemy import and_
 
+from app import app
+from app import cache
 from app import db
 from app.datamgmt.manage.manage_attribute_db import get_default_custom_attributes
+from app.datamgmt.states import get_notes_state
 from app.datamgmt.states import update_notes_state
 from app.models import Comments, NoteDirectory, NoteRevisions
 from app.models import Notes
@@ -29,13 +32,17 @@ from app.models import NotesGroupLink
 from app.models.authorization import User
 
 
-def get_note(note_id, caseid=None):
-    note = Notes.query.filter(and_(
+def get_note(note_id, caseid=None, for_update=False):
+    query = Notes.query.filter(and_(
         Notes.note_id == note_id,
         Notes.note_case_id == caseid
-    )).first()
+    ))
 
-    return note
+    if for_update:
+        # Locks the note until the end of the transaction, so its updates are serialized
+        query = query.with_for_update(of=Notes)
+
+    return query.first()
 
 
 def get_directory(directory_id, caseid):
@@ -60,6 +67,7 @@ def delete_directory(directory, caseid):
 
         # Delete the directory
         db.session.delete(directory)
+        update_notes_state(caseid=caseid)
         db.session.commit()
 
         return True
@@ -383,39 +391,76 @@ def delete_note_comment(note_id, comment_id):
     return True, "Comment deleted"
 
 
-def get_directories_with_note_count(case_id):
-    # Fetch all directories for the given case
-    directories = NoteDirectory.query.filter_by(case_id=case_id).order_by(
+def _build_directories_tree(case_id):
+    directories = NoteDirectory.query.with_entities(
+        NoteDirectory.id,
+        NoteDirectory.name,
+        NoteDirectory.parent_id
+    ).filter(
+        NoteDirectory.case_id == case_id
+    ).order_by(
         NoteDirectory.name.asc()
     ).all()
 
-    # Create a list to store the directories with note counts
-    directories_with_note_count = []
+    notes = Notes.query.with_entities(
+        Notes.note_id,
+        Notes.note_title,
+        Notes.directory_id
+    ).filter(
+        Notes.note_case_id == case_id,
+        Notes.directory_id.isnot(None)
+    ).all()
+
+    directories_notes = {directory.id: [] for directory in directories}
+    for note in notes:
+        if note.directory_id in directories_notes:
+            directories_notes[note.directory_id].append({'id': note.note_id, 'title': note.note_title})
 
-    # For each directory, fetch the subdirectories, note count, and note titles
+    nodes = {}
     for directory in directories:
-        directory_with_note_count = get_directory_with_note_count(directory)
-        notes = [{'id': note.note_id, 'title': note.note_title} for note in directory.notes]
-        # Order by note title
-        notes = sorted(notes, key=lambda note: note['title'])
-        directory_with_note_count['notes'] = notes
-        directories_with_note_count.append(directory_with_note_count)
+        nodes[directory.id] = {
+            'id': directory.id,
+            'name': directory.name,
+            'note_count': len(directories_notes[directory.id]),
+            'subdirectories': []
+        }
 
-    return directories_with_note_count
+    for directory in directories:
+        parent = nodes.get(directory.parent_id)
+        if parent is not None:
+            parent['subdirectories'].append(nodes[directory.id])
 
+    # Every directory is listed at the top level with its notes, its subdirectories being nested without their notes
+    return [
+        {**nodes[directory.id], 'notes': sorted(directories_notes[directory.id], key=lambda note: note['title'])}
+        for directory in directories
+    ]
 
-def get_directory_with_note_count(directory):
-    note_count = Notes.query.filter_by(directory_id=directory.id).count()
 
-    directory_dict = {
-        'id': directory.id,
-        'name': directory.name,
-        'note_count': note_count,
-        'subdirectories': []
-    }
+def get_directories_with_note_count(case_id):
+    """
+    Returns the notes directories of a case, with their subdirectories, number of notes and notes titles.
 
-    if directory.subdirectories:
-        for subdirectory in directory.subdirectories:
-            directory_dict['subdirectories'].append(get_directory_with_note_count(subdirectory))
+    The tree is built from two queries and cached by each process until the notes state of the case changes.
+
+    args:
+        case_id: ID of the case
+
+    returns:
+        list of directories
+    """
+    notes_state = get_notes_state(caseid=case_id)
+    version = notes_state.get('object_state') if notes_state else None
+    cache_key = f'notes_directories_tree_{case_id}'
+
+    if version is not None:
+        cached = cache.get(cache_key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    directories = _build_directories_tree(case_id)
+
+    if version is not None:
+        cache.set(cache_key, (version, directories), timeout=app.config.get('CACHE_DEFAULT_TIMEOUT'))
 
-    return directory_dict
+    return directories
@@ -19,22 +19,43 @@
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 import datetime
+import hashlib
+from collections import Counter
 from pathlib import Path
 
 from flask_login import current_user
 from sqlalchemy import and_
+from sqlalchemy import delete
+from sqlalchemy import event
 from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
 
 from app import app
+from app import cache
 from app import db
 from app.datamgmt.case.case_iocs_db import add_ioc_link
+from app.datamgmt.states import get_datastore_state
+from app.datamgmt.states import update_datastore_state
+from app.iris_engine.utils.uploads import discard_staged_file
+from app.iris_engine.utils.uploads import store_staged_file
 from app.models import CaseReceivedFile
+from app.models import DataStoreBlob
 from app.models import DataStoreFile
 from app.models import DataStorePath
 from app.models import Ioc
 from app.models import IocType
 from app.models import Tlp
 
+# Suffix of the contents renamed until the deletion of their references is committed
+_SET_ASIDE_SUFFIX = '.deleted'
+
+# Keys of the session info holding the contents released by the current transaction
+_RELEASED_CONTENTS = 'datastore_released_contents'
+_SET_ASIDE_CONTENTS = 'datastore_set_aside_contents'
+
 
 def datastore_get_root(cid):
     dsp_root = DataStorePath.query.filter(
@@ -54,23 +75,64 @@ def datastore_get_root(cid):
 
     return dsp_root
 
-def ds_list_tree(cid):
+
+def _get_file_node(dfile):
+    dfnode = dfile._asdict()
+    dfnode['type'] = "file"
+
+    return dfnode
+
+
+def _get_files_query(condition):
+    return DataStoreFile.query.with_entities(
+        *DataStoreFile.__table__.columns
+    ).filter(
+        condition
+    ).order_by(
+        DataStoreFile.file_id
+    )
+
+
+def _build_ds_tree(cid, files_condition=None):
+    """
+    Builds the datastore tree of a case in a single pass over its folders and files. Without files condition, the
+    files of the folders holding more than DATASTORE_TREE_LAZY_FILES files are left out.
+    """
     dsp_root = datastore_get_root(cid)
+    droot_id = f"d-{dsp_root.path_id}"
 
-    dsp = DataStorePath.query.filter(
+    dsp = DataStorePath.query.with_entities(
+        DataStorePath.path_id,
+        DataStorePath.path_name,
+        DataStorePath.path_parent_id
+    ).filter(
         and_(DataStorePath.path_case_id == cid,
              DataStorePath.path_is_root == False
              )
     ).order_by(
-        DataStorePath.path_parent_id
+        DataStorePath.path_parent_id,
+        DataStorePath.path_id
     ).all()
 
-    dsf = DataStoreFile.query.filter(
-        DataStoreFile.file_case_id == cid
-    ).all()
+    lazy_paths = {}
+    if files_condition is None:
+        files_condition = (DataStoreFile.file_case_id == cid)
+
+        # The files of the largest folders are loaded on demand
+        files_counts = DataStoreFile.query.with_entities(
+            DataStoreFile.file_parent_id,
+            func.count(DataStoreFile.file_id)
+        ).filter(
+            files_condition
+        ).group_by(
+            DataStoreFile.file_parent_id
+        ).all()
+        lazy_threshold = app.config.get('DATASTORE_TREE_LAZY_FILES')
+        lazy_paths = {parent_id: count for parent_id, count in files_counts if count > lazy_threshold}
 
-    dsp_root = dsp_root
-    droot_id = f"d-{dsp_root.path_id}"
+    dsf = _get_files_query(files_condition)
+    if lazy_paths:
+        dsf = dsf.filter(DataStoreFile.file_parent_id.notin_(lazy_paths.keys()))
 
     path_tree = {
         droot_id: {
@@ -81,54 +143,82 @@ def ds_list_tree(cid):
         }
     }
 
-    droot_children = path_tree[droot_id]["children"]
+    nodes = {droot_id: path_tree[droot_id]}
+    for dpath in dsp:
+        path_node = {
+            "name": dpath.path_name,
+            "type": "directory",
+            "children": {}
+        }
+        if dpath.path_id in lazy_paths:
+            path_node["lazy"] = True
+            path_node["files_count"] = lazy_paths[dpath.path_id]
+
+        nodes[f"d-{dpath.path_id}"] = path_node
 
-    files_nodes = {}
+    # Files come first in the children of their folder, followed by the subfolders
+    for dfile in dsf.all():
+        parent_node = nodes.get(f"d-{dfile.file_parent_id}")
+        if parent_node is not None:
+            parent_node["children"][f"f-{dfile.file_id}"] = _get_file_node(dfile)
 
-    for dfile in dsf:
-        dfnode = dfile.__dict__
-        dfnode.pop('_sa_instance_state')
-        dfnode['type'] = "file"
-        dnode_id = f"f-{dfile.file_id}"
-        dnode_parent_id = f"d-{dfile.file_parent_id}"
+    for dpath in dsp:
+        parent_node = nodes.get(f"d-{dpath.path_parent_id}")
+        if parent_node is not None:
+            parent_node["children"][f"d-{dpath.path_id}"] = nodes[f"d-{dpath.path_id}"]
 
-        if dnode_parent_id == droot_id:
-            droot_children.update({
-                dnode_id: dfnode
-            })
+    return path_tree
 
-        elif dnode_parent_id in files_nodes:
-            files_nodes[dnode_parent_id].update({
-                dnode_id: dfnode
-            })
 
-        else:
-            files_nodes[dnode_parent_id] = {dnode_id: dfnode}
+def ds_list_tree(cid):
+    """
+    Returns the datastore tree of a case. Folders holding more than DATASTORE_TREE_LAZY_FILES files are returned
+    without their files, flagged as lazy, and their files are listed by ds_list_node_files.
 
-    for dpath in dsp:
-        dpath_id = f"d-{dpath.path_id}"
-        dpath_parent_id = f"d-{dpath.path_parent_id}"
-        path_node = {
-            dpath_id: {
-                "name": dpath.path_name,
-                "type": "directory",
-                "children": {}
-            }
-        }
+    The tree is cached by each process until the datastore state of the case changes.
 
-        path_node_files = files_nodes.get(dpath_id)
-        if path_node_files:
-            path_node[dpath_id]["children"].update(path_node_files)
+    args:
+        cid: case ID
 
-        if dpath_parent_id == droot_id:
-            droot_children.update(path_node)
+    returns:
+        dict
+    """
+    datastore_state = get_datastore_state(caseid=cid)
+    version = datastore_state.get('object_state') if datastore_state else None
+    cache_key = f'datastore_tree_{cid}'
 
-        else:
-            datastore_iter_tree(dpath_parent_id, path_node, droot_children)
+    cached = cache.get(cache_key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    path_tree = _build_ds_tree(cid)
+    cache.set(cache_key, (version, path_tree), timeout=app.config.get('CACHE_DEFAULT_TIMEOUT'))
 
     return path_tree
 
 
+def ds_list_node_files(node_id, cid):
+    """
+    Returns the files of a datastore folder, as nodes of the datastore tree
+
+    args:
+        node_id: ID of the folder
+        cid: case ID
+
+    returns:
+        dict, or None if the folder does not exist in the case
+    """
+    if datastore_get_path_node(node_id, cid) is None:
+        return None
+
+    dsf = _get_files_query(
+        and_(DataStoreFile.file_case_id == cid,
+             DataStoreFile.file_parent_id == node_id)
+    ).all()
+
+    return {f"f-{dfile.file_id}": _get_file_node(dfile) for dfile in dsf}
+
+
 def init_ds_tree(cid):
     dsp_root = DataStorePath.query.filter(
         and_(DataStorePath.path_case_id == cid,
@@ -156,22 +246,11 @@ def init_ds_tree(cid):
         dsp_init.path_is_root = False
         db.session.add(dsp_init)
 
+    update_datastore_state(caseid=cid)
     db.session.commit()
     return dsp_root
 
 
-def datastore_iter_tree(path_parent_id, path_node, tree):
-    for parent_id, node in tree.items():
-        if parent_id == path_parent_id:
-            node["children"].update(path_node)
-            return tree
-
-        if isinstance(node, dict):
-            datastore_iter_tree(path_parent_id, path_node, node)
-
-    return None
-
-
 def datastore_add_child_node(parent_node, folder_name, cid):
     try:
 
@@ -193,6 +272,7 @@ def datastore_add_child_node(parent_node, folder_name, cid):
     dsp.path_is_root = False
 
     db.session.add(dsp)
+    update_datastore_state(caseid=cid)
     db.session.commit()
 
     return False, 'Folder added', dsp
@@ -213,6 +293,7 @@ def datastore_rename_node(parent_node, folder_name, cid):
         return True, 'Parent node is invalid for this case', None
 
     dsp_base.path_name = folder_name
+    update_datastore_state(caseid=cid)
     db.session.commit()
 
     return False, 'Folder renamed', dsp_base
@@ -234,6 +315,9 @@ def datastore_delete_node(node_id, cid):
 
     datastore_iter_deletion(dsp_base, cid)
 
+    update_datastore_state(caseid=cid)
+    db.session.commit()
+
     return False, 'Folder and children deleted'
 
 
@@ -262,14 +346,8 @@ def datastore_delete_files_of_path(node_id, cid):
              )
     ).all()
 
-    for dsf_list_item in dsf_list:
-
-        fln = Path(dsf_list_item.file_local_name)
-        if fln.is_file():
-            fln.unlink(missing_ok=True)
-
-        db.session.delete(dsf_list_item)
-        db.session.commit()
+    datastore_delete_files(dsf_list)
+    db.session.commit()
 
     return
 
@@ -296,27 +374,364 @@ def datastore_get_interactive_path_node(cid):
         dsp.path_is_root = False
 
         db.session.add(dsp)
+        update_datastore_state(caseid=cid)
         db.session.commit()
 
     return dsp
 
 
-def datastore_get_standard_path(datastore_file, cid):
-    root_path = Path(app.config['DATASTORE_PATH'])
+def _get_blob_key(file_hash, password):
+    # Encrypted archives of the same content differ, they are shared by the files with the same password only
+    if not password:
+        return file_hash
 
-    if datastore_file.file_is_ioc:
-        target_path = root_path / 'IOCs'
-    elif datastore_file.file_is_evidence:
-        target_path = root_path / 'Evidences'
-    else:
-        target_path = root_path / 'Regulars'
+    return f"{file_hash}-{hashlib.sha256(password.encode('utf-8')).hexdigest()[:32].upper()}"
 
-    target_path = target_path / f"case-{cid}"
+
+def _get_blob_location(blob_key):
+    target_path = Path(app.config['DATASTORE_PATH']) / 'Blobs' / blob_key[:2]
 
     if not target_path.is_dir():
         target_path.mkdir(parents=True, exist_ok=True)
 
-    return target_path / f"dsf-{datastore_file.file_uuid}"
+    return target_path / blob_key
+
+
+def _reference_blob(file_hash, password):
+    """
+    Adds a reference to the blob of a content, creating the blob row if there is none.
+    Returns the blob and whether its content must be stored.
+    """
+    blob_key = _get_blob_key(file_hash, password)
+    location = _get_blob_location(blob_key)
+
+    # Concurrent references to the same content wait on the blob row until the first one is stored and committed
+    blob_id, blob_refcount = db.session.execute(
+        pg_insert(DataStoreBlob).values(
+            blob_key=blob_key,
+            blob_sha256=file_hash,
+            blob_local_name=location.as_posix() + ('.zip' if password else ''),
+            blob_size=0,
+            blob_refcount=1,
+            blob_date_added=datetime.datetime.now()
+        ).on_conflict_do_update(
+            index_elements=[DataStoreBlob.blob_key],
+            set_={'blob_refcount': DataStoreBlob.blob_refcount + 1}
+        ).returning(
+            DataStoreBlob.blob_id,
+            DataStoreBlob.blob_refcount
+        )
+    ).one()
+
+    blob = db.session.get(DataStoreBlob, blob_id)
+
+    return blob, blob_refcount == 1 or not Path(blob.blob_local_name).is_file()
+
+
+def datastore_store_blob(staged_file, password=None):
+    """
+    References the blob holding the content of a staged file, storing the file as a new blob if there is none.
+    The staged file is discarded when the blob already exists.
+    Expects a db commit soon after, which releases the lock held on the blob.
+
+    args:
+        staged_file: StagedFile to store
+        password: password of the archive the content is stored in, or None to store it as is
+
+    returns:
+        DataStoreBlob
+    """
+    blob, is_new = _reference_blob(staged_file.sha256, password)
+
+    if is_new:
+        location = _get_blob_location(blob.blob_key)
+        blob.blob_local_name = store_staged_file(staged_file, location, password)
+        blob.blob_size = Path(blob.blob_local_name).stat().st_size
+
+    else:
+        discard_staged_file(staged_file)
+
+    return blob
+
+
+def datastore_release_blobs(blobs_references):
+    """
+    Removes references to blobs, and deletes the blobs left without references. Their contents are removed from
+    the disk once the transaction is committed.
+    The files referencing them must be deleted or flushed beforehand. Expects a db commit soon after.
+
+    args:
+        blobs_references: dict of the number of references removed per blob ID
+    """
+    for blob_id, references_count in blobs_references.items():
+        blob = db.session.execute(
+            update(DataStoreBlob).where(
+                DataStoreBlob.blob_id == blob_id
+            ).values(
+                blob_refcount=DataStoreBlob.blob_refcount - references_count
+            ).returning(
+                DataStoreBlob.blob_refcount,
+                DataStoreBlob.blob_local_name
+            ).execution_options(synchronize_session=False)
+        ).one_or_none()
+
+        if blob is None or blob.blob_refcount > 0:
+            continue
+
+        # Deleted while the row is locked, so a concurrent upload of the same content stores it again
+        db.session.execute(delete(DataStoreBlob).where(DataStoreBlob.blob_id == blob_id))
+        _release_contents_on_commit([blob.blob_local_name])
+
+
+def datastore_set_file_content(dsf, staged_file):
+    """
+    Sets the content of a datastore file to a staged file. The content is stored in a blob shared with the files
+    with the same content and password, and the previous content of the file is released.
+    Expects a db commit soon after.
+
+    args:
+        dsf: DataStoreFile
+        staged_file: StagedFile of the new content
+    """
+    previous_blob_id = dsf.file_blob_id
+    previous_local_name = dsf.file_local_name
+
+    blob = datastore_store_blob(staged_file, dsf.file_password or None)
+    dsf.file_blob_id = blob.blob_id
+    dsf.file_local_name = blob.blob_local_name
+    dsf.file_size = staged_file.size
+    dsf.file_sha256 = staged_file.sha256
+    db.session.flush()
+
+    if previous_blob_id is not None:
+        datastore_release_blobs({previous_blob_id: 1})
+
+    elif previous_local_name not in (None, 'tmp_xc', blob.blob_local_name):
+        # Files stored before blobs have their own copy
+        _release_contents_on_commit([previous_local_name])
+
+
+def datastore_delete_files(dsf_list):
+    """
+    Deletes datastore files and releases their content. Expects a db commit soon after.
+
+    args:
+        dsf_list: list of DataStoreFile
+    """
+    blobs_references = Counter()
+    for dsf in dsf_list:
+        if dsf.file_blob_id is not None:
+            blobs_references[dsf.file_blob_id] += 1
+
+        elif dsf.file_local_name not in (None, 'tmp_xc'):
+            _release_contents_on_commit([dsf.file_local_name])
+
+        db.session.delete(dsf)
+
+    db.session.flush()
+    datastore_release_blobs(blobs_references)
+
+
+def datastore_delete_case_files(case_id):
+    """
+    Deletes the datastore files and folders of a case with set-based statements, and releases their blobs.
+    Contents are left on the disk, so they can be kept if the transaction is rolled back. Expects a db commit
+    soon after.
+
+    args:
+        case_id: ID of the case
+
+    returns:
+        list of the paths of the contents no longer referenced, to set aside with datastore_set_aside_contents
+    """
+    case_files = DataStoreFile.file_case_id == case_id
+
+    legacy_paths = db.session.execute(
+        select(DataStoreFile.file_local_name).where(case_files, DataStoreFile.file_blob_id.is_(None))
+    ).scalars().all()
+
+    references = select(
+        DataStoreFile.file_blob_id.label('blob_id'),
+        func.count().label('references_count')
+    ).where(
+        case_files,
+        DataStoreFile.file_blob_id.isnot(None)
+    ).group_by(
+        DataStoreFile.file_blob_id
+    ).subquery()
+
+    released_blobs = db.session.execute(
+        update(DataStoreBlob).where(
+            DataStoreBlob.blob_id == references.c.blob_id
+        ).values(
+            blob_refcount=DataStoreBlob.blob_refcount - references.c.references_count
+        ).returning(
+            DataStoreBlob.blob_id,
+            DataStoreBlob.blob_refcount,
+            DataStoreBlob.blob_local_name
+        ).execution_options(synchronize_session=False)
+    ).all()
+    orphan_blobs = [blob for blob in released_blobs if blob.blob_refcount <= 0]
+
+    db.session.execute(delete(DataStoreFile).where(case_files).execution_options(synchronize_session=False))
+    db.session.execute(delete(DataStorePath).where(
+        DataStorePath.path_case_id == case_id
+    ).execution_options(synchronize_session=False))
+
+    if orphan_blobs:
+        db.session.execute(delete(DataStoreBlob).where(
+            DataStoreBlob.blob_id.in_([blob.blob_id for blob in orphan_blobs])
+        ).execution_options(synchronize_session=False))
+
+    return [path for path in legacy_paths if path not in (None, 'tmp_xc')] + \
+        [blob.blob_local_name for blob in orphan_blobs]
+
+
+def datastore_set_aside_contents(paths):
+    """
+    Renames contents about to be deleted, right before the commit deleting their references. The blobs rows are
+    still locked, so a concurrent upload of the same content waits for the commit and stores it again under its
+    original name.
+
+    args:
+        paths: list of the paths of the contents
+
+    returns:
+        list of the paths of the contents set aside, to pass to datastore_remove_contents once committed, or to
+        datastore_restore_contents if rolled back
+    """
+    set_aside_paths = []
+    for path in paths:
+        set_aside_path = Path(f'{path}{_SET_ASIDE_SUFFIX}')
+        try:
+            Path(path).replace(set_aside_path)
+        except FileNotFoundError:
+            continue
+
+        set_aside_paths.append(set_aside_path)
+
+    return set_aside_paths
+
+
+def datastore_restore_contents(set_aside_paths):
+    """
+    Restores contents set aside by datastore_set_aside_contents whose deletion was rolled back
+    """
+    for set_aside_path in set_aside_paths:
+        set_aside_path.replace(set_aside_path.with_name(set_aside_path.name[:-len(_SET_ASIDE_SUFFIX)]))
+
+
+def datastore_remove_contents(set_aside_paths):
+    """
+    Removes from the disk contents set aside by datastore_set_aside_contents whose deletion was committed
+    """
+    for set_aside_path in set_aside_paths:
+        set_aside_path.unlink(missing_ok=True)
+
+
+def _release_contents_on_commit(paths):
+    """
+    Removes contents from the disk once the transaction deleting their references is committed. They are set
+    aside right before the commit, and restored if it fails.
+    """
+    db.session.info.setdefault(_RELEASED_CONTENTS, []).extend(paths)
+
+
+@event.listens_for(Session, 'before_commit')
+def _set_aside_released_contents(session):
+    released_contents = session.info.pop(_RELEASED_CONTENTS, None)
+    if released_contents:
+        session.info.setdefault(_SET_ASIDE_CONTENTS, []).extend(datastore_set_aside_contents(released_contents))
+
+
+@event.listens_for(Session, 'after_commit')
+def _remove_released_contents(session):
+    datastore_remove_contents(session.info.pop(_SET_ASIDE_CONTENTS, []))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _restore_released_contents(session):
+    session.info.pop(_RELEASED_CONTENTS, None)
+    datastore_restore_contents(session.info.pop(_SET_ASIDE_CONTENTS, []))
+
+
+def datastore_deduplicate_files(progress_callback=None):
+    """
+    Moves the files stored before blobs were introduced to blobs, one transaction per file. The copies of the
+    contents that are already in a blob are deleted.
+
+    args:
+        progress_callback: called with the number of files processed and the total number of files after each file
+
+    returns:
+        dict of statistics: files, moved, deduplicated, bytes_reclaimed
+    """
+    files_ids = [row.file_id for row in DataStoreFile.query.with_entities(
+        DataStoreFile.file_id
+    ).filter(
+        DataStoreFile.file_blob_id.is_(None),
+        DataStoreFile.file_sha256.isnot(None)
+    ).order_by(
+        DataStoreFile.file_id
+    ).all()]
+
+    stats = {
+        'files': len(files_ids),
+        'moved': 0,
+        'deduplicated': 0,
+        'bytes_reclaimed': 0
+    }
+
+    for index, file_id in enumerate(files_ids, start=1):
+        dsf = db.session.get(DataStoreFile, file_id)
+        local_path = Path(dsf.file_local_name) if dsf is not None else None
+
+        if local_path is not None and dsf.file_blob_id is None and local_path.is_file():
+            # Stored contents are already encrypted with the password of the file
+            blob, is_new = _reference_blob(dsf.file_sha256, dsf.file_password or None)
+            if is_new:
+                local_path.replace(blob.blob_local_name)
+                blob.blob_size = Path(blob.blob_local_name).stat().st_size
+                stats['moved'] += 1
+
+            else:
+                stats['bytes_reclaimed'] += local_path.stat().st_size
+                _release_contents_on_commit([local_path])
+                stats['deduplicated'] += 1
+
+            dsf.file_blob_id = blob.blob_id
+            dsf.file_local_name = blob.blob_local_name
+            update_datastore_state(caseid=dsf.file_case_id)
+            db.session.commit()
+
+        if progress_callback:
+            progress_callback(index, len(files_ids))
+
+    return stats
+
+
+def datastore_get_blobs_stats():
+    """
+    Returns the storage statistics of the datastore blobs
+
+    returns:
+        dict with the number of blobs and of files referencing them, the bytes stored, the bytes the files would
+        take without deduplication, and the bytes saved
+    """
+    blobs_count, files_count, stored_bytes, referenced_bytes = db.session.query(
+        func.count(DataStoreBlob.blob_id),
+        func.coalesce(func.sum(DataStoreBlob.blob_refcount), 0),
+        func.coalesce(func.sum(DataStoreBlob.blob_size), 0),
+        func.coalesce(func.sum(DataStoreBlob.blob_size * DataStoreBlob.blob_refcount), 0)
+    ).one()
+
+    return {
+        'blobs': blobs_count,
+        'files': int(files_count),
+        'stored_bytes': int(stored_bytes),
+        'referenced_bytes': int(referenced_bytes),
+        'bytes_saved': int(referenced_bytes - stored_bytes)
+    }
 
 
 def datastore_get_file(file_id, cid):
@@ -337,11 +752,8 @@ def datastore_delete_file(cur_id, cid):
     if dsf is None:
         return True, 'Invalid DS file ID for this case'
 
-    fln = Path(dsf.file_local_name)
-    if fln.is_file():
-        fln.unlink(missing_ok=True)
-
-    db.session.delete(dsf)
+    datastore_delete_files([dsf])
+    update_datastore_state(caseid=cid)
     db.session.commit()
 
     return False, f'File {cur_id} deleted'
@@ -472,93 +884,11 @@ def datastore_filter_tree(filter_d, caseid):
         condition = and_(condition,
                          (DataStoreFile.file_password != ""))
 
-    dsp_root = DataStorePath.query.filter(
-        and_(DataStorePath.path_case_id == caseid,
-             DataStorePath.path_is_root == True
-             )
-    ).first()
-
-    if dsp_root is None:
-        init_ds_tree(caseid)
-
-        dsp_root = DataStorePath.query.filter(
-            and_(DataStorePath.path_case_id == caseid,
-                 DataStorePath.path_is_root == True
-                 )
-        ).first()
-
-    dsp = DataStorePath.query.filter(
-        and_(DataStorePath.path_case_id == caseid,
-             DataStorePath.path_is_root == False
-             )
-    ).order_by(
-        DataStorePath.path_parent_id
-    ).all()
-
     try:
-        dsf = DataStoreFile.query.filter(
-            condition
-        ).all()
+        path_tree = _build_ds_tree(caseid, files_condition=condition)
 
     except Exception as e:
         return None, str(e)
 
-    dsp_root = dsp_root
-    droot_id = f"d-{dsp_root.path_id}"
-
-    path_tree = {
-        droot_id: {
-            "name": dsp_root.path_name,
-            "type": "directory",
-            "is_root": True,
-            "children": {}
-        }
-    }
-
-    droot_children = path_tree[droot_id]["children"]
-
-    files_nodes = {}
-
-    for dfile in dsf:
-        dfnode = dfile.__dict__
-        dfnode.pop('_sa_instance_state')
-        dfnode['type'] = "file"
-        dnode_id = f"f-{dfile.file_id}"
-        dnode_parent_id = f"d-{dfile.file_parent_id}"
-
-        if dnode_parent_id == droot_id:
-            droot_children.update({
-                dnode_id: dfnode
-            })
-
-        elif dnode_parent_id in files_nodes:
-            files_nodes[dnode_parent_id].update({
-                dnode_id: dfnode
-            })
-
-        else:
-            files_nodes[dnode_parent_id] = {dnode_id: dfnode}
-
-    for dpath in dsp:
-        dpath_id = f"d-{dpath.path_id}"
-        dpath_parent_id = f"d-{dpath.path_parent_id}"
-        path_node = {
-            dpath_id: {
-                "name": dpath.path_name,
-                "type": "directory",
-                "children": {}
-            }
-        }
-
-        path_node_files = files_nodes.get(dpath_id)
-        if path_node_files:
-            path_node[dpath_id]["children"].update(path_node_files)
-
-        if dpath_parent_id == droot_id:
-            droot_children.update(path_node)
-
-        else:
-            datastore_iter_tree(dpath_parent_id, path_node, droot_children)
-
     return path_tree, 'Success'
 
@@ -20,6 +20,7 @@ import datetime
 from flask_login import current_user
 
 from app import db, app
+from app.iris_engine.module_handler.module_registry import invalidate_modules_registry
 from app.models import IrisHook
 from app.models import IrisModule
 from app.models import IrisModuleHook
@@ -61,6 +62,8 @@ def iris_module_add(module_name, module_human_name, module_description,
     except Exception:
         return None
 
+    invalidate_modules_registry()
+
     return im
 
 
@@ -93,6 +96,7 @@ def iris_module_save_parameter(mod_id, mod_config, parameter, value, section=Non
             mod_config[index]["value"] = value
             data.module_config = mod_config
             db.session.commit()
+            invalidate_modules_registry()
             return True
 
         index += 1
@@ -105,6 +109,7 @@ def iris_module_enable_by_id(module_id):
     if data:
         data.is_active = True
         db.session.commit()
+        invalidate_modules_registry()
         return True
     return False
 
@@ -114,6 +119,7 @@ def iris_module_disable_by_id(module_id):
     if data:
         data.is_active = False
         db.session.commit()
+        invalidate_modules_registry()
         return True
     return False
 
@@ -199,6 +205,7 @@ def delete_module_from_id(module_id):
 
     IrisModule.query.filter(IrisModule.id == module_id).delete()
     db.session.commit()
+    invalidate_modules_registry()
     return True
 
 
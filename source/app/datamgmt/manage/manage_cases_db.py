@@ -18,18 +18,27 @@
 from datetime import datetime
 from datetime import date
 from datetime import timedelta
-from pathlib import Path
 
 from sqlalchemy import and_, desc, asc
+from sqlalchemy import delete
+from sqlalchemy import exists
+from sqlalchemy import select
+from sqlalchemy import update
 from sqlalchemy.orm import aliased
 from functools import reduce
 
 from app import db, app
 from app.datamgmt.alerts.alerts_db import search_alert_resolution_by_name
 from app.datamgmt.case.case_db import get_case_tags
+from app.datamgmt.datastore.datastore_db import datastore_delete_case_files
+from app.datamgmt.datastore.datastore_db import datastore_remove_contents
+from app.datamgmt.datastore.datastore_db import datastore_restore_contents
+from app.datamgmt.datastore.datastore_db import datastore_set_aside_contents
 from app.datamgmt.manage.manage_case_state_db import get_case_state_by_name
 from app.datamgmt.authorization import has_deny_all_access_level
-from app.datamgmt.states import delete_case_states
+from app.iris_engine.access_control.utils import ac_bump_access_version
+from app.iris_engine.reporter.report_cache import remove_case_reports
+from app.models import AssetComments
 from app.models import CaseAssets, NoteRevisions
 from app.models import CaseClassification
 from app.models import alert_assets_association
@@ -40,21 +49,30 @@ from app.models import Tags
 from app.models import CaseEventCategory
 from app.models import CaseEventsAssets
 from app.models import CaseEventsIoc
+from app.models import CaseGraphAssets
+from app.models import CaseGraphLinks
+from app.models import CaseKanban
 from app.models import CaseReceivedFile
 from app.models import CaseTasks
 from app.models import Cases
 from app.models import CasesEvent
+from app.models import CasesAssetsExt
 from app.models import Client
-from app.models import DataStoreFile
-from app.models import DataStorePath
+from app.models import Comments
+from app.models import EventComments
+from app.models import EvidencesComments
 from app.models import IocAssetLink
+from app.models import IocComments
 from app.models import IocLink
+from app.models import IrisReport
 from app.models import Notes
+from app.models import NotesComments
 from app.models import NotesGroup
 from app.models import NotesGroupLink
+from app.models import ObjectState
+from app.models import TaskComments
 from app.models import UserActivity
 from app.models.alerts import AlertCaseAssociation
-from app.models.authorization import CaseAccessLevel
 from app.models.authorization import GroupCaseAccess
 from app.models.authorization import OrganisationCaseAccess
 from app.models.authorization import User
@@ -167,10 +185,9 @@ def list_cases_dict(user_id):
 def user_list_cases_view(user_id):
     res = UserCaseEffectiveAccess.query.with_entities(
         UserCaseEffectiveAccess.case_id
-    ).filter(and_(
-        UserCaseEffectiveAccess.user_id == user_id,
-        UserCaseEffectiveAccess.access_level != CaseAccessLevel.deny_all.value
-    )).all()
+    ).filter(
+        UserCaseEffectiveAccess.user_id == user_id
+    ).all()
 
     return [r.case_id for r in res]
 
@@ -310,93 +327,104 @@ def get_case_details_rt(case_id):
     return res
 
 
-def delete_case(case_id):
-    if not Cases.query.filter(Cases.case_id == case_id).first():
-        return False
-
-    delete_case_states(caseid=case_id)
-    UserActivity.query.filter(UserActivity.case_id == case_id).delete()
-    CaseReceivedFile.query.filter(CaseReceivedFile.case_id == case_id).delete()
-    IocLink.query.filter(IocLink.case_id == case_id).delete()
-
-    CaseTags.query.filter(CaseTags.case_id == case_id).delete()
-    CaseProtagonist.query.filter(CaseProtagonist.case_id == case_id).delete()
-    AlertCaseAssociation.query.filter(AlertCaseAssociation.case_id == case_id).delete()
-
-    dsf_list = DataStoreFile.query.filter(DataStoreFile.file_case_id == case_id).all()
-
-    for dsf_list_item in dsf_list:
-
-        fln = Path(dsf_list_item.file_local_name)
-        if fln.is_file():
-            fln.unlink(missing_ok=True)
-
-        db.session.delete(dsf_list_item)
-    db.session.commit()
-
-    DataStorePath.query.filter(DataStorePath.path_case_id == case_id).delete()
-
-    da = CaseAssets.query.with_entities(CaseAssets.asset_id).filter(CaseAssets.case_id == case_id).all()
-    for asset in da:
-        IocAssetLink.query.filter(asset.asset_id == asset.asset_id).delete()
-
-    CaseEventsAssets.query.filter(CaseEventsAssets.case_id == case_id).delete()
-    CaseEventsIoc.query.filter(CaseEventsIoc.case_id == case_id).delete()
-
-    CaseAssetsAlias = aliased(CaseAssets)
-
-    # Query for CaseAssets that are not referenced in alerts and match the case_id
-    assets_to_delete = db.session.query(CaseAssets).filter(
-        and_(
-            CaseAssets.case_id == case_id,
-            ~db.session.query(alert_assets_association).filter(
-                alert_assets_association.c.asset_id == CaseAssetsAlias.asset_id
-            ).exists()
-        )
-    )
-
-    # Delete the assets
-    assets_to_delete.delete(synchronize_session='fetch')
-
-    # Get all alerts associated with assets in the case
-    alerts_to_update = db.session.query(CaseAssets).filter(CaseAssets.case_id == case_id)
-
-    # Update case_id for the alerts
-    alerts_to_update.update({CaseAssets.case_id: None}, synchronize_session='fetch')
-    db.session.commit()
+def _get_case_deletion_statements(case_id):
+    """
+    Returns the statements deleting the data of a case, in dependency order
+    """
+    case_assets = select(CaseAssets.asset_id).where(CaseAssets.case_id == case_id)
+    case_comments = select(Comments.comment_id).where(Comments.comment_case_id == case_id)
+    case_events = select(CasesEvent.event_id).where(CasesEvent.case_id == case_id)
+    case_notes = select(Notes.note_id).where(Notes.note_case_id == case_id)
+    case_tasks = select(CaseTasks.id).where(CaseTasks.task_case_id == case_id)
+    alerts_assets = exists().where(alert_assets_association.c.asset_id == CaseAssets.asset_id)
+
+    return [
+        delete(ObjectState).where(ObjectState.object_case_id == case_id),
+        delete(UserActivity).where(UserActivity.case_id == case_id),
+
+        delete(EventComments).where(EventComments.comment_id.in_(case_comments)),
+        delete(TaskComments).where(TaskComments.comment_id.in_(case_comments)),
+        delete(IocComments).where(IocComments.comment_id.in_(case_comments)),
+        delete(AssetComments).where(AssetComments.comment_id.in_(case_comments)),
+        delete(EvidencesComments).where(EvidencesComments.comment_id.in_(case_comments)),
+        delete(NotesComments).where(NotesComments.comment_id.in_(case_comments)),
+        delete(Comments).where(Comments.comment_case_id == case_id),
+
+        delete(CaseReceivedFile).where(CaseReceivedFile.case_id == case_id),
+        delete(IocLink).where(IocLink.case_id == case_id),
+        delete(CaseTags).where(CaseTags.case_id == case_id),
+        delete(CaseProtagonist).where(CaseProtagonist.case_id == case_id),
+        delete(AlertCaseAssociation).where(AlertCaseAssociation.case_id == case_id),
+
+        delete(IocAssetLink).where(IocAssetLink.asset_id.in_(case_assets)),
+        delete(CaseEventsAssets).where(CaseEventsAssets.case_id == case_id),
+        delete(CaseEventsIoc).where(CaseEventsIoc.case_id == case_id),
+        delete(CaseEventCategory).where(CaseEventCategory.event_id.in_(case_events)),
+        delete(CasesEvent).where(CasesEvent.case_id == case_id),
+
+        # Assets referenced by alerts are kept, detached from the case
+        delete(CaseAssets).where(CaseAssets.case_id == case_id, ~alerts_assets),
+        update(CaseAssets).where(CaseAssets.case_id == case_id).values(case_id=None),
+
+        # Legacy notes groups
+        delete(NotesGroupLink).where(NotesGroupLink.case_id == case_id),
+        delete(NotesGroup).where(NotesGroup.group_case_id == case_id),
+
+        delete(NoteRevisions).where(NoteRevisions.note_id.in_(case_notes)),
+        delete(Notes).where(Notes.note_case_id == case_id),
+        delete(NoteDirectory).where(NoteDirectory.case_id == case_id),
+
+        delete(TaskAssignee).where(TaskAssignee.task_id.in_(case_tasks)),
+        delete(CaseTasks).where(CaseTasks.task_case_id == case_id),
+
+        delete(CaseGraphLinks).where(CaseGraphLinks.case_id == case_id),
+        delete(CaseGraphAssets).where(CaseGraphAssets.case_id == case_id),
+        delete(CasesAssetsExt).where(CasesAssetsExt.case_id == case_id),
+        delete(CaseKanban).where(CaseKanban.case_id == case_id),
+        delete(IrisReport).where(IrisReport.case_id == case_id),
+
+        delete(UserCaseAccess).where(UserCaseAccess.case_id == case_id),
+        delete(UserCaseEffectiveAccess).where(UserCaseEffectiveAccess.case_id == case_id),
+        delete(GroupCaseAccess).where(GroupCaseAccess.case_id == case_id),
+        delete(OrganisationCaseAccess).where(OrganisationCaseAccess.case_id == case_id),
+
+        delete(Cases).where(Cases.case_id == case_id)
+    ]
 
-    # Legacy code
-    NotesGroupLink.query.filter(NotesGroupLink.case_id == case_id).delete()
-    NotesGroup.query.filter(NotesGroup.group_case_id == case_id).delete()
 
-    NoteRevisions.query.filter(
-        and_(
-            Notes.note_case_id == case_id,
-            NoteRevisions.note_id == Notes.note_id
-        )
-    ).delete()
+def delete_case(case_id):
+    """
+    Deletes a case and all its data in one transaction, with one set-based statement per table. The datastore
+    contents of the case are removed from the disk once the transaction is committed.
 
-    Notes.query.filter(Notes.note_case_id == case_id).delete()
-    NoteDirectory.query.filter(NoteDirectory.case_id == case_id).delete()
+    args:
+        case_id: ID of the case
 
-    tasks = CaseTasks.query.filter(CaseTasks.task_case_id == case_id).all()
-    for task in tasks:
-        TaskAssignee.query.filter(TaskAssignee.task_id == task.id).delete()
-        CaseTasks.query.filter(CaseTasks.id == task.id).delete()
+    returns:
+        True if the case was deleted, False if it does not exist
+    """
+    # Locked until the commit, so concurrent deletions of the case wait and find nothing to delete
+    if not db.session.execute(select(Cases.case_id).where(Cases.case_id == case_id).with_for_update()).first():
+        db.session.rollback()
+        return False
 
-    da = CasesEvent.query.with_entities(CasesEvent.event_id).filter(CasesEvent.case_id == case_id).all()
-    for event in da:
-        CaseEventCategory.query.filter(CaseEventCategory.event_id == event.event_id).delete()
+    set_aside_contents = []
+    try:
+        released_contents = datastore_delete_case_files(case_id)
+        for statement in _get_case_deletion_statements(case_id):
+            db.session.execute(statement.execution_options(synchronize_session=False))
 
-    CasesEvent.query.filter(CasesEvent.case_id == case_id).delete()
+        set_aside_contents = datastore_set_aside_contents(released_contents)
+        db.session.commit()
 
-    UserCaseAccess.query.filter(UserCaseAccess.case_id == case_id).delete()
-    UserCaseEffectiveAccess.query.filter(UserCaseEffectiveAccess.case_id == case_id).delete()
-    GroupCaseAccess.query.filter(GroupCaseAccess.case_id == case_id).delete()
-    OrganisationCaseAccess.query.filter(OrganisationCaseAccess.case_id == case_id).delete()
+    except Exception:
+        db.session.rollback()
+        datastore_restore_contents(set_aside_contents)
+        raise
 
-    Cases.query.filter(Cases.case_id == case_id).delete()
-    db.session.commit()
+    datastore_remove_contents(set_aside_contents)
+    ac_bump_access_version()
+    remove_case_reports(case_id)
 
     return True
 
@@ -18,6 +18,8 @@
 from sqlalchemy import func
 
 from app import db
+from app.datamgmt.manage.manage_tags_db import add_db_tags
+from app.models import AnalysisStatus, AssetsType, IocType, Tlp
 from app.models.alerts import Severity
 
 
@@ -59,3 +61,29 @@ def search_severity_by_name(name: str, exact_match: bool = True) -> Severity:
         return db.session.query(Severity).filter(func.lower(Severity.severity_name) == name.lower()).all()
 
     return db.session.query(Severity).filter(Severity.severity_name.ilike(f'%{name}%')).all()
+
+
+def get_bulk_schema_context(tag_titles=None) -> dict:
+    """
+    Preload the referential data checked by the IOC and asset schemas, so that bulk loads validate
+    their rows against in-memory lookups instead of querying the database for each row.
+    When tag titles are provided, they are registered at once and the schemas skip their own registration.
+
+    args:
+        tag_titles (iterable): The tags used by the rows to load
+
+    returns:
+        dict: The context to pass to the schemas
+    """
+    context = {
+        'ioc_types': {ioc_type.type_id: ioc_type for ioc_type in IocType.query.all()},
+        'tlp_ids': {tlp_id for tlp_id, in db.session.query(Tlp.tlp_id).all()},
+        'asset_type_ids': {asset_type_id for asset_type_id, in db.session.query(AssetsType.asset_id).all()},
+        'analysis_status_ids': {status_id for status_id, in db.session.query(AnalysisStatus.id).all()}
+    }
+
+    if tag_titles is not None:
+        add_db_tags(tag_titles)
+        context['tags_registered'] = True
+
+    return context
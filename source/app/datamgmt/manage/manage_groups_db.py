@@ -23,6 +23,7 @@ from app.datamgmt.manage.manage_cases_db import list_cases_id
 from app.iris_engine.access_control.utils import ac_access_level_mask_from_val_list, ac_ldp_group_removal
 from app.iris_engine.access_control.utils import ac_access_level_to_list
 from app.iris_engine.access_control.utils import ac_auto_update_user_effective_access
+from app.iris_engine.access_control.utils import ac_dispatch_users_effective_ac_recompute
 from app.iris_engine.access_control.utils import ac_permission_to_list
 from app.models import Cases
 from app.models.authorization import Group
@@ -173,9 +174,7 @@ def update_group_members(group, members):
             ug.user_id = user.id
             db.session.add(ug)
 
-        db.session.commit()
-        ac_auto_update_user_effective_access(uid)
-
+    updated_users = list(users_to_add)
     for uid in users_to_remove:
         if current_user.id == uid and ac_ldp_group_removal(uid, group.group_id):
             continue
@@ -184,9 +183,10 @@ def update_group_members(group, members):
             and_(UserGroup.group_id == group.group_id,
                  UserGroup.user_id == uid)
         ).delete()
+        updated_users.append(uid)
 
-        db.session.commit()
-        ac_auto_update_user_effective_access(uid)
+    db.session.commit()
+    ac_dispatch_users_effective_ac_recompute(updated_users)
 
     return group
 
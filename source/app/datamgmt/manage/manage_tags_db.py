@@ -1,6 +1,8 @@
 from functools import reduce
 
+from datetime import datetime
 from sqlalchemy import and_, desc, asc
+from sqlalchemy.dialects.postgresql import insert
 
 import app
 from app.models import Tags
@@ -83,3 +85,21 @@ def add_db_tag(tag_title, tag_namespace=None):
 
     return tag
 
+
+def add_db_tags(tag_titles):
+    """
+    Adds several tags to the database in a single statement, ignoring the ones which already exist.
+    The session is not committed.
+
+    :param tag_titles: Iterable of tag titles
+    :return: Nothing
+    """
+    titles = {tag_title.strip() for tag_title in tag_titles if tag_title and tag_title.strip()}
+    if not titles:
+        return
+
+    now = datetime.now()
+    app.db.session.execute(
+        insert(Tags).values([{'tag_title': title, 'tag_creation_date': now} for title in titles])
+        .on_conflict_do_nothing(index_elements=['tag_title'])
+    )
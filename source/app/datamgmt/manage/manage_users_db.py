@@ -20,14 +20,17 @@ from typing import List
 from functools import reduce
 from flask_login import current_user
 from sqlalchemy import and_, desc, asc
+from sqlalchemy import func
 
 import app
 from app import bc
 from app import db
 from app.datamgmt.case.case_db import get_case
+from app.iris_engine.access_control.api_key_handler import invalidate_api_key_cache
 from app.iris_engine.access_control.utils import ac_access_level_mask_from_val_list, ac_ldp_group_removal
 from app.iris_engine.access_control.utils import ac_access_level_to_list
 from app.iris_engine.access_control.utils import ac_auto_update_user_effective_access
+from app.iris_engine.access_control.utils import ac_bump_access_version
 from app.iris_engine.access_control.utils import ac_get_detailed_effective_permissions_from_groups
 from app.iris_engine.access_control.utils import ac_remove_case_access_from_user
 from app.iris_engine.access_control.utils import ac_set_case_access_for_user
@@ -392,8 +395,7 @@ def get_user_cases_fast(user_id):
     user_cases = UserCaseEffectiveAccess.query.with_entities(
         UserCaseEffectiveAccess.case_id
     ).where(
-        UserCaseEffectiveAccess.user_id == user_id,
-        UserCaseEffectiveAccess.access_level != CaseAccessLevel.deny_all.value
+        UserCaseEffectiveAccess.user_id == user_id
     ).all()
 
     return [c.case_id for c  in user_cases]
@@ -647,18 +649,21 @@ def get_users_list_restricted_user_view(user_id):
 
 def get_users_list_restricted_from_case(case_id):
 
-    users = UserCaseEffectiveAccess.query.with_entities(
+    # Users without effective access are denied
+    users = User.query.with_entities(
         User.id.label('user_id'),
         User.uuid.label('user_uuid'),
         User.name.label('user_name'),
         User.user.label('user_login'),
         User.active.label('user_active'),
         User.email.label('user_email'),
-        UserCaseEffectiveAccess.access_level.label('user_access_level')
-    ).filter(
-        UserCaseEffectiveAccess.case_id == case_id
-    ).join(
-        UserCaseEffectiveAccess.user
+        func.coalesce(UserCaseEffectiveAccess.access_level,
+                      CaseAccessLevel.deny_all.value).label('user_access_level')
+    ).outerjoin(
+        UserCaseEffectiveAccess, and_(
+            UserCaseEffectiveAccess.user_id == User.id,
+            UserCaseEffectiveAccess.case_id == case_id
+        )
     ).all()
 
     return [u._asdict() for u in users]
@@ -710,6 +715,8 @@ def delete_user(user_id):
 
     User.query.filter(User.id == user_id).delete()
     db.session.commit()
+    ac_bump_access_version(user_id)
+    invalidate_api_key_cache(user_id)
 
 
 def user_exists(user_name, user_email):
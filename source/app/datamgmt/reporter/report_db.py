@@ -19,9 +19,12 @@ import datetime
 import re
 
 from sqlalchemy import desc
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
+from app import db
 from app.business.iocs import get_iocs
-from app.datamgmt.case.case_notes_db import get_notes_from_group, get_case_note_comments
+from app.datamgmt.case.case_notes_db import get_notes_from_group
 from app.datamgmt.case.case_tasks_db import get_tasks_with_assignees
 from app.models import AnalysisStatus, CompromiseStatus, TaskAssignee, NotesGroupLink
 from app.models import AssetsType
@@ -41,6 +44,7 @@ from app.models import IocAssetLink
 from app.models import IocLink
 from app.models import IocType
 from app.models import Notes
+from app.models import NotesComments
 from app.models import NotesGroup
 from app.models import TaskStatus
 from app.models import Tlp
@@ -48,6 +52,36 @@ from app.models.authorization import User
 from app.schema.marshables import CaseDetailsSchema, CommentSchema, CaseNoteSchema, IocSchema
 
 
+_EXPORT_WINDOW_SIZE = 2000
+
+
+def iter_case_json_sections(case_id, case=None):
+    """
+    Yields the sections of a full case export as (name, value) pairs, each section being loaded only when reached.
+    The timeline is yielded as a generator of events, loaded by windows, so that it can be streamed.
+
+    args:
+        case_id: ID of the case
+        case: the already exported case information, if any
+
+    returns:
+        generator of (section name, section value)
+    """
+    if case is None:
+        case = export_caseinfo_json(case_id)
+        case['description'] = process_md_images_links_for_report(case['description'])
+
+    yield 'case', case
+    yield 'evidences', export_case_evidences_json(case_id)
+    yield 'timeline', iter_case_tm_json(case_id)
+    yield 'iocs', export_case_iocs_json(case_id)
+    yield 'assets', export_case_assets_json(case_id)
+    yield 'tasks', export_case_tasks_json(case_id)
+    yield 'comments', export_case_comments_json(case_id)
+    yield 'notes', export_case_notes_json(case_id)
+    yield 'export_date', datetime.datetime.utcnow()
+
+
 def export_case_json(case_id):
     """
     Fully export a case a JSON
@@ -61,15 +95,8 @@ def export_case_json(case_id):
 
     case['description'] = process_md_images_links_for_report(case['description'])
 
-    export['case'] = case
-    export['evidences'] = export_case_evidences_json(case_id)
-    export['timeline'] = export_case_tm_json(case_id)
-    export['iocs'] = export_case_iocs_json(case_id)
-    export['assets'] = export_case_assets_json(case_id)
-    export['tasks'] = export_case_tasks_json(case_id)
-    export['comments'] = export_case_comments_json(case_id)
-    export['notes'] = export_case_notes_json(case_id)
-    export['export_date'] = datetime.datetime.utcnow()
+    for section, value in iter_case_json_sections(case_id, case=case):
+        export[section] = list(value) if section == 'timeline' else value
 
     return export
 
@@ -239,8 +266,32 @@ def export_case_notes_json(case_id):
     # Fetch all notes associated with the case
     notes = Notes.query.filter(
         Notes.note_case_id == case_id
+    ).options(
+        selectinload(Notes.directory)
+    ).all()
+
+    # Fetch all the comments of the notes at once
+    notes_comments = {}
+    comments = Comments.query.with_entities(
+        NotesComments.comment_note_id,
+        Comments
+    ).join(
+        NotesComments,
+        Comments.comment_id == NotesComments.comment_id
+    ).join(
+        Notes,
+        Notes.note_id == NotesComments.comment_note_id
+    ).filter(
+        Notes.note_case_id == case_id
+    ).options(
+        selectinload(Comments.user)
+    ).order_by(
+        Comments.comment_date.asc()
     ).all()
 
+    for note_id, comment in comments:
+        notes_comments.setdefault(note_id, []).append(comment)
+
     # Initialize the schemas
     note_schema = CaseNoteSchema()
     comments_schema = CommentSchema(many=True)
@@ -248,9 +299,8 @@ def export_case_notes_json(case_id):
     # Serialize the notes and their comments
     serialized_notes = []
     for note in notes:
-        note_comments = get_case_note_comments(note.note_id)
         serialized_note = note_schema.dump(note)
-        serialized_note['comments'] = comments_schema.dump(note_comments)
+        serialized_note['comments'] = comments_schema.dump(notes_comments.get(note.note_id, []))
         serialized_note["note_content"] = process_md_images_links_for_report(serialized_note["note_content"])
 
         serialized_notes.append(serialized_note)
@@ -258,8 +308,58 @@ def export_case_notes_json(case_id):
     return serialized_notes
 
 
-def export_case_tm_json(case_id):
-    timeline = CasesEvent.query.with_entities(
+def _get_events_assets_map(events_ids):
+    assets = CaseEventsAssets.query.with_entities(
+        CaseEventsAssets.event_id,
+        CaseAssets.asset_name,
+        AssetsType.asset_name.label('type')
+    ).filter(
+        CaseEventsAssets.event_id.in_(events_ids)
+    ).join(
+        CaseEventsAssets.asset
+    ).join(
+        CaseAssets.asset_type
+    ).all()
+
+    assets_map = {}
+    for asset in assets:
+        assets_map.setdefault(asset.event_id, []).append("{} ({})".format(asset.asset_name, asset.type))
+
+    return assets_map
+
+
+def _get_events_iocs_map(events_ids):
+    iocs = CaseEventsIoc.query.with_entities(
+        CaseEventsIoc.event_id,
+        CaseEventsIoc.ioc_id,
+        Ioc.ioc_value,
+        Ioc.ioc_description,
+        Tlp.tlp_name,
+        IocType.type_name.label('type')
+    ).filter(
+        CaseEventsIoc.event_id.in_(events_ids)
+    ).join(
+        CaseEventsIoc.ioc
+    ).join(
+        Ioc.ioc_type
+    ).join(
+        Ioc.tlp
+    ).all()
+
+    iocs_map = {}
+    for ioc in iocs:
+        ioc = ioc._asdict()
+        iocs_map.setdefault(ioc.pop('event_id'), []).append(ioc)
+
+    return iocs_map
+
+
+def iter_case_tm_json(case_id):
+    """
+    Yields the timeline of a case, event by event. Events are read by windows, and the assets and IOCs of each window
+    are fetched with one query each.
+    """
+    timeline = db.session.execute(select(
         CasesEvent.event_id,
         CasesEvent.event_title,
         CasesEvent.event_in_summary,
@@ -278,60 +378,33 @@ def export_case_tm_json(case_id):
         CasesEvent.event_in_summary,
         CasesEvent.event_color,
         CasesEvent.event_is_flagged
-    ).filter(
-        CasesEvent.case_id == case_id
-    ).order_by(
-        CasesEvent.event_date
+    ).select_from(
+        CasesEvent
     ).join(
         CasesEvent.user
     ).outerjoin(
         CasesEvent.category
-    ).all()
+    ).where(
+        CasesEvent.case_id == case_id
+    ).order_by(
+        CasesEvent.event_date, CasesEvent.event_id
+    ).execution_options(yield_per=_EXPORT_WINDOW_SIZE))
+
+    for window in timeline.partitions():
+        events_ids = [row.event_id for row in window]
+        assets_map = _get_events_assets_map(events_ids)
+        iocs_map = _get_events_iocs_map(events_ids)
+
+        for row in window:
+            ras = row._asdict()
+            ras['assets'] = assets_map.get(row.event_id, [])
+            ras['iocs'] = iocs_map.get(row.event_id, [])
 
-    tim = []
-    for row in timeline:
-        ras = row._asdict()
-        ras['assets'] = None
-
-        as_list = CaseEventsAssets.query.with_entities(
-            CaseAssets.asset_id,
-            CaseAssets.asset_name,
-            AssetsType.asset_name.label('type')
-        ).filter(
-            CaseEventsAssets.event_id == row.event_id
-        ).join(
-            CaseEventsAssets.asset
-        ).join(
-            CaseAssets.asset_type
-        ).all()
-
-        alki = []
-        for asset in as_list:
-            alki.append("{} ({})".format(asset.asset_name, asset.type))
-
-        ras['assets'] = alki
-
-        iocs_list = CaseEventsIoc.query.with_entities(
-            CaseEventsIoc.ioc_id,
-            Ioc.ioc_value,
-            Ioc.ioc_description,
-            Tlp.tlp_name,
-            IocType.type_name.label('type')
-        ).filter(
-            CaseEventsIoc.event_id == row.event_id
-        ).join(
-            CaseEventsIoc.ioc
-        ).join(
-            Ioc.ioc_type
-        ).join(
-            Ioc.tlp
-        ).all()
-
-        ras['iocs'] = [ioc._asdict() for ioc in iocs_list]
-
-        tim.append(ras)
-
-    return tim
+            yield ras
+
+
+def export_case_tm_json(case_id):
+    return list(iter_case_tm_json(case_id))
 
 
 def export_case_iocs_json(case_id):
@@ -362,35 +435,29 @@ def export_case_tasks_json(case_id):
 
     tasks = [c._asdict() for c in res]
 
+    assignees = TaskAssignee.query.with_entities(
+        TaskAssignee.task_id,
+        User.user,
+        User.id,
+        User.name
+    ).join(
+        TaskAssignee.user
+    ).join(
+        CaseTasks, CaseTasks.id == TaskAssignee.task_id
+    ).filter(
+        CaseTasks.task_case_id == case_id
+    ).all()
+
+    assignee_list = {}
+    for member in assignees:
+        assignee_list.setdefault(member.task_id, []).append({
+            'user': member.user,
+            'name': member.name,
+            'id': member.id
+        })
+
     task_with_assignees = []
     for task in tasks:
-        task_id = task['id']
-        get_assignee_list = TaskAssignee.query.with_entities(
-            TaskAssignee.task_id,
-            User.user,
-            User.id,
-            User.name
-        ).join(
-            TaskAssignee.user
-        ).filter(
-            TaskAssignee.task_id == task_id
-        ).all()
-
-        assignee_list = {}
-        for member in get_assignee_list:
-            if member.task_id not in assignee_list:
-
-                assignee_list[member.task_id] = [{
-                    'user': member.user,
-                    'name': member.name,
-                    'id': member.id
-                }]
-            else:
-                assignee_list[member.task_id].append({
-                    'user': member.user,
-                    'name': member.name,
-                    'id': member.id
-                })
         task['task_assignees'] = assignee_list.get(task['id'], [])
         task_with_assignees.append(task)
 
@@ -422,26 +489,31 @@ def export_case_assets_json(case_id):
         CaseAssets.analysis_status
     ).order_by(desc(CaseAssets.asset_compromise_status_id)).all()
 
+    iocs_links = IocAssetLink.query.with_entities(
+        IocAssetLink.asset_id,
+        Ioc.ioc_value,
+        IocType.type_name,
+        Ioc.ioc_description
+    ).join(
+        IocAssetLink.ioc
+    ).join(
+        Ioc.ioc_type
+    ).join(
+        CaseAssets, CaseAssets.asset_id == IocAssetLink.asset_id
+    ).filter(
+        CaseAssets.case_id == case_id
+    ).all()
+
+    assets_iocs = {}
+    for link in iocs_links:
+        link = link._asdict()
+        assets_iocs.setdefault(link.pop('asset_id'), []).append(link)
+
     for row in res:
         row = row._asdict()
         row['light_asset_description'] = row['asset_description']
 
-        ial = IocAssetLink.query.with_entities(
-            Ioc.ioc_value,
-            IocType.type_name,
-            Ioc.ioc_description
-        ).filter(
-            IocAssetLink.asset_id == row['asset_id']
-        ).join(
-            IocAssetLink.ioc
-        ).join(
-            Ioc.ioc_type
-        ).all()
-
-        if ial:
-            row['asset_ioc'] = [row._asdict() for row in ial]
-        else:
-            row['asset_ioc'] = []
+        row['asset_ioc'] = assets_iocs.get(row['asset_id'], [])
 
         if row['asset_compromise_status_id'] is None:
             row['asset_compromise_status_id'] = CompromiseStatus.unknown.value
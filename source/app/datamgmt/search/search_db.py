@@ -0,0 +1,246 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from sqlalchemy import and_
+from sqlalchemy import func
+from sqlalchemy import literal_column
+
+from app.models import Comments
+from app.models.authorization import UserCaseEffectiveAccess
+from app.models.cases import Cases
+from app.models.models import Client
+from app.models.models import Ioc
+from app.models.models import IocLink
+from app.models.models import IocType
+from app.models.models import Notes
+from app.models.models import Tlp
+
+# Full-text documents are built with the same expressions as the indexes created by the migration 5b9d27e3f1a4.
+# They must stay identical, otherwise the searches scan the tables. Only the beginning of large texts is indexed,
+# to stay below the size limit of tsvector values; pattern searches cover the rest.
+_FULLTEXT_CONFIG = literal_column("'simple'::regconfig")
+
+_NOTES_DOCUMENT = literal_column(
+    "to_tsvector('simple'::regconfig, "
+    "left(coalesce(notes.note_title, '') || ' ' || coalesce(notes.note_content, ''), 100000))"
+)
+
+_COMMENTS_DOCUMENT = literal_column(
+    "to_tsvector('simple'::regconfig, left(coalesce(comments.comment_text, ''), 100000))"
+)
+
+_HEADLINE_OPTIONS = 'MaxFragments=2, MaxWords=20, MinWords=5, StartSel=<mark>, StopSel=</mark>'
+
+
+def _filter_user_cases(query, case_id_column, user_id):
+    # Effective accesses only hold granted accesses
+    return query.join(
+        UserCaseEffectiveAccess,
+        and_(UserCaseEffectiveAccess.case_id == case_id_column,
+             UserCaseEffectiveAccess.user_id == user_id)
+    )
+
+
+def _get_results(query, page, per_page):
+    if page is None:
+        return [row._asdict() for row in query.all()]
+
+    results = query.paginate(page=page, per_page=per_page, error_out=False)
+
+    return {
+        'total': results.total,
+        'results': [row._asdict() for row in results.items],
+        'last_page': results.pages,
+        'current_page': results.page,
+        'next_page': results.next_num if results.has_next else None
+    }
+
+
+def search_iocs(search_value, user_id, fulltext=True, page=None, per_page=None):
+    """
+    Searches the IOCs of the cases a user can access.
+
+    In full-text mode, IOCs containing the value are returned, the closest ones first. Otherwise the value is used
+    as a LIKE pattern. Both are served by the trigram index of the IOC values when the pg_trgm extension is available.
+
+    args:
+        search_value: searched value
+        user_id: ID of the user searching
+        fulltext: False to use the value as a LIKE pattern
+        page: page to return, or None to return all the results
+        per_page: number of results per page
+
+    returns:
+        list of results, or dict of the page of results if a page is requested
+    """
+    query = IocLink.query.with_entities(
+        Ioc.ioc_value.label('ioc_name'),
+        Ioc.ioc_description.label('ioc_description'),
+        Ioc.ioc_misp,
+        IocType.type_name,
+        Tlp.tlp_name,
+        Tlp.tlp_bscolor,
+        Cases.name.label('case_name'),
+        Cases.case_id,
+        Client.name.label('customer_name')
+    ).join(
+        IocLink.ioc
+    ).join(
+        Ioc.ioc_type
+    ).join(
+        Ioc.tlp
+    ).join(
+        IocLink.case
+    ).join(
+        Cases.client
+    )
+    query = _filter_user_cases(query, IocLink.case_id, user_id)
+
+    if fulltext:
+        query = query.filter(
+            Ioc.ioc_value.icontains(search_value, autoescape=True)
+        ).order_by(
+            func.length(Ioc.ioc_value), Ioc.ioc_value, Cases.case_id
+        )
+
+    else:
+        query = query.filter(
+            Ioc.ioc_value.like(search_value)
+        ).order_by(
+            Client.name, Cases.case_id
+        )
+
+    return _get_results(query, page, per_page)
+
+
+def search_notes(search_value, user_id, fulltext=True, page=None, per_page=None, case_id=None):
+    """
+    Searches the notes of the cases a user can access.
+
+    In full-text mode, the value is parsed as a web search query (words, "quoted phrases", OR, -excluded) and matched
+    against the titles and contents of the notes with the full-text index. Results are ranked by relevance, and
+    highlighted when a page is requested. Otherwise the notes containing the value are returned.
+
+    args:
+        search_value: searched value
+        user_id: ID of the user searching
+        fulltext: False to search the notes containing the value
+        page: page to return, or None to return all the results
+        per_page: number of results per page
+        case_id: ID of a case to restrict the search to
+
+    returns:
+        list of results, or dict of the page of results if a page is requested
+    """
+    entities = [
+        Notes.note_id,
+        Notes.note_title,
+        Cases.name.label('case_name'),
+        Client.name.label('client_name'),
+        Cases.case_id
+    ]
+
+    if fulltext:
+        ts_query = func.websearch_to_tsquery(_FULLTEXT_CONFIG, search_value)
+        entities.append(func.ts_rank_cd(_NOTES_DOCUMENT, ts_query).label('rank'))
+        if page is not None:
+            entities.append(func.ts_headline(_FULLTEXT_CONFIG, Notes.note_content, ts_query,
+                                             _HEADLINE_OPTIONS).label('highlight'))
+
+    query = Notes.query.with_entities(
+        *entities
+    ).join(
+        Notes.case
+    ).join(
+        Cases.client
+    )
+    query = _filter_user_cases(query, Notes.note_case_id, user_id)
+
+    if case_id is not None:
+        query = query.filter(Notes.note_case_id == case_id)
+
+    if fulltext:
+        query = query.filter(
+            _NOTES_DOCUMENT.op('@@')(ts_query)
+        ).order_by(
+            literal_column('rank').desc(), Notes.note_id
+        )
+
+    else:
+        query = query.filter(
+            Notes.note_content.like(f'%{search_value}%')
+        ).order_by(
+            Client.name, Notes.note_id
+        )
+
+    return _get_results(query, page, per_page)
+
+
+def search_comments(search_value, user_id, fulltext=True, page=None, per_page=None):
+    """
+    Searches the comments of the cases a user can access, as search_notes does for notes.
+
+    args:
+        search_value: searched value
+        user_id: ID of the user searching
+        fulltext: False to search the comments containing the value
+        page: page to return, or None to return all the results
+        per_page: number of results per page
+
+    returns:
+        list of results, or dict of the page of results if a page is requested
+    """
+    entities = [
+        Comments.comment_id,
+        Comments.comment_text,
+        Cases.name.label('case_name'),
+        Client.name.label('customer_name'),
+        Cases.case_id
+    ]
+
+    if fulltext:
+        ts_query = func.websearch_to_tsquery(_FULLTEXT_CONFIG, search_value)
+        entities.append(func.ts_rank_cd(_COMMENTS_DOCUMENT, ts_query).label('rank'))
+        if page is not None:
+            entities.append(func.ts_headline(_FULLTEXT_CONFIG, Comments.comment_text, ts_query,
+                                             _HEADLINE_OPTIONS).label('highlight'))
+
+    query = Comments.query.with_entities(
+        *entities
+    ).join(
+        Comments.case
+    ).join(
+        Cases.client
+    )
+    query = _filter_user_cases(query, Comments.comment_case_id, user_id)
+
+    if fulltext:
+        query = query.filter(
+            _COMMENTS_DOCUMENT.op('@@')(ts_query)
+        ).order_by(
+            literal_column('rank').desc(), Comments.comment_id
+        )
+
+    else:
+        query = query.filter(
+            Comments.comment_text.like(f'%{search_value}%')
+        ).order_by(
+            Client.name, Comments.comment_id
+        )
+
+    return _get_results(query, page, per_page)
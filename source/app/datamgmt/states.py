@@ -19,6 +19,7 @@
 from datetime import datetime
 from flask_login import current_user
 from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app import db
 from app.models import ObjectState
@@ -39,25 +40,24 @@ def _update_object_state(object_name, caseid, userid=None) -> ObjectState:
     if not userid:
         userid = current_user.id
 
-    os = ObjectState.query.filter(and_(
-        ObjectState.object_name == object_name,
-        ObjectState.object_case_id == caseid
-    )).first()
-    if os:
-        os.object_last_update = datetime.utcnow()
-        os.object_state = os.object_state + 1
-        os.object_updated_by_id = userid
-        os.object_case_id = caseid
-
-    else:
-        os = ObjectState()
-        os.object_name = object_name
-        os.object_state = 0
-        os.object_last_update = datetime.utcnow()
-        os.object_updated_by_id = userid
-        os.object_case_id = caseid
-
-        db.session.add(os)
+    # The counter is incremented by the database, so that concurrent updates each produce a distinct state
+    now = datetime.utcnow()
+    stmt = pg_insert(ObjectState).values(
+        object_name=object_name,
+        object_state=0,
+        object_last_update=now,
+        object_updated_by_id=userid,
+        object_case_id=caseid
+    ).on_conflict_do_update(
+        index_elements=['object_case_id', 'object_name'],
+        set_={
+            'object_state': ObjectState.object_state + 1,
+            'object_last_update': now,
+            'object_updated_by_id': userid
+        }
+    ).returning(ObjectState)
+
+    os = db.session.scalars(stmt, execution_options={'populate_existing': True}).one()
 
     return os
 
@@ -129,3 +129,34 @@ def update_notes_state(caseid, userid=None):
 
 def get_notes_state(caseid):
     return get_object_state('notes', caseid=caseid)
+
+
+def get_case_states_version(caseid):
+    """
+    Returns a version of the content of a case, made of all the object states counters of the case.
+    The version changes whenever any of the counters is updated.
+
+    args:
+        caseid: case id
+
+    returns:
+        str
+    """
+    states = ObjectState.query.with_entities(
+        ObjectState.object_name,
+        ObjectState.object_state
+    ).filter(
+        ObjectState.object_case_id == caseid
+    ).order_by(
+        ObjectState.object_name
+    ).all()
+
+    return ','.join(f'{state.object_name}:{state.object_state}' for state in states)
+
+
+def update_datastore_state(caseid, userid=None):
+    return _update_object_state('datastore', caseid=caseid, userid=userid)
+
+
+def get_datastore_state(caseid):
+    return get_object_state('datastore', caseid=caseid)
@@ -0,0 +1,112 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import threading
+import time
+from collections import OrderedDict
+
+from app import app
+from app import db
+from app.models.authorization import User
+from app.models.authorization import get_api_key_digest
+
+# API key digest -> (user ID, expiration timestamp), least recently used first
+_credentials_cache = OrderedDict()
+_credentials_cache_lock = threading.Lock()
+
+
+def _get_cached_user_id(digest: str):
+    now = time.monotonic()
+    with _credentials_cache_lock:
+        entry = _credentials_cache.get(digest)
+        if entry is None:
+            return None
+
+        user_id, expires_at = entry
+        if expires_at < now:
+            del _credentials_cache[digest]
+            return None
+
+        _credentials_cache.move_to_end(digest)
+        return user_id
+
+
+def _set_cached_user_id(digest: str, user_id: int):
+    timeout = app.config.get('API_KEY_CACHE_TIMEOUT')
+    if not timeout:
+        return
+
+    with _credentials_cache_lock:
+        _credentials_cache[digest] = (user_id, time.monotonic() + timeout)
+        _credentials_cache.move_to_end(digest)
+
+        while len(_credentials_cache) > app.config.get('API_KEY_CACHE_SIZE'):
+            _credentials_cache.popitem(last=False)
+
+
+def invalidate_api_key_cache(user_id: int = None):
+    """Drops the cached credentials of a user, or all of them if no user is provided.
+    Must be called whenever an API key is renewed or a user is deactivated or deleted.
+
+    args:
+        user_id: ID of the user
+    """
+    with _credentials_cache_lock:
+        if user_id is None:
+            _credentials_cache.clear()
+            return
+
+        for digest in [d for d, entry in _credentials_cache.items() if entry[0] == user_id]:
+            del _credentials_cache[digest]
+
+
+def get_user_by_api_key(api_key: str):
+    """Returns the active user owning an API key.
+
+    The key is looked up by digest. Known digests are cached in the process and resolved by primary key,
+    the loaded user being checked again so that renewed keys and deactivated users are never accepted.
+
+    args:
+        api_key: API key, with or without the Bearer prefix
+
+    returns:
+        User or None
+    """
+    if not api_key:
+        return None
+
+    api_key = api_key.replace('Bearer ', '', 1)
+    digest = get_api_key_digest(api_key)
+
+    user_id = _get_cached_user_id(digest)
+    if user_id is not None:
+        user = db.session.get(User, user_id)
+        if user and user.active and user.api_key_digest == digest:
+            return user
+
+        invalidate_api_key_cache(user_id)
+
+    user = User.query.filter(
+        User.api_key_digest == digest,
+        User.active == True
+    ).first()
+
+    if user:
+        _set_cached_user_id(digest, user.id)
+
+    return user
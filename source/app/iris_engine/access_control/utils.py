@@ -1,10 +1,22 @@
+import time
+
+from flask import g
+from flask import has_app_context
 from flask import session
 from flask_login import current_user
 from sqlalchemy import and_
+from sqlalchemy import delete
+from sqlalchemy import exists
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import literal
+from sqlalchemy import select
+from sqlalchemy import union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 import app
+from app import cache
 from app import db
-from app.datamgmt.manage.manage_access_control_db import check_ua_case_client
 from app.models import Cases, Client
 from app.models.authorization import CaseAccessLevel, UserClient
 from app.models.authorization import Group
@@ -286,9 +298,75 @@ def ac_trace_effective_user_permissions(user_id):
     return perms
 
 
-def ac_fast_check_user_has_case_access(user_id, cid, access_level):
+def _ac_get_request_cache():
     """
-    Returns true if the user has access to the case
+    Returns the access decisions cache of the current request, or None outside an application context
+    """
+    if not has_app_context():
+        return None
+
+    request_cache = g.get('_ac_case_access_cache')
+    if request_cache is None:
+        request_cache = {}
+        g._ac_case_access_cache = request_cache
+
+    return request_cache
+
+
+def _ac_get_access_version(user_id=None):
+    """
+    Returns the current version stamp of the global access decisions, or of the ones of a user.
+    A missing stamp (never set or evicted) is recreated, so that stale entries can never be hit again.
+    """
+    version_key = f'ac_access_version_{user_id}' if user_id is not None else 'ac_access_version'
+    version = cache.get(version_key)
+    if version is None:
+        version = time.time_ns()
+        cache.set(version_key, version, timeout=0)
+
+    return version
+
+
+def ac_bump_access_version(user_id=None):
+    """
+    Invalidates the cached access decisions of a user, or of every user if no user is provided
+    """
+    version_key = f'ac_access_version_{user_id}' if user_id is not None else 'ac_access_version'
+    cache.set(version_key, time.time_ns(), timeout=0)
+
+    request_cache = _ac_get_request_cache()
+    if request_cache:
+        if user_id is None:
+            request_cache.clear()
+        else:
+            for key in [k for k in request_cache if k[0] == user_id]:
+                del request_cache[key]
+
+
+def _ac_cached_lookup(key, process_key, resolver):
+    """
+    Resolves a value through the request cache, then the process-wide cache if enabled, then the resolver
+    """
+    request_cache = _ac_get_request_cache()
+    if request_cache is not None and key in request_cache:
+        return request_cache[key]
+
+    timeout = app.app.config.get('ACCESS_CONTROL_CACHE_TIMEOUT')
+    value = cache.get(process_key) if timeout else None
+    if value is None:
+        value = resolver()
+        if timeout:
+            cache.set(process_key, value, timeout=timeout)
+
+    if request_cache is not None:
+        request_cache[key] = value
+
+    return value
+
+
+def _ac_resolve_user_case_access(user_id, cid):
+    """
+    Returns the access level of a user on a case, or None if the user has no access
     """
     ucea = UserCaseEffectiveAccess.query.with_entities(
         UserCaseEffectiveAccess.access_level
@@ -297,21 +375,47 @@ def ac_fast_check_user_has_case_access(user_id, cid, access_level):
         UserCaseEffectiveAccess.case_id == cid
     ).first()
 
-    if not ucea:
-        # The user has no direct access, check if he is part of the client
-        cuacu = check_ua_case_client(user_id, cid)
-        if cuacu is None:
-            return None
-        ac_set_case_access_for_user(user_id, cid, cuacu.access_level)
+    return ucea[0] if ucea else None
+
+
+def ac_get_user_case_access(user_id, cid):
+    """
+    Returns the access level of a user on a case, or None if the user has no access.
+    Decisions are memoized for the request, and process-wide for ACCESS_CONTROL_CACHE_TIMEOUT seconds if set.
+    """
+    process_key = (f'ac_case_access_{user_id}_{cid}_'
+                   f'{_ac_get_access_version()}_{_ac_get_access_version(user_id)}')
+
+    return _ac_cached_lookup((user_id, cid), process_key,
+                             lambda: _ac_resolve_user_case_access(user_id, cid))
+
+
+def ac_case_exists(cid):
+    """
+    Returns true if the case exists. Memoized as the access decisions are.
+    """
+    process_key = f'ac_case_exists_{cid}_{_ac_get_access_version()}'
+
+    return _ac_cached_lookup((None, cid), process_key,
+                             lambda: Cases.query.with_entities(Cases.case_id).filter(
+                                 Cases.case_id == cid).first() is not None)
+
 
-        return cuacu.access_level
+def ac_fast_check_user_has_case_access(user_id, cid, access_level):
+    """
+    Returns true if the user has access to the case
+    """
+    user_access_level = ac_get_user_case_access(user_id, cid)
 
-    if ac_flag_match_mask(ucea[0], CaseAccessLevel.deny_all.value):
+    if user_access_level is None:
+        return None
+
+    if ac_flag_match_mask(user_access_level, CaseAccessLevel.deny_all.value):
         return None
 
     for acl in access_level:
-        if ac_flag_match_mask(ucea[0], acl.value):
-            return ucea[0]
+        if ac_flag_match_mask(user_access_level, acl.value):
+            return user_access_level
 
     return None
 
@@ -320,27 +424,209 @@ def ac_fast_check_current_user_has_case_access(cid, access_level):
     return ac_fast_check_user_has_case_access(current_user.id, cid, access_level)
 
 
+def _ac_target_effective_access(users_ids, case_id=None):
+    """
+    Builds the granted effective accesses of a set of users, as a subquery of (user_id, case_id, access_level).
+    Accesses set directly on the user take precedence over the ones of its customers, which take precedence over
+    the ones of its groups. Several accesses of the same kind are combined by keeping the highest.
+    The accesses are restricted to a case if one is provided.
+    """
+    groups_access = select(
+        UserGroup.user_id,
+        GroupCaseAccess.case_id,
+        func.max(GroupCaseAccess.access_level).label('access_level'),
+        literal(0).label('priority')
+    ).join(
+        GroupCaseAccess, GroupCaseAccess.group_id == UserGroup.group_id
+    ).where(
+        UserGroup.user_id.in_(users_ids)
+    ).group_by(
+        UserGroup.user_id, GroupCaseAccess.case_id
+    )
+
+    clients_access = select(
+        UserClient.user_id,
+        Cases.case_id,
+        func.max(UserClient.access_level).label('access_level'),
+        literal(1).label('priority')
+    ).join(
+        Cases, Cases.client_id == UserClient.client_id
+    ).where(
+        UserClient.user_id.in_(users_ids)
+    ).group_by(
+        UserClient.user_id, Cases.case_id
+    )
+
+    users_access = select(
+        UserCaseAccess.user_id,
+        UserCaseAccess.case_id,
+        func.max(UserCaseAccess.access_level).label('access_level'),
+        literal(2).label('priority')
+    ).where(
+        UserCaseAccess.user_id.in_(users_ids)
+    ).group_by(
+        UserCaseAccess.user_id, UserCaseAccess.case_id
+    )
+
+    if case_id is not None:
+        groups_access = groups_access.where(GroupCaseAccess.case_id == case_id)
+        clients_access = clients_access.where(Cases.case_id == case_id)
+        users_access = users_access.where(UserCaseAccess.case_id == case_id)
+
+    sources = union_all(groups_access, clients_access, users_access).subquery()
+
+    resolved = select(
+        sources.c.user_id,
+        sources.c.case_id,
+        sources.c.access_level
+    ).distinct(
+        sources.c.user_id, sources.c.case_id
+    ).order_by(
+        sources.c.user_id, sources.c.case_id, sources.c.priority.desc()
+    ).subquery()
+
+    # Denied accesses are implicit
+    return select(resolved).where(
+        resolved.c.access_level.op('&')(CaseAccessLevel.deny_all.value) == 0
+    ).subquery('target_access')
+
+
+def _ac_apply_target_effective_access(users_ids, case_id=None):
+    """
+    Replaces the effective accesses of a set of users by their target ones, with a set-based delete and upsert.
+    Only the accesses to a case are replaced if one is provided. Expects a db commit soon after.
+    """
+    target = _ac_target_effective_access(users_ids, case_id=case_id)
+
+    conditions = [UserCaseEffectiveAccess.user_id.in_(users_ids)]
+    if case_id is not None:
+        conditions.append(UserCaseEffectiveAccess.case_id == case_id)
+
+    db.session.execute(
+        delete(UserCaseEffectiveAccess).where(
+            *conditions,
+            ~exists().where(
+                target.c.user_id == UserCaseEffectiveAccess.user_id,
+                target.c.case_id == UserCaseEffectiveAccess.case_id
+            )
+        ).execution_options(synchronize_session=False)
+    )
+
+    upsert = pg_insert(UserCaseEffectiveAccess).from_select(
+        ['user_id', 'case_id', 'access_level'],
+        select(target.c.user_id, target.c.case_id, target.c.access_level)
+    )
+    upsert = upsert.on_conflict_do_update(
+        index_elements=['user_id', 'case_id'],
+        set_={'access_level': upsert.excluded.access_level},
+        where=UserCaseEffectiveAccess.access_level != upsert.excluded.access_level
+    )
+    db.session.execute(upsert)
+
+
+def ac_recompute_users_effective_ac(users_ids=None, progress_callback=None):
+    """
+    Recomputes the effective access of a set of users, or of all users if none is provided.
+    Users are processed by batches of AC_RECOMPUTE_BATCH_SIZE, each in its own transaction.
+
+    args:
+        users_ids: list of users IDs
+        progress_callback: called with the number of users processed after each batch
+
+    returns:
+        number of users processed
+    """
+    if users_ids is None:
+        users_ids = [u.id for u in User.query.with_entities(User.id).order_by(User.id).all()]
+
+    users_ids = list(dict.fromkeys(users_ids))
+    batch_size = app.app.config.get('AC_RECOMPUTE_BATCH_SIZE')
+
+    for batch_start in range(0, len(users_ids), batch_size):
+        _ac_apply_target_effective_access(users_ids[batch_start:batch_start + batch_size])
+        db.session.commit()
+
+        if progress_callback:
+            progress_callback(min(batch_start + batch_size, len(users_ids)))
+
+    if len(users_ids) == 1:
+        ac_bump_access_version(users_ids[0])
+    elif users_ids:
+        ac_bump_access_version()
+
+    return len(users_ids)
+
+
+@app.celery.task(bind=True)
+def task_ac_recompute_users_effective_ac(self, users_ids=None):
+    """
+    Recompute the effective access of a set of users in the background, reporting the number of users processed
+    """
+    total = len(users_ids) if users_ids is not None else User.query.count()
+
+    def report_progress(processed):
+        self.update_state(state='PROGRESS', meta={'processed': processed, 'total': total})
+
+    return ac_recompute_users_effective_ac(users_ids, progress_callback=report_progress)
+
+
+def ac_dispatch_users_effective_ac_recompute(users_ids=None):
+    """
+    Recomputes the effective access of a set of users, or of all users if none is provided. Sets larger than
+    AC_RECOMPUTE_ASYNC_USERS are recomputed by a background task.
+
+    args:
+        users_ids: list of users IDs
+
+    returns:
+        ID of the background task, or None if the recompute is already done
+    """
+    users_count = len(users_ids) if users_ids is not None else User.query.count()
+
+    if users_count > app.app.config.get('AC_RECOMPUTE_ASYNC_USERS'):
+        task = task_ac_recompute_users_effective_ac.delay(users_ids=users_ids)
+        return task.id
+
+    ac_recompute_users_effective_ac(users_ids)
+
+    return None
+
+
+def ac_recompute_case_customers_effective_ac(case_id, clients_ids):
+    """
+    Recomputes the effective access to a case of the members of customers, once the customer of the case changed.
+    Only the accesses to the case are recomputed, in the current transaction. Expects a db commit soon after.
+
+    args:
+        case_id: ID of the case
+        clients_ids: IDs of the previous and new customers of the case
+    """
+    users_ids = [user_client.user_id for user_client in UserClient.query.with_entities(
+        UserClient.user_id
+    ).filter(
+        UserClient.client_id.in_(clients_ids)
+    ).distinct().all()]
+
+    if not users_ids:
+        return
+
+    # The new customer of the case must be visible to the recompute
+    db.session.flush()
+    _ac_apply_target_effective_access(users_ids, case_id=case_id)
+
+
 def ac_recompute_effective_ac_from_users_list(users_list):
     """
     Recompute all users effective access of users
     """
-    for member in users_list:
-        ac_auto_update_user_effective_access(user_id=member['id'])
-
-    return
+    return ac_dispatch_users_effective_ac_recompute([member['id'] for member in users_list])
 
 
 def ac_recompute_all_users_effective_ac():
     """
     Recompute all users effective access
     """
-    users = User.query.with_entities(
-        User.id
-    ).all()
-    for user_id in users:
-        ac_auto_update_user_effective_access(user_id[0])
-
-    return
+    return ac_dispatch_users_effective_ac_recompute()
 
 
 def ac_recompute_effective_ac(user_id):
@@ -361,26 +647,27 @@ def ac_add_users_multi_effective_access(users_list, cases_list, access_level):
     return
 
 
-def ac_add_user_effective_access(users_list, case_id, access_level):
+def _ac_is_granting_access(access_level):
+    return access_level is not None and not ac_flag_match_mask(access_level, CaseAccessLevel.deny_all.value)
+
+
+def _ac_insert_effective_access(accesses):
     """
-    Directly add a set of effective user access
+    Inserts effective accesses given as (user ID, case ID, access level) tuples. Denied accesses are implicit and
+    therefore skipped. Expects a db commit soon after.
     """
+    rows = [{'user_id': user_id, 'case_id': case_id, 'access_level': access_level}
+            for user_id, case_id, access_level in accesses if _ac_is_granting_access(access_level)]
 
-    UserCaseEffectiveAccess.query.filter(
-        UserCaseEffectiveAccess.case_id == case_id,
-        UserCaseEffectiveAccess.user_id.in_(users_list)
-    ).delete()
+    if rows:
+        db.session.execute(insert(UserCaseEffectiveAccess), rows)
 
-    access_to_add = []
-    for user_id in users_list:
-        ucea = UserCaseEffectiveAccess()
-        ucea.user_id = user_id
-        ucea.case_id = case_id
-        ucea.access_level = access_level
-        access_to_add.append(ucea)
 
-    db.session.add_all(access_to_add)
-    db.session.commit()
+def ac_add_user_effective_access(users_list, case_id, access_level):
+    """
+    Directly add a set of effective user access
+    """
+    ac_add_user_effective_access_from_map({user_id: access_level for user_id in users_list}, case_id)
 
 
 def ac_add_user_effective_access_from_map(users_map, case_id):
@@ -392,16 +679,10 @@ def ac_add_user_effective_access_from_map(users_map, case_id):
         UserCaseEffectiveAccess.user_id.in_(users_map.keys())
     ).delete()
 
-    access_to_add = []
-    for user_id in users_map:
-        ucea = UserCaseEffectiveAccess()
-        ucea.user_id = user_id
-        ucea.case_id = case_id
-        ucea.access_level = users_map[user_id]
-        access_to_add.append(ucea)
+    _ac_insert_effective_access((user_id, case_id, access_level) for user_id, access_level in users_map.items())
 
-    db.session.add_all(access_to_add)
     db.session.commit()
+    ac_bump_access_version()
 
 
 def ac_set_new_case_access(org_members, case_id, customer_id = None):
@@ -409,15 +690,8 @@ def ac_set_new_case_access(org_members, case_id, customer_id = None):
     Set a new case access
     """
 
-    users = ac_apply_autofollow_groups_access(case_id)
-    if current_user.id in users.keys():
-        del users[current_user.id]
-
-    users_full = User.query.with_entities(User.id).all()
-    users_full_access = list(set([u.id for u in users_full]) - set(users.keys()))
-
-    # Default users case access - Full access
-    ac_add_user_effective_access(users_full_access, case_id, CaseAccessLevel.deny_all.value)
+    # Users without any access on the case are denied implicitly
+    ac_apply_autofollow_groups_access(case_id)
 
     # Add specific right for the user creating the case
     UserCaseAccess.query.filter(
@@ -454,14 +728,9 @@ def ac_apply_autofollow_groups_access(case_id):
     groups = get_auto_follow_groups()
     users = ac_combine_groups_access(groups)
 
-    rows_to_push = []
-    for user_id in users:
-        ucea = UserCaseEffectiveAccess()
-        ucea.user_id = user_id
-        ucea.case_id = case_id
-        ucea.access_level = users[user_id]
-        rows_to_push.append(ucea)
+    _ac_insert_effective_access((user_id, case_id, access_level) for user_id, access_level in users.items())
 
+    rows_to_push = []
     grps_to_add = {}
     for group in groups:
         if group.group_id not in grps_to_add:
@@ -476,6 +745,7 @@ def ac_apply_autofollow_groups_access(case_id):
 
     db.session.add_all(rows_to_push)
     db.session.commit()
+    ac_bump_access_version()
     return users
 
 
@@ -483,44 +753,7 @@ def ac_auto_update_user_effective_access(user_id):
     """
     Updates the effective access of a user given its ID
     """
-    uceas = UserCaseEffectiveAccess.query.filter(
-        UserCaseEffectiveAccess.user_id == user_id
-    ).all()
-
-    grouped_uca = {}
-    for ucea in uceas:
-        grouped_uca[ucea.case_id] = ucea.access_level
-
-    target_ucas = ac_get_user_cases_access(user_id)
-
-    ucea_to_add = {}
-    cid_to_remove = []
-
-    for case_id in target_ucas:
-        if case_id not in grouped_uca:
-            ucea_to_add.update({case_id: target_ucas[case_id]})
-        else:
-            if not ac_flag_match_mask(grouped_uca[case_id], target_ucas[case_id]):
-                cid_to_remove.append(case_id)
-                ucea_to_add.update({case_id: target_ucas[case_id]})
-
-    for prev_case_id in grouped_uca:
-        if prev_case_id not in target_ucas.keys():
-            cid_to_remove.append(prev_case_id)
-
-    UserCaseEffectiveAccess.query.where(and_(
-        UserCaseEffectiveAccess.user_id == user_id,
-        UserCaseEffectiveAccess.case_id.in_(cid_to_remove)
-    )).delete()
-
-    for case_id in ucea_to_add:
-        ucea = UserCaseEffectiveAccess()
-        ucea.user_id = user_id
-        ucea.case_id = case_id
-        ucea.access_level = ucea_to_add[case_id]
-        db.session.add(ucea)
-
-    db.session.commit()
+    ac_recompute_users_effective_ac([user_id])
 
     return
 
@@ -529,29 +762,7 @@ def ac_remove_case_access_from_user(user_id, case_id):
     """
     Remove a case access from a user
     """
-
-    uac = UserCaseEffectiveAccess.query.where(and_(
-        UserCaseEffectiveAccess.user_id == user_id,
-        UserCaseEffectiveAccess.case_id == case_id
-    )).all()
-
-    if len(uac) > 1:
-        log.error(f'Multiple access found for user {user_id} and case {case_id}')
-        for u in uac:
-            db.session.delete(u)
-        db.session.commit()
-
-        uac = UserCaseEffectiveAccess()
-        uac.user_id = user_id
-        uac.case_id = case_id
-        uac.access_level = CaseAccessLevel.deny_all.value
-        db.session.add(uac)
-
-    elif len(uac) == 1:
-        uac = uac[0]
-        uac.access_level = CaseAccessLevel.deny_all.value
-
-    db.session.commit()
+    ac_set_case_access_for_user(user_id, case_id, CaseAccessLevel.deny_all.value)
 
     return
 
@@ -579,49 +790,34 @@ def ac_set_case_access_for_user(user_id, case_id, access_level, commit=True):
     """
     Set a case access from a user
     """
-
-    uac = UserCaseEffectiveAccess.query.where(and_(
+    UserCaseEffectiveAccess.query.where(and_(
         UserCaseEffectiveAccess.user_id == user_id,
         UserCaseEffectiveAccess.case_id == case_id
-    )).all()
-
-    if len(uac) > 1:
-        log.error(f'Multiple access found for user {user_id} and case {case_id}')
-        for u in uac:
-            db.session.delete(u)
-        db.session.commit()
-
-        uac = UserCaseEffectiveAccess()
-        uac.user_id = user_id
-        uac.case_id = case_id
-        uac.access_level = access_level
-        db.session.add(uac)
+    )).delete()
 
-    elif len(uac) == 1:
-        uac = uac[0]
-        uac.access_level = access_level
+    _ac_insert_effective_access([(user_id, case_id, access_level)])
 
     if commit:
         db.session.commit()
 
+    ac_bump_access_version(user_id)
+
     return
 
 
 def ac_get_fast_user_cases_access(user_id):
     ucea = UserCaseEffectiveAccess.query.with_entities(
         UserCaseEffectiveAccess.case_id
-    ).filter(and_(
-        UserCaseEffectiveAccess.user_id == user_id,
-        UserCaseEffectiveAccess.access_level != CaseAccessLevel.deny_all.value
-    )).all()
+    ).filter(
+        UserCaseEffectiveAccess.user_id == user_id
+    ).all()
 
     return [e.case_id for e in ucea]
 
 
 def ac_get_user_case_counts(user_id):
     query = UserCaseEffectiveAccess.query.filter(
-        UserCaseEffectiveAccess.user_id == user_id,
-        UserCaseEffectiveAccess.access_level != CaseAccessLevel.deny_all.value
+        UserCaseEffectiveAccess.user_id == user_id
     )
 
     ucea_count = query.count()
@@ -638,64 +834,6 @@ def ac_get_user_case_counts(user_id):
     return ucea_count, open_cases_count, owned_cases_count
 
 
-def ac_get_user_cases_access(user_id):
-    # ocas = OrganisationCaseAccess.query.with_entities(
-    #     Cases.case_id,
-    #     OrganisationCaseAccess.access_level
-    # ).filter(
-    #     and_(UserOrganisation.user_id == user_id,
-    #          OrganisationCaseAccess.org_id == UserOrganisation.org_id)
-    # ).join(
-    #     OrganisationCaseAccess.case,
-    # ).all()
-    cases = Cases.query.with_entities(
-        Cases.case_id
-    ).all()
-
-    gcas = GroupCaseAccess.query.with_entities(
-        Cases.case_id,
-        GroupCaseAccess.access_level
-    ).filter(
-        and_(UserGroup.user_id == user_id,
-             UserGroup.group_id == GroupCaseAccess.group_id)
-    ).join(
-        GroupCaseAccess.case
-    ).all()
-
-    ccas = UserClient.query.with_entities(
-        UserClient.access_level,
-        Cases.case_id,
-    ).join(
-        Cases, UserClient.client_id == Cases.client_id
-    ).filter(
-        UserClient.user_id == user_id
-    ).all()
-
-    ucas = UserCaseAccess.query.with_entities(
-        Cases.case_id,
-        UserCaseAccess.access_level
-    ).filter(
-        and_(UserCaseAccess.user_id == user_id)
-    ).join(
-        UserCaseAccess.case
-    ).all()
-
-    effective_cases_access = {}
-    for oca in cases:
-        effective_cases_access[oca.case_id] = CaseAccessLevel.deny_all.value
-
-    for gca in gcas:
-        effective_cases_access[gca.case_id] = gca.access_level
-
-    for cca in ccas:
-        effective_cases_access[cca.case_id] = cca.access_level
-
-    for uca in ucas:
-        effective_cases_access[uca.case_id] = uca.access_level
-
-    return effective_cases_access
-
-
 def ac_trace_user_effective_cases_access_2(user_id):
 
     gcas = GroupCaseAccess.query.with_entities(
@@ -25,7 +25,6 @@ from flask_login import current_user
 from packaging import version
 from pickle import dumps
 from pickle import loads
-from sqlalchemy import and_
 
 from app import app
 from app import celery
@@ -34,6 +33,9 @@ from app.datamgmt.iris_engine.modules_db import get_module_config_from_hname
 from app.datamgmt.iris_engine.modules_db import iris_module_add
 from app.datamgmt.iris_engine.modules_db import iris_module_exists
 from app.datamgmt.iris_engine.modules_db import modules_list_pipelines
+from app.iris_engine.module_handler.module_registry import get_hook_subscribers
+from app.iris_engine.module_handler.module_registry import invalidate_modules_registry
+from app.iris_engine.module_handler.module_registry import pooled_module_instance
 from app.models import IrisHook
 from app.models import IrisModule
 from app.models import IrisModuleHook
@@ -384,6 +386,8 @@ def register_hook(module_id: int, iris_hook_name: str, manual_hook_name: str = N
         except Exception as e:
             return False, [str(e)]
 
+        invalidate_modules_registry()
+
         return True, [f"Hook {iris_hook_name} registered"]
 
     else:
@@ -410,6 +414,8 @@ def deregister_from_hook(module_id: int, iris_hook_name: str):
             log.info(f'Deregistered module #{module_id} from {iris_hook_name}')
             db.session.delete(hook)
 
+        invalidate_modules_registry()
+
     return True, ['Hook deregistered']
 
 
@@ -504,38 +510,18 @@ def call_modules_hook(hook_name: str, data: any, caseid: int = None, hook_ui_nam
     :param caseid: Case ID
     :return: Any
     """
-    hook = IrisHook.query.filter(IrisHook.hook_name == hook_name).first()
-    if not hook:
+    subscribers = get_hook_subscribers(hook_name)
+    if subscribers is None:
         log.critical(f'Hook name {hook_name} not found')
         raise Exception(f'Hook name {hook_name} not found')
 
-    if hook_ui_name:
-        condition = and_(
-            IrisModule.is_active == True,
-            IrisModuleHook.hook_id == hook.id,
-            IrisModuleHook.manual_hook_ui_name == hook_ui_name
-        )
-    else:
-        condition = and_(
-            IrisModule.is_active == True,
-            IrisModuleHook.hook_id == hook.id
-        )
-
-    if module_name:
-        condition = and_(
-            condition,
-            IrisModule.module_name == module_name
-        )
-
-    modules = IrisModuleHook.query.with_entities(
-        IrisModuleHook.run_asynchronously,
-        IrisModule.module_name,
-        IrisModuleHook.manual_hook_ui_name
-    ).filter(condition).join(
-        IrisModule, IrisModuleHook.module_id == IrisModule.id
-    ).all()
+    for module in subscribers:
+        if hook_ui_name and module.manual_hook_ui_name != hook_ui_name:
+            continue
+
+        if module_name and module.module_name != module_name:
+            continue
 
-    for module in modules:
         if module.run_asynchronously and "on_preload_" not in hook_name:
             log.info(f'Calling module {module.module_name} asynchronously for hook {hook_name} :: {hook_ui_name}')
             # We cannot directly pass the sqlalchemy in data, as it needs to be serializable
@@ -560,8 +546,8 @@ def call_modules_hook(hook_name: str, data: any, caseid: int = None, hook_ui_nam
                 else:
                     data_list = data
 
-                mod_inst, _ = instantiate_module_from_name(module_name=module.module_name)
-                status = mod_inst.hooks_handler(hook_name, module.manual_hook_ui_name, data=data_list)
+                with pooled_module_instance(module.module_name, instantiate_module_from_name) as mod_inst:
+                    status = mod_inst.hooks_handler(hook_name, module.manual_hook_ui_name, data=data_list)
 
             except Exception as e:
                 log.critical(f"Failed to run hook {hook_name} with module {module.module_name}. Error {str(e)}")
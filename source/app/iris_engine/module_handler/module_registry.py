@@ -0,0 +1,155 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from app import app
+from app.models import IrisHook
+from app.models import IrisModule
+from app.models import IrisModuleHook
+
+HookSubscriber = namedtuple('HookSubscriber', ['module_name', 'run_asynchronously', 'manual_hook_ui_name'])
+
+_registry_lock = threading.Lock()
+
+# Hook name -> tuple of HookSubscriber of the active modules. Every known hook has an entry.
+_hooks_table = None
+_hooks_table_expires_at = 0
+
+# Module name -> list of idle module instances
+_modules_pool = {}
+
+# Incremented on each invalidation, so that instances created before it are not returned to the pool
+_registry_generation = 0
+
+
+def invalidate_modules_registry():
+    """
+    Drops the hooks dispatch table and the pooled module instances of the process.
+    Must be called whenever a module is added, deleted, enabled, disabled or configured, a hook is registered or
+    deregistered, or the server settings are updated. Other processes pick up the changes once their table expires.
+    """
+    global _hooks_table, _registry_generation
+
+    with _registry_lock:
+        _hooks_table = None
+        _modules_pool.clear()
+        _registry_generation += 1
+
+
+def _build_hooks_table():
+    table = {hook.hook_name: [] for hook in IrisHook.query.with_entities(IrisHook.hook_name).all()}
+
+    subscribers = IrisModuleHook.query.with_entities(
+        IrisHook.hook_name,
+        IrisModule.module_name,
+        IrisModuleHook.run_asynchronously,
+        IrisModuleHook.manual_hook_ui_name
+    ).join(
+        IrisModule, IrisModuleHook.module_id == IrisModule.id
+    ).join(
+        IrisHook, IrisModuleHook.hook_id == IrisHook.id
+    ).filter(
+        IrisModule.is_active == True
+    ).order_by(
+        IrisModuleHook.id
+    ).all()
+
+    for subscriber in subscribers:
+        table[subscriber.hook_name].append(HookSubscriber(subscriber.module_name,
+                                                          subscriber.run_asynchronously,
+                                                          subscriber.manual_hook_ui_name))
+
+    return {hook_name: tuple(hook_subscribers) for hook_name, hook_subscribers in table.items()}
+
+
+def get_hook_subscribers(hook_name: str):
+    """
+    Returns the active modules subscribed to a hook, from the dispatch table of the process.
+    The table is rebuilt when invalidated or after MODULES_HOOKS_CACHE_TIMEOUT seconds.
+
+    args:
+        hook_name: Name of the hook
+
+    returns:
+        tuple of HookSubscriber, or None if the hook does not exist
+    """
+    global _hooks_table, _hooks_table_expires_at, _registry_generation
+
+    now = time.monotonic()
+    table = _hooks_table
+    if table is None or _hooks_table_expires_at < now:
+        table = _build_hooks_table()
+
+        with _registry_lock:
+            if _hooks_table is not None:
+                # Expired: instances may hold a configuration updated by another process
+                _modules_pool.clear()
+                _registry_generation += 1
+
+            _hooks_table = table
+            _hooks_table_expires_at = now + app.config.get('MODULES_HOOKS_CACHE_TIMEOUT')
+
+    return table.get(hook_name)
+
+
+def _clear_message_queue(mod_inst):
+    # The logs of a module are queued on its instance, they must not leak to the next caller of a pooled instance
+    message_queue = getattr(mod_inst, 'message_queue', None)
+    if message_queue is not None:
+        message_queue.clear()
+
+
+@contextmanager
+def pooled_module_instance(module_name: str, factory):
+    """
+    Provides an instance of a module, reusing an idle one when possible. The instance is returned to the pool on exit,
+    unless the registry was invalidated meanwhile, so an instance is never used by two callers at once.
+    The logs queued by the instance are cleared when it is taken from and returned to the pool.
+
+    args:
+        module_name: Name of the module
+        factory: called with the module name to create an instance when none is idle. Returns a tuple
+                 (instance or None, message), as instantiate_module_from_name
+
+    returns:
+        module instance, or None if it could not be created
+    """
+    with _registry_lock:
+        generation = _registry_generation
+        idle_instances = _modules_pool.get(module_name)
+        mod_inst = idle_instances.pop() if idle_instances else None
+
+    if mod_inst is None:
+        mod_inst, _ = factory(module_name)
+    else:
+        _clear_message_queue(mod_inst)
+
+    yield mod_inst
+
+    if mod_inst is None:
+        return
+
+    _clear_message_queue(mod_inst)
+
+    with _registry_lock:
+        if generation == _registry_generation:
+            _modules_pool.setdefault(module_name, []).append(mod_inst)
@@ -0,0 +1,201 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from sqlalchemy import func
+
+from app import app
+from app.datamgmt.states import get_case_states_version
+from app.models import Cases
+from app.models import Comments
+from app.models import UserActivity
+
+# Rendered reports are stored under <UPLOADED_PATH>/reports/<case ID>/<slot>/<version>/<report file>, where the slot
+# identifies a template, generation options and the user the report is generated by, and the version is a digest of
+# the content of the case and of the generation date. Only the latest version of each slot is kept.
+
+
+def _get_reports_path(case_id):
+    return os.path.join(app.config['UPLOADED_PATH'], 'reports', str(int(case_id)))
+
+
+def _get_case_fingerprint(case_id, with_activities):
+    case = Cases.query.filter(Cases.case_id == case_id).first()
+    if not case:
+        return None
+
+    case_columns = [str(getattr(case, column.key)) for column in Cases.__table__.columns]
+
+    comments = Comments.query.with_entities(
+        func.count(Comments.comment_id),
+        func.max(Comments.comment_date),
+        func.max(Comments.comment_update_date)
+    ).filter(
+        Comments.comment_case_id == case_id
+    ).first()
+
+    fingerprint = [get_case_states_version(case_id), *case_columns, *[str(value) for value in comments]]
+
+    if with_activities:
+        last_activity = UserActivity.query.with_entities(
+            func.max(UserActivity.id)
+        ).filter(
+            UserActivity.case_id == case_id
+        ).scalar()
+        fingerprint.append(str(last_activity))
+
+    return fingerprint
+
+
+def get_report_slot(report_id, doc_type, safe_mode, user_id):
+    """
+    Returns the name under which the renderings of a report template with the given options are stored.
+    Reports hold the name of the user who generated them, so each user has its own renderings.
+
+    args:
+        report_id: ID of the report template
+        doc_type: Investigation or Activities
+        safe_mode: True if the report is generated in safe mode
+        user_id: ID of the user generating the report
+
+    returns:
+        str
+    """
+    return f'{int(user_id)}_{int(report_id)}_{doc_type.lower()}_{"safe" if safe_mode else "full"}'
+
+
+def get_report_version(case_id, report, doc_type):
+    """
+    Returns the version of a report for the current content of a case. The version is a digest of the object states
+    counters of the case, the case itself and its comments, the activities for activities reports, the template and
+    the current day, as reports are dated. It must be computed before the case is exported, so that a concurrent update
+    invalidates the rendering.
+
+    args:
+        case_id: ID of the case
+        report: CaseTemplateReport to render
+        doc_type: Investigation or Activities
+
+    returns:
+        str, or None if the case does not exist
+    """
+    fingerprint = _get_case_fingerprint(case_id, with_activities=doc_type == 'Activities')
+    if fingerprint is None:
+        return None
+
+    template_path = os.path.join(app.config['TEMPLATES_PATH'], report.internal_reference)
+    template_mtime = os.path.getmtime(template_path) if os.path.exists(template_path) else None
+    fingerprint.extend([str(report.id), report.internal_reference, str(report.naming_format), str(template_mtime),
+                        datetime.utcnow().strftime('%Y-%m-%d')])
+
+    return hashlib.sha256('\x1f'.join(fingerprint).encode('utf-8')).hexdigest()
+
+
+def get_cached_report(case_id, slot, version):
+    """
+    Returns the path of the rendered report matching a version, if any
+
+    args:
+        case_id: ID of the case
+        slot: slot of the report, as returned by get_report_slot
+        version: version of the report, as returned by get_report_version
+
+    returns:
+        str or None
+    """
+    version_path = os.path.join(_get_reports_path(case_id), slot, version)
+    if not os.path.isdir(version_path):
+        return None
+
+    files = os.listdir(version_path)
+    if len(files) != 1:
+        return None
+
+    return os.path.join(version_path, files[0])
+
+
+def store_report(case_id, slot, version, file_path):
+    """
+    Moves a rendered report in the cache, replacing the previous versions of its slot
+
+    args:
+        case_id: ID of the case
+        slot: slot of the report, as returned by get_report_slot
+        version: version of the report, as returned by get_report_version
+        file_path: path of the rendered report
+
+    returns:
+        path of the cached report
+    """
+    slot_path = os.path.join(_get_reports_path(case_id), slot)
+    os.makedirs(slot_path, exist_ok=True)
+
+    # The version directory is filled aside then renamed, so that readers never see a partial report
+    staging_path = tempfile.mkdtemp(dir=slot_path, prefix='.staging_')
+    shutil.move(file_path, os.path.join(staging_path, os.path.basename(file_path)))
+
+    version_path = os.path.join(slot_path, version)
+    try:
+        os.rename(staging_path, version_path)
+    except OSError:
+        # Another worker already stored this version
+        shutil.rmtree(staging_path, ignore_errors=True)
+
+    for entry in os.listdir(slot_path):
+        if entry != version and not entry.startswith('.staging_'):
+            shutil.rmtree(os.path.join(slot_path, entry), ignore_errors=True)
+
+    return get_cached_report(case_id, slot, version)
+
+
+def get_stored_report_path(case_id, relative_path):
+    """
+    Returns the absolute path of a report stored for a case, if it is still in the cache
+
+    args:
+        case_id: ID of the case
+        relative_path: path of the report relative to the reports of the case
+
+    returns:
+        str or None
+    """
+    reports_path = os.path.realpath(_get_reports_path(case_id))
+    file_path = os.path.realpath(os.path.join(reports_path, relative_path))
+
+    if not file_path.startswith(reports_path + os.sep) or not os.path.isfile(file_path):
+        return None
+
+    return file_path
+
+
+def get_report_relative_path(case_id, file_path):
+    return os.path.relpath(file_path, _get_reports_path(case_id))
+
+
+def remove_case_reports(case_id):
+    """
+    Removes all the rendered reports of a case
+
+    args:
+        case_id: ID of the case
+    """
+    shutil.rmtree(_get_reports_path(case_id), ignore_errors=True)
@@ -19,15 +19,29 @@
 # IMPORTS ------------------------------------------------
 import os
 import urllib.parse
+from celery.schedules import crontab
 from celery.signals import task_prerun
 from flask_login import current_user
+from flask_login import login_user
 
 from app import app
+from app import celery
 from app import db
+from app.business.cases import delete as delete_case
+from app.business.csv_imports import delete_expired_csv_imports_errors
+from app.business.csv_imports import get_csv_import
+from app.business.errors import BusinessProcessingError
+from app.business.errors import PermissionDeniedError
+from app.business.reports import generate_report
+from app.datamgmt.alerts.alerts_db import prune_similar_alerts_cache
+from app.datamgmt.case.case_note_revisions_db import compact_note_revisions
 from app.datamgmt.case.case_db import get_case
+from app.datamgmt.datastore.datastore_db import datastore_deduplicate_files
 from app.iris_engine.module_handler.module_handler import pipeline_dispatcher
+from app.iris_engine.reporter.report_cache import get_report_relative_path
 from app.iris_engine.utils.common import build_upload_path
 from app.iris_engine.utils.tracker import track_activity
+from app.models.authorization import User
 from iris_interface import IrisInterfaceStatus as IStatus
 from iris_interface.IrisModuleInterface import IrisPipelineTypes
 
@@ -98,3 +112,161 @@ def chunks(lst, n):
     """Yield successive n-sized chunks from lst."""
     for i in range(0, len(lst), n):
         yield lst[i:i + n]
+
+
+@celery.task
+def task_prune_similar_alerts_cache():
+    """
+    Remove the postings older than the configured retention from the alerts similarity index
+    """
+    retention_days = app.config.get('ALERTS_SIMILARITY_RETENTION_DAYS')
+    removed = prune_similar_alerts_cache(retention_days)
+    app.logger.info(f'Cron - Removed {removed} postings from the alerts similarity index')
+
+    return IStatus.I2Success(f'Removed {removed} postings from the alerts similarity index')
+
+
+@celery.task(bind=True)
+def task_compact_note_revisions(self):
+    """
+    Convert the stored note revisions to snapshots and deltas, reporting the number of notes processed
+    """
+    def report_progress(processed, total):
+        self.update_state(state='PROGRESS', meta={'processed': processed, 'total': total})
+
+    stats = compact_note_revisions(progress_callback=report_progress)
+    app.logger.info(f'Compacted {stats["converted"]} note revisions, {stats["bytes_reclaimed"]} bytes reclaimed')
+
+    return IStatus.I2Success(f'{stats["bytes_reclaimed"]} bytes reclaimed', data=stats)
+
+
+@celery.task(bind=True)
+def task_deduplicate_datastore(self):
+    """
+    Move the datastore files stored before blobs to blobs, reporting the number of files processed
+    """
+    def report_progress(processed, total):
+        self.update_state(state='PROGRESS', meta={'processed': processed, 'total': total})
+
+    stats = datastore_deduplicate_files(progress_callback=report_progress)
+    app.logger.info(f'Deduplicated {stats["deduplicated"]} datastore files, {stats["bytes_reclaimed"]} bytes reclaimed')
+
+    return IStatus.I2Success(f'{stats["bytes_reclaimed"]} bytes reclaimed', data=stats)
+
+
+@celery.task
+def task_delete_expired_import_errors():
+    """
+    Remove the errors reports of the background CSV imports older than the configured expiration
+    """
+    removed = delete_expired_csv_imports_errors()
+    app.logger.info(f'Cron - Removed {removed} expired CSV import errors reports')
+
+    return IStatus.I2Success(f'Removed {removed} expired CSV import errors reports')
+
+
+@celery.on_after_finalize.connect
+def setup_periodic_similarity_prune(self, **kwargs):
+    self.add_periodic_task(
+        crontab(hour=1, minute=0),
+        task_prune_similar_alerts_cache.s(),
+        name='iris_prune_similar_alerts_cache'
+    )
+
+
+@celery.on_after_finalize.connect
+def setup_periodic_import_errors_cleanup(self, **kwargs):
+    self.add_periodic_task(
+        crontab(minute=30),
+        task_delete_expired_import_errors.s(),
+        name='iris_delete_expired_import_errors'
+    )
+
+
+@celery.task(bind=True)
+def task_import_csv(self, import_name, csv_path, caseid, user_id, lines_count, csv_options=None):
+    """
+    Import a CSV file of one of the CsvImport kinds in a case on behalf of a user, reporting the number of rows
+    processed. The rejected rows are written to an errors report, downloaded through the task ID. The file is
+    removed once processed.
+    """
+    csv_import = get_csv_import(import_name)
+
+    def report_progress(processed):
+        self.update_state(state='PROGRESS', meta={'import_name': import_name, 'caseid': caseid,
+                                                  'processed': processed, 'total': lines_count})
+
+    try:
+        user = User.query.filter(User.id == user_id).first()
+        if not user:
+            return IStatus.I2Error(message=f'Unknown user ID {user_id}', logs=[], caseid=caseid)
+
+        # Hooks and activities are attributed to the user who uploaded the file
+        with app.test_request_context():
+            login_user(user)
+            imported_count, errors = csv_import.import_file(csv_path, caseid, csv_options,
+                                                            progress_callback=report_progress)
+
+    except BusinessProcessingError as e:
+        return IStatus.I2Error(message=e.get_message(), logs=[str(e.get_data())], caseid=caseid)
+
+    finally:
+        if os.path.exists(csv_path):
+            os.remove(csv_path)
+
+    if errors:
+        csv_import.write_errors(errors, csv_import.get_errors_path(self.request.id))
+
+    return IStatus.I2Success(f'{imported_count} {csv_import.objects_name} imported, {len(errors)} rows rejected',
+                             data={'imported_count': imported_count, 'errors_count': len(errors)})
+
+
+@celery.task(bind=True)
+def task_generate_report(self, caseid, report_id, doc_type, safe_mode, user_id):
+    """
+    Generate a report of a case on behalf of a user, reporting the generation step.
+    The report is kept in the reports cache, from which it is downloaded.
+    """
+    def report_progress(step):
+        self.update_state(state='PROGRESS', meta={'caseid': caseid, 'step': step})
+
+    user = User.query.filter(User.id == user_id).first()
+    if not user:
+        return IStatus.I2Error(message=f'Unknown user ID {user_id}', logs=[], caseid=caseid)
+
+    try:
+        # Hooks and activities are attributed to the user who requested the report
+        with app.test_request_context():
+            login_user(user)
+            fpath, cached = generate_report(caseid, report_id, doc_type, safe_mode, progress_callback=report_progress)
+
+    except BusinessProcessingError as e:
+        return IStatus.I2Error(message=e.get_message(), logs=[str(e.get_data())], caseid=caseid)
+
+    return IStatus.I2Success('Report generated', data={'report_path': get_report_relative_path(caseid, fpath),
+                                                       'file_name': os.path.basename(fpath),
+                                                       'cached': cached})
+
+
+@celery.task(bind=True)
+def task_delete_case(self, caseid, user_id):
+    """
+    Delete a case on behalf of a user. The deletion is a single transaction, so no progress is reported.
+    """
+    user = User.query.filter(User.id == user_id).first()
+    if not user:
+        return IStatus.I2Error(message=f'Unknown user ID {user_id}', logs=[], caseid=caseid)
+
+    try:
+        # Hooks and activities are attributed to the user who requested the deletion
+        with app.test_request_context():
+            login_user(user)
+            delete_case(caseid)
+
+    except BusinessProcessingError as e:
+        return IStatus.I2Error(message=e.get_message(), logs=[str(e.get_data())], caseid=caseid)
+
+    except PermissionDeniedError:
+        return IStatus.I2Error(message='Permission denied', logs=[], caseid=caseid)
+
+    return IStatus.I2Success(f'Case {caseid} deleted', data={'case_id': caseid})
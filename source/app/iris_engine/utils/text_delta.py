@@ -0,0 +1,101 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import json
+from difflib import SequenceMatcher
+
+# A delta is a JSON-serializable list of operations applied in order to the lines of a base text:
+#   - a positive integer n copies the next n lines of the base
+#   - a negative integer -n skips the next n lines of the base
+#   - a string is inserted as is
+
+
+def _split_lines(text):
+    return (text or '').splitlines(keepends=True)
+
+
+def make_delta(base: str, text: str) -> list:
+    """
+    Computes the line delta turning a text into another
+
+    args:
+        base: text the delta applies to
+        text: text the delta produces
+
+    returns:
+        list of operations
+    """
+    base_lines = _split_lines(base)
+    lines = _split_lines(text)
+
+    delta = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, base_lines, lines).get_opcodes():
+        if tag == 'equal':
+            delta.append(i2 - i1)
+            continue
+
+        if i2 > i1:
+            delta.append(i1 - i2)
+
+        if j2 > j1:
+            delta.append(''.join(lines[j1:j2]))
+
+    return delta
+
+
+def apply_delta(base: str, delta: list) -> str:
+    """
+    Applies a delta computed by make_delta to its base text
+
+    args:
+        base: text the delta was computed from
+        delta: list of operations
+
+    returns:
+        str
+    """
+    base_lines = _split_lines(base)
+    position = 0
+    parts = []
+
+    for operation in delta:
+        if isinstance(operation, str):
+            parts.append(operation)
+
+        elif operation > 0:
+            parts.extend(base_lines[position:position + operation])
+            position += operation
+
+        else:
+            position -= operation
+
+    return ''.join(parts)
+
+
+def get_delta_size(delta: list) -> int:
+    """
+    Returns the number of bytes a delta takes once serialized
+    """
+    return len(json.dumps(delta, separators=(',', ':')).encode('utf-8'))
+
+
+def get_text_size(text: str) -> int:
+    """
+    Returns the number of bytes a text takes once encoded
+    """
+    return len((text or '').encode('utf-8'))
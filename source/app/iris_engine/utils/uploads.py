@@ -0,0 +1,512 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from flask import Request
+from flask import current_app
+from flask_login import current_user
+from pathlib import Path
+
+import pyminizip
+
+# Uploads of the views marked with streamed_upload are spooled by werkzeug in a staging folder of the datastore,
+# hashed and measured while they are received. They are then hard linked to their final location, so a file is
+# written once. The chunks of chunked uploads whose parameters are in the query string are written by werkzeug
+# straight at their offset in the assembled file, in the same staging folder. It is moved once complete.
+
+# Multiple of the filesystems pages, large enough to keep the number of syscalls low
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+_UPLOADS_DIR_NAME = '.uploads'
+_CHUNKED_UPLOADS_DIR_NAME = 'chunks'
+_CHUNKED_UPLOAD_DATA = 'data'
+_CHUNKED_UPLOAD_COMPLETE = 'complete'
+_CHUNKED_UPLOAD_MANIFEST = 'manifest.json'
+_CHUNKED_UPLOAD_ID_RE = re.compile(r'^[\w-]{1,128}$')
+# Staged files are created private, stored files are also read by the proxy serving the datastore
+_STORED_FILE_MODE = 0o644
+
+
+class HashingFile:
+    """
+    Wraps a writable file to compute the size and SHA256 of the data written in it
+    """
+    def __init__(self, file):
+        self._file = file
+        self._sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self._sha256.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def hexdigest(self):
+        return self._sha256.hexdigest().upper()
+
+    def __iter__(self):
+        return iter(self._file)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def streamed_upload(f):
+    """
+    Marks a view whose uploaded files are spooled in the datastore staging folder and hashed while received
+    """
+    f.streamed_upload = True
+    return f
+
+
+class StreamedUploadRequest(Request):
+    """
+    Request spooling the uploaded files of the views marked with streamed_upload in the datastore staging folder.
+    The chunks of chunked uploads are written at their offset in the file of their upload instead.
+    """
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        view = current_app.view_functions.get(self.endpoint) if self.endpoint else None
+        if not getattr(view, 'streamed_upload', False):
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+        if self.args.get('dzuuid') is not None and current_user.is_authenticated:
+            try:
+                chunk = get_upload_chunk(self.args, current_app.config.get('DROPZONE_MAX_FILE_SIZE'))
+                return open_upload_chunk(current_user.id, chunk)
+
+            except ValueError:
+                # Spooled, then rejected by the view
+                pass
+
+        return HashingFile(tempfile.NamedTemporaryFile(dir=get_uploads_path(), prefix='upload-'))
+
+
+def get_uploads_path():
+    uploads_path = Path(current_app.config['DATASTORE_PATH']) / _UPLOADS_DIR_NAME
+    uploads_path.mkdir(parents=True, exist_ok=True)
+
+    return uploads_path
+
+
+def copy_stream(stream, fout, buffer_size=UPLOAD_BUFFER_SIZE):
+    """
+    Copies a stream into a file, computing the size and SHA256 of the data copied
+
+    args:
+        stream: readable stream
+        fout: writable file
+        buffer_size: size of the reads
+
+    returns:
+        tuple of the size and upper case SHA256 of the data
+    """
+    sha256 = hashlib.sha256()
+    size = 0
+    buffer = memoryview(bytearray(buffer_size))
+    readinto = getattr(stream, 'readinto', None)
+
+    while True:
+        if readinto is not None:
+            read = readinto(buffer)
+            data = buffer[:read] if read else None
+        else:
+            data = stream.read(buffer_size)
+            read = len(data)
+
+        if not read:
+            break
+
+        sha256.update(data)
+        fout.write(data)
+        size += read
+
+    return size, sha256.hexdigest().upper()
+
+
+def hash_file(file_path, buffer_size=UPLOAD_BUFFER_SIZE):
+    """
+    Returns the size and upper case SHA256 of a file
+    """
+    sha256 = hashlib.sha256()
+    size = 0
+    buffer = memoryview(bytearray(buffer_size))
+
+    with open(file_path, 'rb', buffering=0) as fin:
+        for read in iter(lambda: fin.readinto(buffer), 0):
+            sha256.update(buffer[:read])
+            size += read
+
+    return size, sha256.hexdigest().upper()
+
+
+def _link_or_copy(source_path, target_path):
+    try:
+        os.link(source_path, target_path)
+
+    except OSError:
+        # Different filesystems, or links not supported
+        with open(source_path, 'rb') as fin, open(target_path, 'wb') as fout:
+            copy_stream(fin, fout)
+
+
+class StagedFile:
+    """
+    File of the staging folder waiting to be stored, with its size and upper case SHA256.
+    Owned files are moved when stored, the others are linked.
+    """
+    def __init__(self, path, size, sha256, owned):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.owned = owned
+
+
+def stage_upload(file_storage):
+    """
+    Stages an uploaded file. Files spooled by StreamedUploadRequest are already hashed and staged.
+
+    args:
+        file_storage: uploaded file
+
+    returns:
+        StagedFile
+    """
+    stream = file_storage.stream
+
+    if isinstance(stream, HashingFile):
+        stream.flush()
+        return StagedFile(stream.name, stream.size, stream.hexdigest(), owned=False)
+
+    with tempfile.NamedTemporaryFile(dir=get_uploads_path(), prefix='upload-', delete=False) as fout:
+        file_size, file_hash = copy_stream(stream, fout)
+
+    return StagedFile(fout.name, file_size, file_hash, owned=True)
+
+
+def stage_file(file_path):
+    """
+    Stages a file of the staging folder, such as an assembled chunked upload. The file is moved when stored.
+
+    args:
+        file_path: path of the file
+
+    returns:
+        StagedFile
+    """
+    file_size, file_hash = hash_file(file_path)
+
+    return StagedFile(file_path, file_size, file_hash, owned=True)
+
+
+def stage_content(content):
+    """
+    Stages a content held in memory
+
+    args:
+        content: bytes of the file
+
+    returns:
+        StagedFile
+    """
+    with tempfile.NamedTemporaryFile(dir=get_uploads_path(), prefix='upload-', delete=False) as fout:
+        fout.write(content)
+
+    return StagedFile(fout.name, len(content), hashlib.sha256(content).hexdigest().upper(), owned=True)
+
+
+def store_staged_file(staged_file, location, password=None):
+    """
+    Stores a staged file at its location, encrypted in a zip archive if a password is provided.
+    The archived file is named after its hash, and the encryption is the only pass over the data.
+
+    args:
+        staged_file: StagedFile
+        location: path of the stored file, without the archive extension
+        password: password of the archive, or None to store the file as is
+
+    returns:
+        path of the stored file
+    """
+    if password is None:
+        if staged_file.owned:
+            os.replace(staged_file.path, location)
+        else:
+            _link_or_copy(staged_file.path, location)
+
+        os.chmod(location, _STORED_FILE_MODE)
+        return location.as_posix()
+
+    file_path = location.as_posix() + '.zip'
+    with tempfile.TemporaryDirectory(dir=get_uploads_path()) as staging:
+        archived_path = Path(staging) / staged_file.sha256
+        if staged_file.owned:
+            os.replace(staged_file.path, archived_path)
+        else:
+            _link_or_copy(staged_file.path, archived_path)
+
+        pyminizip.compress(archived_path.as_posix(), None, file_path, password, 0)
+
+    os.chmod(file_path, _STORED_FILE_MODE)
+    return file_path
+
+
+def discard_staged_file(staged_file):
+    """
+    Deletes a staged file that was not stored
+    """
+    if staged_file.owned:
+        Path(staged_file.path).unlink(missing_ok=True)
+
+
+def _get_chunked_upload_path(user_id, upload_id):
+    if not upload_id or not _CHUNKED_UPLOAD_ID_RE.match(upload_id):
+        raise ValueError('Invalid upload ID')
+
+    return get_uploads_path() / _CHUNKED_UPLOADS_DIR_NAME / f'{user_id}-{upload_id}'
+
+
+def _delete_expired_chunked_uploads():
+    expiration = time.time() - current_app.config.get('DATASTORE_CHUNKED_UPLOADS_EXPIRATION') * 3600
+    chunked_uploads_path = get_uploads_path() / _CHUNKED_UPLOADS_DIR_NAME
+    if not chunked_uploads_path.is_dir():
+        return
+
+    for upload_path in chunked_uploads_path.iterdir():
+        if upload_path.stat().st_mtime < expiration:
+            shutil.rmtree(upload_path, ignore_errors=True)
+
+
+def get_chunked_upload_chunks(user_id, upload_id):
+    """
+    Returns the indexes of the chunks received for a chunked upload
+
+    args:
+        user_id: ID of the user uploading
+        upload_id: ID of the upload, chosen by the client
+
+    returns:
+        sorted list of int
+    """
+    upload_path = _get_chunked_upload_path(user_id, upload_id)
+    if not upload_path.is_dir():
+        return []
+
+    return sorted(int(marker.stem) for marker in upload_path.glob('*.chunk'))
+
+
+class UploadChunk:
+    """
+    Position of a chunk in a chunked upload
+    """
+    def __init__(self, upload_id, index, chunks_count, chunk_size, offset, total_size):
+        self.upload_id = upload_id
+        self.index = index
+        self.chunks_count = chunks_count
+        self.chunk_size = chunk_size
+        self.offset = offset
+        self.total_size = total_size
+        # Only the last chunk may be shorter
+        self.size = min(chunk_size, total_size - offset)
+
+    def get_manifest(self):
+        return {'chunks_count': self.chunks_count, 'chunk_size': self.chunk_size, 'total_size': self.total_size}
+
+
+def get_upload_chunk(values, max_file_size):
+    """
+    Reads the chunk parameters of a request, which follow the parameters of Dropzone chunked uploads.
+    The chunks must all have the same size but the last one, and be at the offset matching their index.
+
+    args:
+        values: parameters of the request
+        max_file_size: maximum size of an uploaded file
+
+    returns:
+        UploadChunk, or None if the request is not a chunk
+
+    raises:
+        ValueError: if the chunk parameters are invalid
+    """
+    upload_id = values.get('dzuuid')
+    if upload_id is None:
+        return None
+
+    try:
+        chunk_index = int(values.get('dzchunkindex'))
+        chunks_count = int(values.get('dztotalchunkcount'))
+        chunk_size = int(values.get('dzchunksize'))
+        offset = int(values.get('dzchunkbyteoffset'))
+        total_size = int(values.get('dztotalfilesize'))
+    except (TypeError, ValueError):
+        raise ValueError('Invalid chunk parameters')
+
+    if not 0 <= total_size <= max_file_size:
+        raise ValueError('File exceeds the maximum upload size')
+
+    if chunk_size <= 0 or chunks_count != max(1, -(-total_size // chunk_size)):
+        raise ValueError('Invalid chunk size')
+
+    if not 0 <= chunk_index < chunks_count or offset != chunk_index * chunk_size:
+        raise ValueError('Invalid chunk')
+
+    return UploadChunk(upload_id, chunk_index, chunks_count, chunk_size, offset, total_size)
+
+
+class ChunkFile:
+    """
+    Writes a chunk at its offset in the file of its upload. The data beyond the size of the chunk is counted,
+    but not written.
+    """
+    def __init__(self, data_path, chunk):
+        self.chunk = chunk
+        self.size = 0
+        self._remaining = chunk.size
+        self._file = os.fdopen(os.open(data_path, os.O_RDWR | os.O_CREAT, 0o600), 'r+b')
+        self._file.seek(chunk.offset)
+
+    def write(self, data):
+        self.size += len(data)
+        if self._remaining > 0:
+            written = self._file.write(data[:self._remaining])
+            self._remaining -= written
+
+        return len(data)
+
+    def seek(self, *args):
+        # Werkzeug rewinds the files it parsed, the chunk is already in place
+        return 0
+
+    def read(self, *args):
+        return b''
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+
+def _check_chunked_upload_manifest(upload_path, chunk):
+    """
+    Records the geometry of an upload with its first chunk received, and checks the following chunks against it
+    """
+    manifest_path = upload_path / _CHUNKED_UPLOAD_MANIFEST
+    manifest = chunk.get_manifest()
+
+    # Written aside then linked, so that the manifest is never read partially written
+    with tempfile.NamedTemporaryFile('w', dir=upload_path, prefix='manifest-', delete=False) as fout:
+        json.dump(manifest, fout)
+
+    try:
+        os.link(fout.name, manifest_path)
+    except FileExistsError:
+        with open(manifest_path) as fin:
+            if json.load(fin) != manifest:
+                raise ValueError('Chunk does not match the upload')
+    finally:
+        os.unlink(fout.name)
+
+
+def open_upload_chunk(user_id, chunk):
+    """
+    Opens the file of a chunked upload to write a chunk at its offset
+
+    args:
+        user_id: ID of the user uploading
+        chunk: UploadChunk
+
+    returns:
+        ChunkFile
+
+    raises:
+        ValueError: if the chunk does not match the chunks already received
+    """
+    upload_path = _get_chunked_upload_path(user_id, chunk.upload_id)
+
+    if chunk.index == 0:
+        _delete_expired_chunked_uploads()
+
+    upload_path.mkdir(parents=True, exist_ok=True)
+    _check_chunked_upload_manifest(upload_path, chunk)
+
+    return ChunkFile(upload_path / _CHUNKED_UPLOAD_DATA, chunk)
+
+
+def save_upload_chunk(file_storage, user_id, chunk):
+    """
+    Saves a chunk of a resumable upload. Chunks can be sent in any order and sent again. A chunk is only recorded
+    as received once all its data is written, and the upload is complete once every chunk is received.
+
+    args:
+        file_storage: uploaded chunk, already written at its offset if opened by StreamedUploadRequest
+        user_id: ID of the user uploading
+        chunk: UploadChunk
+
+    returns:
+        path of the complete file once all the chunks are received, None otherwise.
+        Only one call gets the path; the caller stores the file then calls discard_chunked_upload.
+
+    raises:
+        ValueError: if the chunk is invalid
+    """
+    chunk_file = file_storage.stream
+    if not isinstance(chunk_file, ChunkFile):
+        chunk_file = open_upload_chunk(user_id, chunk)
+        try:
+            copy_stream(file_storage.stream, chunk_file)
+        finally:
+            chunk_file.close()
+
+    chunk_file.close()
+    if chunk_file.size != chunk.size:
+        raise ValueError('Size of the chunk does not match')
+
+    upload_path = _get_chunked_upload_path(user_id, chunk.upload_id)
+    (upload_path / f'{chunk.index}.chunk').touch()
+    if get_chunked_upload_chunks(user_id, chunk.upload_id) != list(range(chunk.chunks_count)):
+        return None
+
+    try:
+        os.close(os.open(upload_path / _CHUNKED_UPLOAD_COMPLETE, os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        # Completed by a concurrent chunk
+        return None
+
+    data_path = upload_path / _CHUNKED_UPLOAD_DATA
+    if data_path.stat().st_size != chunk.total_size:
+        discard_chunked_upload(user_id, chunk.upload_id)
+        raise ValueError('Size of the uploaded file does not match')
+
+    return data_path
+
+
+def discard_chunked_upload(user_id, upload_id):
+    """
+    Deletes the staged data of a chunked upload
+    """
+    shutil.rmtree(_get_chunked_upload_path(user_id, upload_id), ignore_errors=True)
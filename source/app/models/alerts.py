@@ -2,7 +2,7 @@ from datetime import datetime
 
 import uuid
 from sqlalchemy.dialects.postgresql import JSON
-from sqlalchemy import BigInteger, Table, Boolean, String
+from sqlalchemy import BigInteger, Table, Boolean, String, Index
 from sqlalchemy import Column
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
@@ -89,11 +89,17 @@ class AlertResolutionStatus(db.Model):
 
 class SimilarAlertsCache(db.Model):
     __tablename__ = 'similar_alerts_cache'
+    __table_args__ = (
+        Index('idx_similar_alerts_cache_posting', 'customer_id', 'posting_key', 'created_at'),
+        Index('idx_similar_alerts_cache_alert_id', 'alert_id'),
+        Index('idx_similar_alerts_cache_created_at', 'created_at')
+    )
 
     id = Column(BigInteger, primary_key=True)
     customer_id = Column(BigInteger, ForeignKey('client.client_id'), nullable=False)
     asset_name = Column(Text, nullable=True)
     ioc_value = Column(Text, nullable=True)
+    posting_key = Column(Text, nullable=True)
     alert_id = Column(BigInteger, ForeignKey('alerts.alert_id'), nullable=False)
     created_at = Column(DateTime, nullable=False, server_default=text("now()"))
 
@@ -106,10 +112,11 @@ class SimilarAlertsCache(db.Model):
     ioc_type = relationship('IocType')
 
     def __init__(self, customer_id, alert_id, asset_name=None, ioc_value=None, asset_type_id=None, ioc_type_id=None,
-                 created_at=None):
+                 created_at=None, posting_key=None):
         self.customer_id = customer_id
         self.asset_name = asset_name
         self.ioc_value = ioc_value
+        self.posting_key = posting_key
         self.alert_id = alert_id
         self.asset_type_id = asset_type_id
         self.ioc_type_id = ioc_type_id
@@ -1,4 +1,5 @@
 import enum
+import hashlib
 import secrets
 import pyotp
 import uuid
@@ -7,10 +8,12 @@ from sqlalchemy import BigInteger, JSON
 from sqlalchemy import Boolean
 from sqlalchemy import Column
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Text
 from sqlalchemy import UniqueConstraint
+from sqlalchemy import event
 from sqlalchemy import text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -124,7 +127,14 @@ class UserCaseAccess(db.Model):
 
 
 class UserCaseEffectiveAccess(db.Model):
+    """
+    Sparse effective access of users on cases: only granted accesses are stored, no row meaning no access
+    """
     __tablename__ = "user_case_effective_access"
+    __table_args__ = (
+        Index('ix_user_case_effective_access_user_case', 'user_id', 'case_id', unique=True),
+        Index('ix_user_case_effective_access_case_id', 'case_id')
+    )
 
     id = Column(BigInteger, primary_key=True, nullable=False)
     user_id = Column(BigInteger, ForeignKey('user.id'), nullable=False)
@@ -134,8 +144,6 @@ class UserCaseEffectiveAccess(db.Model):
     user = relationship('User')
     case = relationship('Cases')
 
-    UniqueConstraint('case_id', 'user_id')
-
 
 class UserOrganisation(db.Model):
     __tablename__ = "user_organisation"
@@ -179,6 +187,18 @@ class UserClient(db.Model):
     UniqueConstraint('user_id', 'client_id')
 
 
+def get_api_key_digest(api_key: str) -> str:
+    """Returns the digest under which an API key is looked up
+
+    Args:
+        api_key (str): API key in plain text
+
+    Returns:
+        str: hexadecimal SHA-256 digest of the key
+    """
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
+
 class User(UserMixin, db.Model):
     __tablename__ = 'user'
 
@@ -193,6 +213,7 @@ class User(UserMixin, db.Model):
     ctx_human_case = Column(String(256))
     active = Column(Boolean())
     api_key = Column(Text(), unique=True)
+    api_key_digest = Column(String(64), unique=True, index=True)
     external_id = Column(Text, unique=True)
     in_dark_mode = Column(Boolean())
     has_mini_sidebar = Column(Boolean(), default=False)
@@ -228,3 +249,9 @@ class User(UserMixin, db.Model):
         db.session.commit()
 
         return self
+
+
+@event.listens_for(User.api_key, 'set')
+def _user_api_key_set(target, value, oldvalue, initiator):
+    # Keep the lookup digest in sync wherever the key is generated or renewed
+    target.api_key_digest = get_api_key_digest(value) if value else None
@@ -26,6 +26,7 @@ from sqlalchemy import Column
 from sqlalchemy import Date
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Text
@@ -203,6 +204,7 @@ class CasesEvent(db.Model):
 
     __table_args__ = (
         CheckConstraint('event_id != parent_event_id', name='check_different_ids'),
+        Index('idx_cases_events_case_date', 'case_id', 'event_date'),
     )
 
 
@@ -26,6 +26,7 @@ from sqlalchemy import Boolean
 from sqlalchemy import Column
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import LargeBinary
 from sqlalchemy import Sequence
@@ -290,6 +291,10 @@ class CaseEventsAssets(db.Model):
     asset = relationship('CaseAssets')
     case = relationship('Cases')
 
+    __table_args__ = (
+        Index('idx_case_events_assets_case_event', 'case_id', 'event_id'),
+    )
+
 
 class CaseEventsIoc(db.Model):
     __tablename__ = 'case_events_ioc'
@@ -303,9 +308,16 @@ class CaseEventsIoc(db.Model):
     ioc = relationship('Ioc')
     case = relationship('Cases')
 
+    __table_args__ = (
+        Index('idx_case_events_ioc_case_event', 'case_id', 'event_id'),
+    )
+
 
 class ObjectState(db.Model):
     __tablename__ = 'object_state'
+    __table_args__ = (
+        Index('ix_object_state_object_case_id_object_name', 'object_case_id', 'object_name', unique=True),
+    )
 
     object_id = Column(BigInteger, primary_key=True)
     object_case_id = Column(ForeignKey('cases.case_id'))
@@ -446,6 +458,22 @@ class DataStorePath(db.Model):
     case = relationship('Cases')
 
 
+class DataStoreBlob(db.Model):
+    """
+    Content stored once in the datastore and shared by the files with the same content and password.
+    The blob is deleted with its last reference.
+    """
+    __tablename__ = 'data_store_blob'
+
+    blob_id = Column(BigInteger, primary_key=True)
+    blob_key = Column(Text, nullable=False, unique=True)
+    blob_sha256 = Column(Text, nullable=False)
+    blob_local_name = Column(Text, nullable=False)
+    blob_size = Column(BigInteger, nullable=False, default=0)
+    blob_refcount = Column(BigInteger, nullable=False, default=0)
+    blob_date_added = Column(DateTime)
+
+
 class DataStoreFile(db.Model):
     __tablename__ = 'data_store_file'
 
@@ -465,6 +493,7 @@ class DataStoreFile(db.Model):
     added_by_user_id = Column(ForeignKey('user.id'), nullable=False)
     modification_history = Column(JSON)
     file_case_id = Column(ForeignKey('cases.case_id'), nullable=False)
+    file_blob_id = Column(ForeignKey('data_store_blob.blob_id'), index=True)
 
     case = relationship('Cases')
     user = relationship('User')
@@ -492,6 +521,10 @@ class IocLink(db.Model):
     ioc = relationship('Ioc')
     case = relationship('Cases')
 
+    __table_args__ = (
+        Index('ix_ioc_link_ioc_id_case_id', 'ioc_id', 'case_id', unique=True),
+    )
+
 
 class IocAssetLink(db.Model):
     __tablename__ = 'ioc_asset_link'
@@ -545,13 +578,21 @@ class Notes(db.Model):
 
 
 class NoteRevisions(db.Model):
+    """
+    Revisions of a note. A revision either holds a full snapshot of the content in note_content, or the line delta
+    from the previous revision of the note in note_content_delta, see app.datamgmt.case.case_note_revisions_db
+    """
     __tablename__ = 'note_revisions'
+    __table_args__ = (
+        UniqueConstraint('note_id', 'revision_number', name='uq_note_revisions_note_id_revision_number'),
+    )
 
     revision_id = Column(BigInteger, primary_key=True)
     note_id = Column(BigInteger, ForeignKey('notes.note_id'), nullable=False)
     revision_number = Column(Integer, nullable=False)
     note_title = Column(String(155))
     note_content = Column(Text)
+    note_content_delta = Column(JSON(none_as_null=True))
     note_user = Column(ForeignKey('user.id'))
     revision_timestamp = Column(DateTime, default=datetime.datetime.utcnow)
 
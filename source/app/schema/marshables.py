@@ -20,12 +20,9 @@ import dateutil.parser
 import marshmallow
 import os
 import psycopg2
-import pyminizip
 import random
 import re
-import shutil
 import string
-import tempfile
 from flask_login import current_user
 from marshmallow import ValidationError, EXCLUDE
 from marshmallow import fields
@@ -42,10 +39,15 @@ from werkzeug.datastructures import FileStorage
 from app import app
 from app import db
 from app import ma
-from app.datamgmt.datastore.datastore_db import datastore_get_standard_path
+from app.datamgmt.datastore.datastore_db import datastore_set_file_content
 from app.datamgmt.manage.manage_attribute_db import merge_custom_attributes
 from app.datamgmt.manage.manage_tags_db import add_db_tag
 from app.iris_engine.access_control.utils import ac_mask_from_val_list
+from app.iris_engine.utils.uploads import StagedFile
+from app.iris_engine.utils.uploads import discard_staged_file
+from app.iris_engine.utils.uploads import stage_content
+from app.iris_engine.utils.uploads import stage_file
+from app.iris_engine.utils.uploads import stage_upload
 from app.models import AnalysisStatus, CaseClassification, SavedFilter, DataStorePath, IrisModuleHook, Tags, \
     ReviewStatus, EvidenceTypes, CaseStatus, NoteDirectory, NoteRevisions
 from app.models import AssetsType
@@ -73,7 +75,7 @@ from app.models.authorization import Group
 from app.models.authorization import Organisation
 from app.models.authorization import User
 from app.models.cases import CaseState, CaseProtagonist
-from app.util import file_sha256sum, str_to_bool, assert_type_mml
+from app.util import str_to_bool, assert_type_mml
 from app.util import stream_sha256sum
 
 ALLOWED_EXTENSIONS = {'png', 'svg'}
@@ -399,6 +401,7 @@ class CaseNoteRevisionSchema(ma.SQLAlchemyAutoSchema):
         model = NoteRevisions
         load_instance = True
         include_fk = True
+        exclude = ['note_content_delta']
         unknown = EXCLUDE
 
 
@@ -765,7 +768,12 @@ class CaseAssetsSchema(ma.SQLAlchemyAutoSchema):
                         field_name="asset_type_id",
                         type=int)
 
-        asset_type = AssetsType.query.filter(AssetsType.asset_id == data.get('asset_type_id')).count()
+        # Bulk loaders provide the known identifiers in the context to avoid queries per asset
+        asset_type_ids = self.context.get('asset_type_ids')
+        if asset_type_ids is not None:
+            asset_type = int(data.get('asset_type_id')) in asset_type_ids
+        else:
+            asset_type = AssetsType.query.filter(AssetsType.asset_id == data.get('asset_type_id')).count()
         if not asset_type:
             raise marshmallow.exceptions.ValidationError("Invalid asset type ID",
                                                          field_name="asset_type_id")
@@ -775,12 +783,16 @@ class CaseAssetsSchema(ma.SQLAlchemyAutoSchema):
                         allow_none=True)
 
         if data.get('analysis_status_id'):
-            status = AnalysisStatus.query.filter(AnalysisStatus.id == data.get('analysis_status_id')).count()
+            analysis_status_ids = self.context.get('analysis_status_ids')
+            if analysis_status_ids is not None:
+                status = int(data.get('analysis_status_id')) in analysis_status_ids
+            else:
+                status = AnalysisStatus.query.filter(AnalysisStatus.id == data.get('analysis_status_id')).count()
             if not status:
                 raise marshmallow.exceptions.ValidationError("Invalid analysis status ID",
                                                              field_name="analysis_status_id")
 
-        if data.get('asset_tags'):
+        if data.get('asset_tags') and not self.context.get('tags_registered'):
             for tag in data.get('asset_tags').split(','):
                 if not isinstance(tag, str):
                     raise marshmallow.exceptions.ValidationError("All items in list must be strings",
@@ -988,7 +1000,12 @@ class IocSchema(ma.SQLAlchemyAutoSchema):
         """
         if data.get('ioc_type_id'):
             assert_type_mml(input_var=data.get('ioc_type_id'), field_name="ioc_type_id", type=int)
-            ioc_type = IocType.query.filter(IocType.type_id == data.get('ioc_type_id')).first()
+            # Bulk loaders provide the IOC types in the context to avoid a query per IOC
+            ioc_types = self.context.get('ioc_types')
+            if ioc_types is not None:
+                ioc_type = ioc_types.get(int(data.get('ioc_type_id')))
+            else:
+                ioc_type = IocType.query.filter(IocType.type_id == data.get('ioc_type_id')).first()
             if not ioc_type:
                 raise marshmallow.exceptions.ValidationError("Invalid IOC type ID", field_name="ioc_type_id")
 
@@ -1002,9 +1019,14 @@ class IocSchema(ma.SQLAlchemyAutoSchema):
             assert_type_mml(input_var=data.get('ioc_tlp_id'), field_name="ioc_tlp_id", type=int,
                             max_val=POSTGRES_INT_MAX)
 
-            Tlp.query.filter(Tlp.tlp_id == data.get('ioc_tlp_id')).count()
+            tlp_ids = self.context.get('tlp_ids')
+            if tlp_ids is not None:
+                if int(data.get('ioc_tlp_id')) not in tlp_ids:
+                    raise marshmallow.exceptions.ValidationError("Invalid TLP ID", field_name="ioc_tlp_id")
+            else:
+                Tlp.query.filter(Tlp.tlp_id == data.get('ioc_tlp_id')).count()
 
-        if data.get('ioc_tags'):
+        if data.get('ioc_tags') and not self.context.get('tags_registered'):
             for tag in data.get('ioc_tags').split(','):
                 if not isinstance(tag, str):
                     raise marshmallow.exceptions.ValidationError("All items in list must be strings",
@@ -1243,14 +1265,16 @@ class DSFileSchema(ma.SQLAlchemyAutoSchema):
         model = DataStoreFile
         include_fk = True
         load_instance = True
+        exclude = ['file_blob_id']
         unknown = EXCLUDE
 
     def ds_store_file_b64(self, filename: str, file_content: bytes, dsp: DataStorePath, cid: int) -> Tuple[
         DataStoreFile, bool]:
         """Stores a file in the data store.
 
-        This method stores a file in the data store. If the file already exists in the data store, it returns the
-        existing file. Otherwise, it creates a new file and returns it.
+        This method stores a file in the data store. If the file already exists in the data store of the case, it
+        returns the existing file. Otherwise, it creates a new file and returns it. The content is shared with the
+        files of the other cases with the same content.
 
         Args:
             filename: The name of the file.
@@ -1269,7 +1293,11 @@ class DSFileSchema(ma.SQLAlchemyAutoSchema):
             filename = filename.rstrip().replace('\t', '').replace('\n', '').replace('\r', '')
             file_hash = stream_sha256sum(file_content)
 
-            dsf = DataStoreFile.query.filter(DataStoreFile.file_sha256 == file_hash).first()
+            dsf = DataStoreFile.query.filter(
+                DataStoreFile.file_sha256 == file_hash,
+                DataStoreFile.file_case_id == cid,
+                func.coalesce(DataStoreFile.file_password, '') == ''
+            ).first()
             if dsf:
                 exists = True
 
@@ -1286,17 +1314,16 @@ class DSFileSchema(ma.SQLAlchemyAutoSchema):
                 dsf.added_by_user_id = current_user.id
                 dsf.file_local_name = 'tmp_xc'
                 dsf.file_parent_id = dsp.path_id
-                dsf.file_sha256 = file_hash
 
-                db.session.add(dsf)
-                db.session.commit()
+                staged_file = stage_content(file_content)
+                try:
+                    datastore_set_file_content(dsf, staged_file)
+                finally:
+                    discard_staged_file(staged_file)
 
-                dsf.file_local_name = datastore_get_standard_path(dsf, cid).as_posix()
+                db.session.add(dsf)
                 db.session.commit()
 
-                with open(dsf.file_local_name, 'wb') as fout:
-                    fout.write(file_content)
-
                 exists = False
 
         except Exception as e:
@@ -1309,22 +1336,20 @@ class DSFileSchema(ma.SQLAlchemyAutoSchema):
 
         return dsf, exists
 
-    def ds_store_file(self, file_storage: FileStorage, location: Path, is_ioc: bool, password: Optional[str]) -> Tuple[
-        str, int, str]:
+    def ds_store_file(self, file_storage: FileStorage, dsf: DataStoreFile) -> Optional[DataStoreFile]:
         """Stores a file in the data store.
 
-        This method stores a file in the data store. If the file is an IOC and no password is provided, it uses a default
-        password. If a password is provided, it encrypts the file with the password. It returns the path, size, and hash
-        of the stored file.
+        This method stores the content of a data store file. If the file has a password, IOCs having the default
+        password, the content is encrypted with the password. The content is stored once and shared with the files
+        having the same content and password. The size and hash of the file are updated.
+        Expects a db commit soon after.
 
         Args:
             file_storage: The file to store.
-            location: The location where the file should be stored.
-            is_ioc: Whether the file is an IOC.
-            password: The password to use for encrypting the file.
+            dsf: The data store file the content belongs to.
 
         Returns:
-            A tuple containing the path, size, and hash of the stored file.
+            The data store file, or None if no file was uploaded.
 
         Raises:
             ValidationError: If there is an error storing the file.
@@ -1339,62 +1364,73 @@ class DSFileSchema(ma.SQLAlchemyAutoSchema):
         if not file_storage.filename:
             return None
 
-        passwd = None
-
         try:
-            if is_ioc and not password:
-                passwd = 'infected'
-            elif password:
-                passwd = password
+            staged_file = stage_upload(file_storage)
 
-            if passwd is not None:
-                try:
-                    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-                        file_storage.save(tmp)
-                        file_storage.close()
+        except Exception as e:
+            log.exception(e)
+            file_storage.close()
+            raise marshmallow.exceptions.ValidationError(
+                str(e),
+                field_name='file_content'
+            )
+
+        try:
+            self._ds_store_staged_file(staged_file, dsf)
+        finally:
+            file_storage.close()
 
-                        fn = tmp
+        return dsf
 
-                    file_hash = file_sha256sum(fn.name)
-                    file_size = os.stat(fn.name).st_size
+    def ds_store_uploaded_file(self, upload_path: Path, dsf: DataStoreFile) -> DataStoreFile:
+        """Stores a file assembled from a chunked upload in the data store.
 
-                    file_path = location.as_posix() + '.zip'
+        This method moves the assembled file to the data store, as ds_store_file does with uploaded files.
+        Expects a db commit soon after.
 
-                    shutil.copyfile(fn.name, Path(fn.name).parent / file_hash)
+        Args:
+            upload_path: The path of the assembled file.
+            dsf: The data store file the content belongs to.
 
-                    pyminizip.compress((Path(fn.name).parent / file_hash).as_posix(), None, file_path, passwd, 0)
-                    os.unlink(Path(tmp.name).parent / file_hash)
-                    os.unlink(fn.name)
+        Returns:
+            The data store file.
 
-                except Exception as e:
-                    log.exception(e)
-                    raise marshmallow.exceptions.ValidationError(
-                        str(e),
-                        field_name='file_password'
-                    )
+        Raises:
+            ValidationError: If there is an error storing the file.
 
-            else:
-                file_storage.save(location)
-                file_storage.close()
-                file_path = location.as_posix()
-                file_size = location.stat().st_size
-                file_hash = file_sha256sum(file_path)
+        """
+        try:
+            staged_file = stage_file(upload_path)
 
         except Exception as e:
+            log.exception(e)
             raise marshmallow.exceptions.ValidationError(
                 str(e),
                 field_name='file_content'
             )
 
-        if location is None:
+        self._ds_store_staged_file(staged_file, dsf)
+
+        return dsf
+
+    def _ds_store_staged_file(self, staged_file: StagedFile, dsf: DataStoreFile) -> None:
+        if dsf.file_is_ioc and not dsf.file_password:
+            dsf.file_password = 'infected'
+
+        try:
+            datastore_set_file_content(dsf, staged_file)
+
+        except Exception as e:
+            log.exception(e)
             raise marshmallow.exceptions.ValidationError(
-                f"Unable to save file in target location",
-                field_name='file_content'
+                str(e),
+                field_name='file_password' if dsf.file_password else 'file_content'
             )
 
-        setattr(self, 'file_local_path', str(location))
+        finally:
+            discard_staged_file(staged_file)
 
-        return file_path, file_size, file_hash
+        setattr(self, 'file_local_path', str(dsf.file_local_name))
 
 
 class ServerSettingsSchema(ma.SQLAlchemyAutoSchema):
@@ -2272,7 +2308,7 @@ class AlertSchema(ma.SQLAlchemyAutoSchema):
         """
         Verify that the alert tags are valid and save them if they don't exist
         """
-        if data.get('alert_tags'):
+        if data.get('alert_tags') and not self.context.get('tags_registered'):
             for tag in data.get('alert_tags').split(','):
                 if not isinstance(tag, str):
                     raise marshmallow.exceptions.ValidationError("All items in list must be strings",
@@ -2246,4 +2246,12 @@ $(document).ready(function () {
         badge.attr('title', 'New alerts available');
     });
 
+    socket.on('new_alerts', function (data) {
+        const badge = $('#newAlertsBadge');
+        const currentCount = parseInt(badge.text()) || 0;
+        const alertIds = JSON.parse(data).alert_ids || [];
+        badge.text(currentCount + alertIds.length).show();
+        badge.attr('title', 'New alerts available');
+    });
+
 });
\ No newline at end of file
@@ -326,6 +326,14 @@ function upload_assets() {
         .done((data) => {
             jsdata = data;
             if (jsdata.status == "success") {
+                if (jsdata.data && jsdata.data.task_id) {
+                    $('#upload_assets_progress').text('Import queued');
+                    wait_csv_import('/case/assets/upload', jsdata.data.task_id, '#upload_assets_progress', function () {
+                        $('#modal_upload_assets').modal('hide');
+                        reload_assets();
+                    });
+                    return;
+                }
                 reload_assets();
                 $('#modal_upload_assets').modal('hide');
                 swal("Got news for you", data.message, "success");
@@ -16,6 +16,49 @@ function getSharedLink(){
     return null;
 }
 
+/* Polls a CSV import started in the background until it is done, then offers to download the rejected rows */
+function wait_csv_import(upload_uri, task_id, progress_element, on_imported) {
+    get_request_api(upload_uri + '/status/' + task_id)
+    .done((data) => {
+        if (data.status !== 'success') {
+            $(progress_element).text('');
+            swal("Got bad news for you", data.message, "error");
+            return;
+        }
+
+        if (data.data.state === 'pending' || data.data.state === 'progress') {
+            if (data.data.state === 'progress') {
+                $(progress_element).text(`Processed ${data.data.processed} of ${data.data.total} rows`);
+            }
+            setTimeout(function () {
+                wait_csv_import(upload_uri, task_id, progress_element, on_imported);
+            }, 2000);
+            return;
+        }
+
+        $(progress_element).text('');
+        on_imported();
+        if (!data.data.errors_count) {
+            swal("Got news for you", data.message, "success");
+            return;
+        }
+
+        swal({
+            title: "Got news for you",
+            text: data.message,
+            icon: "warning",
+            buttons: {
+                cancel: "Close",
+                confirm: "Download the rejected rows"
+            }
+        }).then((download) => {
+            if (download) {
+                window.open(upload_uri + '/errors/' + task_id + case_param());
+            }
+        });
+    });
+}
+
 
 $(document).ready(function(){
     $(function(){
@@ -325,8 +325,16 @@ function upload_ioc() {
         .done((data) => {
             jsdata = data;
             if (jsdata.status == "success") {
-                reload_iocs();
+                if (jsdata.data && jsdata.data.task_id) {
+                    $('#upload_iocs_progress').text('Import queued');
+                    wait_csv_import('/case/ioc/upload', jsdata.data.task_id, '#upload_iocs_progress', function () {
+                        $('#modal_upload_ioc').modal('hide');
+                        reload_iocs();
+                    });
+                    return;
+                }
                 $('#modal_upload_ioc').modal('hide');
+                reload_iocs();
                 swal("Got news for you", data.message, "success");
 
             } else {
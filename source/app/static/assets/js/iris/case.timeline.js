@@ -1312,31 +1312,33 @@ function upload_csv_events() {
     const api_path =  '/case/timeline/events/csv_upload';
     const modal_dlg = '#modal_upload_csv_events'
     const file_input = '#input_upload_csv_events'
+    const progress_element = '#upload_csv_events_progress'
 
-    var file = $(file_input).get(0).files[0];
+    // The file is streamed to the server, which imports the large ones in the background
+    let formData = new FormData();
+    formData.append('csrf_token', $('#csrf_token').val());
+    formData.append('file', $(file_input).get(0).files[0]);
 
-    var reader = new FileReader();
-    reader.onload = function (e) {
-        let fileData = e.target.result
-        let data = new Object();
-        data['csrf_token'] = $('#csrf_token').val();
-        data['CSVData'] = fileData;
-
-        post_request_api(api_path, JSON.stringify(data), true)
-        .done((data) => {
+    post_request_data_api(api_path + '/file', formData, false)
+    .done((data) => {
+        if (data.status !== 'success') {
+            swal("Got bad news for you", data.message, "error");
+            return;
+        }
 
-            if (notify_auto_api(data)) {
+        if (data.data && data.data.task_id) {
+            $(progress_element).text('Import queued');
+            wait_csv_import(api_path, data.data.task_id, progress_element, function () {
                 apply_filtering();
                 $(modal_dlg).modal('hide');
-                swal("Got news for you", data.message, "success");
-            } else {
-                //alert( JSON.stringify(data.data,null,2));
-                swal("Got bad news for you", data.message, "error");
-            }
-        })
+            });
+            return;
+        }
 
-    };
-    reader.readAsText(file)
+        apply_filtering();
+        $(modal_dlg).modal('hide');
+        swal("Got news for you", data.message, "success");
+    })
 
     return false;
 }
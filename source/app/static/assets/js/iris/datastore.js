@@ -79,6 +79,9 @@ function build_ds_tree(data, tree_node) {
                 </li>`;
             $('#'+ tree_node).append(jnode);
             build_ds_tree(data[node].children, 'tree-' + node);
+            if (data[node].lazy) {
+                $('#tree-' + node).append(`<li id="lazy-${node}"><a href="#" onclick="load_ds_lazy_folder('${node}');return false;"><small><i class="fa-solid fa-ellipsis mr-1"></i>Load ${parseInt(data[node].files_count)} files</small></a></li>`);
+            }
         } else {
             data[node].file_original_name = sanitizeHTML(data[node].file_original_name);
             data[node].file_password = sanitizeHTML(data[node].file_password);
@@ -134,6 +137,16 @@ function build_ds_tree(data, tree_node) {
     });
 }
 
+function load_ds_lazy_folder(node) {
+    get_request_api(`/datastore/list/tree/${node.replace('d-', '')}`)
+    .done(function (data){
+        if(notify_auto_api(data, true)){
+            $('#lazy-' + node).remove();
+            build_ds_tree(data.data, 'tree-' + node);
+        }
+    });
+}
+
 function show_datastore() {
     $('html').addClass('ds_sidebar_open');
     $('.ds-sidebar-toggler').addClass('toggled');
@@ -277,6 +290,101 @@ function info_ds_file(node) {
     });
 }
 
+/* Files larger than a chunk are sent in chunks, following the Dropzone chunked uploads parameters.
+ * Saving a file again after an interrupted upload only sends the missing chunks. */
+const DS_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024;
+
+function show_ds_upload_progress(title) {
+    window.swal({
+        title: title,
+        text: "Please wait. This window will close automatically when the file is uploaded.",
+        icon: "/static/assets/img/loader.gif",
+        button: false,
+        allowOutsideClick: false
+    });
+}
+
+function post_ds_file_chunk(uri, chunkData, chunk) {
+    // The chunk parameters are in the query string, so that the server writes the chunk in place while receiving it
+    return $.ajax({
+        url: `${uri}${case_param()}&${$.param(chunk)}`,
+        type: 'POST',
+        data: chunkData,
+        dataType: "json",
+        contentType: false,
+        processData: false
+    });
+}
+
+async function upload_ds_file_chunks(uri, formData, file) {
+    let upload_id = `${file.size}-${file.lastModified}-${file.name}`.replace(/[^\w-]/g, '_').substring(0, 128);
+    let chunks_count = Math.ceil(file.size / DS_UPLOAD_CHUNK_SIZE);
+    let received_chunks = [];
+
+    try {
+        let status = await get_request_api(`/datastore/file/add/chunks/${upload_id}`);
+        received_chunks = status.data.received_chunks;
+    } catch (e) {
+        received_chunks = [];
+    }
+
+    let chunkData = new FormData();
+    for (let [key, value] of formData.entries()) {
+        if (key !== 'file_content') {
+            chunkData.append(key, value);
+        }
+    }
+
+    let data = null;
+    for (let index = 0; index < chunks_count; index++) {
+        // The last chunk is always sent, it completes the upload
+        if (index < chunks_count - 1 && received_chunks.includes(index)) {
+            continue;
+        }
+
+        let offset = index * DS_UPLOAD_CHUNK_SIZE;
+        chunkData.set('file_content', file.slice(offset, offset + DS_UPLOAD_CHUNK_SIZE), file.name);
+
+        try {
+            data = await post_ds_file_chunk(uri, chunkData, {
+                dzuuid: upload_id,
+                dzchunkindex: index,
+                dztotalchunkcount: chunks_count,
+                dzchunkbyteoffset: offset,
+                dzchunksize: DS_UPLOAD_CHUNK_SIZE,
+                dztotalfilesize: file.size
+            });
+        } catch (jqXHR) {
+            let reason = jqXHR.responseJSON ? jqXHR.responseJSON.message : `error ${jqXHR.status} - ${jqXHR.statusText}`;
+            throw new Error(`Upload of ${file.name} failed at chunk ${index + 1}/${chunks_count}: ${reason}`);
+        }
+
+        if (data.status !== 'success') {
+            break;
+        }
+    }
+
+    return data;
+}
+
+function notify_ds_upload_error(error) {
+    // Errors of the single requests are notified by post_request_data_api
+    if (error instanceof Error) {
+        notify_error(error.message);
+    }
+}
+
+function upload_ds_file(uri, formData, file, title) {
+    if (file === undefined || file.size <= DS_UPLOAD_CHUNK_SIZE) {
+        return Promise.resolve(post_request_data_api(uri, formData, true, function () {
+            show_ds_upload_progress(title);
+        }));
+    }
+
+    show_ds_upload_progress(title);
+    return upload_ds_file_chunks(uri, formData, file);
+}
+
 async function save_ds_multi_files(node, index_i) {
     let formData = new FormData($('#form_new_ds_files')[0]);
     let totalFiles = $('#input_upload_ds_files').prop('files').length;
@@ -290,52 +398,42 @@ async function save_ds_multi_files(node, index_i) {
     formData.append('file_content', file);
     formData.append('file_original_name', file.name);
     let uri = '/datastore/file/add/' + node;
-    await post_request_data_api(uri, formData, true, function () {
-        window.swal({
-            title: `File ${file.name} is uploading. (${index}/${totalFiles} files)`,
-            text: "Please wait. This window will close automatically when the file is uploaded.",
-            icon: "/static/assets/img/loader.gif",
-            button: false,
-            allowOutsideClick: false
-        });
-    }).then((data) => {
+    await upload_ds_file(uri, formData, file, `File ${file.name} is uploading. (${index}/${totalFiles} files)`)
+    .then((data) => {
         notify_auto_api(data);
         index += 1;
         save_ds_multi_files(node, index);
         load_datastore();
-    }).always((data) => {
+    }).catch((error) => {
+        notify_ds_upload_error(error);
+    }).finally(() => {
         window.swal.close();
     });
 }
 
 function save_ds_file(node, file_id) {
     var formData = new FormData($('#form_new_ds_file')[0]);
-    formData.append('file_content', $('#input_upload_ds_file').prop('files')[0]);
-    let uri = '';
+    let file = $('#input_upload_ds_file').prop('files')[0];
+    formData.append('file_content', file);
+    let upload = null;
 
     if (file_id === undefined) {
-        uri = '/datastore/file/add/' + node;
+        upload = upload_ds_file('/datastore/file/add/' + node, formData, file, "File is uploading");
     } else {
-        uri = '/datastore/file/update/' + file_id;
+        upload = upload_ds_file('/datastore/file/update/' + file_id, formData, undefined, "File is uploading");
     }
 
-    post_request_data_api(uri, formData, true, function() {
-        window.swal({
-              title: "File is uploading",
-              text: "Please wait. This window will close automatically when the file is uploaded.",
-              icon: "/static/assets/img/loader.gif",
-              button: false,
-              allowOutsideClick: false
-        });
-    })
-    .done(function (data){
+    upload.then((data) => {
         if(notify_auto_api(data)){
             $('#modal_ds_file').modal("hide");
             reset_ds_file_view();
             load_datastore();
         }
     })
-    .always((data) => {
+    .catch((error) => {
+        notify_ds_upload_error(error);
+    })
+    .finally(() => {
         window.swal.close();
     });
 }
@@ -76,22 +76,8 @@ function remove_case(id) {
             if (willDelete) {
                 post_request_api('/manage/cases/delete/' + id)
                 .done((data) => {
-                    if (notify_auto_api(data)) {
-                        if (!refresh_case_table()) {
-                            swal({
-                                title: "Done!",
-                                text: "You will be redirected in 5 seconds",
-                                icon: "success",
-                                buttons: false,
-                                dangerMode: false
-                            })
-                            setTimeout(function () {
-                                window.location.href = '/dashboard?cid=1';
-                            }, 4500);
-                        } else {
-                            refresh_case_table();
-                            $('#modal_case_detail').modal('hide');
-                        }
+                    if (notify_auto_api(data, true)) {
+                        wait_case_deletion(data.data.task_id, on_case_deleted);
                     }
                 });
             } else {
@@ -100,6 +86,39 @@ function remove_case(id) {
         });
 }
 
+/* Polls a case deletion started in the background until it is done */
+function wait_case_deletion(task_id, on_deleted) {
+    // The deleted case may be the current one, so the status is requested from the primary case
+    get_request_api('/manage/cases/delete/status/' + task_id, false, undefined, 1)
+    .done((data) => {
+        if (data.status === 'success' && data.data.state === 'pending') {
+            setTimeout(function () {
+                wait_case_deletion(task_id, on_deleted);
+            }, 2000);
+        } else if (notify_auto_api(data)) {
+            on_deleted();
+        }
+    });
+}
+
+function on_case_deleted() {
+    if (!refresh_case_table()) {
+        swal({
+            title: "Done!",
+            text: "You will be redirected in 5 seconds",
+            icon: "success",
+            buttons: false,
+            dangerMode: false
+        })
+        setTimeout(function () {
+            window.location.href = '/dashboard?cid=1';
+        }, 4500);
+    } else {
+        refresh_case_table();
+        $('#modal_case_detail').modal('hide');
+    }
+}
+
 function edit_case_info() {
     $('#case_gen_info_content').hide();
     $('#case_gen_info_edit').show();
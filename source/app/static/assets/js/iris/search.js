@@ -145,7 +145,7 @@ function search() {
               $('#search_table_wrapper_1').hide();
               $('#search_table_wrapper_2').hide();
               $('#search_table_wrapper_3').hide();
-            val = $("input[type='radio']:checked").val();
+            val = $("input[name='search_type']:checked").val();
             if (val == "ioc") {
                 Table_1.rows.add(data.data);
                 Table_1.columns.adjust().draw();
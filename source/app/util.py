@@ -31,6 +31,7 @@ import requests
 import shutil
 import string
 import traceback
+import types
 import uuid
 import weakref
 from cryptography.exceptions import InvalidSignature
@@ -40,6 +41,7 @@ from flask import Request
 from flask import render_template
 from flask import request
 from flask import session
+from flask import stream_with_context
 from flask import url_for
 from flask_login import current_user
 from flask_login import login_user
@@ -59,6 +61,7 @@ from app import db
 from app.datamgmt.case.case_db import get_case
 from app.datamgmt.manage.manage_access_control_db import user_has_client_access
 from app.datamgmt.manage.manage_users_db import get_user
+from app.iris_engine.access_control.utils import ac_case_exists
 from app.iris_engine.access_control.utils import ac_fast_check_user_has_case_access
 from app.iris_engine.access_control.utils import ac_get_effective_permissions_of_user
 from app.iris_engine.utils.tracker import track_activity
@@ -99,6 +102,46 @@ def response_success(msg='', data=None):
                               mimetype='application/json')
 
 
+def response_success_stream(msg='', data_sections=None):
+    """
+    Streams a success response whose data is built section by section, instead of being serialized at once.
+
+    args:
+        msg: message of the response
+        data_sections: iterable of (key, value) pairs making the data object. Values that are generators are
+                       written as JSON lists, item by item.
+
+    returns:
+        Streamed response
+    """
+    encoder = AlchemyEncoder()
+
+    def generate():
+        yield '{"status": "success", "message": ' + encoder.encode(msg) + ', "data": {'
+
+        separator = ''
+        for key, value in data_sections or []:
+            yield f'{separator}{encoder.encode(key)}: '
+            separator = ', '
+
+            if isinstance(value, types.GeneratorType):
+                item_separator = ''
+                yield '['
+                for item in value:
+                    yield item_separator + encoder.encode(item)
+                    item_separator = ', '
+                yield ']'
+
+            else:
+                yield encoder.encode(value)
+
+        yield '}}'
+
+    return app.response_class(response=stream_with_context(generate()),
+                              status=200,
+                              mimetype='application/json')
+
+
 def g_db_commit():
     db.session.commit()
 
@@ -332,7 +375,7 @@ def get_case_access(request_data, access_level, from_api=False, no_cid_required=
 
     update_session(caseid, eaccess_level, from_api)
 
-    if caseid is not None and not get_case(caseid):
+    if caseid is not None and not ac_case_exists(caseid):
         log.warning('No case found. Using default case')
         return True, 1, True
 
@@ -819,8 +862,8 @@ def file_sha256sum(file_path):
 
     sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        # Read and update hash string value in blocks of 4K
-        for byte_block in iter(lambda: f.read(4096), b""):
+        # Read and update hash string value in blocks of 1M
+        for byte_block in iter(lambda: f.read(1024 * 1024), b""):
             sha256_hash.update(byte_block)
 
         return sha256_hash.hexdigest().upper()
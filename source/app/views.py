@@ -65,6 +65,7 @@ from app.blueprints.overview.overview_routes import overview_blueprint
 from app.blueprints.profile.profile_routes import profile_blueprint
 from app.blueprints.reports.reports_route import reports_blueprint
 from app.blueprints.search.search_routes import search_blueprint
+from app.iris_engine.access_control.api_key_handler import get_user_by_api_key
 from app.models.authorization import User
 from app.post_init import run_post_init
 
@@ -127,17 +128,6 @@ def load_user(user_id):
     return User.query.get(int(user_id))
 
 
-def _get_user_by_api_key(api_key):
-    if not api_key:
-        return None
-
-    api_key = api_key.replace('Bearer ', '', 1)
-    return User.query.filter(
-        User.api_key == api_key,
-        User.active == True
-    ).first()
-
-
 @lm.request_loader
 def load_user_from_request(request):
     api_key_sources = [
@@ -147,7 +137,7 @@ def load_user_from_request(request):
 
     for api_key in api_key_sources:
         if api_key:
-            user = _get_user_by_api_key(api_key)
+            user = get_user_by_api_key(api_key)
             if user:
                 return user
 
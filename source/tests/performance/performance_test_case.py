@@ -0,0 +1,77 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from contextlib import contextmanager
+from unittest import TestCase
+
+import logging
+from datetime import datetime
+from sqlalchemy import event
+
+from app import app
+from app import cache
+from app import db
+from app.models.authorization import User
+from app.post_init import run_post_init
+from tests.clean_database import clean_db
+
+
+class PerformanceTestCase(TestCase):
+    """
+    Benchmark running against a clean database initialized as on a first start
+    """
+
+    def setUp(self) -> None:
+        logging.info('SetUp called')
+        self._app_context = app.app_context()
+        self._app_context.push()
+        clean_db()
+        # Cached values are versioned by object states, which restart from the same values on a clean database
+        cache.clear()
+        run_post_init()
+
+    def tearDown(self) -> None:
+        logging.info('Teardown called')
+        clean_db()
+        self._app_context.pop()
+
+    @staticmethod
+    def get_administrator() -> User:
+        return User.query.filter(User.user == 'administrator').first()
+
+    @contextmanager
+    def assert_max_statements(self, max_statements: int, description: str):
+        """
+        Logs the duration of the block and fails if it executes more than max_statements SQL statements, so a
+        regression to a statement per row is caught whatever the speed of the database
+        """
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', count_statement)
+        start_time = datetime.utcnow()
+        try:
+            yield
+        finally:
+            elapsed = datetime.utcnow() - start_time
+            event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+        logging.info(f'{description} in {elapsed} with {len(statements)} statements')
+        self.assertLessEqual(len(statements), max_statements)
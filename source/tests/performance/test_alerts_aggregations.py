@@ -0,0 +1,61 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from datetime import datetime, timedelta
+from flask_login import login_user
+from sqlalchemy import insert
+
+from app import app
+from app import db
+from app.datamgmt.alerts.alerts_db import get_alerts_aggregations
+from app.models.alerts import Alert
+from app.models.cases import Client
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestAlertsAggregations(PerformanceTestCase):
+    _ALERTS_NB = 50000
+
+    def test_alerts_aggregations(self):
+        administrator = self.get_administrator()
+        client_id = Client.query.first().client_id
+        now = datetime.utcnow()
+
+        db.session.execute(insert(Alert), [{
+            'alert_title': f'Suspicious login #{i}', 'alert_severity_id': i % 5 + 1, 'alert_status_id': i % 3 + 1,
+            'alert_customer_id': client_id, 'alert_source': f'sensor-{i % 10}',
+            'alert_source_event_time': now, 'alert_creation_time': now - timedelta(hours=i % 48)
+        } for i in range(self._ALERTS_NB)])
+        db.session.commit()
+
+        with app.test_request_context():
+            login_user(administrator)
+
+            filters = {'current_user_id': administrator.id}
+            # The counts are computed by a single statement, the names of the groups by one statement each
+            with self.assert_max_statements(10, f'Aggregated {self._ALERTS_NB} alerts'):
+                aggregations = get_alerts_aggregations(filters, time_bucket='hour', use_cache=False)
+
+            with self.assert_max_statements(0, f'Aggregated {self._ALERTS_NB} alerts from the cache'):
+                cached_aggregations = get_alerts_aggregations(filters, time_bucket='hour')
+
+        self.assertEqual(self._ALERTS_NB, aggregations['total'])
+        self.assertEqual(5, len(aggregations['severity']))
+        self.assertEqual(10, len(aggregations['source']))
+        self.assertEqual(self._ALERTS_NB, sum(entry['count'] for entry in aggregations['time']))
+        self.assertEqual(aggregations, cached_aggregations)
@@ -0,0 +1,63 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from datetime import datetime
+from flask_login import login_user
+from sqlalchemy import insert
+
+from app import app
+from app import db
+from app.datamgmt.alerts.alerts_db import add_alerts_history_entry
+from app.datamgmt.alerts.alerts_db import get_alerts_by_ids
+from app.datamgmt.alerts.alerts_db import update_alerts_batch
+from app.models.alerts import Alert
+from app.models.cases import Client
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestAlertsBatchUpdate(PerformanceTestCase):
+    _ALERTS_NB = 5000
+
+    def test_alerts_batch_update(self):
+        administrator = self.get_administrator()
+        client_id = Client.query.first().client_id
+        now = datetime.utcnow()
+
+        alert_ids = db.session.execute(insert(Alert).returning(Alert.alert_id), [{
+            'alert_title': f'False positive #{i}', 'alert_severity_id': 1, 'alert_status_id': 1,
+            'alert_customer_id': client_id, 'alert_source_event_time': now, 'alert_creation_time': now,
+            'modification_history': {'0': {'user': 'administrator', 'user_id': administrator.id,
+                                           'action': 'Alert created'}}
+        } for i in range(self._ALERTS_NB)]).scalars().all()
+        db.session.commit()
+
+        with app.test_request_context():
+            login_user(administrator)
+
+            # The alerts are loaded, updated and given their history entry with a statement each
+            with self.assert_max_statements(5, f'Updated {self._ALERTS_NB} alerts'):
+                alerts = get_alerts_by_ids(alert_ids)
+                update_alerts_batch([alert.alert_id for alert in alerts], {'alert_status_id': 2},
+                                    default_owner_id=administrator.id)
+                add_alerts_history_entry(alert_ids, 'updated alert: "alert_status_id"')
+                db.session.commit()
+
+        alert = db.session.get(Alert, alert_ids[-1])
+        self.assertEqual(2, alert.alert_status_id)
+        self.assertEqual(administrator.id, alert.alert_owner_id)
+        self.assertEqual(2, len(alert.modification_history))
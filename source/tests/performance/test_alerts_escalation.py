@@ -0,0 +1,88 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from datetime import datetime
+from flask_login import login_user
+from sqlalchemy import insert
+
+from app import app
+from app import db
+from app.datamgmt.alerts.alerts_db import create_case_from_alerts
+from app.datamgmt.alerts.alerts_db import get_alerts_by_ids
+from app.models import CaseAssets
+from app.models import CaseEventsIoc
+from app.models import CasesEvent
+from app.models import Ioc
+from app.models import IocAssetLink
+from app.models import IocLink
+from app.models import alert_assets_association
+from app.models import alert_iocs_association
+from app.models.alerts import Alert
+from app.models.cases import Client
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestAlertsEscalation(PerformanceTestCase):
+    _ALERTS_NB = 200
+    _OBSERVABLES_NB = 20
+
+    def test_escalate_alerts(self):
+        administrator = self.get_administrator()
+        client_id = Client.query.first().client_id
+        now = datetime.utcnow()
+
+        alert_ids = db.session.execute(insert(Alert).returning(Alert.alert_id, sort_by_parameter_order=True), [{
+            'alert_title': f'Phishing #{i}', 'alert_severity_id': 1, 'alert_status_id': 1,
+            'alert_customer_id': client_id, 'alert_source_event_time': now, 'alert_creation_time': now
+        } for i in range(self._ALERTS_NB)]).scalars().all()
+
+        # Each alert has its own observables, sharing their values with the other alerts
+        iocs_ids = db.session.execute(insert(Ioc).returning(Ioc.ioc_id, sort_by_parameter_order=True), [{
+            'ioc_value': f'phishing-{i % self._OBSERVABLES_NB}.example.com', 'ioc_type_id': 1, 'ioc_tlp_id': 1,
+            'user_id': administrator.id
+        } for i in range(self._ALERTS_NB)]).scalars().all()
+        assets_ids = db.session.execute(insert(CaseAssets).returning(CaseAssets.asset_id,
+                                                                     sort_by_parameter_order=True), [{
+            'asset_name': f'workstation-{i % self._OBSERVABLES_NB}', 'asset_type_id': 9,
+            'user_id': administrator.id, 'date_added': now, 'date_update': now
+        } for i in range(self._ALERTS_NB)]).scalars().all()
+
+        db.session.execute(insert(alert_iocs_association), [{'alert_id': alert_id, 'ioc_id': ioc_id}
+                                                            for alert_id, ioc_id in zip(alert_ids, iocs_ids)])
+        db.session.execute(insert(alert_assets_association), [{'alert_id': alert_id, 'asset_id': asset_id}
+                                                              for alert_id, asset_id in zip(alert_ids, assets_ids)])
+        db.session.commit()
+
+        with app.test_request_context():
+            login_user(administrator)
+
+            # The case creation runs a fixed number of statements, the alerts and their observables are imported by
+            # a statement per table
+            with self.assert_max_statements(self._ALERTS_NB // 2, f'Escalated {self._ALERTS_NB} alerts'):
+                alerts = get_alerts_by_ids(alert_ids, with_observables=True)
+                iocs_list = [str(ioc.ioc_uuid) for alert in alerts for ioc in alert.iocs]
+                assets_list = [str(asset.asset_uuid) for alert in alerts for asset in alert.assets]
+                case = create_case_from_alerts(alerts, iocs_list, assets_list, 'Phishing campaign', '', True, '',
+                                               None)
+
+        self.assertEqual(self._OBSERVABLES_NB, IocLink.query.filter(IocLink.case_id == case.case_id).count())
+        self.assertEqual(self._OBSERVABLES_NB,
+                         CaseAssets.query.filter(CaseAssets.case_id == case.case_id).count())
+        self.assertEqual(self._OBSERVABLES_NB, IocAssetLink.query.count())
+        self.assertEqual(self._ALERTS_NB, CasesEvent.query.filter(CasesEvent.case_id == case.case_id).count())
+        self.assertEqual(self._ALERTS_NB, CaseEventsIoc.query.filter(CaseEventsIoc.case_id == case.case_id).count())
@@ -0,0 +1,122 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import logging
+import random
+from datetime import datetime
+from datetime import timedelta
+from sqlalchemy import insert
+from types import SimpleNamespace
+
+from app import db
+from app.datamgmt.alerts.alerts_db import cache_similar_alerts
+from app.datamgmt.alerts.alerts_db import get_related_alerts
+from app.models.alerts import Alert
+from app.models.cases import Client
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestAlertsSimilarity(PerformanceTestCase):
+    _ALERTS_NB = 1000000
+    _CHUNK_SIZE = 10000
+    _ASSETS_NB = 50000
+    _IOCS_NB = 200000
+    _RESULTS_NB = 1000
+
+    def _create_burst_alerts(self, client_id: int, now: datetime):
+        for chunk_start in range(0, self._ALERTS_NB, self._CHUNK_SIZE):
+            logging.info(f"Creating alerts #{chunk_start}")
+            alerts = [{
+                'alert_title': f"Failed logon on host_{random.randrange(self._ASSETS_NB)} #{i}",
+                'alert_severity_id': 1,
+                'alert_status_id': 1,
+                'alert_customer_id': client_id,
+                'alert_source_event_time': now - timedelta(minutes=i + 1),
+                'alert_creation_time': now
+            } for i in range(chunk_start, chunk_start + self._CHUNK_SIZE)]
+
+            rows = db.session.execute(insert(Alert).returning(Alert.alert_id, Alert.alert_title,
+                                                              Alert.alert_source_event_time), alerts).all()
+
+            cache_similar_alerts([{
+                'customer_id': client_id,
+                'alert_id': alert_id,
+                'creation_date': event_time,
+                'title': title,
+                'assets': [{'asset_name': f"host_{random.randrange(self._ASSETS_NB)}", 'asset_type_id': 1}],
+                'iocs': [{'ioc_value': f"10.0.{random.randrange(self._IOCS_NB)}", 'ioc_type_id': 1}
+                         for _ in range(random.randrange(1, 4))]
+            } for alert_id, title, event_time in rows])
+
+    def _create_marker_alert(self, client_id: int, now: datetime) -> int:
+        alert_id = db.session.execute(insert(Alert).returning(Alert.alert_id), [{
+            'alert_title': 'Failed logon on host_marker #0',
+            'alert_severity_id': 1,
+            'alert_status_id': 1,
+            'alert_customer_id': client_id,
+            'alert_source_event_time': now,
+            'alert_creation_time': now
+        }]).scalar_one()
+
+        cache_similar_alerts([{
+            'customer_id': client_id,
+            'alert_id': alert_id,
+            'creation_date': now,
+            'title': 'Failed logon on host_marker #0',
+            'assets': [{'asset_name': 'host_marker', 'asset_type_id': 1}],
+            'iocs': [{'ioc_value': '10.1.0.1', 'ioc_type_id': 1}]
+        }])
+
+        return alert_id
+
+    def test_related_alerts_lookup_time(self):
+        client = Client(name='similarity_client')
+        db.session.add(client)
+        db.session.commit()
+
+        now = datetime.utcnow()
+        start_time = datetime.utcnow()
+        self._create_burst_alerts(client.client_id, now)
+        marker_alert_id = self._create_marker_alert(client.client_id, now)
+        logging.info(f"Indexed {self._ALERTS_NB} alerts in {(datetime.utcnow() - start_time).__str__()}")
+
+        lookups_nb = 200
+        # A statement for each kind of match, whatever the number of postings
+        with self.assert_max_statements(3 * lookups_nb, f'{lookups_nb} related alerts lookups'):
+            for _ in range(lookups_nb):
+                assets = [SimpleNamespace(asset_name=f"host_{random.randrange(self._ASSETS_NB)}")]
+                iocs = [SimpleNamespace(ioc_value=f"10.0.{random.randrange(self._IOCS_NB)}")]
+                get_related_alerts(client.client_id, assets, iocs, title='Failed logon on host_1 #1', days_back=30,
+                                   number_of_results=self._RESULTS_NB)
+
+        assets = [SimpleNamespace(asset_name='host_marker')]
+        iocs = [SimpleNamespace(ioc_value='10.1.0.1')]
+        similarities = get_related_alerts(client.client_id, assets, iocs, title='Failed logon on host_1 #1',
+                                          days_back=30, number_of_results=self._RESULTS_NB)
+
+        self.assertEqual([marker_alert_id], similarities['assets'])
+        self.assertEqual([marker_alert_id], similarities['iocs'])
+
+        # Every alert shares the title fingerprint, only the most recent ones are kept
+        self.assertEqual(self._RESULTS_NB, len(similarities['titles']))
+        self.assertEqual(marker_alert_id, similarities['titles'][0])
+        older_alerts_nb = Alert.query.filter(
+            Alert.alert_id.in_(similarities['titles']),
+            Alert.alert_source_event_time < now - timedelta(minutes=self._RESULTS_NB)
+        ).count()
+        self.assertEqual(0, older_alerts_nb)
@@ -0,0 +1,57 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from app import db
+from app.iris_engine.access_control.api_key_handler import get_user_by_api_key
+from app.iris_engine.access_control.api_key_handler import invalidate_api_key_cache
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestApiKeyAuth(PerformanceTestCase):
+    _REQUESTS_NB = 10000
+
+    def setUp(self) -> None:
+        super().setUp()
+        administrator = self.get_administrator()
+        self._administrator_id = administrator.id
+        self._api_key = administrator.api_key
+
+    def tearDown(self) -> None:
+        invalidate_api_key_cache()
+        super().tearDown()
+
+    def _authenticate_requests(self, cached: bool):
+        # Whether the key digest is cached or not, each request loads its user with a single statement
+        with self.assert_max_statements(self._REQUESTS_NB, f"{self._REQUESTS_NB} authentications "
+                                                           f"({'cached' if cached else 'uncached'})"):
+            for _ in range(self._REQUESTS_NB):
+                if not cached:
+                    invalidate_api_key_cache()
+
+                user = get_user_by_api_key(f'Bearer {self._api_key}')
+                self.assertEqual(self._administrator_id, user.id)
+                # Each API request gets a fresh session
+                db.session.remove()
+
+    def test_api_key_authentication_overhead(self):
+        self._authenticate_requests(cached=False)
+        self._authenticate_requests(cached=True)
+
+    def test_api_key_authentication_should_reject_an_unknown_key(self):
+        with self.assert_max_statements(1, 'Unknown key authentication'):
+            self.assertIsNone(get_user_by_api_key('Bearer unknown'))
@@ -0,0 +1,70 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from flask_login import login_user
+from sqlalchemy import insert
+
+from app import app
+from app import db
+from app.business.assets import import_csv_assets
+from app.models import CaseAssets
+from app.models import Ioc
+from app.models import IocAssetLink
+from app.models import IocLink
+from app.models.cases import Cases
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestAssetsCsvImport(PerformanceTestCase):
+    _ASSETS_NB = 20000
+    _IOCS_NB = 100
+
+    def test_import_assets_csv(self):
+        administrator = self.get_administrator()
+        case_id = Cases.query.first().case_id
+
+        iocs_ids = db.session.execute(insert(Ioc).returning(Ioc.ioc_id), [
+            {'ioc_value': f'ioc {i}', 'user_id': administrator.id} for i in range(self._IOCS_NB)
+        ]).scalars().all()
+        db.session.execute(insert(IocLink), [{'ioc_id': ioc_id, 'case_id': case_id} for ioc_id in iocs_ids])
+        db.session.commit()
+
+        csv_lines = ['asset_name,asset_type_name,asset_description,asset_ip,asset_domain,asset_tags,asset_iocs']
+        csv_lines.extend(f'host-{i},Windows - Computer,CMDB export,10.0.{i // 256 % 256}.{i % 256},iris.local,'
+                         f'cmdb|windows,ioc {i % self._IOCS_NB}' for i in range(self._ASSETS_NB))
+        # Repeats the first asset of the file, in the last chunk
+        csv_lines.append('HOST-0,Windows - Computer,Repeated,,,,')
+
+        with app.test_request_context():
+            login_user(administrator)
+
+            # The assets and their IOCs links are inserted by chunks, whatever the number of rows
+            with self.assert_max_statements(self._ASSETS_NB // 100, f'Imported {self._ASSETS_NB} assets'):
+                imported, errors = import_csv_assets(csv_lines, case_id)
+
+            # The assets already exist in the case
+            imported_again, errors_again = import_csv_assets(csv_lines[:-1], case_id)
+
+        self.assertEqual(self._ASSETS_NB, len(imported))
+        self.assertEqual([{'row': self._ASSETS_NB + 2, 'asset_name': 'HOST-0', 'asset_type_name': 'Windows - Computer',
+                           'error': 'duplicate of row 2 in the file'}], errors)
+        self.assertEqual(0, len(imported_again))
+        self.assertEqual(self._ASSETS_NB, len(errors_again))
+        self.assertEqual({'asset name already exists in this case'}, {error['error'] for error in errors_again})
+        self.assertEqual(self._ASSETS_NB, CaseAssets.query.filter(CaseAssets.case_id == case_id).count())
+        self.assertEqual(self._ASSETS_NB, IocAssetLink.query.count())
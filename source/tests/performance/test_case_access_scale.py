@@ -0,0 +1,117 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import logging
+from datetime import datetime
+from flask_login import login_user
+from sqlalchemy import insert
+
+from app import app
+from app import db
+from app.iris_engine.access_control.utils import ac_recompute_case_customers_effective_ac
+from app.iris_engine.access_control.utils import ac_recompute_users_effective_ac
+from app.iris_engine.access_control.utils import ac_set_new_case_access
+from app.models.authorization import User
+from app.models.authorization import UserCaseEffectiveAccess
+from app.models.authorization import UserClient
+from app.models.cases import Cases
+from app.models.cases import Client
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestCaseAccessScale(PerformanceTestCase):
+    _USERS_NB = 600
+    _CASES_NB = 40000
+    _CLIENTS_NB = 40
+    _CHUNK_SIZE = 10000
+    _CREATED_CASES_NB = 100
+
+    def _create_population(self, administrator: User):
+        clients_ids = [r[0] for r in db.session.execute(insert(Client).returning(Client.client_id), [{
+            'name': f'access_client_{i}'
+        } for i in range(self._CLIENTS_NB)]).all()]
+
+        users_ids = [r[0] for r in db.session.execute(insert(User).returning(User.id), [{
+            'user': f'access_user_{i}', 'name': f'Access user {i}', 'email': f'access_user_{i}@iris.local',
+            'active': True
+        } for i in range(self._USERS_NB)]).all()]
+
+        # Each user is a member of one customer, and therefore has access to its cases
+        db.session.execute(insert(UserClient), [{
+            'user_id': user_id, 'client_id': clients_ids[i % self._CLIENTS_NB], 'access_level': 4,
+            'allow_alerts': True
+        } for i, user_id in enumerate(users_ids)])
+
+        for chunk_start in range(0, self._CASES_NB, self._CHUNK_SIZE):
+            logging.info(f"Creating cases #{chunk_start}")
+            db.session.execute(insert(Cases), [{
+                'name': f'Access case {i}', 'description': '', 'soc_id': '',
+                'client_id': clients_ids[i % self._CLIENTS_NB], 'user_id': administrator.id,
+                'owner_id': administrator.id, 'open_date': datetime.utcnow().date(), 'status_id': 0
+            } for i in range(chunk_start, min(chunk_start + self._CHUNK_SIZE, self._CASES_NB))])
+
+        db.session.commit()
+
+        return users_ids
+
+    @staticmethod
+    def _count_members_access(case_id: int, client_id: int) -> int:
+        return UserCaseEffectiveAccess.query.join(
+            UserClient, UserClient.user_id == UserCaseEffectiveAccess.user_id
+        ).filter(
+            UserCaseEffectiveAccess.case_id == case_id,
+            UserClient.client_id == client_id
+        ).count()
+
+    def test_case_access_at_scale(self):
+        administrator = self.get_administrator()
+        users_ids = self._create_population(administrator)
+        members_nb = self._USERS_NB // self._CLIENTS_NB
+
+        # Two set-based statements by batch of users
+        batches_nb = -(-User.query.count() // app.config.get('AC_RECOMPUTE_BATCH_SIZE'))
+        with self.assert_max_statements(1 + 2 * batches_nb, f'Recomputed the access of {self._USERS_NB} users '
+                                                            f'on {self._CASES_NB} cases'):
+            ac_recompute_users_effective_ac()
+
+        access_rows_nb = UserCaseEffectiveAccess.query.filter(UserCaseEffectiveAccess.user_id.in_(users_ids)).count()
+        self.assertEqual(self._CASES_NB * members_nb, access_rows_nb)
+
+        client_id = Client.query.filter(Client.name == 'access_client_0').first().client_id
+        other_client_id = Client.query.filter(Client.name == 'access_client_1').first().client_id
+        with app.test_request_context():
+            login_user(administrator)
+
+            # A fixed number of statements by case, whatever the number of members of its customer
+            with self.assert_max_statements(25 * self._CREATED_CASES_NB, f'Created {self._CREATED_CASES_NB} cases'):
+                for i in range(self._CREATED_CASES_NB):
+                    case = Cases(name=f'New access case {i}', description='', soc_id='', client_id=client_id,
+                                 user=administrator)
+                    db.session.add(case)
+                    db.session.commit()
+                    ac_set_new_case_access(None, case.case_id, client_id)
+
+            self.assertEqual(members_nb, self._count_members_access(case.case_id, client_id))
+
+            with self.assert_max_statements(4, 'Moved a case to another customer'):
+                case.client_id = other_client_id
+                ac_recompute_case_customers_effective_ac(case.case_id, [client_id, other_client_id])
+                db.session.commit()
+
+            self.assertEqual(0, self._count_members_access(case.case_id, client_id))
+            self.assertEqual(members_nb, self._count_members_access(case.case_id, other_client_id))
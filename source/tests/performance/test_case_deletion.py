@@ -0,0 +1,111 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from datetime import datetime
+from sqlalchemy import insert
+
+from app import db
+from app.datamgmt.datastore.datastore_db import datastore_get_root
+from app.datamgmt.manage.manage_cases_db import delete_case
+from app.models import CaseAssets
+from app.models import CaseEventCategory
+from app.models import CaseTasks
+from app.models import DataStoreFile
+from app.models import EventCategory
+from app.models import Ioc
+from app.models import IocAssetLink
+from app.models import IocLink
+from app.models import TaskAssignee
+from app.models.cases import Cases
+from app.models.cases import CasesEvent
+from app.models.cases import Client
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestCaseDeletion(PerformanceTestCase):
+    _ROWS_NB = 5000
+    # The lock of the case, the datastore files, folders and blobs, then one statement per table
+    _DELETION_STATEMENTS_NB = 44
+
+    def _create_case(self, administrator):
+        case = Cases(name='Deleted case', description='', soc_id='', client_id=Client.query.first().client_id,
+                     user=administrator)
+        db.session.add(case)
+        db.session.flush()
+
+        return case.case_id
+
+    def _create_assets_with_iocs(self, case_id, user_id):
+        assets_ids = db.session.execute(insert(CaseAssets).returning(CaseAssets.asset_id), [
+            {'asset_name': f'asset {i}', 'case_id': case_id, 'user_id': user_id} for i in range(self._ROWS_NB)
+        ]).scalars().all()
+        iocs_ids = db.session.execute(insert(Ioc).returning(Ioc.ioc_id), [
+            {'ioc_value': f'ioc {case_id} {i}', 'user_id': user_id} for i in range(self._ROWS_NB)
+        ]).scalars().all()
+
+        db.session.execute(insert(IocLink), [{'ioc_id': ioc_id, 'case_id': case_id} for ioc_id in iocs_ids])
+        db.session.execute(insert(IocAssetLink), [
+            {'ioc_id': ioc_id, 'asset_id': asset_id} for ioc_id, asset_id in zip(iocs_ids, assets_ids)
+        ])
+
+    def _create_case_content(self, case_id, user_id):
+        self._create_assets_with_iocs(case_id, user_id)
+
+        tasks_ids = db.session.execute(insert(CaseTasks).returning(CaseTasks.id), [
+            {'task_title': f'task {i}', 'task_case_id': case_id} for i in range(self._ROWS_NB)
+        ]).scalars().all()
+        db.session.execute(insert(TaskAssignee), [{'user_id': user_id, 'task_id': task_id} for task_id in tasks_ids])
+
+        events_ids = db.session.execute(insert(CasesEvent).returning(CasesEvent.event_id), [
+            {'event_title': f'event {i}', 'case_id': case_id, 'event_date': datetime.utcnow()}
+            for i in range(self._ROWS_NB)
+        ]).scalars().all()
+        category_id = EventCategory.query.first().id
+        db.session.execute(insert(CaseEventCategory), [
+            {'event_id': event_id, 'category_id': category_id} for event_id in events_ids
+        ])
+
+        root_id = datastore_get_root(case_id).path_id
+        db.session.execute(insert(DataStoreFile), [
+            {'file_original_name': f'file {i}', 'file_local_name': 'tmp_xc', 'file_parent_id': root_id,
+             'added_by_user_id': user_id, 'file_case_id': case_id, 'file_date_added': datetime.utcnow()}
+            for i in range(self._ROWS_NB)
+        ])
+
+    def test_delete_case(self):
+        administrator = self.get_administrator()
+        case_id = self._create_case(administrator)
+        self._create_case_content(case_id, administrator.id)
+
+        # The links of the other cases must be kept
+        kept_case_id = self._create_case(administrator)
+        self._create_assets_with_iocs(kept_case_id, administrator.id)
+        db.session.commit()
+        kept_links_count = IocAssetLink.query.count() - self._ROWS_NB
+
+        with self.assert_max_statements(self._DELETION_STATEMENTS_NB,
+                                        f'Deleted a case with {self._ROWS_NB} rows of each kind'):
+            self.assertTrue(delete_case(case_id))
+
+        self.assertIsNone(db.session.get(Cases, case_id))
+        self.assertEqual(0, CaseTasks.query.filter(CaseTasks.task_case_id == case_id).count())
+        self.assertEqual(0, DataStoreFile.query.filter(DataStoreFile.file_case_id == case_id).count())
+        self.assertEqual(kept_links_count, IocAssetLink.query.count())
+
+        with self.assert_max_statements(1, 'Deleted a missing case'):
+            self.assertFalse(delete_case(case_id))
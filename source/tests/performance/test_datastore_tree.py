@@ -0,0 +1,101 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from datetime import datetime
+from sqlalchemy import insert
+
+from app import app
+from app import db
+from app.datamgmt.datastore.datastore_db import datastore_get_root
+from app.datamgmt.datastore.datastore_db import ds_list_node_files
+from app.datamgmt.datastore.datastore_db import ds_list_tree
+from app.datamgmt.states import update_datastore_state
+from app.models import DataStoreFile
+from app.models import DataStorePath
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+def _count_nodes(node, node_type):
+    children = node['children'].values()
+    return sum(child['type'] == node_type for child in children) + sum(
+        _count_nodes(child, node_type) for child in children if child['type'] == 'directory')
+
+
+class TestDatastoreTree(PerformanceTestCase):
+    _CASE_ID = 1
+    _USER_ID = 1
+    _FOLDERS_NB = 200
+    _FILES_PER_FOLDER = 50
+
+    def _create_folder(self, name, parent_id):
+        folder = DataStorePath(path_name=name, path_parent_id=parent_id, path_is_root=False,
+                               path_case_id=self._CASE_ID)
+        db.session.add(folder)
+        db.session.flush()
+
+        return folder.path_id
+
+    def _create_files(self, folder_id, files_nb):
+        db.session.execute(insert(DataStoreFile), [
+            {'file_original_name': f'file {i}', 'file_local_name': f'file_{folder_id}_{i}',
+             'file_parent_id': folder_id, 'added_by_user_id': self._USER_ID, 'file_case_id': self._CASE_ID,
+             'file_date_added': datetime.utcnow()}
+            for i in range(files_nb)
+        ])
+
+    def test_datastore_tree(self):
+        root_id = datastore_get_root(self._CASE_ID).path_id
+        parent_id = root_id
+        for i in range(self._FOLDERS_NB):
+            # Chains of 10 nested folders
+            parent_id = self._create_folder(f'folder {i}', parent_id if i % 10 else root_id)
+            self._create_files(parent_id, self._FILES_PER_FOLDER)
+
+        update_datastore_state(caseid=self._CASE_ID, userid=self._USER_ID)
+        db.session.commit()
+
+        # The datastore state, then the root, the folders, the files counts and the files
+        for label, max_statements in [('uncached', 5), ('cached', 1)]:
+            with self.assert_max_statements(max_statements, f'Tree of {self._FOLDERS_NB} folders and '
+                                                            f'{self._FOLDERS_NB * self._FILES_PER_FOLDER} files '
+                                                            f'({label})'):
+                tree = ds_list_tree(self._CASE_ID)
+
+            root_node = tree[f'd-{root_id}']
+            self.assertEqual(self._FOLDERS_NB, _count_nodes(root_node, 'directory'))
+            self.assertEqual(self._FOLDERS_NB * self._FILES_PER_FOLDER, _count_nodes(root_node, 'file'))
+
+    def test_datastore_tree_lazy_folder(self):
+        root_id = datastore_get_root(self._CASE_ID).path_id
+        files_nb = app.config.get('DATASTORE_TREE_LAZY_FILES') + 1
+        folder_id = self._create_folder('large folder', root_id)
+        self._create_files(folder_id, files_nb)
+        update_datastore_state(caseid=self._CASE_ID, userid=self._USER_ID)
+        db.session.commit()
+
+        tree = ds_list_tree(self._CASE_ID)
+        folder_node = tree[f'd-{root_id}']['children'][f'd-{folder_id}']
+        self.assertTrue(folder_node['lazy'])
+        self.assertEqual(files_nb, folder_node['files_count'])
+        self.assertEqual({}, folder_node['children'])
+
+        # The folder, then its files
+        with self.assert_max_statements(2, f'Lazy folder of {files_nb} files listed'):
+            files = ds_list_node_files(folder_id, self._CASE_ID)
+
+        self.assertEqual(files_nb, len(files))
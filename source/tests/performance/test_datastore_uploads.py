@@ -0,0 +1,133 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pyminizip
+from werkzeug.datastructures import FileStorage
+
+from app.iris_engine.utils.uploads import HashingFile
+from app.iris_engine.utils.uploads import discard_chunked_upload
+from app.iris_engine.utils.uploads import get_chunked_upload_chunks
+from app.iris_engine.utils.uploads import get_upload_chunk
+from app.iris_engine.utils.uploads import open_upload_chunk
+from app.iris_engine.utils.uploads import save_upload_chunk
+from app.iris_engine.utils.uploads import stage_file
+from app.iris_engine.utils.uploads import copy_stream
+from app.iris_engine.utils.uploads import get_uploads_path
+from app.iris_engine.utils.uploads import stage_upload
+from app.iris_engine.utils.uploads import store_staged_file
+from app.util import file_sha256sum
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestDatastoreUploads(PerformanceTestCase):
+    _FILE_SIZE = 256 * 1024 * 1024
+    _CHUNK_SIZE = 8 * 1024 * 1024
+    _USER_ID = 0
+    _PASSWORD = 'infected'
+
+    def setUp(self) -> None:
+        super().setUp()
+        self._directory = Path(tempfile.mkdtemp(dir=get_uploads_path()))
+        self._source = self._directory / 'source'
+        block = os.urandom(1024 * 1024)
+        with open(self._source, 'wb') as fout:
+            for _ in range(self._FILE_SIZE // len(block)):
+                fout.write(block)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._directory, ignore_errors=True)
+        super().tearDown()
+
+    def _assert_no_statements(self, label):
+        # Uploads are stored before their database objects are created, so without holding a transaction open
+        return self.assert_max_statements(0, f'{label} of {self._FILE_SIZE // 1024 // 1024} MB')
+
+    def _spool(self):
+        # Same as StreamedUploadRequest, the upload is hashed while received
+        spooled = HashingFile(tempfile.NamedTemporaryFile(dir=get_uploads_path()))
+        with open(self._source, 'rb') as fin:
+            shutil.copyfileobj(fin, spooled, 1024 * 1024)
+        spooled.seek(0)
+
+        return FileStorage(stream=spooled, filename='source')
+
+    def test_copy_stream_buffer_sizes(self):
+        for buffer_size in [4096, 64 * 1024, 1024 * 1024, 4 * 1024 * 1024]:
+            with self._assert_no_statements(f'Copy and hash with {buffer_size} bytes buffers'):
+                with open(self._source, 'rb') as fin, open(self._directory / 'copy', 'wb') as fout:
+                    size, _ = copy_stream(fin, fout, buffer_size)
+
+            self.assertEqual(self._FILE_SIZE, size)
+
+    def test_store_upload(self):
+        file_storage = self._spool()
+        with self._assert_no_statements('Store spooled upload'):
+            staged_file = stage_upload(file_storage)
+            file_path = store_staged_file(staged_file, self._directory / 'stored')
+        file_storage.close()
+
+        self.assertEqual(self._FILE_SIZE, staged_file.size)
+        self.assertEqual(self._FILE_SIZE, Path(file_path).stat().st_size)
+
+    def test_store_encrypted_upload(self):
+        # Previous pipeline: save, hash, copy under the hash name and compress
+        with self._assert_no_statements('Store encrypted upload with copies'):
+            shutil.copyfile(self._source, self._directory / 'saved')
+            file_hash = file_sha256sum(self._directory / 'saved')
+            shutil.copyfile(self._directory / 'saved', self._directory / file_hash)
+            pyminizip.compress((self._directory / file_hash).as_posix(), None,
+                               (self._directory / 'previous.zip').as_posix(), self._PASSWORD, 0)
+
+        file_storage = self._spool()
+        with self._assert_no_statements('Store spooled encrypted upload'):
+            staged_file = stage_upload(file_storage)
+            store_staged_file(staged_file, self._directory / 'stored', self._PASSWORD)
+        file_storage.close()
+
+        self.assertEqual(file_hash, staged_file.sha256)
+
+    def test_store_chunked_upload(self):
+        chunks_count = self._FILE_SIZE // self._CHUNK_SIZE
+        upload_path = None
+
+        with self._assert_no_statements('Store chunked upload'), open(self._source, 'rb') as fin:
+            for index in range(chunks_count):
+                chunk = get_upload_chunk({
+                    'dzuuid': 'benchmark', 'dzchunkindex': index, 'dztotalchunkcount': chunks_count,
+                    'dzchunksize': self._CHUNK_SIZE, 'dzchunkbyteoffset': index * self._CHUNK_SIZE,
+                    'dztotalfilesize': self._FILE_SIZE
+                }, self._FILE_SIZE)
+
+                # Same as StreamedUploadRequest, the chunk is written at its offset while received
+                chunk_file = open_upload_chunk(self._USER_ID, chunk)
+                chunk_file.write(fin.read(self._CHUNK_SIZE))
+                upload_path = save_upload_chunk(FileStorage(stream=chunk_file), self._USER_ID, chunk)
+
+            staged_file = stage_file(upload_path)
+            file_path = store_staged_file(staged_file, self._directory / 'stored')
+
+        discard_chunked_upload(self._USER_ID, 'benchmark')
+
+        self.assertEqual(self._FILE_SIZE, staged_file.size)
+        self.assertEqual(self._FILE_SIZE, Path(file_path).stat().st_size)
+        self.assertEqual([], get_chunked_upload_chunks(self._USER_ID, 'benchmark'))
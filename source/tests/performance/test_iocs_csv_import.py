@@ -0,0 +1,57 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from flask_login import login_user
+
+from app import app
+from app.business.iocs import import_csv_iocs
+from app.models import IocLink
+from app.models.cases import Cases
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestIocsCsvImport(PerformanceTestCase):
+    _IOCS_NB = 50000
+
+    def test_import_iocs_csv(self):
+        administrator = self.get_administrator()
+        case_id = Cases.query.first().case_id
+
+        csv_lines = ['ioc_value,ioc_type,ioc_description,ioc_tags,ioc_tlp']
+        csv_lines.extend(f'indicator-{i}.example.com,domain,Threat intel feed,feed|intel,amber'
+                         for i in range(self._IOCS_NB))
+        # Repeats the first IOC of the file, in the last chunk
+        csv_lines.append('indicator-0.example.com,domain,Repeated,,amber')
+
+        with app.test_request_context():
+            login_user(administrator)
+
+            # The IOCs and their links are inserted by chunks, whatever the number of rows
+            with self.assert_max_statements(self._IOCS_NB // 100, f'Imported {self._IOCS_NB} IOCs'):
+                imported, errors = import_csv_iocs(csv_lines, case_id)
+
+            # Importing the same file again only links the existing IOCs, which are all linked already
+            imported_again, errors_again = import_csv_iocs(csv_lines[:-1], case_id)
+
+        self.assertEqual(self._IOCS_NB, len(imported))
+        self.assertEqual([{'row': self._IOCS_NB + 2, 'ioc_value': 'indicator-0.example.com', 'ioc_type': 'domain',
+                           'error': 'duplicate of row 2 in the file'}], errors)
+        self.assertEqual(0, len(imported_again))
+        self.assertEqual(self._IOCS_NB, len(errors_again))
+        self.assertEqual({'already exists and linked to this case'}, {error['error'] for error in errors_again})
+        self.assertEqual(self._IOCS_NB, IocLink.query.filter(IocLink.case_id == case_id).count())
@@ -0,0 +1,47 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from app import db
+from app.iris_engine.module_handler.module_handler import call_modules_hook
+from app.iris_engine.module_handler.module_registry import invalidate_modules_registry
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestModulesHooks(PerformanceTestCase):
+    _CALLS_NB = 10000
+
+    def tearDown(self) -> None:
+        invalidate_modules_registry()
+        super().tearDown()
+
+    def _call_hooks(self, cached: bool):
+        # Rebuilding the dispatch table takes two statements, a cached table none
+        max_statements = 0 if cached else 2 * self._CALLS_NB
+        with self.assert_max_statements(max_statements, f"{self._CALLS_NB} hook calls "
+                                                         f"({'cached' if cached else 'uncached'})"):
+            for i in range(self._CALLS_NB):
+                if not cached:
+                    invalidate_modules_registry()
+
+                # Hooks without subscribers are the common case
+                self.assertEqual(i, call_modules_hook('on_postload_event_create', data=i, caseid=1))
+                db.session.remove()
+
+    def test_hook_dispatch_overhead(self):
+        self._call_hooks(cached=False)
+        self._call_hooks(cached=True)
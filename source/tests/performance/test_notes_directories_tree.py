@@ -0,0 +1,63 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from sqlalchemy import insert
+
+from app import db
+from app.datamgmt.case.case_notes_db import get_directories_with_note_count
+from app.datamgmt.states import update_notes_state
+from app.models import NoteDirectory
+from app.models import Notes
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestNotesDirectoriesTree(PerformanceTestCase):
+    _CASE_ID = 1
+    _DIRECTORIES_NB = 500
+    _NOTES_PER_DIRECTORY = 4
+
+    def _create_directories(self):
+        parent_id = None
+        directories_ids = []
+        for i in range(self._DIRECTORIES_NB):
+            # Chains of 10 nested directories
+            directory = NoteDirectory(name=f'directory {i}', case_id=self._CASE_ID,
+                                      parent_id=parent_id if i % 10 else None)
+            db.session.add(directory)
+            db.session.flush()
+            parent_id = directory.id
+            directories_ids.append(directory.id)
+
+        db.session.execute(insert(Notes), [
+            {'note_title': f'note {i}', 'note_content': '', 'note_case_id': self._CASE_ID, 'directory_id': directory_id}
+            for directory_id in directories_ids for i in range(self._NOTES_PER_DIRECTORY)
+        ])
+        # The tree is cached for a version of the notes state
+        update_notes_state(caseid=self._CASE_ID, userid=self.get_administrator().id)
+        db.session.commit()
+
+    def test_notes_directories_tree(self):
+        self._create_directories()
+
+        # The notes state, then the directories and the notes
+        for label, max_statements in [('uncached', 3), ('cached', 1)]:
+            with self.assert_max_statements(max_statements, f'Tree of {self._DIRECTORIES_NB} directories ({label})'):
+                directories = get_directories_with_note_count(self._CASE_ID)
+
+            self.assertEqual(self._DIRECTORIES_NB, len(directories))
+            self.assertTrue(all(d['note_count'] == self._NOTES_PER_DIRECTORY for d in directories))
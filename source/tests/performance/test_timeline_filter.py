@@ -0,0 +1,143 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import logging
+import random
+from datetime import datetime
+from datetime import timedelta
+from sqlalchemy import distinct
+from sqlalchemy import func
+from sqlalchemy import insert
+
+from app import db
+from app.datamgmt.case.case_events_db import get_filtered_case_events
+from app.models.cases import Cases
+from app.models.cases import CasesEvent
+from app.models.cases import Client
+from app.models.models import CaseAssets
+from app.models.models import CaseEventsAssets
+from app.models.models import CaseEventsIoc
+from app.models.models import Ioc
+from app.models.models import IocLink
+from tests.performance.performance_test_case import PerformanceTestCase
+
+
+class TestTimelineFilter(PerformanceTestCase):
+    _CASES_SIZES = [10000, 100000, 1000000]
+    _CHUNK_SIZE = 10000
+    _ASSETS_NB = 500
+    _IOCS_NB = 2000
+
+    def _create_synthetic_case(self, events_nb: int) -> int:
+        user = self.get_administrator()
+        client = Client.query.first()
+
+        case = Cases(name=f'Timeline {events_nb}', description='Synthetic timeline', soc_id='',
+                     client_id=client.client_id, user=user)
+        db.session.add(case)
+        db.session.commit()
+
+        assets_ids = [r[0] for r in db.session.execute(insert(CaseAssets).returning(CaseAssets.asset_id), [{
+            'asset_name': f'host_{i}', 'asset_type_id': 1, 'case_id': case.case_id, 'user_id': user.id
+        } for i in range(self._ASSETS_NB)]).all()]
+
+        iocs_ids = [r[0] for r in db.session.execute(insert(Ioc).returning(Ioc.ioc_id), [{
+            'ioc_value': f'10.0.{i // 256}.{i % 256}', 'ioc_type_id': 1, 'ioc_tlp_id': 1, 'user_id': user.id
+        } for i in range(self._IOCS_NB)]).all()]
+        db.session.execute(insert(IocLink), [{'ioc_id': ioc_id, 'case_id': case.case_id} for ioc_id in iocs_ids])
+
+        now = datetime.utcnow()
+        for chunk_start in range(0, events_nb, self._CHUNK_SIZE):
+            logging.info(f"Creating events #{chunk_start}")
+            events_ids = [r[0] for r in db.session.execute(insert(CasesEvent).returning(CasesEvent.event_id), [{
+                'case_id': case.case_id,
+                'user_id': user.id,
+                'event_title': f'Event {i}',
+                'event_content': f'Content of event {i}',
+                'event_raw': '',
+                'event_source': 'synthetic',
+                'event_tags': random.choice(['malware', 'network', 'lateral']),
+                'event_color': '',
+                'event_date': now - timedelta(seconds=i),
+                'event_added': now,
+                'event_is_flagged': i % 10 == 0
+            } for i in range(chunk_start, min(chunk_start + self._CHUNK_SIZE, events_nb))]).all()]
+
+            db.session.execute(insert(CaseEventsAssets), [{
+                'event_id': event_id, 'asset_id': random.choice(assets_ids), 'case_id': case.case_id
+            } for event_id in events_ids for _ in range(random.randrange(0, 4))])
+
+            db.session.execute(insert(CaseEventsIoc), [{
+                'event_id': event_id, 'ioc_id': random.choice(iocs_ids), 'case_id': case.case_id
+            } for event_id in events_ids for _ in range(random.randrange(0, 3))])
+
+            db.session.commit()
+
+        return case.case_id
+
+    def _time_filter(self, label: str, events_nb: int, **filters) -> dict:
+        # The events, their assets and their IOCs, plus the count when paginated
+        with self.assert_max_statements(4, f'{events_nb} events - {label}'):
+            result = get_filtered_case_events(**filters)
+
+        logging.info(f"{events_nb} events - {label}: {len(result.get('events'))} events")
+        return result
+
+    @staticmethod
+    def _count_linked_events(link_model, object_model, condition, case_id: int) -> int:
+        return db.session.query(
+            func.count(distinct(link_model.event_id))
+        ).join(
+            object_model
+        ).filter(
+            link_model.case_id == case_id,
+            condition
+        ).scalar()
+
+    def test_timeline_filter_time(self):
+        for events_nb in self._CASES_SIZES:
+            case_id = self._create_synthetic_case(events_nb)
+
+            result = self._time_filter('asset', events_nb, caseid=case_id, assets=['host_1'])
+            expected_nb = self._count_linked_events(CaseEventsAssets, CaseAssets, CaseAssets.asset_name == 'host_1',
+                                                    case_id)
+            self.assertEqual(expected_nb, result['total'])
+            for event in result['events']:
+                self.assertTrue(any(asset['name'].startswith('host_1 (') for asset in event['assets']))
+
+            result = self._time_filter('ioc', events_nb, caseid=case_id, iocs=['10.0.0.1'])
+            expected_nb = self._count_linked_events(CaseEventsIoc, Ioc, Ioc.ioc_value == '10.0.0.1', case_id)
+            self.assertEqual(expected_nb, result['total'])
+            for event in result['events']:
+                self.assertIn('10.0.0.1', [ioc['name'] for ioc in event['iocs']])
+
+            result = self._time_filter('tag and flag', events_nb, caseid=case_id, tags=['malware'], flag=True)
+            expected_nb = CasesEvent.query.filter(CasesEvent.case_id == case_id,
+                                                  CasesEvent.event_tags == 'malware',
+                                                  CasesEvent.event_is_flagged == True).count()
+            self.assertEqual(expected_nb, result['total'])
+
+            result = self._time_filter('first page', events_nb, caseid=case_id, page=1, per_page=500)
+            self.assertEqual(events_nb, result['total'])
+            self.assertEqual(f'Event {events_nb - 1}', result['events'][0]['event_title'])
+            self.assertEqual(500, len(result['events']))
+
+            result = self._time_filter('last page', events_nb, caseid=case_id, page=events_nb // 500, per_page=500)
+            self.assertEqual(events_nb, result['total'])
+            self.assertEqual('Event 0', result['events'][-1]['event_title'])
+            self.assertEqual(500, len(result['events']))
@@ -0,0 +1,62 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from unittest import TestCase
+
+import os
+import time
+import uuid
+
+from app import app
+from app.business.csv_imports import ASSETS_CSV_IMPORT
+from app.business.csv_imports import IOCS_CSV_IMPORT
+from app.business.csv_imports import delete_expired_csv_imports_errors
+
+
+class TestCsvImports(TestCase):
+    def setUp(self) -> None:
+        self._app_context = app.app_context()
+        self._app_context.push()
+
+    def tearDown(self) -> None:
+        self._app_context.pop()
+
+    def _write_errors(self, csv_import, age_hours):
+        errors_path = csv_import.get_errors_path(str(uuid.uuid4()))
+        csv_import.write_errors([], errors_path)
+        modification_time = time.time() - age_hours * 3600
+        os.utime(errors_path, (modification_time, modification_time))
+
+        return errors_path
+
+    def test_delete_expired_csv_imports_errors_should_only_delete_the_expired_reports(self):
+        expiration = app.config.get('CSV_IMPORT_ERRORS_EXPIRATION')
+        expired_iocs_errors = self._write_errors(IOCS_CSV_IMPORT, expiration + 1)
+        expired_assets_errors = self._write_errors(ASSETS_CSV_IMPORT, expiration + 1)
+        recent_errors = self._write_errors(IOCS_CSV_IMPORT, 0)
+        pending_csv = IOCS_CSV_IMPORT.save_file('ioc_value,ioc_type,ioc_description,ioc_tags,ioc_tlp\n')
+        os.utime(pending_csv, (0, 0))
+
+        delete_expired_csv_imports_errors()
+
+        self.assertFalse(os.path.exists(expired_iocs_errors))
+        self.assertFalse(os.path.exists(expired_assets_errors))
+        self.assertTrue(os.path.exists(recent_errors))
+        self.assertTrue(os.path.exists(pending_csv))
+        os.remove(recent_errors)
+        os.remove(pending_csv)
@@ -0,0 +1,66 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+from unittest import TestCase
+
+from pathlib import Path
+
+from app import app
+from app import db
+from app.datamgmt.datastore.datastore_db import datastore_release_blobs
+from app.datamgmt.datastore.datastore_db import datastore_store_blob
+from app.iris_engine.utils.uploads import stage_content
+from app.models import DataStoreBlob
+from tests.clean_database import clean_db
+
+
+class TestDatastoreDB(TestCase):
+    def setUp(self) -> None:
+        self._app_context = app.app_context()
+        self._app_context.push()
+        clean_db()
+
+    def tearDown(self) -> None:
+        clean_db()
+        self._app_context.pop()
+
+    def _store_blob(self):
+        blob = datastore_store_blob(stage_content(b'blob content'))
+        db.session.commit()
+
+        return blob.blob_id, Path(blob.blob_local_name)
+
+    def test_release_blobs_should_remove_the_content_once_committed(self):
+        blob_id, blob_path = self._store_blob()
+
+        datastore_release_blobs({blob_id: 1})
+        self.assertTrue(blob_path.is_file())
+        db.session.commit()
+
+        self.assertFalse(blob_path.exists())
+        self.assertIsNone(db.session.get(DataStoreBlob, blob_id))
+
+    def test_release_blobs_should_keep_the_content_when_rolled_back(self):
+        blob_id, blob_path = self._store_blob()
+
+        datastore_release_blobs({blob_id: 1})
+        db.session.rollback()
+
+        self.assertTrue(blob_path.is_file())
+        self.assertIsNotNone(db.session.get(DataStoreBlob, blob_id))
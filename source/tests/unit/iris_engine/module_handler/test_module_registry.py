@@ -0,0 +1,50 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from unittest import TestCase
+
+from types import SimpleNamespace
+
+from app.iris_engine.module_handler.module_registry import invalidate_modules_registry
+from app.iris_engine.module_handler.module_registry import pooled_module_instance
+
+
+def _create_module_instance(module_name):
+    return SimpleNamespace(module_name=module_name, message_queue=[]), None
+
+
+class TestModuleRegistry(TestCase):
+    def setUp(self) -> None:
+        invalidate_modules_registry()
+
+    def tearDown(self) -> None:
+        invalidate_modules_registry()
+
+    def test_pooled_module_instance_should_reuse_the_idle_instance(self):
+        with pooled_module_instance('module', _create_module_instance) as first_instance:
+            pass
+
+        with pooled_module_instance('module', _create_module_instance) as second_instance:
+            self.assertIs(first_instance, second_instance)
+
+    def test_pooled_module_instance_should_not_keep_the_logs_of_the_previous_caller(self):
+        with pooled_module_instance('module', _create_module_instance) as mod_inst:
+            mod_inst.message_queue.append('log of the first call')
+
+        with pooled_module_instance('module', _create_module_instance) as mod_inst:
+            self.assertEqual([], mod_inst.message_queue)
@@ -0,0 +1,48 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from unittest import TestCase
+
+from app.iris_engine.utils.text_delta import apply_delta
+from app.iris_engine.utils.text_delta import get_delta_size
+from app.iris_engine.utils.text_delta import get_text_size
+from app.iris_engine.utils.text_delta import make_delta
+
+
+class TestTextDelta(TestCase):
+    def test_apply_delta_should_rebuild_the_text(self):
+        base = '# Summary\nFirst line\nSecond line\n\nConclusion'
+        text = '# Summary\nFirst line updated\nSecond line\nNew line\n\nConclusion\n'
+
+        self.assertEqual(text, apply_delta(base, make_delta(base, text)))
+
+    def test_apply_delta_should_keep_line_endings(self):
+        base = 'a\r\nb\r\nc'
+        text = 'a\r\nc\rd'
+
+        self.assertEqual(text, apply_delta(base, make_delta(base, text)))
+
+    def test_apply_delta_should_handle_empty_texts(self):
+        self.assertEqual('content', apply_delta(None, make_delta(None, 'content')))
+        self.assertEqual('', apply_delta('content', make_delta('content', '')))
+
+    def test_delta_should_be_smaller_than_the_text_for_small_changes(self):
+        base = ''.join(f'Line {i} of the investigation notes\n' for i in range(1000))
+        text = base.replace('Line 500 ', 'Updated line 500 ')
+
+        self.assertLess(get_delta_size(make_delta(base, text)), get_text_size(text) // 10)
@@ -0,0 +1,134 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+import hashlib
+import io
+import os
+import stat
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from app.iris_engine.utils.uploads import ChunkFile
+from app.iris_engine.utils.uploads import HashingFile
+from app.iris_engine.utils.uploads import StagedFile
+from app.iris_engine.utils.uploads import UploadChunk
+from app.iris_engine.utils.uploads import copy_stream
+from app.iris_engine.utils.uploads import get_upload_chunk
+from app.iris_engine.utils.uploads import hash_file
+from app.iris_engine.utils.uploads import store_staged_file
+
+
+class _ReadOnlyStream:
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+
+    def read(self, size):
+        return self._stream.read(size)
+
+
+class TestUploads(TestCase):
+    _DATA = bytes(range(256)) * 8193
+
+    def _get_sha256(self, data):
+        return hashlib.sha256(data).hexdigest().upper()
+
+    def test_copy_stream_should_return_size_and_hash(self):
+        fout = io.BytesIO()
+
+        result = copy_stream(io.BytesIO(self._DATA), fout, buffer_size=4096)
+
+        self.assertEqual((len(self._DATA), self._get_sha256(self._DATA)), result)
+        self.assertEqual(self._DATA, fout.getvalue())
+
+    def test_copy_stream_should_handle_streams_without_readinto(self):
+        fout = io.BytesIO()
+
+        result = copy_stream(_ReadOnlyStream(self._DATA), fout)
+
+        self.assertEqual((len(self._DATA), self._get_sha256(self._DATA)), result)
+        self.assertEqual(self._DATA, fout.getvalue())
+
+    def test_copy_stream_should_handle_empty_streams(self):
+        self.assertEqual((0, self._get_sha256(b'')), copy_stream(io.BytesIO(), io.BytesIO()))
+
+    def test_hashing_file_should_hash_written_data(self):
+        with tempfile.NamedTemporaryFile() as tmp:
+            hashing_file = HashingFile(tmp)
+            hashing_file.write(self._DATA[:10])
+            hashing_file.write(self._DATA[10:])
+            hashing_file.flush()
+
+            self.assertEqual(len(self._DATA), hashing_file.size)
+            self.assertEqual(self._get_sha256(self._DATA), hashing_file.hexdigest())
+            self.assertEqual((hashing_file.size, hashing_file.hexdigest()), hash_file(tmp.name))
+
+    def _get_chunk_parameters(self, chunk_index, offset, chunk_size=10, chunks_count=3, total_size=25):
+        return {'dzuuid': 'upload', 'dzchunkindex': chunk_index, 'dztotalchunkcount': chunks_count,
+                'dzchunksize': chunk_size, 'dzchunkbyteoffset': offset, 'dztotalfilesize': total_size}
+
+    def test_get_upload_chunk_should_return_none_for_requests_without_chunk(self):
+        self.assertIsNone(get_upload_chunk({}, 100))
+
+    def test_get_upload_chunk_should_compute_the_size_of_the_last_chunk(self):
+        chunk = get_upload_chunk(self._get_chunk_parameters(2, 20), 100)
+
+        self.assertEqual(5, chunk.size)
+
+    def test_get_upload_chunk_should_reject_an_offset_not_matching_the_index(self):
+        with self.assertRaises(ValueError):
+            get_upload_chunk(self._get_chunk_parameters(1, 5), 100)
+
+    def test_get_upload_chunk_should_reject_a_chunks_count_not_matching_the_size(self):
+        with self.assertRaises(ValueError):
+            get_upload_chunk(self._get_chunk_parameters(0, 0, chunks_count=2), 100)
+
+    def test_get_upload_chunk_should_reject_files_above_the_maximum_size(self):
+        with self.assertRaises(ValueError):
+            get_upload_chunk(self._get_chunk_parameters(0, 0), 20)
+
+    def test_chunk_file_should_write_the_chunk_at_its_offset(self):
+        with tempfile.NamedTemporaryFile() as tmp:
+            chunk_file = ChunkFile(tmp.name, UploadChunk('upload', 1, 3, 10, 10, 25))
+            chunk_file.write(self._DATA[:10])
+            chunk_file.close()
+
+            self.assertEqual(10, chunk_file.size)
+            self.assertEqual(bytes(10) + self._DATA[:10], tmp.read())
+
+    def test_chunk_file_should_not_write_beyond_the_chunk(self):
+        with tempfile.NamedTemporaryFile() as tmp:
+            chunk_file = ChunkFile(tmp.name, UploadChunk('upload', 2, 3, 10, 20, 25))
+            chunk_file.write(self._DATA[:10])
+            chunk_file.close()
+
+            self.assertEqual(10, chunk_file.size)
+            self.assertEqual(25, len(tmp.read()))
+
+    def test_store_staged_file_should_make_the_stored_file_readable_by_the_proxy(self):
+        with tempfile.TemporaryDirectory() as directory:
+            staged_path = Path(directory) / 'staged'
+            with tempfile.NamedTemporaryFile(dir=directory, delete=False) as fout:
+                fout.write(self._DATA)
+            os.replace(fout.name, staged_path)
+
+            stored_path = store_staged_file(StagedFile(staged_path.as_posix(), len(self._DATA), '', owned=True),
+                                            Path(directory) / 'stored')
+
+            self.assertEqual(0o644, stat.S_IMODE(os.stat(stored_path).st_mode))
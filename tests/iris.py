@@ -79,6 +79,93 @@ class Iris:
         }
         return self._api.post('/alerts/add', body)
 
+    def create_alerts_batch(self, alerts):
+        return self._api.post('/alerts/batch/add', {'alerts': alerts})
+
+    def update_alerts_batch(self, alert_identifiers, updates):
+        return self._api.post('/alerts/batch/update', {'alert_ids': alert_identifiers, 'updates': updates})
+
+    def get_alert(self, alert_identifier):
+        return self._api.get(f'/alerts/{alert_identifier}')
+
+    def escalate_alerts_batch(self, alert_identifiers, iocs_uuids, assets_uuids):
+        body = {
+            'alert_ids': alert_identifiers,
+            'iocs_import_list': iocs_uuids,
+            'assets_import_list': assets_uuids,
+            'import_as_event': True,
+            'case_tags': '',
+            'case_title': 'escalated alerts'
+        }
+        return self._api.post('/alerts/batch/escalate', body)
+
+    def get_case_iocs(self, case_identifier):
+        return self._api.get('/case/ioc/list', query_parameters={'cid': case_identifier})
+
+    def get_case_assets(self, case_identifier):
+        return self._api.get('/case/assets/filter', query_parameters={'cid': case_identifier})
+
+    def get_alerts_filter(self, query_parameters=None):
+        return self._api.get('/alerts/filter', query_parameters=query_parameters)
+
+    def get_alerts_aggregations(self, query_parameters=None):
+        return self._api.get('/alerts/aggregations', query_parameters=query_parameters)
+
+    def upload_timeline_csv(self, csv_data):
+        return self._api.post_multipart('/case/timeline/events/csv_upload/file', {'CSVOptions': '{}'},
+                                        {'file': ('timeline.csv', csv_data, 'text/csv')})
+
+    def create_notes_directory(self, name):
+        return self._api.post('/case/notes/directories/add', {'name': name, 'parent_id': None})
+
+    def create_note(self, directory_identifier, title, content=''):
+        return self._api.post('/case/notes/add', {'directory_id': directory_identifier, 'note_title': title,
+                                                  'note_content': content})
+
+    def get_notes_directories(self):
+        return self._api.get('/case/notes/directories/filter')
+
+    def export_case(self):
+        return self._api.get('/case/export')
+
+    def upload_iocs_csv(self, csv_data):
+        return self._api.post('/case/ioc/upload', {'CSVData': csv_data})
+
+    def upload_assets_csv(self, case_identifier, csv_data):
+        return self._api.post('/case/assets/upload', {'CSVData': csv_data}, query_parameters={'cid': case_identifier})
+
+    def add_report_job(self, report_id, report_type):
+        return self._api.post('/case/report/jobs/add', {'report_id': report_id, 'report_type': report_type})
+
+    def get_report_job(self, job_id):
+        return self._api.get(f'/case/report/jobs/{job_id}')
+
+    def search(self, search_value, search_type, page=None):
+        body = {'search_value': search_value, 'search_type': search_type}
+        if page is not None:
+            body['page'] = page
+        return self._api.post('/search', body)
+
+    def compact_note_revisions(self):
+        return self._api.post('/manage/server/maintenance/compact-note-revisions', {})
+
+    def get_datastore_tree(self, case_identifier):
+        return self._api.get('/datastore/list/tree', query_parameters={'cid': case_identifier})
+
+    def upload_datastore_file(self, case_identifier, file_name, content):
+        tree = self.get_datastore_tree(case_identifier)
+        root_identifier = next(iter(tree['data'])).replace('d-', '')
+        return self._api.post_multipart(f'/datastore/file/add/{root_identifier}', {'file_original_name': file_name},
+                                        {'file_content': (file_name, content)},
+                                        query_parameters={'cid': case_identifier})
+
+    def download_datastore_file(self, case_identifier, file_identifier, headers=None):
+        return self._api.get_raw(f'/datastore/file/view/{file_identifier}', headers=headers,
+                                 query_parameters={'cid': case_identifier})
+
+    def get_datastore_stats(self):
+        return self._api.get('/manage/server/datastore/stats')
+
     def create_asset(self):
         body = {
             'asset_type_id': '9',
@@ -106,6 +193,12 @@ class Iris:
         response = self._api.post('/manage/cases/add', body)
         return response['data']
 
+    def delete_case(self, case_identifier):
+        response = self._api.post(f'/manage/cases/delete/{case_identifier}', {})
+        status_url = f'/manage/cases/delete/status/{response["data"]["task_id"]}'
+        self._wait(lambda: self._api.get(status_url)['data']['state'] != 'pending', 60)
+        return self._api.get(status_url)
+
     def update_case(self, case_identifier, data):
         return self._api.post(f'/manage/cases/update/{case_identifier}', data)
 
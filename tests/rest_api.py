@@ -37,6 +37,12 @@ class RestApi:
         print(f'GET {url} => {response.status_code} {body}')
         return body
 
+    def get_raw(self, path, headers=None, query_parameters=None):
+        url = self._build_url(path)
+        response = requests.get(url, headers={**self._headers, **(headers or {})}, params=query_parameters)
+        print(f'GET {url} {headers} => {response.status_code}')
+        return response
+
     def post(self, path, payload, query_parameters=None):
         url = self._build_url(path)
         response = requests.post(url, headers=self._headers, params=query_parameters, json=payload)
@@ -44,6 +50,14 @@ class RestApi:
         print(f'POST {url} {payload} => {response.status_code} {body}')
         return body
 
+    def post_multipart(self, path, data, files, query_parameters=None):
+        url = self._build_url(path)
+        headers = {'Authorization': self._headers['Authorization']}
+        response = requests.post(url, headers=headers, params=query_parameters, data=data, files=files)
+        body = response.json()
+        print(f'POST {url} {data} => {response.status_code} {body}')
+        return body
+
     def is_ready(self):
         try:
             requests.head(self._url)
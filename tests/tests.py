@@ -16,6 +16,7 @@
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
 from iris import Iris
 from iris import API_URL
 from graphql_api import GraphQLApi
@@ -50,6 +51,121 @@ class Tests(TestCase):
         cls._user_count += 1
         return f'user{cls._user_count}'
 
+    def test_upload_timeline_csv_file_should_add_events(self):
+        csv_data = 'event_date,event_tz,event_title,event_category,event_content,event_raw,event_source,' \
+                   'event_assets,event_iocs,event_tags\n' \
+                   '2024-01-01T10:00:00.000,+00:00,First event,,content,raw,source,,,tag1|tag2\n' \
+                   '2024-01-01T11:00:00.000,+00:00,Second event,,content,raw,source,,,\n'
+        response = self._subject.upload_timeline_csv(csv_data)
+        self.assertEqual(2, response['data']['events_count'])
+
+    def test_upload_timeline_csv_file_should_reject_unknown_asset(self):
+        csv_data = 'event_date,event_tz,event_title,event_category,event_content,event_raw,event_source,' \
+                   'event_assets,event_iocs,event_tags\n' \
+                   '2024-01-01T10:00:00.000,+00:00,First event,,content,raw,source,unknown_asset,,\n'
+        response = self._subject.upload_timeline_csv(csv_data)
+        self.assertEqual('error', response['status'])
+
+    def test_get_notes_directories_should_list_notes_created_concurrently(self):
+        directory_identifier = self._subject.create_notes_directory('concurrent notes')['data']['id']
+        self._subject.get_notes_directories()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda index: self._subject.create_note(directory_identifier, f'note {index}'),
+                              range(8)))
+        directories = self._subject.get_notes_directories()['data']
+        directory = next(directory for directory in directories if directory['id'] == directory_identifier)
+        self.assertEqual(8, directory['note_count'])
+
+    def test_export_case_should_include_the_timeline_events(self):
+        csv_data = 'event_date,event_tz,event_title,event_category,event_content,event_raw,event_source,' \
+                   'event_assets,event_iocs,event_tags\n' \
+                   '2024-01-02T10:00:00.000,+00:00,Exported event,,content,raw,source,,,\n'
+        self._subject.upload_timeline_csv(csv_data)
+        response = self._subject.export_case()
+        events_titles = [event['event_title'] for event in response['data']['timeline']]
+        self.assertIn('Exported event', events_titles)
+
+    def test_upload_iocs_csv_should_import_valid_rows_and_report_the_others(self):
+        ioc_value = self._generate_new_dummy_ioc_value()
+        csv_data = 'ioc_value,ioc_type,ioc_description,ioc_tags,ioc_tlp\n' \
+                   f'{ioc_value},other,description,tag1|tag2,amber\n' \
+                   f'{ioc_value},other,duplicate,,amber\n' \
+                   f'{ioc_value},unknown type,description,,amber\n'
+        response = self._subject.upload_iocs_csv(csv_data)
+        self.assertEqual(1, len(response['data']))
+
+    def test_upload_assets_csv_should_import_valid_rows_and_report_the_others(self):
+        case_identifier = self._subject.create_case()['case_id']
+        csv_data = 'asset_name,asset_type_name,asset_description,asset_ip,asset_domain,asset_tags\n' \
+                   'XCAS,Windows - Server,Xcas server,192.168.15.48,iris.local,\n' \
+                   'xcas,Windows - Server,Duplicate,192.168.15.48,iris.local,\n' \
+                   'XCAS,Unknown type,Xcas server,192.168.15.48,iris.local,\n'
+        response = self._subject.upload_assets_csv(case_identifier, csv_data)
+        self.assertEqual(1, len(response['data']))
+
+    def test_add_report_job_should_reject_unknown_report_type(self):
+        response = self._subject.add_report_job(1, 'Unknown')
+        self.assertEqual('error', response['status'])
+
+    def test_get_report_job_should_return_pending_for_unknown_job(self):
+        response = self._subject.get_report_job('00000000-0000-0000-0000-000000000000')
+        self.assertEqual('pending', response['data']['state'])
+
+    def test_search_notes_with_page_should_return_paginated_results(self):
+        response = self._subject.search('unknown_value', 'notes', page=1)
+        self.assertEqual(0, response['data']['total'])
+
+    def test_search_notes_should_find_a_part_of_a_word(self):
+        directory_identifier = self._subject.create_notes_directory('searched notes')['data']['id']
+        self._subject.create_note(directory_identifier, 'searched note', 'lateral movement through psexecsvc')
+        response = self._subject.search('psexec', 'notes')
+        self.assertEqual(['searched note'], [note['note_title'] for note in response['data']])
+
+    def test_search_with_invalid_page_should_fail(self):
+        response = self._subject.search('unknown_value', 'notes', page='first')
+        self.assertEqual('error', response['status'])
+
+    def test_compact_note_revisions_should_start_a_task(self):
+        response = self._subject.compact_note_revisions()
+        self.assertIn('task_id', response['data'])
+
+    def test_upload_same_datastore_file_in_two_cases_should_store_it_once(self):
+        content = b'triage package content'
+        bytes_saved = self._subject.get_datastore_stats()['data']['bytes_saved']
+        for _ in range(2):
+            case_identifier = self._subject.create_case()['case_id']
+            response = self._subject.upload_datastore_file(case_identifier, 'triage.bin', content)
+            self.assertEqual('success', response['status'])
+        response = self._subject.get_datastore_stats()
+        self.assertLessEqual(bytes_saved + len(content), response['data']['bytes_saved'])
+
+    def test_get_datastore_tree_should_list_files_uploaded_concurrently(self):
+        case_identifier = self._subject.create_case()['case_id']
+        self._subject.get_datastore_tree(case_identifier)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda index: self._subject.upload_datastore_file(case_identifier, f'file{index}.bin',
+                                                                                f'content {index}'.encode()),
+                              range(8)))
+        tree = self._subject.get_datastore_tree(case_identifier)['data']
+        root = next(iter(tree.values()))
+        self.assertEqual(8, len([child for child in root['children'] if child.startswith('f-')]))
+
+    def test_download_datastore_file_with_range_should_return_partial_content(self):
+        case_identifier = self._subject.create_case()['case_id']
+        response = self._subject.upload_datastore_file(case_identifier, 'memory.raw', b'0123456789')
+        file_identifier = response['data']['file_id']
+        response = self._subject.download_datastore_file(case_identifier, file_identifier, {'Range': 'bytes=2-5'})
+        self.assertEqual(206, response.status_code)
+        self.assertEqual(b'2345', response.content)
+
+    def test_download_datastore_file_with_matching_etag_should_not_return_content(self):
+        case_identifier = self._subject.create_case()['case_id']
+        response = self._subject.upload_datastore_file(case_identifier, 'memory.raw', b'memory content')
+        file_identifier = response['data']['file_id']
+        etag = self._subject.download_datastore_file(case_identifier, file_identifier).headers['ETag']
+        response = self._subject.download_datastore_file(case_identifier, file_identifier, {'If-None-Match': etag})
+        self.assertEqual(304, response.status_code)
+
     def test_create_asset_should_not_fail(self):
         response = self._subject.create_asset()
         self.assertEqual('success', response['status'])
@@ -66,12 +182,87 @@ class Tests(TestCase):
         case_count = len(response['data'])
         self.assertEqual(initial_case_count + 1, case_count)
 
+    def test_delete_case_should_remove_the_case(self):
+        case_identifier = self._subject.create_case()['case_id']
+        self._subject.upload_datastore_file(case_identifier, 'triage.bin', b'deleted case content')
+        response = self._subject.delete_case(case_identifier)
+        self.assertEqual('success', response['data']['state'])
+        response = self._subject.get_cases()
+        self.assertNotIn(case_identifier, [case['case_id'] for case in response['data']])
+
     def test_update_case_should_not_require_case_name_issue_358(self):
         case = self._subject.create_case()
         case_identifier = case['case_id']
         response = self._subject.update_case(case_identifier, {'case_tags': 'test,example'})
         self.assertEqual('success', response['status'])
 
+    def test_alerts_filter_with_cursor_should_return_disjoint_pages(self):
+        for _ in range(3):
+            self._subject.create_alert()
+        first_page = self._subject.get_alerts_filter({'pagination': 'cursor', 'per_page': 2})
+        cursor = first_page['data']['next_cursor']
+        second_page = self._subject.get_alerts_filter({'cursor': cursor, 'per_page': 2})
+        first_identifiers = {alert['alert_id'] for alert in first_page['data']['alerts']}
+        second_identifiers = {alert['alert_id'] for alert in second_page['data']['alerts']}
+        self.assertEqual(set(), first_identifiers & second_identifiers)
+
+    def test_alerts_filter_should_reject_invalid_cursor(self):
+        response = self._subject.get_alerts_filter({'cursor': 'not a cursor'})
+        self.assertEqual('error', response['status'])
+
+    def test_create_alerts_batch_should_create_every_alert(self):
+        alert = {'alert_title': 'batch alert', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        response = self._subject.create_alerts_batch([alert, alert, alert])
+        self.assertEqual(3, response['data']['count'])
+
+    def test_create_alerts_batch_should_not_create_any_alert_when_one_is_invalid(self):
+        alert = {'alert_title': 'rejected batch alert', 'alert_severity_id': 4, 'alert_status_id': 3,
+                 'alert_customer_id': 1}
+        response = self._subject.create_alerts_batch([alert, {'alert_title': 'missing fields'}])
+        self.assertEqual(1, response['data'][0]['index'])
+        response = self._subject.get_alerts_filter({'alert_title': 'rejected batch alert'})
+        self.assertEqual(0, response['data']['total'])
+
+    def test_update_alerts_batch_should_report_the_outcome_of_each_alert(self):
+        alert = {'alert_title': 'batch alert', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        response = self._subject.create_alerts_batch([alert, alert])
+        alert_identifiers = [alert['alert_id'] for alert in response['data']['alerts']]
+        response = self._subject.update_alerts_batch(alert_identifiers + [0], {'alert_severity_id': 5})
+        outcomes = [result['outcome'] for result in response['data']['results']]
+        self.assertEqual(['updated', 'updated', 'not_found'], outcomes)
+
+    def test_get_alerts_aggregations_should_count_the_filtered_alerts_by_status(self):
+        alerts = [{'alert_title': 'aggregated alert', 'alert_severity_id': 4, 'alert_status_id': status_id,
+                   'alert_customer_id': 1} for status_id in [2, 2, 3]]
+        response = self._subject.create_alerts_batch(alerts)
+        alert_identifiers = ','.join(str(alert['alert_id']) for alert in response['data']['alerts'])
+        response = self._subject.get_alerts_aggregations({'alert_ids': alert_identifiers})
+        statuses = {entry['id']: entry['count'] for entry in response['data']['status']}
+        self.assertEqual(3, response['data']['total'])
+        self.assertEqual({2: 2, 3: 1}, statuses)
+
+    def test_get_alerts_aggregations_should_reject_an_invalid_time_bucket(self):
+        response = self._subject.get_alerts_aggregations({'time_bucket': 'decade'})
+        self.assertEqual('error', response['status'])
+
+    def test_escalate_alerts_batch_should_deduplicate_the_observables_of_the_alerts(self):
+        alert = {'alert_title': 'escalated alert', 'alert_severity_id': 4, 'alert_status_id': 3,
+                 'alert_customer_id': 1,
+                 'alert_iocs': [{'ioc_value': self._generate_new_dummy_ioc_value(), 'ioc_type_id': 1, 'ioc_tlp_id': 1}],
+                 'alert_assets': [{'asset_name': 'escalated host', 'asset_type_id': 9}]}
+        response = self._subject.create_alerts_batch([alert, alert])
+        alert_identifiers = [alert['alert_id'] for alert in response['data']['alerts']]
+        iocs_uuids = []
+        assets_uuids = []
+        for alert_identifier in alert_identifiers:
+            alert = self._subject.get_alert(alert_identifier)['data']
+            iocs_uuids.extend(ioc['ioc_uuid'] for ioc in alert['iocs'])
+            assets_uuids.extend(asset['asset_uuid'] for asset in alert['assets'])
+        case_identifier = self._subject.escalate_alerts_batch(alert_identifiers, iocs_uuids,
+                                                              assets_uuids)['data']['case_id']
+        self.assertEqual(1, len(self._subject.get_case_iocs(case_identifier)['data']['ioc']))
+        self.assertEqual(1, len(self._subject.get_case_assets(case_identifier)['data']['assets']))
+
     def test_graphql_endpoint_should_reject_requests_with_wrong_authentication_token(self):
         graphql_api = GraphQLApi(API_URL + '/graphql', 64*'0')
         payload = {